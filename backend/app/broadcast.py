@@ -9,14 +9,28 @@ from channels.layers import get_channel_layer
 
 from app.serializers import (
     DraftEventSerializer,
-    DraftSerializerForTournament,
     DraftTeamSerializerFull,
-    HeroDraftSerializer,
 )
+from app.services.draft_snapshot import DraftSnapshot
+from app.services.herodraft_snapshot import HeroDraftSnapshot
+from app.ws_frames import draft_event_message, frame, herodraft_event_message
+from telemetry.metrics import timed
+from telemetry.tracing import span
 
 log = logging.getLogger(__name__)
 
 
+def group_send(channel_layer, group, message):
+    """``channel_layer.group_send`` from sync code, traced and timed per group kind."""
+    kind = group.split("_", 1)[0]
+    attributes = {"ws.group_kind": kind, "ws.message_type": message["type"]}
+    with (
+        span(f"ws group_send {kind}", **attributes),
+        timed("ws.group_send.duration", attributes),
+    ):
+        async_to_sync(channel_layer.group_send)(group, message)
+
+
 def broadcast_event(event, include_draft_state=True):
     """
     Broadcast a DraftEvent to both draft-specific and tournament channel groups.
@@ -38,39 +52,31 @@ def broadcast_event(event, include_draft_state=True):
     payload = DraftEventSerializer(event).data
     tournament_id = event.draft.tournament_id
 
-    # Include the full draft state so clients can update without additional API calls
-    draft_state = None
+    # Include the full draft state so clients can update without additional API
+    # calls; spliced in from the snapshot new connections are also served
+    raw = {}
     if include_draft_state:
         try:
-            # Refresh the draft from DB to get the latest state
-            event.draft.refresh_from_db()
-            draft_state = DraftSerializerForTournament(event.draft).data
+            raw["draft_state"] = DraftSnapshot.get(event.draft_id).encoded
         except Exception as e:
             log.warning(f"Failed to serialize draft state: {e}")
 
     try:
-        message = {
-            "type": "draft.event",
-            "payload": payload,
-        }
-        if draft_state:
-            message["draft_state"] = draft_state
+        # Encode once; both groups' consumers forward the same frame
+        draft_group = f"draft_{event.draft_id}"
+        message = frame(
+            "draft.event", draft_group, draft_event_message({"payload": payload}), raw
+        )
 
         # Send to draft-specific channel
-        async_to_sync(channel_layer.group_send)(
-            f"draft_{event.draft_id}",
-            message,
-        )
+        group_send(channel_layer, draft_group, message)
 
         # Send to tournament channel
-        async_to_sync(channel_layer.group_send)(
-            f"tournament_{tournament_id}",
-            message,
-        )
+        group_send(channel_layer, f"tournament_{tournament_id}", message)
 
         log.debug(
             f"Broadcast {event.event_type} to draft_{event.draft_id} and tournament_{tournament_id}"
-            + (" (with draft state)" if draft_state else "")
+            + (" (with draft state)" if raw else "")
         )
     except Exception as e:
         # Log the error but don't fail the draft operation
@@ -107,24 +113,18 @@ def broadcast_herodraft_event(draft, event_type: str, draft_team=None, metadata=
 
     # Build payload
     payload = {
-        "type": "herodraft.event",
         "event_type": event_type,
         "event_id": event.id,
+        "seq": event.seq,
         "draft_team": DraftTeamSerializerFull(draft_team).data if draft_team else None,
         "metadata": metadata or {},  # Include metadata for hero_id, action_type etc
         "timestamp": event.created_at.isoformat(),
     }
 
-    # Include full draft state with prefetched members
+    # Include the full draft state, spliced in from the shared snapshot JSON
+    raw = {}
     try:
-        from app.models import HeroDraft
-
-        draft = HeroDraft.objects.prefetch_related(
-            "draft_teams__tournament_team__captain",
-            "draft_teams__tournament_team__members",
-            "rounds",
-        ).get(id=draft.id)
-        payload["draft_state"] = HeroDraftSerializer(draft).data
+        raw["draft_state"] = HeroDraftSnapshot.get(draft.id).encoded
     except Exception as e:
         log.warning(f"Failed to serialize herodraft state: {e}")
 
@@ -132,7 +132,12 @@ def broadcast_herodraft_event(draft, event_type: str, draft_team=None, metadata=
     room_group_name = f"herodraft_{draft.id}"
 
     try:
-        async_to_sync(channel_layer.group_send)(room_group_name, payload)
+        message = herodraft_event_message(payload)
+        group_send(
+            channel_layer,
+            room_group_name,
+            frame("herodraft.event", room_group_name, message, raw),
+        )
         log.debug(f"Broadcast herodraft {event_type} to {room_group_name}")
     except Exception as e:
         log.warning(
@@ -160,10 +165,7 @@ def broadcast_herodraft_state(draft, event_type: str, metadata=None, draft_team=
         return
 
     # Build payload with current state
-    payload = {
-        "type": "herodraft.event",
-        "event_type": event_type,
-    }
+    payload = {"event_type": event_type}
 
     if metadata:
         payload["metadata"] = metadata
@@ -172,16 +174,9 @@ def broadcast_herodraft_state(draft, event_type: str, metadata=None, draft_team=
     if draft_team:
         payload["draft_team"] = DraftTeamSerializerFull(draft_team).data
 
-    # Include full draft state with prefetched members
+    # Include the full draft state, spliced in from the shared snapshot JSON
     try:
-        from app.models import HeroDraft
-
-        draft = HeroDraft.objects.prefetch_related(
-            "draft_teams__tournament_team__captain",
-            "draft_teams__tournament_team__members",
-            "rounds",
-        ).get(id=draft.id)
-        payload["draft_state"] = HeroDraftSerializer(draft).data
+        raw = {"draft_state": HeroDraftSnapshot.get(draft.id).encoded}
     except Exception as e:
         log.warning(f"Failed to serialize herodraft state: {e}")
         return  # Don't broadcast without state
@@ -190,7 +185,12 @@ def broadcast_herodraft_state(draft, event_type: str, metadata=None, draft_team=
     room_group_name = f"herodraft_{draft.id}"
 
     try:
-        async_to_sync(channel_layer.group_send)(room_group_name, payload)
+        message = herodraft_event_message(payload)
+        group_send(
+            channel_layer,
+            room_group_name,
+            frame("herodraft.event", room_group_name, message, raw),
+        )
         log.debug(f"Broadcast herodraft state ({event_type}) to {room_group_name}")
     except Exception as e:
         log.warning(
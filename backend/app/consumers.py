@@ -6,18 +6,92 @@ import json
 import logging
 import time
 from datetime import timedelta
+from urllib.parse import parse_qs
 
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.core.exceptions import ObjectDoesNotExist
 from django.utils import timezone
 
+from app.ws_frames import (
+    FrameOptions,
+    draft_event_message,
+    encode,
+    herodraft_event_message,
+    herodraft_kicked_message,
+    herodraft_tick_message,
+    render,
+)
+from telemetry.metrics import histogram
 from telemetry.websocket import TelemetryConsumerMixin
 
 log = logging.getLogger(__name__)
 
 
-class DraftConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
+class FramedConsumerMixin:
+    """
+    Send frames in the format and compression the connection asked for.
+
+    Options come from the WebSocket URL (see ``FrameOptions``); the default
+    is plain JSON text. Records ``ws.frame.sent_bytes`` per consumer,
+    format and compression.
+    """
+
+    _frame_options = None
+
+    @property
+    def frame_options(self) -> FrameOptions:
+        if self._frame_options is None:
+            self._frame_options = FrameOptions.from_scope(self.scope)
+        return self._frame_options
+
+    async def send_frame(self, text, frame_id=None):
+        options = self.frame_options
+        data = render(text, options, frame_id)
+        histogram("ws.frame.sent_bytes", unit="By").record(
+            len(data),
+            {
+                "ws.consumer": type(self).__name__,
+                "ws.format": options.format,
+                "ws.compression": options.compress,
+            },
+        )
+        if isinstance(data, bytes):
+            await self.send(bytes_data=data)
+        else:
+            await self.send(text_data=data)
+
+
+def event_frame(event, build_message):
+    """
+    The pre-encoded frame of a group message.
+
+    Messages without one (e.g. from a process running older code) are
+    encoded here from their fields with ``build_message``.
+    """
+    if "frame" in event:
+        return event["frame"]
+    return encode(build_message(event))
+
+
+def replay_cursor(scope):
+    """
+    The ``after_seq`` of the WebSocket URL's query string, or None.
+
+    A reconnecting client passes the ``seq`` of the last event it saw and
+    is sent the events after it instead of the latest ones.
+    """
+    query = parse_qs(scope.get("query_string", b"").decode())
+    try:
+        after_seq = int(query["after_seq"][0])
+    except (KeyError, ValueError):
+        return None
+    return after_seq if after_seq >= 0 else None
+
+
+class DraftConsumer(
+    FramedConsumerMixin, TelemetryConsumerMixin, AsyncWebsocketConsumer
+):
     """WebSocket consumer for draft-specific events."""
 
     async def connect(self):
@@ -35,16 +109,23 @@ class DraftConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         await self.accept()
 
-        # Send recent events and current draft state on connect
-        recent_events = await self.get_recent_events(self.draft_id)
-        draft_state = await self.get_draft_state(self.draft_id)
-        await self.send(
-            text_data=json.dumps(
+        # Send recent events and current draft state on connect, both already
+        # encoded: events from a Redis list (or replayed from the client's
+        # cursor), state from the shared snapshot
+        with self.telemetry_phase("initial_state"):
+            after_seq = replay_cursor(self.scope)
+            if after_seq is None:
+                recent_events = await self.get_recent_events(self.draft_id)
+            else:
+                recent_events = await self.replay_events(self.draft_id, after_seq)
+            snapshot = await self.get_draft_state(self.draft_id)
+        await self.send_frame(
+            encode(
+                {"type": "initial_events"},
                 {
-                    "type": "initial_events",
-                    "events": recent_events,
-                    "draft_state": draft_state,
-                }
+                    "events": f"[{','.join(recent_events)}]",
+                    "draft_state": snapshot.encoded if snapshot else "null",
+                },
             )
         )
 
@@ -59,14 +140,9 @@ class DraftConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
 
     async def draft_event(self, event):
         """Handle draft.event messages from channel layer."""
-        message = {
-            "type": "draft_event",
-            "event": event["payload"],
-        }
-        # Include draft state if available (allows clients to update without API calls)
-        if "draft_state" in event:
-            message["draft_state"] = event["draft_state"]
-        await self.send(text_data=json.dumps(message))
+        await self.send_frame(
+            event_frame(event, draft_event_message), event.get("frame_id")
+        )
 
     @database_sync_to_async
     def draft_exists(self, draft_id):
@@ -75,33 +151,35 @@ class DraftConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
         return Draft.objects.filter(pk=draft_id).exists()
 
     @database_sync_to_async
-    def get_recent_events(self, draft_id, limit=20):
-        from app.models import DraftEvent
-        from app.serializers import DraftEventSerializer
+    def get_recent_events(self, draft_id):
+        from app.services.recent_events import RecentDraftEvents
+
+        return RecentDraftEvents.for_draft(draft_id)
+
+    @database_sync_to_async
+    def replay_events(self, draft_id, after_seq):
+        from app.services.event_log import DraftEventLog
+        from app.services.recent_events import RecentDraftEvents
 
-        events = DraftEvent.objects.filter(draft_id=draft_id)[:limit]
-        return DraftEventSerializer(events, many=True).data
+        # Newest first, like the recent events
+        return RecentDraftEvents.encode(
+            reversed(DraftEventLog.since(draft_id, after_seq))
+        )
 
     @database_sync_to_async
     def get_draft_state(self, draft_id):
         from app.models import Draft
-        from app.serializers import DraftSerializerForTournament
+        from app.services.draft_snapshot import DraftSnapshot
 
         try:
-            # Note: users_remaining is a property, not a relation, so it can't be prefetched
-            draft = Draft.objects.prefetch_related(
-                "draft_rounds__captain",
-                "draft_rounds__choice",
-                "tournament__teams__captain",
-                "tournament__teams__members",
-                "tournament__users",  # Prefetch users for users_remaining calculation
-            ).get(pk=draft_id)
-            return DraftSerializerForTournament(draft).data
+            return DraftSnapshot.get(draft_id)
         except Draft.DoesNotExist:
             return None
 
 
-class TournamentConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
+class TournamentConsumer(
+    FramedConsumerMixin, TelemetryConsumerMixin, AsyncWebsocketConsumer
+):
     """WebSocket consumer for tournament-wide events."""
 
     async def connect(self):
@@ -120,13 +198,15 @@ class TournamentConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
         await self.accept()
 
         # Send recent events on connect
-        recent_events = await self.get_recent_events(self.tournament_id)
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "initial_events",
-                    "events": recent_events,
-                }
+        with self.telemetry_phase("initial_state"):
+            after_seq = replay_cursor(self.scope)
+            if after_seq is None:
+                recent_events = await self.get_recent_events(self.tournament_id)
+            else:
+                recent_events = await self.replay_events(self.tournament_id, after_seq)
+        await self.send_frame(
+            encode(
+                {"type": "initial_events"}, {"events": f"[{','.join(recent_events)}]"}
             )
         )
 
@@ -140,14 +220,9 @@ class TournamentConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
 
     async def draft_event(self, event):
         """Handle draft.event messages from channel layer."""
-        message = {
-            "type": "draft_event",
-            "event": event["payload"],
-        }
-        # Include draft state if available (allows clients to update without API calls)
-        if "draft_state" in event:
-            message["draft_state"] = event["draft_state"]
-        await self.send(text_data=json.dumps(message))
+        await self.send_frame(
+            event_frame(event, draft_event_message), event.get("frame_id")
+        )
 
     @database_sync_to_async
     def tournament_exists(self, tournament_id):
@@ -156,20 +231,34 @@ class TournamentConsumer(TelemetryConsumerMixin, AsyncWebsocketConsumer):
         return Tournament.objects.filter(pk=tournament_id).exists()
 
     @database_sync_to_async
-    def get_recent_events(self, tournament_id, limit=20):
-        from app.models import Draft, DraftEvent
-        from app.serializers import DraftEventSerializer
+    def get_recent_events(self, tournament_id):
+        from app.services.recent_events import RecentDraftEvents
 
-        # Get events from the tournament's draft
-        try:
-            draft = Draft.objects.get(tournament_id=tournament_id)
-            events = DraftEvent.objects.filter(draft=draft)[:limit]
-            return DraftEventSerializer(events, many=True).data
-        except Draft.DoesNotExist:
+        # Events of the tournament's draft
+        return RecentDraftEvents.for_tournament(tournament_id)
+
+    @database_sync_to_async
+    def replay_events(self, tournament_id, after_seq):
+        from app.models import Draft
+        from app.services.event_log import DraftEventLog
+        from app.services.recent_events import RecentDraftEvents
+
+        # A tournament has at most one draft, so its seq is the cursor
+        draft_id = (
+            Draft.objects.filter(tournament_id=tournament_id)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if draft_id is None:
             return []
+        return RecentDraftEvents.encode(
+            reversed(DraftEventLog.since(draft_id, after_seq))
+        )
 
 
-class HeroDraftConsumer(AsyncWebsocketConsumer):
+class HeroDraftConsumer(
+    FramedConsumerMixin, TelemetryConsumerMixin, AsyncWebsocketConsumer
+):
     """WebSocket consumer for Captain's Mode hero draft."""
 
     # Redis key patterns for captain connection tracking
@@ -177,6 +266,7 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
     CAPTAIN_HEARTBEAT_KEY = "herodraft:{draft_id}:captain:{user_id}:heartbeat"
 
     async def connect(self):
+        await self.telemetry_connect()
         self.draft_id = self.scope["url_route"]["kwargs"]["draft_id"]
         self.room_group_name = f"herodraft_{self.draft_id}"
         self.user = self.scope.get("user")
@@ -210,21 +300,28 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
 
         # Send initial state
         try:
-            initial_state = await self.get_draft_state(self.draft_id)
-            await self.send(
-                text_data=json.dumps(
-                    {
-                        "type": "initial_state",
-                        "draft_state": initial_state,
-                    }
-                )
+            with self.telemetry_phase("initial_state"):
+                snapshot = await self.get_draft_state(self.draft_id)
+            # Splice the shared snapshot JSON in rather than re-encoding it;
+            # variants are rendered once per snapshot version
+            await self.send_frame(
+                encode({"type": "initial_state"}, {"draft_state": snapshot.encoded}),
+                f"herodraft:{self.draft_id}:initial:{snapshot.version}",
             )
 
+            # A reconnecting client catches up on the events it missed
+            after_seq = replay_cursor(self.scope)
+            if after_seq is not None:
+                events = await self.replay_events(self.draft_id, after_seq)
+                await self.send_frame(
+                    encode({"type": "herodraft_events"}, {"events": events})
+                )
+
             # Start tick broadcaster if draft is in drafting state
-            # Compare against enum value since initial_state is serialized JSON
+            # Compare against enum value since the snapshot is serialized JSON
             from app.models import HeroDraftState
 
-            if initial_state.get("state") == HeroDraftState.DRAFTING.value:
+            if snapshot.data.get("state") == HeroDraftState.DRAFTING.value:
                 await self.maybe_start_tick_broadcaster()
 
         except Exception as e:
@@ -239,6 +336,7 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
             await self.mark_captain_connected(self.draft_id, self.user, True)
 
     async def disconnect(self, close_code):
+        await self.telemetry_disconnect(close_code)
         # Track disconnection
         if hasattr(self, "_connection_tracked") and self._connection_tracked:
             await self.track_connection(False)
@@ -410,14 +508,7 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
         # Mark this connection as kicked so disconnect() knows not to trigger
         # disconnect events (the new connection is already active)
         self._was_kicked = True
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "herodraft_kicked",
-                    "reason": reason,
-                }
-            )
-        )
+        await self.send_frame(event_frame(event, herodraft_kicked_message))
         await self.close(code=4000)  # Custom close code for "kicked"
 
     async def receive(self, text_data):
@@ -436,43 +527,14 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
 
     async def herodraft_event(self, event):
         """Handle herodraft.event messages from channel layer."""
-        # Build message with only fields that have actual values
-        # Using .get() with missing keys returns None, which serializes to null
-        # and fails Zod validation where .optional() expects undefined, not null
-        message = {
-            "type": "herodraft_event",
-            "event_type": event.get("event_type"),
-        }
-        # Only include optional fields if they have values
-        if "event_id" in event and event["event_id"] is not None:
-            message["event_id"] = event["event_id"]
-        if "draft_team" in event and event["draft_team"] is not None:
-            message["draft_team"] = event["draft_team"]
-        if "draft_state" in event and event["draft_state"] is not None:
-            message["draft_state"] = event["draft_state"]
-        if "timestamp" in event and event["timestamp"] is not None:
-            message["timestamp"] = event["timestamp"]
-        if "metadata" in event and event["metadata"] is not None:
-            message["metadata"] = event["metadata"]
-
-        await self.send(text_data=json.dumps(message))
+        await self.send_frame(
+            event_frame(event, herodraft_event_message), event.get("frame_id")
+        )
 
     async def herodraft_tick(self, event):
         """Handle tick updates during active drafting."""
-        await self.send(
-            text_data=json.dumps(
-                {
-                    "type": "herodraft_tick",
-                    "current_round": event.get("current_round"),
-                    "active_team_id": event.get("active_team_id"),
-                    "grace_time_remaining_ms": event.get("grace_time_remaining_ms"),
-                    "team_a_id": event.get("team_a_id"),
-                    "team_a_reserve_ms": event.get("team_a_reserve_ms"),
-                    "team_b_id": event.get("team_b_id"),
-                    "team_b_reserve_ms": event.get("team_b_reserve_ms"),
-                    "draft_state": event.get("draft_state"),
-                }
-            )
+        await self.send_frame(
+            event_frame(event, herodraft_tick_message), event.get("frame_id")
         )
 
     @database_sync_to_async
@@ -483,98 +545,94 @@ class HeroDraftConsumer(AsyncWebsocketConsumer):
 
     @database_sync_to_async
     def get_draft_state(self, draft_id):
-        from app.models import HeroDraft
-        from app.serializers import HeroDraftSerializer
+        from app.services.herodraft_snapshot import HeroDraftSnapshot
 
-        draft = HeroDraft.objects.prefetch_related(
-            "draft_teams__tournament_team__captain",
-            "draft_teams__tournament_team__members",
-            "rounds",
-        ).get(id=draft_id)
-        return HeroDraftSerializer(draft).data
+        return HeroDraftSnapshot.get(draft_id)
 
     @database_sync_to_async
-    def mark_captain_connected(self, draft_id, user, is_connected):
-        from django.db import transaction
+    def replay_events(self, draft_id, after_seq):
+        """Events after ``after_seq``, oldest first, encoded as a JSON array."""
+        from app.serializers import HeroDraftEventSerializer
+        from app.services.event_log import HeroDraftEventLog
+        from app.ws_frames import dumps
 
+        events = HeroDraftEventLog.since(draft_id, after_seq)
+        return dumps(HeroDraftEventSerializer(events, many=True).data).decode()
+
+    @database_sync_to_async
+    def mark_captain_connected(self, draft_id, user, is_connected):
         from app.broadcast import broadcast_herodraft_state
         from app.models import DraftTeam, HeroDraft, HeroDraftEvent, HeroDraftState
+        from app.utils.write_queue import write_queue
 
         # Track what to do after transaction commits
-        broadcast_event_type = None
-        should_broadcast = False
         should_restart_tick_broadcaster = False
 
-        try:
-            with transaction.atomic():
-                draft = HeroDraft.objects.select_for_update().get(id=draft_id)
+        def apply_connection_change():
+            """Flag the captain's connection; returns the event to broadcast."""
+            draft = HeroDraft.objects.select_for_update().get(id=draft_id)
 
-                draft_team = draft.draft_teams.filter(
-                    tournament_team__captain=user
-                ).first()
+            draft_team = draft.draft_teams.filter(tournament_team__captain=user).first()
 
-                if draft_team:
-                    draft_team.is_connected = is_connected
-                    draft_team.save()
+            if draft_team:
+                draft_team.is_connected = is_connected
+                draft_team.save()
 
-                    event_type = (
-                        "captain_connected" if is_connected else "captain_disconnected"
-                    )
+                event_type = (
+                    "captain_connected" if is_connected else "captain_disconnected"
+                )
+                HeroDraftEvent.objects.create(
+                    draft=draft,
+                    event_type=event_type,
+                    draft_team=draft_team,
+                    metadata={"user_id": user.id, "username": user.username},
+                )
+
+                # Handle pause/resume on disconnect - only during DRAFTING phase
+                # (when timers are running and picks matter)
+                # Ignore disconnects during RESUMING to prevent infinite time exploit
+                if not is_connected and draft.state == HeroDraftState.DRAFTING:
+                    draft.state = HeroDraftState.PAUSED
+                    draft.paused_at = timezone.now()
+                    draft.save()
                     HeroDraftEvent.objects.create(
                         draft=draft,
-                        event_type=event_type,
+                        event_type="draft_paused",
                         draft_team=draft_team,
-                        metadata={"user_id": user.id, "username": user.username},
+                        metadata={"reason": "captain_disconnected"},
                     )
+                    log.info(
+                        f"HeroDraft {draft_id} paused: captain {user.username} disconnected"
+                    )
+                    return "draft_paused"
+                elif is_connected and draft.state == HeroDraftState.PAUSED:
+                    # All pauses require manual resume via the Resume button
+                    # Just broadcast the connection status change
+                    return event_type
+                else:
+                    # Always broadcast connection status changes so UI updates
+                    return event_type
+            return None
 
-                    # Handle pause/resume on disconnect - only during DRAFTING phase
-                    # (when timers are running and picks matter)
-                    # Ignore disconnects during RESUMING to prevent infinite time exploit
-                    if not is_connected and draft.state == HeroDraftState.DRAFTING:
-                        draft.state = HeroDraftState.PAUSED
-                        draft.paused_at = timezone.now()
-                        draft.save()
-                        HeroDraftEvent.objects.create(
-                            draft=draft,
-                            event_type="draft_paused",
-                            draft_team=draft_team,
-                            metadata={"reason": "captain_disconnected"},
-                        )
-                        log.info(
-                            f"HeroDraft {draft_id} paused: captain {user.username} disconnected"
-                        )
-                        broadcast_event_type = "draft_paused"
-                        should_broadcast = True
-                    elif is_connected and draft.state == HeroDraftState.PAUSED:
-                        # All pauses require manual resume via the Resume button
-                        # Just broadcast the connection status change
-                        broadcast_event_type = event_type
-                        should_broadcast = True
-                    else:
-                        # Always broadcast connection status changes so UI updates
-                        broadcast_event_type = event_type
-                        should_broadcast = True
-
+        try:
+            # Connection flags and events are small writes; group-commit them
+            broadcast_event_type = write_queue.run(apply_connection_change)
         except HeroDraft.DoesNotExist:
             return
+        should_broadcast = broadcast_event_type is not None
 
         # Broadcast AFTER transaction commits to ensure other connections see changes
         if should_broadcast and broadcast_event_type:
             try:
-                # Re-fetch draft to get committed state
-                draft = HeroDraft.objects.prefetch_related(
-                    "draft_teams__tournament_team__captain",
-                    "draft_teams__tournament_team__members",
-                    "rounds",
-                ).get(id=draft_id)
-                # Get fresh draft_team from prefetched data (filter() bypasses prefetch cache)
-                # Use DraftTeam.captain property which accesses tournament_team.captain
-                fresh_draft_team = None
-                for dt in draft.draft_teams.all():
-                    # DraftTeam.captain property returns tournament_team.captain
-                    if dt.captain and dt.captain.id == user.id:
-                        fresh_draft_team = dt
-                        break
+                # Re-fetch the captain's team to get committed state; the
+                # draft state itself comes from the shared snapshot
+                draft = HeroDraft.objects.get(id=draft_id)
+                fresh_draft_team = (
+                    DraftTeam.objects.select_related("tournament_team__captain")
+                    .prefetch_related("tournament_team__members")
+                    .filter(draft_id=draft_id, tournament_team__captain=user)
+                    .first()
+                )
 
                 broadcast_herodraft_state(
                     draft, broadcast_event_type, draft_team=fresh_draft_team
@@ -2,8 +2,11 @@
 
 import logging
 import random
+from typing import Optional
 
 from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Q, Value, When
+from django.db.models.functions import Greatest
 from django.utils import timezone
 
 from app.models import (
@@ -13,6 +16,8 @@ from app.models import (
     HeroDraftRound,
     HeroDraftState,
 )
+from app.services.hero_pool import HeroPool
+from app.services.herodraft_snapshot import HeroDraftSnapshot
 
 log = logging.getLogger(__name__)
 
@@ -164,49 +169,83 @@ def submit_choice(draft: HeroDraft, team: DraftTeam, choice_type: str, value: st
             first_round.save()
 
 
-def submit_pick(draft: HeroDraft, team: DraftTeam, hero_id: int) -> HeroDraftRound:
+class PickConflict(ValueError):
+    """The draft changed between reading it and applying a pick; retry."""
+
+
+def submit_pick(
+    draft: HeroDraft,
+    team: DraftTeam,
+    hero_id: int,
+    events=(),
+    expected_version: Optional[int] = None,
+    round_id: Optional[int] = None,
+) -> HeroDraftRound:
     """
     Submit a hero pick or ban for the current round.
 
-    Returns the completed round.
+    Takes no row locks. The draft's rounds are read in one query and the
+    transition is planned in memory, then applied as:
+
+    - an UPDATE claiming the draft version that was read, while the draft
+      is still drafting (optimistic concurrency; any other draft write
+      moves the version on),
+    - one UPDATE completing the current round and activating the next,
+    - an UPDATE of the team's reserve time, only when reserve was used,
+    - one bulk insert of ``events`` plus the pick's own events.
+
+    A caller that decided to pick from its own earlier read (e.g. the
+    timeout check) passes that read's ``expected_version`` and active
+    ``round_id``; the pick then conflicts if either has moved on since,
+    instead of applying to whatever round is active now.
+
+    Raises ``PickConflict`` when another write won the race or the draft
+    is no longer drafting, and
+    ``ValueError`` when the pick is not allowed. The round and draft team
+    writes bypass ``post_save``, so the hero pool and snapshot updates
+    their signals make are done here. Returns the completed round.
     """
-    with transaction.atomic():
-        draft = HeroDraft.objects.select_for_update().get(id=draft.id)
-        team = DraftTeam.objects.select_for_update().get(id=team.id)
-        current_round = draft.rounds.select_for_update().filter(state="active").first()
-
-        if not current_round:
-            raise ValueError("No active round")
-
-        if current_round.draft_team_id != team.id:
-            raise ValueError("Not your turn")
-
-        # Check hero not already picked/banned
-        used_heroes = draft.rounds.exclude(hero_id=None).values_list(
-            "hero_id", flat=True
-        )
-        if hero_id in used_heroes:
-            raise ValueError("Hero already picked or banned")
-
-        # Calculate time spent and update reserve time
-        now = timezone.now()
-        elapsed_ms = int((now - current_round.started_at).total_seconds() * 1000)
-        grace_used = min(elapsed_ms, current_round.grace_time_ms)
-        reserve_used = max(0, elapsed_ms - current_round.grace_time_ms)
-
-        team.reserve_time_remaining = max(0, team.reserve_time_remaining - reserve_used)
-        team.save()
-
-        # Complete the round
-        current_round.hero_id = hero_id
-        current_round.state = "completed"
-        current_round.completed_at = now
-        current_round.save()
-
-        HeroDraftEvent.objects.create(
-            draft=draft,
+    # State and version in one read, and the claim below requires both: a
+    # pause committed at any point after the caller's own state check
+    # makes the pick fail instead of applying to a paused draft
+    state, version = HeroDraft.objects.values_list("state", "version").get(id=draft.id)
+    if state != HeroDraftState.DRAFTING:
+        raise PickConflict(f"Cannot submit pick in state '{state}'")
+    if expected_version is not None and version != expected_version:
+        raise PickConflict("Draft changed, please try again")
+    rounds = list(HeroDraftRound.objects.filter(draft_id=draft.id))
+
+    current_round = next((r for r in rounds if r.state == "active"), None)
+    if not current_round:
+        raise ValueError("No active round")
+    if round_id is not None and current_round.pk != round_id:
+        raise PickConflict("Round already completed")
+
+    if current_round.draft_team_id != team.id:
+        raise ValueError("Not your turn")
+
+    # Callers pre-check against the cached HeroPool; the rounds just read
+    # are the authoritative check, and the version claim keeps it valid
+    if any(r.hero_id == hero_id for r in rounds):
+        raise ValueError("Hero already picked or banned")
+
+    next_round = next((r for r in rounds if r.state == "planned"), None)
+
+    # Calculate time spent and reserve time used
+    now = timezone.now()
+    elapsed_ms = int((now - current_round.started_at).total_seconds() * 1000)
+    reserve_used = max(0, elapsed_ms - current_round.grace_time_ms)
+
+    current_round.hero_id = hero_id
+    current_round.state = "completed"
+    current_round.completed_at = now
+
+    events = [*events]
+    events.append(
+        HeroDraftEvent(
+            draft_id=draft.id,
             event_type="hero_selected",
-            draft_team=team,
+            draft_team_id=team.id,
             metadata={
                 "round_number": current_round.round_number,
                 "hero_id": hero_id,
@@ -215,191 +254,110 @@ def submit_pick(draft: HeroDraft, team: DraftTeam, hero_id: int) -> HeroDraftRou
                 "reserve_used_ms": reserve_used,
             },
         )
-
-        # Activate next round or complete draft
-        next_round = draft.rounds.filter(state="planned").first()
-        if next_round:
-            next_round.state = "active"
-            next_round.started_at = timezone.now()
-            next_round.save()
-
-            HeroDraftEvent.objects.create(
-                draft=draft,
+    )
+    if next_round:
+        events.append(
+            HeroDraftEvent(
+                draft_id=draft.id,
                 event_type="round_started",
-                draft_team=next_round.draft_team,
+                draft_team_id=next_round.draft_team_id,
                 metadata={
                     "round_number": next_round.round_number,
                     "action_type": next_round.action_type,
                 },
             )
-        else:
-            draft.state = HeroDraftState.COMPLETED
-            draft.save()
+        )
+    else:
+        events.append(
+            HeroDraftEvent(draft_id=draft.id, event_type="draft_completed", metadata={})
+        )
 
-            HeroDraftEvent.objects.create(
-                draft=draft, event_type="draft_completed", metadata={}
+    with transaction.atomic():
+        claimed = HeroDraft.objects.filter(
+            id=draft.id, state=HeroDraftState.DRAFTING, version=version
+        ).update(version=F("version") + 1)
+        if not claimed:
+            raise PickConflict("Draft changed, please try again")
+
+        # Complete the current round and activate the next in one statement
+        transition = Q(pk=current_round.pk, state="active")
+        if next_round:
+            transition |= Q(pk=next_round.pk, state="planned")
+        updated = HeroDraftRound.objects.filter(transition).update(
+            state=Case(
+                When(pk=current_round.pk, then=Value("completed")),
+                default=Value("active"),
+            ),
+            hero_id=Case(
+                When(pk=current_round.pk, then=Value(hero_id)),
+                default=F("hero_id"),
+            ),
+            completed_at=Case(
+                When(pk=current_round.pk, then=Value(now)),
+                default=F("completed_at"),
+                output_field=DateTimeField(),
+            ),
+            started_at=Case(
+                When(pk=current_round.pk, then=F("started_at")),
+                default=Value(now),
+                output_field=DateTimeField(),
+            ),
+        )
+        if updated != (2 if next_round else 1):
+            raise PickConflict("Round changed, please try again")
+
+        if reserve_used:
+            DraftTeam.objects.filter(id=team.id).update(
+                reserve_time_remaining=Greatest(
+                    F("reserve_time_remaining") - reserve_used, 0
+                )
             )
 
-        return current_round
+        HeroDraftEvent.bulk_append(draft.id, events)
+
+        if not next_round:
+            # Rare, and the completion receivers should run: save normally
+            draft = HeroDraft.objects.get(id=draft.id)
+            draft.state = HeroDraftState.COMPLETED
+            draft.save()
+
+    HeroPool.invalidate_after_write(draft.id)
+    HeroDraftSnapshot.bump(draft.id)
+    return current_round
 
 
 def get_available_heroes(draft: HeroDraft) -> list[int]:
     """Return list of hero IDs not yet picked or banned."""
-    # All valid Dota 2 hero IDs from dotaconstants (as of Jan 2025)
-    # Hero IDs are not sequential - there are gaps (e.g., 24 doesn't exist, 139-144, 146-154 don't exist)
-    # This list should be updated when new heroes are added to Dota 2
-    ALL_HERO_IDS = [
-        1,
-        2,
-        3,
-        4,
-        5,
-        6,
-        7,
-        8,
-        9,
-        10,
-        11,
-        12,
-        13,
-        14,
-        15,
-        16,
-        17,
-        18,
-        19,
-        20,
-        21,
-        22,
-        23,
-        25,
-        26,
-        27,
-        28,
-        29,
-        30,
-        31,
-        32,
-        33,
-        34,
-        35,
-        36,
-        37,
-        38,
-        39,
-        40,
-        41,
-        42,
-        43,
-        44,
-        45,
-        46,
-        47,
-        48,
-        49,
-        50,
-        51,
-        52,
-        53,
-        54,
-        55,
-        56,
-        57,
-        58,
-        59,
-        60,
-        61,
-        62,
-        63,
-        64,
-        65,
-        66,
-        67,
-        68,
-        69,
-        70,
-        71,
-        72,
-        73,
-        74,
-        75,
-        76,
-        77,
-        78,
-        79,
-        80,
-        81,
-        82,
-        83,
-        84,
-        85,
-        86,
-        87,
-        88,
-        89,
-        90,
-        91,
-        92,
-        93,
-        94,
-        95,
-        96,
-        97,
-        98,
-        99,
-        100,
-        101,
-        102,
-        103,
-        104,
-        105,
-        106,
-        107,
-        108,
-        109,
-        110,
-        111,
-        112,
-        113,
-        114,
-        119,
-        120,
-        121,
-        123,  # Newer heroes with gaps
-        126,
-        128,
-        129,
-        131,
-        135,
-        136,
-        137,
-        138,
-        145,
-        155,  # Recent heroes including Largo (155)
-    ]
-
-    used_heroes = set(
-        draft.rounds.exclude(hero_id=None).values_list("hero_id", flat=True)
-    )
+    return HeroPool.available(draft.id)
 
-    return [h for h in ALL_HERO_IDS if h not in used_heroes]
 
+def auto_random_pick(
+    draft: HeroDraft,
+    team: DraftTeam,
+    expected_version: Optional[int] = None,
+    round_id: Optional[int] = None,
+) -> HeroDraftRound:
+    """
+    Auto-pick a random available hero when time runs out.
 
-def auto_random_pick(draft: HeroDraft, team: DraftTeam) -> HeroDraftRound:
-    """Auto-pick a random available hero when time runs out."""
-    available = get_available_heroes(draft)
-    if not available:
+    ``expected_version`` and ``round_id`` are passed to ``submit_pick``.
+    """
+    hero_id = HeroPool.random_available(draft.id)
+    if hero_id is None:
         raise ValueError("No heroes available")
 
-    hero_id = random.choice(available)
-
-    # Record timeout event
-    HeroDraftEvent.objects.create(
-        draft=draft,
+    # Record the timeout event in the pick's insert
+    timeout_event = HeroDraftEvent(
+        draft_id=draft.id,
         event_type="round_timeout",
-        draft_team=team,
+        draft_team_id=team.id,
         metadata={"auto_picked_hero": hero_id},
     )
-
-    # Submit the pick
-    return submit_pick(draft, team, hero_id)
+    return submit_pick(
+        draft,
+        team,
+        hero_id,
+        events=[timeout_event],
+        expected_version=expected_version,
+        round_id=round_id,
+    )
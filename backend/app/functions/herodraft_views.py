@@ -12,26 +12,21 @@ from rest_framework.response import Response
 
 from app.broadcast import broadcast_herodraft_event
 from app.functions.herodraft import (
+    PickConflict,
     get_available_heroes,
     submit_choice,
     submit_pick,
     trigger_roll,
 )
 from app.models import DraftTeam, Game, HeroDraft, HeroDraftEvent, HeroDraftState
-from app.serializers import HeroDraftEventSerializer, HeroDraftSerializer
+from app.serializers import HeroDraftEventSerializer
+from app.services.event_log import REPLAY_LIMIT, HeroDraftEventLog
+from app.services.hero_pool import HeroPool
+from app.services.herodraft_snapshot import HeroDraftSnapshot
 
 log = logging.getLogger(__name__)
 
 
-def _get_draft_with_prefetch(draft_pk: int) -> HeroDraft:
-    """Get a draft with all related data prefetched for serialization."""
-    return HeroDraft.objects.prefetch_related(
-        "draft_teams__tournament_team__captain",
-        "draft_teams__tournament_team__members",
-        "rounds",
-    ).get(pk=draft_pk)
-
-
 def _get_draft_team_for_user(draft: HeroDraft, user) -> DraftTeam | None:
     """Get the DraftTeam for a user in this draft, if they are a captain."""
     for draft_team in draft.draft_teams.all():
@@ -63,8 +58,9 @@ def create_herodraft(request, game_pk):
 
     # Check if draft already exists - return existing draft instead of error
     if hasattr(game, "herodraft"):
-        draft = _get_draft_with_prefetch(game.herodraft.pk)
-        return Response(HeroDraftSerializer(draft).data, status=status.HTTP_200_OK)
+        return Response(
+            HeroDraftSnapshot.for_draft(game.herodraft.pk), status=status.HTTP_200_OK
+        )
 
     # If teams not assigned to game but provided in request, assign them
     radiant_team_id = request.data.get("radiant_team_id")
@@ -130,9 +126,9 @@ def create_herodraft(request, game_pk):
 
     broadcast_herodraft_event(draft, "draft_created")
 
-    # Refetch with prefetch for proper serialization
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data, status=status.HTTP_201_CREATED)
+    return Response(
+        HeroDraftSnapshot.for_draft(draft.pk), status=status.HTTP_201_CREATED
+    )
 
 
 @api_view(["GET"])
@@ -147,8 +143,7 @@ def get_herodraft(request, draft_pk):
         200: Draft data
         404: Draft not found
     """
-    draft = _get_draft_with_prefetch(draft_pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft_pk))
 
 
 @api_view(["POST"])
@@ -201,8 +196,7 @@ def set_ready(request, draft_pk):
 
     broadcast_herodraft_event(draft, "captain_ready", draft_team)
 
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 @api_view(["POST"])
@@ -244,9 +238,7 @@ def do_trigger_roll(request, draft_pk):
 
     broadcast_herodraft_event(draft, "roll_result", winner)
 
-    # Refetch with prefetch for proper serialization
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 @api_view(["POST"])
@@ -354,16 +346,15 @@ def do_submit_choice(request, draft_pk):
 
     broadcast_herodraft_event(draft, "choice_made", draft_team)
 
-    # Refetch with prefetch for proper serialization
-    draft = _get_draft_with_prefetch(draft.pk)
+    snapshot = HeroDraftSnapshot.for_draft(draft.pk)
 
     # Start tick broadcaster if draft just entered drafting state
-    if draft.state == HeroDraftState.DRAFTING:
+    if snapshot["state"] == HeroDraftState.DRAFTING:
         from app.tasks.herodraft_tick import start_tick_broadcaster
 
         start_tick_broadcaster(draft.id)
 
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(snapshot)
 
 
 @api_view(["POST"])
@@ -380,6 +371,7 @@ def do_submit_pick(request, draft_pk):
         403: User is not a captain or not their turn
         404: Draft not found
         400: Invalid state, hero already picked, or invalid hero
+        409: The draft changed while the pick was applied (retry)
     """
     draft = get_object_or_404(HeroDraft, pk=draft_pk)
 
@@ -410,8 +402,7 @@ def do_submit_pick(request, draft_pk):
         )
 
     # Check hero is available
-    available = get_available_heroes(draft)
-    if hero_id not in available:
+    if not HeroPool.is_available(draft.id, hero_id):
         return Response(
             {"error": "Hero is not available (already picked or banned)"},
             status=status.HTTP_400_BAD_REQUEST,
@@ -419,6 +410,8 @@ def do_submit_pick(request, draft_pk):
 
     try:
         completed_round = submit_pick(draft, draft_team, hero_id)
+    except PickConflict as e:
+        return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
     except ValueError as e:
         return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
@@ -438,24 +431,47 @@ def do_submit_pick(request, draft_pk):
         },
     )
 
-    # Refetch with prefetch for proper serialization
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def list_events(request, draft_pk):
     """
-    List all events for a hero draft.
+    List a hero draft's events, oldest first, a page at a time.
+
+    Query params:
+        after_seq: Only events after this ``seq`` (default 0, from the start)
+        limit: Page size (default and maximum ``REPLAY_LIMIT``)
+
+    A full page carries an ``X-Next-After-Seq`` header with the cursor of
+    the next page.
 
     Returns:
         200: List of events
+        400: Invalid after_seq or limit
         404: Draft not found
     """
     draft = get_object_or_404(HeroDraft, pk=draft_pk)
-    events = draft.events.all()
-    return Response(HeroDraftEventSerializer(events, many=True).data)
+    try:
+        after_seq = int(request.query_params.get("after_seq", 0))
+        limit = min(int(request.query_params.get("limit", REPLAY_LIMIT)), REPLAY_LIMIT)
+    except ValueError:
+        return Response(
+            {"error": "after_seq and limit must be integers"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if after_seq < 0 or limit < 1:
+        return Response(
+            {"error": "after_seq must be >= 0 and limit >= 1"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    events = HeroDraftEventLog.since(draft.pk, after_seq, limit)
+    response = Response(HeroDraftEventSerializer(events, many=True).data)
+    if len(events) == limit:
+        response["X-Next-After-Seq"] = str(events[-1].seq)
+    return response
 
 
 @api_view(["GET"])
@@ -524,8 +540,7 @@ def abandon_draft(request, draft_pk):
 
     broadcast_herodraft_event(draft, "draft_abandoned")
 
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 @api_view(["POST"])
@@ -583,8 +598,7 @@ def reset_draft(request, draft_pk):
 
     broadcast_herodraft_event(draft, "draft_reset")
 
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 def _user_is_league_staff(draft: HeroDraft, user) -> bool:
@@ -667,8 +681,7 @@ def pause_draft(request, draft_pk):
 
     broadcast_herodraft_event(draft, "draft_paused", draft_team)
 
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
 
 
 @api_view(["POST"])
@@ -756,5 +769,4 @@ def resume_draft(request, draft_pk):
 
     start_tick_broadcaster(draft.pk)
 
-    draft = _get_draft_with_prefetch(draft.pk)
-    return Response(HeroDraftSerializer(draft).data)
+    return Response(HeroDraftSnapshot.for_draft(draft.pk))
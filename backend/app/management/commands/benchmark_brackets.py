@@ -0,0 +1,67 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.services import bracket_engine
+
+
+class Command(BaseCommand):
+    help = "Time in-memory bracket generation for large events"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--teams",
+            type=int,
+            nargs="+",
+            default=[64, 128],
+            help="Team counts to benchmark",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Runs per team count (best time is reported)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        for team_count in options["teams"]:
+            team_ids = list(range(1, team_count + 1))
+            rng.shuffle(team_ids)
+
+            # Swiss round 2 after a random first round
+            round_one = bracket_engine.generate("swiss", team_ids)
+            results = [
+                (
+                    m["radiantTeam"]["pk"],
+                    m.get("direTeam", {}).get("pk"),
+                    rng.choice([m["radiantTeam"], m.get("direTeam") or {}]).get("pk")
+                    or m["radiantTeam"]["pk"],
+                )
+                for m in round_one
+            ]
+
+            cases = {
+                "single_elimination": lambda: bracket_engine.single_elimination(
+                    team_ids
+                ),
+                "double_elimination": lambda: bracket_engine.double_elimination(
+                    team_ids
+                ),
+                "swiss_round": lambda: bracket_engine.swiss_pairings(
+                    *bracket_engine.swiss_standings(results, team_ids), 2
+                ),
+            }
+            for name, build in cases.items():
+                best = float("inf")
+                for _ in range(options["iterations"]):
+                    start = time.perf_counter()
+                    matches = build()
+                    best = min(best, time.perf_counter() - start)
+                self.stdout.write(
+                    f"{team_count:>5} teams  {name:<20} {len(matches):>5} games  "
+                    f"{best * 1000:8.3f} ms"
+                )
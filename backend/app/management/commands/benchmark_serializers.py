@@ -0,0 +1,338 @@
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from app.utils.scratch_db import scratch_database
+
+HERODRAFT_ROUNDS = 24
+
+
+def _tournament(fixture):
+    # TournamentView.retrieve
+    from app.models import Tournament
+    from app.serializers import TournamentSerializer
+
+    return TournamentSerializer(Tournament.objects.get(pk=fixture["tournament"])).data
+
+
+def _draft(fixture):
+    # DraftSnapshot miss: DraftConsumer initial state and every draft broadcast
+    from app.services.draft_snapshot import DraftSnapshot
+
+    return DraftSnapshot.build(fixture["draft"])
+
+
+def _herodraft(fixture):
+    # HeroDraftSnapshot miss: REST, hero draft broadcasts and initial state
+    from app.services.herodraft_snapshot import HeroDraftSnapshot
+
+    return HeroDraftSnapshot.build(fixture["herodraft"])
+
+
+def _teams(fixture):
+    # TeamView.list for one tournament (TeamSerializer.get_total_mmr)
+    from app.models import Team
+    from app.serializers import TeamSerializer
+
+    teams = Team.objects.filter(tournament_id=fixture["tournament"])
+    return TeamSerializer(teams, many=True).data
+
+
+def _league_matches(fixture):
+    # LeagueView.matches
+    from app.models import Game
+    from app.serializers import LeagueMatchSerializer
+
+    league = fixture["league"]
+    games = (
+        Game.objects.filter(Q(league_id=league) | Q(tournament__league_id=league))
+        .select_related(
+            "tournament",
+            "league",
+            "radiant_team",
+            "radiant_team__captain",
+            "dire_team",
+            "dire_team__captain",
+            "winning_team",
+        )
+        .order_by("-pk")
+    )
+    return LeagueMatchSerializer(games, many=True).data
+
+
+CASES = {
+    "tournament": _tournament,
+    "draft": _draft,
+    "herodraft": _herodraft,
+    "teams": _teams,
+    "league_matches": _league_matches,
+}
+
+
+def build_fixture(teams, rng, label):
+    """
+    Seed one synthetic tournament scaled by its team count.
+
+    ``teams`` teams of five (captain + four drafted players), a snake draft
+    with half its picks made, a game per adjacent pair of teams in the
+    tournament's league, and a hero draft on the first game with up to
+    ``2 * teams`` of its 24 rounds completed.
+    """
+    from app.functions.herodraft import build_draft_rounds
+    from app.models import (
+        CustomUser,
+        Draft,
+        DraftTeam,
+        Game,
+        HeroDraft,
+        HeroDraftState,
+        League,
+        PositionsModel,
+        Team,
+        Tournament,
+    )
+
+    users = []
+    for i in range(teams * 5):
+        positions = PositionsModel.objects.create(
+            **{
+                role: rng.randint(0, 5)
+                for role in (
+                    "carry",
+                    "mid",
+                    "offlane",
+                    "soft_support",
+                    "hard_support",
+                )
+            }
+        )
+        users.append(
+            CustomUser.objects.create(
+                username=f"bench_{label}_{i}",
+                # Unique per size, numeric like real Discord/Steam IDs
+                discordId=str(900000000000000000 + teams * 10000 + i),
+                mmr=rng.randint(200, 6000),
+                steamid=76561197960265728 + teams * 10000 + i,
+                positions=positions,
+            )
+        )
+
+    league = League.objects.create(
+        steam_league_id=900000 + teams, name=f"Bench League {label}"
+    )
+    tournament = Tournament.objects.create(
+        name=f"Bench Tournament {label}",
+        date_played=timezone.now(),
+        state="in_progress",
+        league=league,
+    )
+    tournament.users.set(users)
+    team_objects = []
+    for i, captain in enumerate(users[:teams]):
+        team = Team.objects.create(
+            tournament=tournament,
+            name=f"Bench Team {label}-{i}",
+            captain=captain,
+            draft_order=i + 1,
+        )
+        team.members.add(captain)
+        team_objects.append(team)
+
+    draft = Draft.objects.create(tournament=tournament, draft_style="snake")
+    draft.build_rounds()
+    players = users[teams:]
+    rounds = list(draft.draft_rounds.order_by("pick_number"))
+    for draft_round, player in zip(rounds[: len(rounds) // 2], players):
+        draft_round.pick_player(player)
+
+    games = [
+        Game.objects.create(
+            tournament=tournament,
+            league=league,
+            radiant_team=radiant,
+            dire_team=dire,
+            round=i + 1,
+        )
+        for i, (radiant, dire) in enumerate(zip(team_objects, team_objects[1:]))
+    ]
+
+    herodraft = HeroDraft.objects.create(game=games[0], state=HeroDraftState.DRAFTING)
+    first, second = [
+        DraftTeam.objects.create(
+            draft=herodraft,
+            tournament_team=team,
+            is_first_pick=index == 0,
+            is_radiant=index == 0,
+        )
+        for index, team in enumerate(team_objects[:2])
+    ]
+    build_draft_rounds(herodraft, first, second)
+    now = timezone.now()
+    heroes = rng.sample(range(1, 130), HERODRAFT_ROUNDS)
+    for hero_round in herodraft.rounds.order_by("round_number")[: teams * 2]:
+        hero_round.hero_id = heroes[hero_round.round_number - 1]
+        hero_round.state = "completed"
+        hero_round.started_at = now - timedelta(seconds=20)
+        hero_round.completed_at = now
+        hero_round.save()
+
+    return {
+        "tournament": tournament.pk,
+        "draft": draft.pk,
+        "herodraft": herodraft.pk,
+        "league": league.pk,
+    }
+
+
+def measure(case, fixture, iterations):
+    """Queries, median time and peak allocation of one serialization path."""
+    with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+        case(fixture)
+    query_count = len(queries)
+
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        case(fixture)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    case(fixture)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "queries": query_count,
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def query_growth(results):
+    """Cases whose query count grows between the smallest and largest size."""
+    growth = {}
+    for name, by_size in results.items():
+        sizes = sorted(by_size, key=int)
+        low, high = by_size[sizes[0]]["queries"], by_size[sizes[-1]]["queries"]
+        if high > low:
+            growth[name] = (sizes[0], low, sizes[-1], high)
+    return growth
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the serializers on hot read paths (query count, median time, "
+        "peak allocation) over synthetic tournaments of growing size. Fails when "
+        "a path's query count grows with the tournament size (N+1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--teams",
+            type=int,
+            nargs="+",
+            default=[4, 8, 16],
+            help="Tournament sizes (teams of five) to benchmark",
+        )
+        parser.add_argument(
+            "--cases",
+            nargs="+",
+            choices=list(CASES),
+            default=list(CASES),
+            help="Serialization paths to benchmark",
+        )
+        parser.add_argument(
+            "--iterations", type=int, default=20, help="Timed runs per case"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--save-baseline", metavar="PATH", help="Write results as JSON to PATH"
+        )
+        parser.add_argument(
+            "--baseline",
+            metavar="PATH",
+            help="Compare with a saved baseline; fail on more queries or slower runs",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative slowdown against the baseline",
+        )
+
+    def handle(self, *args, **options):
+        if len(options["teams"]) < 2:
+            raise CommandError("Give at least two --teams sizes to detect N+1")
+        rng = random.Random(options["seed"])
+
+        # Measure the database path, not cacheops hits, without DEBUG query logging
+        with override_settings(CACHEOPS_ENABLED=False, DEBUG=False), scratch_database():
+            fixtures = {
+                str(teams): build_fixture(teams, rng, label=f"t{teams}")
+                for teams in options["teams"]
+            }
+            results = {
+                name: {
+                    size: measure(CASES[name], fixture, options["iterations"])
+                    for size, fixture in fixtures.items()
+                }
+                for name in options["cases"]
+            }
+
+        self.stdout.write(
+            f"{'case':<16} {'teams':>5} {'queries':>8} {'median ms':>10} "
+            f"{'peak KiB':>9}"
+        )
+        for name, by_size in results.items():
+            for size, r in by_size.items():
+                self.stdout.write(
+                    f"{name:<16} {size:>5} {r['queries']:>8} "
+                    f"{r['median_ms']:>10.3f} {r['peak_kib']:>9.1f}"
+                )
+
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(
+                json.dumps(results, indent=2, sort_keys=True) + "\n"
+            )
+            self.stdout.write(f"Baseline saved to {options['save_baseline']}")
+
+        failures = []
+        for name, (low_size, low, high_size, high) in query_growth(results).items():
+            failures.append(
+                f"{name}: {low} -> {high} queries from {low_size} to {high_size} teams"
+            )
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            failures += self._regressions(results, baseline, options["tolerance"])
+
+        for failure in failures:
+            self.stdout.write(self.style.ERROR(failure))
+        if failures:
+            raise CommandError(f"{len(failures)} serializer benchmark failures")
+
+    def _regressions(self, results, baseline, tolerance):
+        regressions = []
+        for name, by_size in results.items():
+            for size, r in by_size.items():
+                old = baseline.get(name, {}).get(size)
+                if not old:
+                    continue
+                if r["queries"] > old["queries"]:
+                    regressions.append(
+                        f"{name}[{size}]: {old['queries']} -> {r['queries']} queries"
+                    )
+                if r["median_ms"] > old["median_ms"] * (1 + tolerance):
+                    regressions.append(
+                        f"{name}[{size}]: {old['median_ms']} -> {r['median_ms']} ms"
+                    )
+        return regressions
@@ -0,0 +1,186 @@
+import random
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from app.utils.write_queue import WriteQueue
+
+BENCH_ALIAS = "sqlite_write_bench"
+
+MODES = {
+    # Production settings before tuning: rollback journal, deferred transactions
+    "baseline": {"timeout": 30},
+    "tuned": {
+        "timeout": 30,
+        "transaction_mode": "IMMEDIATE",
+        "init_command": ";".join(
+            f"PRAGMA {k}={v}" for k, v in settings.SQLITE_PRAGMAS.items()
+        ),
+    },
+}
+MODES["queued"] = MODES["tuned"]
+
+
+def _event_write(cursor, rng, draft_id):
+    cursor.execute(
+        "INSERT INTO bench_event (draft_id, kind, payload, created) "
+        "VALUES (%s, %s, %s, %s)",
+        [draft_id, "hero_picked", '{"hero_id": %d}' % rng.randint(1, 130), time.time()],
+    )
+
+
+def _flag_write(cursor, rng, draft_id):
+    cursor.execute(
+        "UPDATE bench_team SET connected = %s WHERE id = %s",
+        [rng.randint(0, 1), draft_id * 2 + rng.randint(0, 1)],
+    )
+
+
+def _pick_write(cursor, rng, draft_id):
+    # Read-then-write, like a pick validating state before updating it
+    cursor.execute("SELECT version FROM bench_draft WHERE id = %s", [draft_id])
+    (version,) = cursor.fetchone()
+    cursor.execute(
+        "UPDATE bench_draft SET version = %s WHERE id = %s", [version + 1, draft_id]
+    )
+
+
+WRITES = [_event_write, _event_write, _flag_write, _pick_write]
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate event-night write load against a scratch SQLite database and "
+        "report writes/s and p99 write latency (lock wait included)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(MODES),
+            default=list(MODES),
+            help="Configurations to compare",
+        )
+        parser.add_argument(
+            "--threads", type=int, default=16, help="Concurrent writer threads"
+        )
+        parser.add_argument("--writes", type=int, default=200, help="Writes per thread")
+        parser.add_argument(
+            "--drafts", type=int, default=8, help="Concurrent hero drafts"
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['threads']} threads x {options['writes']} writes, "
+            f"{options['drafts']} drafts"
+        )
+        self.stdout.write(
+            f"{'mode':<10} {'writes/s':>10} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'max ms':>9} {'errors':>7}"
+        )
+        for mode in options["modes"]:
+            with tempfile.TemporaryDirectory() as tmp:
+                self._configure(Path(tmp) / "bench.sqlite3", MODES[mode])
+                try:
+                    self._setup(options["drafts"])
+                    result = self._run(mode == "queued", options)
+                finally:
+                    connections[BENCH_ALIAS].close()
+                    del connections.settings[BENCH_ALIAS]
+            self.stdout.write(
+                f"{mode:<10} {result['rate']:>10.0f} {result['p50']:>9.2f} "
+                f"{result['p99']:>9.2f} {result['max']:>9.2f} {result['errors']:>7}"
+            )
+
+    def _configure(self, path, db_options):
+        connections.settings[BENCH_ALIAS] = {
+            **connections.settings["default"],
+            "NAME": str(path),
+            "OPTIONS": dict(db_options),
+        }
+        if hasattr(connections._connections, BENCH_ALIAS):
+            delattr(connections._connections, BENCH_ALIAS)
+
+    def _setup(self, drafts):
+        with connections[BENCH_ALIAS].cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE bench_event (id INTEGER PRIMARY KEY, draft_id INTEGER,"
+                " kind TEXT, payload TEXT, created REAL)"
+            )
+            cursor.execute(
+                "CREATE TABLE bench_team (id INTEGER PRIMARY KEY, connected INTEGER)"
+            )
+            cursor.execute(
+                "CREATE TABLE bench_draft (id INTEGER PRIMARY KEY, version INTEGER)"
+            )
+            cursor.executemany(
+                "INSERT INTO bench_team (id, connected) VALUES (%s, 1)",
+                [(i,) for i in range(drafts * 2 + 2)],
+            )
+            cursor.executemany(
+                "INSERT INTO bench_draft (id, version) VALUES (%s, 0)",
+                [(i,) for i in range(drafts + 1)],
+            )
+
+    def _run(self, queued, options):
+        write_queue = WriteQueue(using=BENCH_ALIAS, enabled=queued)
+        latencies = []
+        errors = [0]
+        lock = threading.Lock()
+
+        def write(fn, rng, draft_id):
+            with connections[BENCH_ALIAS].cursor() as cursor:
+                fn(cursor, rng, draft_id)
+
+        def worker(index):
+            rng = random.Random(options["seed"] * 1000 + index)
+            local = []
+            failed = 0
+            for _ in range(options["writes"]):
+                fn = rng.choice(WRITES)
+                draft_id = rng.randint(1, options["drafts"])
+                start = time.perf_counter()
+                try:
+                    if queued:
+                        write_queue.run(write, fn, rng, draft_id)
+                    else:
+                        with transaction.atomic(using=BENCH_ALIAS):
+                            write(fn, rng, draft_id)
+                except OperationalError:
+                    failed += 1
+                    continue
+                local.append(time.perf_counter() - start)
+            connections[BENCH_ALIAS].close()
+            with lock:
+                latencies.extend(local)
+                errors[0] += failed
+
+        threads = [
+            threading.Thread(target=worker, args=(i,))
+            for i in range(options["threads"])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        write_queue.stop()
+
+        latencies.sort()
+        ms = [latency * 1000 for latency in latencies] or [0.0]
+        return {
+            "rate": len(latencies) / elapsed,
+            "p50": statistics.median(ms),
+            "p99": ms[min(len(ms) - 1, int(len(ms) * 0.99))],
+            "max": ms[-1],
+            "errors": errors[0],
+        }
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from app.models import HeroDraft, HeroDraftState
+from app.services.event_log import HeroDraftEventLog
+
+
+class Command(BaseCommand):
+    help = "Drop connection churn events of completed and abandoned hero drafts"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--draft-id",
+            type=int,
+            help="Compact the events of this hero draft only",
+        )
+
+    def handle(self, *args, **options):
+        drafts = HeroDraft.objects.filter(
+            state__in=(HeroDraftState.COMPLETED, HeroDraftState.ABANDONED)
+        )
+        if options["draft_id"]:
+            drafts = drafts.filter(pk=options["draft_id"])
+
+        deleted = 0
+        draft_ids = list(drafts.values_list("pk", flat=True))
+        for draft_id in draft_ids:
+            deleted += HeroDraftEventLog.compact(draft_id)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Deleted {deleted} connection events from {len(draft_ids)} drafts"
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from app.services.draft_analytics import CHUNK_SIZE, export
+
+
+class Command(BaseCommand):
+    help = "Export completed hero drafts' picks and bans as columnar files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Directory to write the column files to")
+        parser.add_argument(
+            "--league-id",
+            type=int,
+            help="Only export drafts of this league's games",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=CHUNK_SIZE,
+            help="Rounds read and written per chunk",
+        )
+
+    def handle(self, *args, **options):
+        rows = export(
+            options["output"],
+            league_id=options["league_id"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Exported {rows} rounds to {options['output']}")
+        )
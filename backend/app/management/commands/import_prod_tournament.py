@@ -1,19 +1,11 @@
 import logging
-from datetime import datetime
 
 import requests
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
-from app.models import (
-    CustomUser,
-    Draft,
-    DraftRound,
-    Game,
-    PositionsModel,
-    Team,
-    Tournament,
-)
+from app.models import CustomUser, PositionsModel
+from app.services.tournament_import import TournamentImporter
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +40,7 @@ class Command(BaseCommand):
         tournament_id = options["tournament_id"]
         include_draft = options["include_draft"]
         dry_run = options.get("dry_run", False)
-        base_url = options.get("url") or self.PROD_BASE_URL
+        base_url = options.get("url") or PROD_BASE_URL
 
         self.stdout.write(f"Fetching tournament {tournament_id} from production...")
 
@@ -158,140 +150,41 @@ class Command(BaseCommand):
 
     def create_tournament(self, data, include_draft=False):
         """Create tournament and related objects."""
-        # Add users to map and collect for tournament
-        users = []
-        for user_data in data.get("users", []):
-            user = self.get_or_create_user_by_discord(user_data)
-            if user:
-                users.append(user)
-
-        # Parse date
-        date_str = data.get("date_played")
-        if date_str:
-            date_played = datetime.strptime(date_str, "%Y-%m-%d").date()
-        else:
-            date_played = datetime.now().date()
-
-        # Create tournament with "Real-" prefix to distinguish from test data
-        tournament = Tournament.objects.create(
-            name=f"Real-{data['name']}",
-            date_played=date_played,
-            timezone=data.get("timezone", "US/Eastern"),
-            state=data.get("state", "past"),
-            tournament_type=data.get("tournament_type", "double_elimination"),
+        # Resolve (creating if needed) every user first, so the bulk import
+        # below only reads the map
+        for user_data in self._iter_users(data):
+            self.get_or_create_user_by_discord(user_data)
+
+        importer = TournamentImporter(
+            resolve_user=self._resolve_user,
+            # "Real-" prefix to distinguish from test data
+            name_prefix="Real-",
+            include_draft=include_draft,
+            default_state="past",
         )
-        tournament.users.set(users)
+        (tournament,) = importer.import_batch([data])
 
         self.stdout.write(f"  Created tournament: {tournament.name}")
-
-        # Create teams
-        team_map = {}  # Map prod team name -> local team
-        for team_data in data.get("teams", []):
-            team = self._create_team(tournament, team_data)
-            if team:
-                team_map[team_data.get("name")] = team
-
-        # Set winning team if exists
-        winning_team_data = data.get("winning_team")
-        if winning_team_data:
-            winning_team_name = winning_team_data.get("name")
-            if winning_team_name and winning_team_name in team_map:
-                tournament.winning_team = team_map[winning_team_name]
-                tournament.save()
-
-        # Create draft if requested and exists
+        self.stdout.write(f"    Created {len(data.get('teams', []))} teams")
         if include_draft and data.get("draft"):
-            self._create_draft(tournament, data["draft"])
-
-        # Create games
-        for game_data in data.get("games", []):
-            self._create_game(tournament, game_data, team_map)
-
+            self.stdout.write(
+                f"    Created draft with {len(data['draft'].get('draft_rounds', []))} rounds"
+            )
         return tournament
 
-    def _create_team(self, tournament, team_data):
-        """Create a team from production API data."""
-        captain = self.get_or_create_user_by_discord(team_data.get("captain"))
-
-        team = Team.objects.create(
-            tournament=tournament,
-            name=team_data.get("name", "Unnamed Team"),
-            captain=captain,
-            draft_order=team_data.get("draft_order", 0),
-        )
-
-        # Add members
-        for member_data in team_data.get("members", []):
-            member = self.get_or_create_user_by_discord(member_data)
-            if member:
-                team.members.add(member)
-
-        # Add dropin members
-        for member_data in team_data.get("dropin_members", []):
-            member = self.get_or_create_user_by_discord(member_data)
-            if member:
-                team.dropin_members.add(member)
-
-        # Add left members
-        for member_data in team_data.get("left_members", []):
-            member = self.get_or_create_user_by_discord(member_data)
-            if member:
-                team.left_members.add(member)
-
-        self.stdout.write(f"    Created team: {team.name}")
-        return team
-
-    def _create_draft(self, tournament, draft_data):
-        """Create draft and rounds."""
-        draft = Draft.objects.create(
-            tournament=tournament,
-            draft_style=draft_data.get("draft_style", "snake"),
-        )
-
-        # Create draft rounds
-        for round_data in draft_data.get("draft_rounds", []):
-            captain = self.get_or_create_user_by_discord(round_data.get("captain"))
-            choice = self.get_or_create_user_by_discord(round_data.get("choice"))
-
-            if captain:
-                DraftRound.objects.create(
-                    draft=draft,
-                    captain=captain,
-                    choice=choice,
-                    pick_number=round_data.get("pick_number", 1),
-                    pick_phase=round_data.get("pick_phase", 1),
-                )
-
-        self.stdout.write(
-            f"    Created draft with {len(draft_data.get('draft_rounds', []))} rounds"
-        )
-        return draft
-
-    def _create_game(self, tournament, game_data, team_map):
-        """Create a game from production API data."""
-        radiant_data = game_data.get("radiant_team")
-        dire_data = game_data.get("dire_team")
-        winning_data = game_data.get("winning_team")
-
-        radiant_team = None
-        dire_team = None
-        winning_team = None
-
-        # Find teams by name
-        if radiant_data:
-            radiant_team = team_map.get(radiant_data.get("name"))
-        if dire_data:
-            dire_team = team_map.get(dire_data.get("name"))
-        if winning_data:
-            winning_team = team_map.get(winning_data.get("name"))
-
-        game = Game.objects.create(
-            tournament=tournament,
-            round=game_data.get("round", 1),
-            gameid=game_data.get("gameid"),
-            radiant_team=radiant_team,
-            dire_team=dire_team,
-            winning_team=winning_team,
-        )
+    def _resolve_user(self, user_data):
+        if not user_data:
+            return None
+        user = self.user_map.get(user_data.get("discordId"))
+        return user.pk if user else None
 
-        return game
+    @staticmethod
+    def _iter_users(data):
+        yield from data.get("users", [])
+        for team_data in data.get("teams", []):
+            yield team_data.get("captain")
+            for field in ("members", "dropin_members", "left_members"):
+                yield from team_data.get(field, [])
+        for round_data in (data.get("draft") or {}).get("draft_rounds", []):
+            yield round_data.get("captain")
+            yield round_data.get("choice")
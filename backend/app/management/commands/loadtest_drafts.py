@@ -0,0 +1,519 @@
+import asyncio
+import contextlib
+import io
+import json
+import random
+import statistics
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, reset_queries
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from app.routing import websocket_urlpatterns
+from app.utils.scratch_db import scratch_database
+
+LAYERS = {
+    "memory": {"BACKEND": "channels.layers.InMemoryChannelLayer"},
+    "redis": None,  # As configured in settings
+}
+
+HEARTBEAT_SECONDS = 3  # Same interval as the frontend
+DELIVERY_TIMEOUT = 10
+MEMORY_SAMPLE = 20
+
+# Metric -> direction that counts as a regression
+REGRESSION_DIRECTIONS = {
+    "p50_ms": 1,
+    "p99_ms": 1,
+    "action_p50_ms": 1,
+    "action_p99_ms": 1,
+    "delivery_p50_ms": 1,
+    "delivery_p99_ms": 1,
+    "queries_per_action": 1,
+    "memory_per_connection_kb": 1,
+    "messages_per_s": -1,
+}
+
+
+def _percentiles(values):
+    ms = sorted(value * 1000 for value in values) or [0.0]
+    return (
+        round(statistics.median(ms), 2),
+        round(ms[min(len(ms) - 1, int(len(ms) * 0.99))], 2),
+    )
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """Return ``(section, metric, baseline, current)`` for metrics that regressed."""
+    regressions = []
+    for section, metrics in results.items():
+        for metric, value in metrics.items():
+            direction = REGRESSION_DIRECTIONS.get(metric)
+            old = baseline.get(section, {}).get(metric)
+            if direction is None or not old:
+                continue
+            change = (value - old) / old * direction
+            if change > tolerance:
+                regressions.append((section, metric, old, value))
+    return regressions
+
+
+class Room:
+    """Clients subscribed to one draft, and the events they are waiting for."""
+
+    def __init__(self, name):
+        self.name = name
+        self.clients = []
+        self.messages = 0
+        self.latencies = []
+        self._pending = {}
+
+    def expect(self, key):
+        done = asyncio.Event()
+        self._pending[key] = [time.perf_counter(), len(self.clients), done]
+        return done
+
+    def received(self, key):
+        self.messages += 1
+        pending = self._pending.get(key)
+        if pending is None:
+            return
+        sent_at, remaining, done = pending
+        self.latencies.append(time.perf_counter() - sent_at)
+        pending[1] = remaining - 1
+        if pending[1] == 0:
+            del self._pending[key]
+            done.set()
+
+
+def _event_key(message):
+    if message.get("type") == "herodraft_event":
+        if message.get("event_type") == "hero_selected":
+            return ("hero_selected", message["metadata"]["round_number"])
+    elif message.get("type") == "draft_event":
+        event = message["event"]
+        if event.get("event_type") == "player_picked":
+            return ("player_picked", event["payload"]["pick_number"])
+    return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test draft and hero draft WebSocket traffic in-process against a "
+        "scratch database: concurrent hero drafts with spectators plus a snake "
+        "player draft, driven through the REST pick endpoints. Reports event "
+        "delivery latency, messages/s, DB queries per action and memory per "
+        "connection, and can save or compare a baseline. Set LOG_LEVEL=WARNING "
+        "to keep per-connection log lines out of the report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--herodrafts", type=int, default=10, help="Concurrent hero drafts"
+        )
+        parser.add_argument(
+            "--spectators",
+            type=int,
+            default=200,
+            help="Anonymous spectators, spread over all drafts",
+        )
+        parser.add_argument(
+            "--teams",
+            type=int,
+            default=12,
+            help="Teams in the snake draft (5 players each)",
+        )
+        parser.add_argument(
+            "--layer",
+            choices=list(LAYERS),
+            default="memory",
+            help="Channel layer: in-process memory or the configured Redis layer",
+        )
+        parser.add_argument(
+            "--think-ms",
+            type=int,
+            default=20,
+            help="Pause between a delivered event and the next pick",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument(
+            "--save-baseline", metavar="PATH", help="Write results as JSON to PATH"
+        )
+        parser.add_argument(
+            "--baseline",
+            metavar="PATH",
+            help="Compare with a saved baseline; fail on regressions",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Allowed relative regression against the baseline",
+        )
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or settings.TEST):
+            raise CommandError("Load tests flush Redis; run them with DEBUG or TEST")
+
+        from tests.populate import _flush_redis_cache
+
+        random.seed(options["seed"])
+        layer = LAYERS[options["layer"]]
+        layers = {"default": layer} if layer else settings.CHANNEL_LAYERS
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            _flush_redis_cache()
+        try:
+            with scratch_database(), override_settings(CHANNEL_LAYERS=layers):
+                results = self.run_scenario(options)
+        finally:
+            with contextlib.redirect_stdout(io.StringIO()):
+                _flush_redis_cache()
+
+        self._report(results)
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(
+                json.dumps(results, indent=2, sort_keys=True) + "\n"
+            )
+            self.stdout.write(f"Baseline saved to {options['save_baseline']}")
+        if options["baseline"]:
+            baseline = json.loads(Path(options["baseline"]).read_text())
+            regressions = compare_to_baseline(results, baseline, options["tolerance"])
+            for section, metric, old, new in regressions:
+                self.stdout.write(
+                    self.style.ERROR(f"{section}.{metric}: {old} -> {new}")
+                )
+            if regressions:
+                raise CommandError(f"{len(regressions)} metrics regressed")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
+
+    def run_scenario(self, options):
+        """Seed the drafts and run the load; returns the results dict."""
+        self.think_ms = options["think_ms"]
+        with contextlib.redirect_stdout(io.StringIO()):
+            herodrafts, player_draft = self._seed(options)
+        results = async_to_sync(self._load)(herodrafts, player_draft, options)
+        results["config"] = {
+            key: options[key]
+            for key in ("herodrafts", "spectators", "teams", "layer", "think_ms")
+        }
+        return results
+
+    def _seed(self, options):
+        from django.utils import timezone
+
+        from app.models import Draft as PlayerDraft
+        from app.models import (
+            DraftTeam,
+            Game,
+            HeroDraft,
+            HeroDraftState,
+            Team,
+            Tournament,
+        )
+        from tests.populate import create_user, generate_mock_discord_members
+
+        captain_count = options["herodrafts"] * 2
+        player_count = options["teams"] * 5
+        users = [
+            create_user(member)
+            for member in generate_mock_discord_members(captain_count + player_count)
+        ]
+        captains, players = users[:captain_count], users[captain_count:]
+
+        # Hero drafts: one game per pair of captains
+        tournament = Tournament.objects.create(
+            name="Load Test Hero Drafts",
+            date_played=timezone.now(),
+            state="in_progress",
+        )
+        herodrafts = []
+        for i in range(options["herodrafts"]):
+            teams = [
+                Team.objects.create(
+                    tournament=tournament, name=f"Hero Team {i}-{side}", captain=c
+                )
+                for side, c in enumerate(captains[i * 2 : i * 2 + 2])
+            ]
+            for team in teams:
+                team.members.add(team.captain)
+            game = Game.objects.create(
+                tournament=tournament, radiant_team=teams[0], dire_team=teams[1]
+            )
+            # Clients connect while choosing, so no tick thread is started
+            draft = HeroDraft.objects.create(game=game, state=HeroDraftState.CHOOSING)
+            for team in teams:
+                DraftTeam.objects.create(draft=draft, tournament_team=team)
+            herodrafts.append(draft)
+
+        # Snake player draft
+        tournament = Tournament.objects.create(
+            name="Load Test Snake Draft",
+            date_played=timezone.now(),
+            state="in_progress",
+        )
+        tournament.users.set(players)
+        for i, captain in enumerate(players[: options["teams"]]):
+            team = Team.objects.create(
+                tournament=tournament,
+                name=f"Snake Team {i}",
+                captain=captain,
+                draft_order=i + 1,
+            )
+            team.members.add(captain)
+        player_draft = PlayerDraft.objects.create(
+            tournament=tournament, draft_style="snake"
+        )
+        player_draft.build_rounds()
+        player_draft.rebuild_teams()
+        player_draft.save()
+        return herodrafts, player_draft
+
+    async def _load(self, herodrafts, player_draft, options):
+        application = URLRouter(websocket_urlpatterns)
+        rooms = {draft.id: Room(f"herodraft_{draft.id}") for draft in herodrafts}
+        player_room = Room(f"draft_{player_draft.id}")
+
+        connects = await sync_to_async(self._connect_plan)(
+            herodrafts, player_draft, options["spectators"]
+        )
+
+        async def connect(path, user):
+            communicator = WebsocketCommunicator(application, path)
+            communicator.scope["user"] = user
+            connected, _ = await communicator.connect()
+            if not connected:
+                raise CommandError(f"Could not connect to {path}")
+            await communicator.receive_from(timeout=DELIVERY_TIMEOUT)
+            return communicator
+
+        connect_times = []
+        clients = []
+        for path, user, draft_id in connects:
+            room = rooms.get(draft_id, player_room)
+            start = time.perf_counter()
+            communicator = await connect(path, user)
+            connect_times.append(time.perf_counter() - start)
+            room.clients.append(communicator)
+            clients.append((communicator, room, user))
+
+        # Retained memory per connection, from extra spectators (tracemalloc
+        # slows allocation too much to run it during the timed connects)
+        path = connects[-1][0]
+        tracemalloc.start()
+        memory_before = tracemalloc.get_traced_memory()[0]
+        sample = [await connect(path, AnonymousUser()) for _ in range(MEMORY_SAMPLE)]
+        memory_after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        for communicator in sample:
+            await communicator.disconnect()
+
+        stop = threading.Event()
+        tasks = [
+            asyncio.create_task(self._read(communicator, room))
+            for communicator, room, _ in clients
+        ]
+        tasks += [
+            asyncio.create_task(self._heartbeat(communicator, stop))
+            for communicator, _, user in clients
+            if user.is_authenticated and "herodraft" in communicator.scope["path"]
+        ]
+
+        # Start the hero drafts and their tick loops in this event loop
+        from app.tasks.herodraft_tick import run_tick_loop
+
+        await sync_to_async(self._start_herodrafts)(herodrafts)
+        tasks += [
+            asyncio.create_task(run_tick_loop(draft.id, stop)) for draft in herodrafts
+        ]
+
+        hero_actions = []
+        player_actions = []
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(
+                *(
+                    self._drive(
+                        self._next_hero_pick, draft, rooms[draft.id], hero_actions
+                    )
+                    for draft in herodrafts
+                ),
+                self._drive(
+                    self._next_player_pick, player_draft, player_room, player_actions
+                ),
+            )
+        finally:
+            elapsed = time.perf_counter() - start
+            stop.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for communicator, _, _ in clients:
+                await communicator.disconnect()
+
+        connect_p50, connect_p99 = _percentiles(connect_times)
+        return {
+            "connect": {
+                "connections": len(clients),
+                "p50_ms": connect_p50,
+                "p99_ms": connect_p99,
+                "memory_per_connection_kb": round(
+                    (memory_after - memory_before) / MEMORY_SAMPLE / 1024, 2
+                ),
+            },
+            "herodraft": self._summary(list(rooms.values()), hero_actions, elapsed),
+            "player_draft": self._summary([player_room], player_actions, elapsed),
+        }
+
+    def _connect_plan(self, herodrafts, player_draft, spectators):
+        """(path, user, draft id) for every client, in connect order."""
+        plan = []
+        for draft in herodrafts:
+            for draft_team in draft.draft_teams.select_related(
+                "tournament_team__captain"
+            ):
+                captain = draft_team.tournament_team.captain
+                plan.append((f"/api/herodraft/{draft.id}/", captain, draft.id))
+        for player in player_draft.tournament.users.all():
+            plan.append((f"/api/draft/{player_draft.id}/", player, None))
+
+        paths = [(f"/api/herodraft/{d.id}/", d.id) for d in herodrafts]
+        paths.append((f"/api/tournament/{player_draft.tournament_id}/", None))
+        for i in range(spectators):
+            path, draft_id = paths[i % len(paths)]
+            plan.append((path, AnonymousUser(), draft_id))
+        return plan
+
+    async def _read(self, communicator, room):
+        while True:
+            message = json.loads(await communicator.receive_from(timeout=3600))
+            room.received(_event_key(message))
+
+    async def _heartbeat(self, communicator, stop):
+        while not stop.is_set():
+            await communicator.send_to(text_data=json.dumps({"type": "heartbeat"}))
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+
+    def _start_herodrafts(self, herodrafts):
+        from app.functions.herodraft import submit_choice
+
+        for draft in herodrafts:
+            first, second = list(draft.draft_teams.all())
+            submit_choice(draft, first, "pick_order", "first")
+            submit_choice(draft, second, "side", "radiant")
+
+    async def _drive(self, next_action, draft, room, actions):
+        """Run picks one after another until the draft is done."""
+        client = APIClient(SERVER_NAME="localhost")
+        while True:
+            action = await sync_to_async(next_action)(draft)
+            if action is None:
+                return
+            key, user, url, data = action
+            delivered = room.expect(key)
+            duration, queries, status = await sync_to_async(self._post)(
+                client, user, url, data
+            )
+            if status >= 400:
+                raise CommandError(f"{url} returned {status} for {data}")
+            actions.append((duration, queries))
+            await asyncio.wait_for(delivered.wait(), DELIVERY_TIMEOUT)
+            await asyncio.sleep(self.think_ms / 1000)
+
+    def _post(self, client, user, url, data):
+        client.force_authenticate(user)
+        reset_queries()  # DEBUG query log is capped; keep counts exact
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as queries:
+            start = time.perf_counter()
+            response = client.post(url, data, format="json")
+            duration = time.perf_counter() - start
+        return duration, len(queries), response.status_code
+
+    def _next_hero_pick(self, draft):
+        from app.functions.herodraft import get_available_heroes
+
+        draft.refresh_from_db()
+        current = (
+            draft.rounds.filter(state="active")
+            .select_related("draft_team__tournament_team__captain")
+            .first()
+        )
+        if current is None:
+            return None
+        hero_id = random.choice(get_available_heroes(draft))
+        return (
+            ("hero_selected", current.round_number),
+            current.draft_team.tournament_team.captain,
+            reverse("herodraft_submit_pick", args=[draft.id]),
+            {"hero_id": hero_id},
+        )
+
+    def _next_player_pick(self, draft):
+        current = (
+            draft.draft_rounds.filter(choice__isnull=True)
+            .select_related("captain")
+            .order_by("pick_number")
+            .first()
+        )
+        if current is None:
+            return None
+        player = random.choice(list(draft.users_remaining))
+        return (
+            ("player_picked", current.pick_number),
+            current.captain,
+            reverse("pick_player"),
+            {"draft_round_pk": current.pk, "user_pk": player.pk},
+        )
+
+    def _summary(self, rooms, actions, elapsed):
+        action_p50, action_p99 = _percentiles([duration for duration, _ in actions])
+        delivery_p50, delivery_p99 = _percentiles(
+            [latency for room in rooms for latency in room.latencies]
+        )
+        return {
+            "actions": len(actions),
+            "action_p50_ms": action_p50,
+            "action_p99_ms": action_p99,
+            "delivery_p50_ms": delivery_p50,
+            "delivery_p99_ms": delivery_p99,
+            "messages_per_s": round(sum(room.messages for room in rooms) / elapsed, 1),
+            "queries_per_action": round(
+                sum(queries for _, queries in actions) / max(len(actions), 1), 1
+            ),
+        }
+
+    def _report(self, results):
+        config = results["config"]
+        self.stdout.write(
+            f"{config['herodrafts']} hero drafts, {config['teams'] * 5}-player snake "
+            f"draft, {config['spectators']} spectators ({config['layer']} layer)"
+        )
+        connect = results["connect"]
+        self.stdout.write(
+            f"connect      {connect['connections']:>5} clients  "
+            f"p50 {connect['p50_ms']:>8.2f} ms  p99 {connect['p99_ms']:>8.2f} ms  "
+            f"{connect['memory_per_connection_kb']:.1f} KiB/connection"
+        )
+        self.stdout.write(
+            f"{'':<12} {'actions':>7} {'act p50':>8} {'act p99':>8} "
+            f"{'dlv p50':>8} {'dlv p99':>8} {'msg/s':>8} {'q/action':>8}"
+        )
+        for section in ("herodraft", "player_draft"):
+            r = results[section]
+            self.stdout.write(
+                f"{section:<12} {r['actions']:>7} {r['action_p50_ms']:>8.2f} "
+                f"{r['action_p99_ms']:>8.2f} {r['delivery_p50_ms']:>8.2f} "
+                f"{r['delivery_p99_ms']:>8.2f} {r['messages_per_s']:>8.1f} "
+                f"{r['queries_per_action']:>8.1f}"
+            )
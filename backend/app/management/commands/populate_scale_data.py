@@ -0,0 +1,61 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Populate the database with a seeded synthetic dataset at production "
+        "scale (each Steam match adds 10 player stats rows)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+        parser.add_argument("--organizations", type=int, default=2)
+        parser.add_argument("--leagues", type=int, default=4)
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--tournaments", type=int, default=50)
+        parser.add_argument("--teams-per-tournament", type=int, default=8)
+        parser.add_argument("--games-per-tournament", type=int, default=7)
+        parser.add_argument(
+            "--matches",
+            type=int,
+            default=10000,
+            help="Steam matches to generate (100000 for 1M player stats)",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Replace scale data from a previous run",
+        )
+
+    def handle(self, *args, **options):
+        from tests.populate_scale import populate_scale_data
+
+        try:
+            self.stdout.write("Starting scale data population...")
+            counts = populate_scale_data(
+                seed=options["seed"],
+                organizations=options["organizations"],
+                leagues=options["leagues"],
+                users=options["users"],
+                tournaments=options["tournaments"],
+                teams_per_tournament=options["teams_per_tournament"],
+                games_per_tournament=options["games_per_tournament"],
+                matches=options["matches"],
+                force=options["force"],
+            )
+            if counts:
+                summary = ", ".join(f"{n} {name}" for name, n in counts.items())
+                self.stdout.write(self.style.SUCCESS(f"Created {summary}"))
+
+        except Exception as e:
+            self.stdout.write(
+                self.style.ERROR(f"Error populating scale data: {str(e)}")
+            )
+            logger.error(
+                f"Error in populate_scale_data command: {str(e)}", exc_info=True
+            )
+            raise
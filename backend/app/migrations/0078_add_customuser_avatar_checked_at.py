@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0077_add_discord_server_id_to_organization"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="avatar_checked_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="Last time the Discord avatar was verified (refresh cursor)",
+                null=True,
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations, models
+
+
+def number_events(apps, schema_editor):
+    """Number each draft's existing events in creation order."""
+    for model_name in ("DraftEvent", "HeroDraftEvent"):
+        Event = apps.get_model("app", model_name)
+        seqs = {}
+        events = []
+        for event in Event.objects.order_by("draft_id", "created_at", "id"):
+            event.seq = seqs[event.draft_id] = seqs.get(event.draft_id, 0) + 1
+            events.append(event)
+        Event.objects.bulk_update(events, ["seq"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0078_add_customuser_avatar_checked_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="draftevent",
+            name="seq",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Position in the draft's event log, starting at 1",
+            ),
+        ),
+        migrations.AddField(
+            model_name="herodraftevent",
+            name="seq",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Position in the draft's event log, starting at 1",
+            ),
+        ),
+        migrations.RunPython(number_events, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name="draftevent",
+            options={"ordering": ["-seq"]},
+        ),
+        migrations.AlterModelOptions(
+            name="herodraftevent",
+            options={"ordering": ["seq"]},
+        ),
+        migrations.AddConstraint(
+            model_name="draftevent",
+            constraint=models.UniqueConstraint(
+                fields=("draft", "seq"), name="unique_draft_event_seq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="herodraftevent",
+            constraint=models.UniqueConstraint(
+                fields=("draft", "seq"), name="unique_herodraft_event_seq"
+            ),
+        ),
+    ]
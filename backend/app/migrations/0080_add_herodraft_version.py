@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0079_add_event_seq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="herodraft",
+            name="version",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Bumped on every write; a pick applies only to the version it read",
+            ),
+        ),
+    ]
@@ -5,7 +5,7 @@ import requests
 from cacheops import cached_as, invalidate_obj
 from django.conf import settings
 from django.core.exceptions import ValidationError as DjangoValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.utils import IntegrityError
 from django.utils import timezone
 from social_django.models import USER_MODEL  # fix: skip
@@ -16,7 +16,7 @@ User = settings.AUTH_USER_MODEL
 from enum import IntEnum, StrEnum
 
 from django.contrib.auth.models import AbstractUser
-from django.db.models import JSONField
+from django.db.models import F, JSONField
 
 log = logging.getLogger(__name__)
 
@@ -101,6 +101,12 @@ class CustomUser(AbstractUser):
         blank=True,
     )
     avatar = models.TextField(null=True, blank=True)
+    avatar_checked_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="Last time the Discord avatar was verified (refresh cursor)",
+    )
     discordId = models.TextField(null=True, unique=True, blank=True)
     discordUsername = models.TextField(null=True, blank=True)
     discordNickname = models.TextField(null=True, blank=True)
@@ -1377,7 +1383,63 @@ class Joke(models.Model):
         return f"{self.user.username} - {self.tangoes_purchased} tangoes"
 
 
-class DraftEvent(models.Model):
+class SequencedEvent(models.Model):
+    """
+    An event in a per-draft log, numbered by ``seq`` (1, 2, 3, ...).
+
+    ``seq`` is assigned on insert and is the cursor clients replay from
+    ("events after seq N"). It only ever grows; compaction may leave gaps.
+    Subclasses define a ``draft`` foreign key. Use ``bulk_append`` rather
+    than ``bulk_create``, which bypasses ``save`` and would not number them.
+    """
+
+    # Concurrent inserts for one draft can pick the same next seq; the
+    # (draft, seq) unique constraint rejects all but one, the rest retry
+    SEQ_ATTEMPTS = 5
+
+    seq = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Position in the draft's event log, starting at 1",
+    )
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def _last_seq(cls, draft_id):
+        last_seq = cls.objects.filter(draft_id=draft_id).aggregate(
+            last_seq=models.Max("seq")
+        )["last_seq"]
+        return last_seq or 0
+
+    def save(self, *args, **kwargs):
+        if not (self._state.adding and not self.seq):
+            return super().save(*args, **kwargs)
+        for attempt in range(self.SEQ_ATTEMPTS):
+            self.seq = self._last_seq(self.draft_id) + 1
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == self.SEQ_ATTEMPTS - 1:
+                    raise
+
+    @classmethod
+    def bulk_append(cls, draft_id, events):
+        """Insert one draft's new ``events`` in a single statement, in order."""
+        for attempt in range(cls.SEQ_ATTEMPTS):
+            for seq, event in enumerate(events, start=cls._last_seq(draft_id) + 1):
+                event.seq = seq
+            try:
+                with transaction.atomic():
+                    return cls.objects.bulk_create(events)
+            except IntegrityError:
+                if attempt == cls.SEQ_ATTEMPTS - 1:
+                    raise
+
+
+class DraftEvent(SequencedEvent):
     """Tracks draft lifecycle events for history and WebSocket broadcast."""
 
     EVENT_TYPE_CHOICES = [
@@ -1413,7 +1475,12 @@ class DraftEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["-created_at"]
+        ordering = ["-seq"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["draft", "seq"], name="unique_draft_event_seq"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.event_type} - Draft {self.draft_id} at {self.created_at}"
@@ -1457,9 +1524,25 @@ class HeroDraft(models.Model):
     is_manual_pause = models.BooleanField(
         default=False
     )  # True if paused manually by captain/staff
+    version = models.PositiveIntegerField(
+        default=0,
+        help_text="Bumped on every write; a pick applies only to the version it read",
+    )
 
     def save(self, *args, **kwargs):
+        # Picks claim the draft with UPDATE ... WHERE version = <read>; every
+        # other write moves the version on so a pick planned before it fails.
+        # Bumped in SQL: an instance loaded before a pick's claim would
+        # otherwise write back a version the pick already used.
+        adding = self._state.adding
+        if not adding:
+            self.version = F("version") + 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None and "version" not in update_fields:
+                kwargs["update_fields"] = [*update_fields, "version"]
         super().save(*args, **kwargs)
+        if not adding:
+            self.refresh_from_db(fields=["version"])
 
         invalidate_obj(self)
 
@@ -1539,9 +1622,12 @@ class HeroDraftRound(models.Model):
         return f"Round {self.round_number}: {self.action_type} by {self.draft_team}"
 
 
-class HeroDraftEvent(models.Model):
+class HeroDraftEvent(SequencedEvent):
     """Audit log for hero draft events."""
 
+    # Heartbeat-driven reconnects; compacted once the draft is over
+    CONNECTION_EVENTS = ("captain_connected", "captain_disconnected")
+
     EVENT_CHOICES = [
         ("captain_connected", "Captain Connected"),
         ("captain_disconnected", "Captain Disconnected"),
@@ -1572,7 +1658,12 @@ class HeroDraftEvent(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ["created_at"]
+        ordering = ["seq"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["draft", "seq"], name="unique_herodraft_event_seq"
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
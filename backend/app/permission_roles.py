@@ -0,0 +1,156 @@
+"""
+Precomputed organization and league roles for permission checks.
+
+A user's roles are loaded once (a handful of ``values_list`` queries),
+cached in Redis and kept for the rest of the request, so the helpers in
+``app.permissions_org`` answer from in-memory sets instead of running
+``.exists()`` queries per organization and league.
+
+Cached role maps are versioned: any role change (admin/staff membership,
+org ownership, league-org links, OrgLog/LeagueLog entries) bumps a single
+version number, which retires every cached map at once.
+"""
+
+import logging
+import time
+from collections import namedtuple
+from contextvars import ContextVar
+
+from django.core.cache import cache
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+ROLE_VERSION_KEY = "perm:roles:version"
+ROLE_CACHE_KEY = "perm:roles:v{version}:{user_id}"
+ROLE_CACHE_TIMEOUT = 60 * 60
+
+# Org and league pks per role; league sets include access inherited from orgs
+RoleMap = namedtuple(
+    "RoleMap",
+    ["org_owner", "org_admin", "org_staff", "league_admin", "league_staff"],
+)
+
+EMPTY_ROLES = RoleMap(*(frozenset() for _ in RoleMap._fields))
+
+# user pk -> RoleMap for the current request (None outside a request)
+_request_roles = ContextVar("request_roles", default=None)
+
+
+def build_role_map(user_id):
+    """Load a user's org and league roles from the database."""
+    from app.models import League, Organization
+
+    org_owner = set(
+        Organization.objects.filter(owner_id=user_id).values_list("pk", flat=True)
+    )
+    org_admin = org_owner | set(
+        Organization.admins.through.objects.filter(customuser_id=user_id).values_list(
+            "organization_id", flat=True
+        )
+    )
+    org_staff = org_admin | set(
+        Organization.staff.through.objects.filter(customuser_id=user_id).values_list(
+            "organization_id", flat=True
+        )
+    )
+
+    league_admin = set(
+        League.admins.through.objects.filter(customuser_id=user_id).values_list(
+            "league_id", flat=True
+        )
+    )
+    league_staff = set(
+        League.staff.through.objects.filter(customuser_id=user_id).values_list(
+            "league_id", flat=True
+        )
+    )
+
+    # Leagues reachable through the user's organizations
+    if org_staff:
+        for league_id, org_id in League.organizations.through.objects.filter(
+            organization_id__in=org_staff
+        ).values_list("league_id", "organization_id"):
+            if org_id in org_admin:
+                league_admin.add(league_id)
+            league_staff.add(league_id)
+    league_staff |= league_admin
+
+    return RoleMap(
+        frozenset(org_owner),
+        frozenset(org_admin),
+        frozenset(org_staff),
+        frozenset(league_admin),
+        frozenset(league_staff),
+    )
+
+
+def get_role_map(user):
+    """
+    Return the role map for a user.
+
+    Looks in the current request scope first, then Redis, then the database.
+    """
+    if not user.is_authenticated:
+        return EMPTY_ROLES
+
+    scope = _request_roles.get()
+    if scope is not None and user.pk in scope:
+        return scope[user.pk]
+
+    version = cache.get(ROLE_VERSION_KEY)
+    if version is None:
+        version = _start_role_version()
+    key = ROLE_CACHE_KEY.format(version=version, user_id=user.pk)
+    roles = cache.get(key)
+    if roles is None:
+        roles = build_role_map(user.pk)
+        cache.set(key, roles, timeout=ROLE_CACHE_TIMEOUT)
+
+    if scope is not None:
+        scope[user.pk] = roles
+    return roles
+
+
+def _start_role_version():
+    # Never restart from a number an evicted counter may already have used
+    cache.add(ROLE_VERSION_KEY, time.time_ns(), timeout=None)
+    return cache.get(ROLE_VERSION_KEY)
+
+
+def _bump_role_version():
+    try:
+        cache.incr(ROLE_VERSION_KEY)
+    except ValueError:
+        # Key missing (first change or evicted): start a new version series
+        _start_role_version()
+
+
+def invalidate_role_maps():
+    """
+    Retire every cached role map after a role change.
+
+    The version is bumped now, so the changing transaction sees its own
+    change, and again on commit: another request may have rebuilt a map
+    from the pre-commit rows under the first bump.
+    """
+    _bump_role_version()
+    transaction.on_commit(_bump_role_version)
+
+    scope = _request_roles.get()
+    if scope is not None:
+        scope.clear()
+
+
+class RoleScopeMiddleware:
+    """Keep role maps loaded during a request for the rest of that request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_roles.set({})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_roles.reset(token)
@@ -2,6 +2,8 @@
 
 from rest_framework import permissions
 
+from app.permission_roles import get_role_map
+
 
 def is_org_owner(user, organization):
     """Check if user is the org owner."""
@@ -17,7 +19,7 @@ def has_org_admin_access(user, organization):
     return (
         user.is_superuser
         or is_org_owner(user, organization)
-        or organization.admins.filter(pk=user.pk).exists()
+        or organization.pk in get_role_map(user).org_admin
     )
 
 
@@ -27,7 +29,7 @@ def has_org_staff_access(user, organization):
         return False
     return (
         has_org_admin_access(user, organization)
-        or organization.staff.filter(pk=user.pk).exists()
+        or organization.pk in get_role_map(user).org_staff
     )
 
 
@@ -40,16 +42,8 @@ def has_league_admin_access(user, league):
     if user.is_superuser:
         return True
 
-    # Check if user is a league-specific admin
-    if league.admins.filter(pk=user.pk).exists():
-        return True
-
-    # Check if user is admin (or owner) of ANY linked organization
-    for org in league.organizations.all():
-        if has_org_admin_access(user, org):
-            return True
-
-    return False
+    # League admins and admins (or owners) of any linked organization
+    return league.pk in get_role_map(user).league_admin
 
 
 def has_league_staff_access(user, league):
@@ -57,20 +51,11 @@ def has_league_staff_access(user, league):
     if not user.is_authenticated:
         return False
 
-    # League admin has staff access
-    if has_league_admin_access(user, league):
-        return True
-
-    # Check if user is a league-specific staff
-    if league.staff.filter(pk=user.pk).exists():
+    if user.is_superuser:
         return True
 
-    # Check if user is staff of ANY linked organization
-    for org in league.organizations.all():
-        if has_org_staff_access(user, org):
-            return True
-
-    return False
+    # League admins/staff and admins/staff of any linked organization
+    return league.pk in get_role_map(user).league_staff
 
 
 class IsOrgOwner(permissions.BasePermission):
@@ -141,8 +126,8 @@ def can_edit_tournament(user, tournament):
         return True
 
     # If tournament has a league, check league admin access
-    if tournament.league:
-        return has_league_admin_access(user, tournament.league)
+    if tournament.league_id:
+        return tournament.league_id in get_role_map(user).league_admin
 
     # No league - fall back to org admin if we can find the org
     # This shouldn't normally happen but provides a fallback
@@ -170,12 +155,12 @@ def can_manage_game(user, game):
         return True
 
     # Check game's league first (direct league reference)
-    if game.league:
-        return has_league_staff_access(user, game.league)
+    if game.league_id:
+        return game.league_id in get_role_map(user).league_staff
 
     # Fall back to tournament's league
-    if game.tournament and game.tournament.league:
-        return has_league_staff_access(user, game.tournament.league)
+    if game.tournament and game.tournament.league_id:
+        return game.tournament.league_id in get_role_map(user).league_staff
 
     return False
 
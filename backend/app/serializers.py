@@ -798,6 +798,40 @@ class UserSerializer(serializers.ModelSerializer):
             return user
 
 
+class SessionUserSerializer(UserSerializer):
+    """Profile fields for the session bootstrap (no team history)."""
+
+    teams = None
+
+    class Meta(UserSerializer.Meta):
+        fields = tuple(f for f in UserSerializer.Meta.fields if f != "teams")
+
+
+class TeamHistorySerializer(serializers.ModelSerializer):
+    """Compact team entry for a user's team history."""
+
+    tournament_name = serializers.CharField(source="tournament.name", read_only=True)
+    tournament_date = serializers.DateTimeField(
+        source="tournament.date_played", read_only=True
+    )
+    tournament_state = serializers.CharField(source="tournament.state", read_only=True)
+
+    class Meta:
+        model = Team
+        fields = (
+            "pk",
+            "name",
+            "tournament",
+            "tournament_name",
+            "tournament_date",
+            "tournament_state",
+            "captain",
+            "deputy_captain",
+            "placement",
+        )
+        read_only_fields = fields
+
+
 class GameSerializer(serializers.ModelSerializer):
 
     tournament_id = serializers.PrimaryKeyRelatedField(
@@ -907,6 +941,7 @@ class BracketGenerateSerializer(serializers.Serializer):
     seeding_method = serializers.ChoiceField(
         choices=["random", "mmr_total", "captain_mmr"], default="mmr_total"
     )
+    persist = serializers.BooleanField(default=False)
 
 
 class JokeSerializer(serializers.ModelSerializer):
@@ -923,6 +958,7 @@ class DraftEventSerializer(serializers.ModelSerializer):
         model = DraftEvent
         fields = (
             "pk",
+            "seq",
             "event_type",
             "payload",
             "actor",
@@ -1033,7 +1069,7 @@ class HeroDraftEventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = HeroDraftEvent
-        fields = ["id", "event_type", "draft_team", "metadata", "created_at"]
+        fields = ["id", "seq", "event_type", "draft_team", "metadata", "created_at"]
 
 
 class HeroDraftSerializer(serializers.ModelSerializer):
@@ -1042,7 +1078,7 @@ class HeroDraftSerializer(serializers.ModelSerializer):
     pk = serializers.IntegerField(source="id", read_only=True)
     draft_teams = DraftTeamSerializerFull(many=True, read_only=True)
     rounds = HeroDraftRoundSerializerFull(many=True, read_only=True)
-    roll_winner = DraftTeamSerializerFull(read_only=True)
+    roll_winner = serializers.SerializerMethodField()
     current_round = serializers.SerializerMethodField()
     tournament_id = serializers.SerializerMethodField()
 
@@ -1063,16 +1099,26 @@ class HeroDraftSerializer(serializers.ModelSerializer):
             "updated_at",
         ]
 
+    def get_roll_winner(self, obj):
+        # Look the winner up among the (prefetched) draft teams
+        if obj.roll_winner_id is None:
+            return None
+        for draft_team in obj.draft_teams.all():
+            if draft_team.pk == obj.roll_winner_id:
+                return DraftTeamSerializerFull(draft_team).data
+        return None
+
     def get_current_round(self, obj):
-        active_round = obj.rounds.filter(state="active").first()
-        if active_round:
-            # Return index (0-based) into rounds array for frontend compatibility
-            return active_round.round_number - 1
+        # Iterate rounds() so a prefetch is used rather than a new query
+        for hero_round in obj.rounds.all():
+            if hero_round.state == "active":
+                # Return index (0-based) into rounds array for frontend compatibility
+                return hero_round.round_number - 1
         return None
 
     def get_tournament_id(self, obj):
-        if obj.game and obj.game.tournament:
-            return obj.game.tournament.id
+        if obj.game:
+            return obj.game.tournament_id
         return None
 
 
@@ -1,11 +1,35 @@
 """Service layer for app."""
 
+from .bracket_graph import BracketGraph
+from .bracket_writer import BracketWriter
+from .draft_analytics import HeroDraftColumns, HeroDraftStats
+from .draft_snapshot import DraftSnapshot
+from .event_log import DraftEventLog, HeroDraftEventLog
+from .hero_pool import HeroPool
+from .herodraft_snapshot import HeroDraftSnapshot
 from .match_finalization import LeagueMatchService
 from .rating import EloRatingSystem, FixedDeltaRatingSystem, get_rating_system
+from .recent_events import RecentDraftEvents
+from .session_bootstrap import SessionBootstrap
+from .team_membership import TeamMembershipService
+from .tournament_import import TournamentImporter
 
 __all__ = [
+    "BracketGraph",
+    "BracketWriter",
     "get_rating_system",
     "EloRatingSystem",
     "FixedDeltaRatingSystem",
+    "DraftEventLog",
+    "DraftSnapshot",
+    "HeroDraftColumns",
+    "HeroDraftEventLog",
+    "HeroDraftStats",
+    "HeroDraftSnapshot",
+    "HeroPool",
     "LeagueMatchService",
+    "RecentDraftEvents",
+    "SessionBootstrap",
+    "TeamMembershipService",
+    "TournamentImporter",
 ]
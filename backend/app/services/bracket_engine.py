@@ -0,0 +1,418 @@
+"""
+Pure-Python bracket generation engine.
+
+Builds complete single elimination, double elimination and Swiss round
+structures in memory for any number of teams. Output uses the same match
+dict format as the frontend bracket editor (``w-1-0`` style ids,
+``nextMatchId``/``loserNextMatchId`` wiring), so it can be returned to the
+client as-is or persisted in bulk with ``BracketWriter``.
+
+Nothing here touches the database; teams are referenced by primary key.
+"""
+
+import math
+import random
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+SLOTS = ("radiant", "dire")
+
+MATCH_ID_PREFIX = {
+    "winners": "w",
+    "losers": "l",
+    "grand_finals": "gf",
+    "swiss": "sw",
+}
+
+
+def match_id(bracket_type: str, round_: int, position: int) -> str:
+    """Frontend match id for a bracket position (e.g. ``w-1-0``)."""
+    return f"{MATCH_ID_PREFIX[bracket_type]}-{round_}-{position}"
+
+
+def seed_order(bracket_size: int) -> List[int]:
+    """
+    Standard seed positions for a power-of-2 bracket (1-indexed).
+
+    For 8 teams: [1, 8, 4, 5, 2, 7, 3, 6], i.e. 1v8, 4v5, 2v7, 3v6, so the
+    top seeds cannot meet before the later rounds.
+    """
+    order = [1]
+    while len(order) < bracket_size:
+        size = len(order) * 2
+        order = [s for seed in order for s in (seed, size + 1 - seed)]
+    return order
+
+
+def seed_teams(
+    team_mmrs: Iterable[Tuple[int, int]], method: str = "mmr_total", rng=None
+) -> List[int]:
+    """
+    Order teams by seed.
+
+    Args:
+        team_mmrs: (team pk, seeding MMR) pairs
+        method: "random" shuffles, anything else sorts by MMR (highest first)
+        rng: Optional ``random.Random`` for reproducible shuffles
+
+    Returns:
+        Team pks, top seed first
+    """
+    teams = list(team_mmrs)
+    if method == "random":
+        team_ids = [pk for pk, _ in teams]
+        (rng or random).shuffle(team_ids)
+        return team_ids
+    # Ties keep a stable order by pk so regenerating gives the same bracket
+    return [pk for pk, _ in sorted(teams, key=lambda t: (-(t[1] or 0), t[0]))]
+
+
+class _Game:
+    """Mutable game node used while building an elimination bracket."""
+
+    __slots__ = ("bracket_type", "round", "position", "inputs", "next", "loser_next")
+
+    def __init__(self, bracket_type: str, round_: int, position: int):
+        self.bracket_type = bracket_type
+        self.round = round_
+        self.position = position
+        # slot -> ("team", pk) | ("winner", game) | ("loser", game) | None
+        self.inputs = {"radiant": None, "dire": None}
+        # (game, slot) the winner / loser moves on to
+        self.next = None
+        self.loser_next = None
+
+
+class _EliminationBuilder:
+    """Builds a full power-of-2 bracket, then collapses byes."""
+
+    def __init__(self, seeded_team_ids: Sequence[int], elimination_type: str):
+        if len(seeded_team_ids) < 2:
+            raise ValueError("Need at least 2 teams for a bracket")
+        self.team_ids = list(seeded_team_ids)
+        self.elimination_type = elimination_type
+        self.rounds = math.ceil(math.log2(len(self.team_ids)))
+        self.size = 2**self.rounds
+        self.games: List[_Game] = []  # Creation order is a topological order
+
+    def _game(self, bracket_type: str, round_: int, position: int) -> _Game:
+        game = _Game(bracket_type, round_, position)
+        self.games.append(game)
+        return game
+
+    @staticmethod
+    def _link(source: _Game, target: _Game, slot: str, kind: str = "winner"):
+        target.inputs[slot] = (kind, source)
+        if kind == "winner":
+            source.next = (target, slot)
+        else:
+            source.loser_next = (target, slot)
+
+    def build_winners(self) -> List[List[_Game]]:
+        seeds = seed_order(self.size)
+        rounds = []
+        for r in range(1, self.rounds + 1):
+            games = [self._game("winners", r, p) for p in range(self.size >> r)]
+            if r == 1:
+                for p, game in enumerate(games):
+                    for slot, seed in zip(SLOTS, seeds[p * 2 : p * 2 + 2]):
+                        if seed <= len(self.team_ids):
+                            game.inputs[slot] = ("team", self.team_ids[seed - 1])
+            else:
+                for p, source in enumerate(rounds[-1]):
+                    self._link(source, games[p // 2], SLOTS[p % 2])
+            rounds.append(games)
+        return rounds
+
+    def build_losers(self, winners: List[List[_Game]]) -> List[List[_Game]]:
+        rounds = []
+        for r in range(1, 2 * (self.rounds - 1) + 1):
+            count = self.size >> ((r + 1) // 2 + 1)
+            games = [self._game("losers", r, p) for p in range(count)]
+            if r == 1:
+                # Losers of winners round 1 play each other
+                for p, source in enumerate(winners[0]):
+                    self._link(source, games[p // 2], SLOTS[p % 2], kind="loser")
+            elif r % 2 == 0:
+                # Survivors meet the losers dropping from the next winners round
+                for p, game in enumerate(games):
+                    self._link(rounds[-1][p], game, "radiant")
+                    self._link(winners[r // 2][p], game, "dire", kind="loser")
+            else:
+                for p, source in enumerate(rounds[-1]):
+                    self._link(source, games[p // 2], SLOTS[p % 2])
+            rounds.append(games)
+        return rounds
+
+    def collapse_byes(self) -> List[_Game]:
+        """
+        Remove games that cannot have two entrants.
+
+        A game fed by a single entrant (a bye, or a losers-bracket game whose
+        only other feeder was a bye) is removed and its entrant forwarded to
+        the game's successor. Games are visited in creation order, which
+        always processes a game after every game feeding it.
+        """
+        kept = []
+        for game in self.games:
+            live = [(s, src) for s, src in game.inputs.items() if src is not None]
+            if len(live) == 2:
+                kept.append(game)
+                continue
+
+            entrant = live[0][1] if live else None
+            if game.next:
+                target, slot = game.next
+                target.inputs[slot] = entrant
+                if entrant and entrant[0] != "team":
+                    source = entrant[1]
+                    if entrant[0] == "winner":
+                        source.next = (target, slot)
+                    else:
+                        source.loser_next = (target, slot)
+            elif entrant and entrant[0] != "team":
+                # Collapsed final: its single feeder becomes the final
+                source = entrant[1]
+                if entrant[0] == "winner":
+                    source.next = None
+                else:
+                    source.loser_next = None
+            if game.loser_next:
+                target, slot = game.loser_next
+                target.inputs[slot] = None
+        return kept
+
+    def to_matches(self, games: List[_Game]) -> List[Dict]:
+        """Renumber rounds/positions compactly and emit frontend match dicts."""
+        by_round = defaultdict(list)
+        for game in games:
+            by_round[(game.bracket_type, game.round)].append(game)
+
+        round_numbers = {}
+        for bracket_type in MATCH_ID_PREFIX:
+            rounds = sorted(r for t, r in by_round if t == bracket_type)
+            for number, r in enumerate(rounds, start=1):
+                round_numbers[(bracket_type, r)] = number
+
+        ids = {}
+        for key, round_games in by_round.items():
+            for position, game in enumerate(
+                sorted(round_games, key=lambda g: g.position)
+            ):
+                ids[id(game)] = (round_numbers[key], position)
+
+        matches = []
+        for game in games:
+            round_, position = ids[id(game)]
+            match = {
+                "id": match_id(game.bracket_type, round_, position),
+                "round": round_,
+                "position": position,
+                "bracketType": game.bracket_type,
+                "eliminationType": self.elimination_type,
+                "status": "pending",
+            }
+            for slot, source in game.inputs.items():
+                if source and source[0] == "team":
+                    match[f"{slot}Team"] = {"pk": source[1]}
+            for attr, key in (("next", "nextMatch"), ("loser_next", "loserNextMatch")):
+                link = getattr(game, attr)
+                if link:
+                    target, slot = link
+                    match[f"{key}Id"] = match_id(target.bracket_type, *ids[id(target)])
+                    match[f"{key}Slot"] = slot
+            matches.append(match)
+        return matches
+
+
+def single_elimination(seeded_team_ids: Sequence[int]) -> List[Dict]:
+    """Generate a single elimination bracket for any number of teams."""
+    builder = _EliminationBuilder(seeded_team_ids, "single")
+    builder.build_winners()
+    return builder.to_matches(builder.collapse_byes())
+
+
+def double_elimination(seeded_team_ids: Sequence[int]) -> List[Dict]:
+    """
+    Generate a double elimination bracket for any number of teams.
+
+    Winners bracket losers drop into the losers bracket; the winners and
+    losers bracket champions meet in a single grand final.
+    """
+    builder = _EliminationBuilder(seeded_team_ids, "double")
+    winners = builder.build_winners()
+    losers = builder.build_losers(winners)
+
+    final = builder._game("grand_finals", 1, 0)
+    builder._link(winners[-1][0], final, "radiant")
+    if losers:
+        builder._link(losers[-1][0], final, "dire")
+    return builder.to_matches(builder.collapse_byes())
+
+
+def swiss_standings(
+    results: Iterable[Tuple[int, int, Optional[int]]], team_ids: Iterable[int] = ()
+) -> Tuple[Dict[int, List[int]], Set[frozenset]]:
+    """
+    Compute Swiss records from played games.
+
+    Args:
+        results: (radiant pk, dire pk, winner pk or None) per game
+        team_ids: Teams to include even if they have not played yet
+
+    Returns:
+        ({team pk: [wins, losses]}, set of frozenset pairs already played,
+        with a one-team frozenset for each bye)
+    """
+    records = {pk: [0, 0] for pk in team_ids}
+    played = set()
+    for radiant, dire, winner in results:
+        for pk in (radiant, dire):
+            if pk is not None:
+                records.setdefault(pk, [0, 0])
+        if radiant is None or dire is None:
+            # Bye: the single team is credited with a win
+            pk = radiant if radiant is not None else dire
+            if pk is not None:
+                played.add(frozenset((pk,)))
+                if winner == pk:
+                    records[pk][0] += 1
+            continue
+        played.add(frozenset((radiant, dire)))
+        if winner is None:
+            continue
+        loser = dire if winner == radiant else radiant
+        records[winner][0] += 1
+        records[loser][1] += 1
+    return records, played
+
+
+def swiss_pairings(
+    records: Dict[int, Sequence[int]],
+    played: Set[frozenset],
+    round_number: int,
+    seeds: Optional[Dict[int, int]] = None,
+    wins_to_advance: Optional[int] = None,
+    losses_to_eliminate: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Pair the next Swiss round.
+
+    Teams are sorted by record then seed and split into score groups. With
+    an odd count, the lowest-ranked team that has not had a bye yet sits
+    this round out, as a completed win. Each group pairs its top half
+    against its bottom half, skipping rematches where a later opponent in
+    the group allows it; an odd team out floats down to the next group.
+    Sorting is O(n log n), but taking an opponent from the middle of a
+    group is O(n), so pairing is O(n^2) in the worst case (one large score
+    group, as in early rounds).
+
+    Args:
+        records: {team pk: (wins, losses)}
+        played: Pairs that already met, as frozensets of team pks; a bye is
+            a one-team frozenset
+        round_number: Round number for the generated matches
+        seeds: Optional {team pk: seed}, lower is better
+        wins_to_advance: Teams at this many wins are no longer paired
+        losses_to_eliminate: Teams at this many losses are no longer paired
+
+    Returns:
+        Frontend match dicts with bracketType "swiss"
+    """
+    seeds = seeds or {}
+    active = [
+        pk
+        for pk, (wins, losses) in records.items()
+        if (wins_to_advance is None or wins < wins_to_advance)
+        and (losses_to_eliminate is None or losses < losses_to_eliminate)
+    ]
+    active.sort(key=lambda pk: (-records[pk][0], records[pk][1], seeds.get(pk, 0), pk))
+
+    bye_team = None
+    if len(active) % 2:
+        # Lowest-ranked team without a bye, else the lowest-ranked team
+        bye_team = next(
+            (pk for pk in reversed(active) if frozenset((pk,)) not in played),
+            active[-1],
+        )
+        active.remove(bye_team)
+
+    groups = defaultdict(list)
+    for pk in active:
+        groups[tuple(records[pk])].append(pk)
+    ordered_groups = [
+        groups[key] for key in sorted(groups, key=lambda k: (-k[0], k[1]))
+    ]
+
+    pairs = []
+    floater = []
+    for group in ordered_groups:
+        group = floater + group
+        floater = [group.pop()] if len(group) % 2 else []
+        half = len(group) // 2
+        top, bottom = group[:half], group[half:]
+        for team in top:
+            # First bottom-half opponent not met before, else the first one
+            index = next(
+                (
+                    i
+                    for i, opp in enumerate(bottom)
+                    if frozenset((team, opp)) not in played
+                ),
+                0,
+            )
+            pairs.append((team, bottom.pop(index)))
+
+    matches = []
+    for position, (radiant, dire) in enumerate(pairs):
+        wins, losses = records[radiant]
+        matches.append(
+            {
+                "id": match_id("swiss", round_number, position),
+                "round": round_number,
+                "position": position,
+                "bracketType": "swiss",
+                "eliminationType": "swiss",
+                "status": "pending",
+                "radiantTeam": {"pk": radiant},
+                "direTeam": {"pk": dire},
+                "swissRecordWins": wins,
+                "swissRecordLosses": losses,
+            }
+        )
+    if bye_team is not None:
+        # A bye is a completed win for the unpaired team
+        wins, losses = records[bye_team]
+        matches.append(
+            {
+                "id": match_id("swiss", round_number, len(pairs)),
+                "round": round_number,
+                "position": len(pairs),
+                "bracketType": "swiss",
+                "eliminationType": "swiss",
+                "status": "completed",
+                "winner": "radiant",
+                "radiantTeam": {"pk": bye_team},
+                "swissRecordWins": wins,
+                "swissRecordLosses": losses,
+            }
+        )
+    return matches
+
+
+def generate(tournament_type: str, seeded_team_ids: Sequence[int]) -> List[Dict]:
+    """
+    Generate a bracket for a tournament type.
+
+    Swiss tournaments get their first round; later rounds come from
+    ``swiss_pairings`` once results are in.
+    """
+    if tournament_type == "single_elimination":
+        return single_elimination(seeded_team_ids)
+    if tournament_type == "double_elimination":
+        return double_elimination(seeded_team_ids)
+    if tournament_type == "swiss":
+        records = {pk: (0, 0) for pk in seeded_team_ids}
+        seeds = {pk: seed for seed, pk in enumerate(seeded_team_ids)}
+        return swiss_pairings(records, set(), 1, seeds=seeds)
+    raise ValueError(f"Unknown tournament type: {tournament_type}")
@@ -0,0 +1,272 @@
+"""Cached in-memory bracket topology for a tournament."""
+
+import logging
+from collections import defaultdict, deque, namedtuple
+from typing import Dict, List, Optional
+
+from django.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+GRAPH_CACHE_KEY = "bracket:graph:{tournament_id}"
+GRAPH_CACHE_TIMEOUT = 60 * 60  # Topology only changes when the bracket is saved
+
+# Static shape of a bracket game; team/winner state is read fresh from the DB
+BracketNode = namedtuple(
+    "BracketNode",
+    [
+        "pk",
+        "bracket_type",
+        "elimination_type",
+        "round",
+        "position",
+        "next_game_id",
+        "next_game_slot",
+        "loser_next_game_id",
+        "loser_next_game_slot",
+    ],
+)
+
+# Planned result of declaring a winner: Game attribute changes keyed by game pk
+# and final placements keyed by team pk
+Advancement = namedtuple("Advancement", ["game_updates", "placements"])
+
+STATE_FIELDS = ("radiant_team_id", "dire_team_id", "winning_team_id", "status")
+
+
+class BracketGraph:
+    """
+    Games of a tournament bracket with their successor edges.
+
+    Built from a single query and cached per tournament, so advancing a
+    winner and calculating placements need no per-call topology lookups.
+    The cache is dropped whenever a game of the tournament is saved or
+    deleted, which covers bracket saves and regeneration.
+    """
+
+    def __init__(self, tournament_id: Optional[int], nodes: Dict[int, BracketNode]):
+        self.tournament_id = tournament_id
+        self.nodes = nodes
+
+        # Deepest round per bracket side (winners, losers, grand_finals, swiss)
+        self.max_round = {}
+        for node in nodes.values():
+            if node.round > self.max_round.get(node.bracket_type, 0):
+                self.max_round[node.bracket_type] = node.round
+
+    @classmethod
+    def cache_key(cls, tournament_id: int) -> str:
+        return GRAPH_CACHE_KEY.format(tournament_id=tournament_id)
+
+    @classmethod
+    def build(cls, tournament_id: int) -> "BracketGraph":
+        """Build the graph for a tournament from one query."""
+        from app.models import Game
+
+        rows = Game.objects.filter(tournament_id=tournament_id).values_list(
+            *BracketNode._fields
+        )
+        return cls(tournament_id, {row[0]: BracketNode(*row) for row in rows})
+
+    @classmethod
+    def for_tournament(cls, tournament_id: int) -> "BracketGraph":
+        """Return the cached graph for a tournament, building it on a miss."""
+        nodes = cache.get(cls.cache_key(tournament_id))
+        if nodes is not None:
+            return cls(tournament_id, nodes)
+        return cls.rebuild(tournament_id)
+
+    @classmethod
+    def rebuild(cls, tournament_id: int) -> "BracketGraph":
+        """Build the graph for a tournament and replace the cached one."""
+        graph = cls.build(tournament_id)
+        cache.set(
+            cls.cache_key(tournament_id), graph.nodes, timeout=GRAPH_CACHE_TIMEOUT
+        )
+        log.debug(
+            f"Built bracket graph for tournament {tournament_id} "
+            f"({len(graph.nodes)} games)"
+        )
+        return graph
+
+    @classmethod
+    def for_game(cls, game) -> "BracketGraph":
+        """Return the graph a game belongs to (a single-node graph if standalone)."""
+        if not game.tournament_id:
+            node = BracketNode(*(getattr(game, f) for f in BracketNode._fields))
+            return cls(None, {game.pk: node})
+
+        graph = cls.for_tournament(game.tournament_id)
+        if game.pk not in graph.nodes:
+            # A cached graph without the game is stale; placements and
+            # successors need the whole bracket
+            log.info(
+                f"Bracket graph for tournament {game.tournament_id} "
+                f"is missing game {game.pk}, rebuilding"
+            )
+            graph = cls.rebuild(game.tournament_id)
+        return graph
+
+    @classmethod
+    def invalidate(cls, tournament_id: Optional[int]) -> None:
+        """Drop the cached graph for a tournament."""
+        if tournament_id:
+            cache.delete(cls.cache_key(tournament_id))
+
+    def placement(self, game_pk: int) -> Optional[int]:
+        """
+        Calculate placement for a team eliminated from this game.
+
+        Returns placement number or None if team isn't eliminated
+        (e.g., winners bracket losers go to losers bracket).
+        """
+        node = self.nodes[game_pk]
+
+        # Grand finals loser = 2nd place
+        if node.bracket_type == "grand_finals":
+            return 2
+
+        # Losers bracket elimination
+        if node.bracket_type == "losers":
+            rounds_from_final = self.max_round["losers"] - node.round
+
+            if rounds_from_final == 0:  # Losers finals
+                return 3
+            elif rounds_from_final <= 2:  # Losers semi (4th)
+                return 4
+            else:
+                # Each earlier round: 5th-6th, 7th-8th, etc.
+                base = 5
+                for i in range(rounds_from_final - 3):
+                    base += 2**i
+                return base
+
+        # Winners bracket elimination → goes to losers (no placement yet)
+        return None
+
+    def advance(
+        self, game_pk: int, winning_team_id: int, losing_team_id: Optional[int]
+    ) -> Advancement:
+        """
+        Plan the writes for declaring a winner, without touching the database.
+
+        Args:
+            game_pk: Game being decided
+            winning_team_id: Team that won the game
+            losing_team_id: Team that lost the game, if any
+
+        Returns:
+            Advancement with per-game attribute updates and team placements
+        """
+        node = self.nodes[game_pk]
+        game_updates = defaultdict(dict)
+        placements = {}
+
+        game_updates[node.pk].update(
+            {"winning_team_id": winning_team_id, "status": "completed"}
+        )
+
+        # Advance winner to next game if exists
+        if node.next_game_id and node.next_game_slot:
+            game_updates[node.next_game_id][
+                f"{node.next_game_slot}_team_id"
+            ] = winning_team_id
+
+        # Handle loser path
+        if losing_team_id:
+            if (
+                node.elimination_type == "double"
+                and node.loser_next_game_id
+                and node.loser_next_game_slot
+            ):
+                # Advance loser to losers bracket
+                game_updates[node.loser_next_game_id][
+                    f"{node.loser_next_game_slot}_team_id"
+                ] = losing_team_id
+            else:
+                # No loser path - team is eliminated, set placement
+                placement = self.placement(node.pk)
+                if placement:
+                    placements[losing_team_id] = placement
+
+        # Grand finals - also set winner's placement
+        if node.bracket_type == "grand_finals":
+            placements[winning_team_id] = 1
+
+        return Advancement(dict(game_updates), placements)
+
+    def topological_order(self) -> List[int]:
+        """Game pks ordered so every game comes after the games feeding it."""
+        indegree = {pk: 0 for pk in self.nodes}
+        for node in self.nodes.values():
+            for target in (node.next_game_id, node.loser_next_game_id):
+                if target in indegree:
+                    indegree[target] += 1
+
+        queue = deque(
+            sorted(
+                (pk for pk, degree in indegree.items() if degree == 0),
+                key=lambda pk: (self.nodes[pk].round, self.nodes[pk].position),
+            )
+        )
+        order = []
+        while queue:
+            pk = queue.popleft()
+            order.append(pk)
+            node = self.nodes[pk]
+            for target in (node.next_game_id, node.loser_next_game_id):
+                if target in indegree:
+                    indegree[target] -= 1
+                    if indegree[target] == 0:
+                        queue.append(target)
+        return order
+
+    def simulate(
+        self, state: Dict[int, Dict], winners: Optional[Dict[int, str]] = None
+    ) -> Dict:
+        """
+        Play out the rest of the bracket in memory.
+
+        Completed games keep their recorded winner. Every other game whose two
+        teams are known is decided by ``winners`` (game pk -> "radiant" or
+        "dire"), defaulting to the radiant (higher seeded) side.
+
+        Args:
+            state: Current team/winner state per game pk (``STATE_FIELDS``)
+            winners: Optional forced winner slot per game pk
+
+        Returns:
+            Dict with simulated per-game state and resulting team placements
+        """
+        winners = winners or {}
+        games = {pk: dict(state.get(pk, {})) for pk in self.nodes}
+        placements = {}
+        simulated = set()
+
+        for pk in self.topological_order():
+            game = games[pk]
+            radiant, dire = game.get("radiant_team_id"), game.get("dire_team_id")
+
+            if game.get("status") == "completed" and game.get("winning_team_id"):
+                winner = game["winning_team_id"]
+            elif radiant and dire:
+                winner = dire if winners.get(pk) == "dire" else radiant
+                simulated.add(pk)
+            else:
+                continue
+
+            loser = dire if winner == radiant else radiant
+            advancement = self.advance(pk, winner, loser)
+            for target, updates in advancement.game_updates.items():
+                if target == pk and pk not in simulated:
+                    continue
+                games[target].update(updates)
+            placements.update(advancement.placements)
+
+        return {
+            "games": [
+                {"pk": pk, **games[pk], "simulated": pk in simulated}
+                for pk in self.topological_order()
+            ],
+            "placements": placements,
+        }
@@ -0,0 +1,211 @@
+"""Diff-based bracket persistence for tournament games."""
+
+import copy
+import logging
+from typing import Dict, List, Optional
+
+from cacheops import invalidate_obj, no_invalidation
+from django.db import transaction
+
+from .bracket_graph import BracketGraph
+from .draft_analytics import HeroDraftStats
+
+log = logging.getLogger(__name__)
+
+# Scalar Game fields written from the frontend match payload:
+# (model attribute, payload key, default)
+MATCH_FIELDS = (
+    ("round", "round", 1),
+    ("position", "position", 0),
+    ("bracket_type", "bracketType", "winners"),
+    ("elimination_type", "eliminationType", "double"),
+    ("status", "status", "pending"),
+    ("next_game_slot", "nextMatchSlot", None),
+    ("loser_next_game_slot", "loserNextMatchSlot", None),
+    ("swiss_record_wins", "swissRecordWins", 0),
+    ("swiss_record_losses", "swissRecordLosses", 0),
+)
+
+# Game FK attributes wired from frontend match ids: (model attribute, payload key)
+LINK_FIELDS = (
+    ("next_game_id", "nextMatchId"),
+    ("loser_next_game_id", "loserNextMatchId"),
+)
+
+
+def _team_pk(team: Optional[dict]) -> Optional[int]:
+    if team and team.get("pk"):
+        return team["pk"]
+    return None
+
+
+class BracketWriter:
+    """
+    Persist a submitted bracket by diffing it against the tournament's games.
+
+    Existing games are matched by ``gameId`` (the Game pk the frontend keeps
+    after a save) and otherwise by their (bracket_type, round, position) slot,
+    so re-saving a bracket keeps linked Steam matches, HeroDrafts and
+    LeagueMatches. Only what changed is written: new games in one
+    ``bulk_create``, removed games in one delete, and field changes plus
+    next-game wiring in one ``bulk_update``. Caches are invalidated once per
+    changed game after the writes instead of on every save, and the cached
+    BracketGraph and league hero draft statistics are dropped (the bulk
+    writes send no ``post_save``).
+    """
+
+    def __init__(self, tournament):
+        self.tournament = tournament
+        self.created: List = []
+        self.updated: List = []
+        self.deleted_pks: List[int] = []
+
+        # pk -> copy of the game before this save (for cache invalidation)
+        self._originals: Dict[int, object] = {}
+        # pk -> set of changed model attributes
+        self._dirty: Dict[int, set] = {}
+
+    @staticmethod
+    def match_values(match: dict) -> Dict:
+        """
+        Map a frontend match dict to Game attribute values (without links).
+
+        ``winning_team_id`` is only included when the match names a
+        ``winner`` slot, so saving a bracket without results keeps them.
+        """
+        values = {attr: match.get(key, default) for attr, key, default in MATCH_FIELDS}
+        values["radiant_team_id"] = _team_pk(match.get("radiantTeam"))
+        values["dire_team_id"] = _team_pk(match.get("direTeam"))
+        if match.get("winner") in ("radiant", "dire"):
+            values["winning_team_id"] = values[f"{match['winner']}_team_id"]
+        return values
+
+    def _set(self, game, attr: str, value) -> None:
+        """Set an attribute on a persisted game, tracking it if it changed."""
+        if getattr(game, attr) == value:
+            return
+        if game.pk not in self._originals:
+            self._originals[game.pk] = copy.copy(game)
+        self._dirty.setdefault(game.pk, set()).add(attr)
+        setattr(game, attr, value)
+
+    def _resolve_existing(self, matches: List[dict], existing: List) -> Dict:
+        """Map frontend match ids to existing games they should reuse."""
+        by_pk = {game.pk: game for game in existing}
+        by_slot = {(g.bracket_type, g.round, g.position): g for g in existing}
+
+        resolved = {}
+        used = set()
+
+        # Explicit game ids win over slot matches so a moved game keeps its row
+        for match in matches:
+            game = by_pk.get(match.get("gameId"))
+            if game is not None and game.pk not in used:
+                resolved[match["id"]] = game
+                used.add(game.pk)
+
+        for match in matches:
+            if match["id"] in resolved:
+                continue
+            values = self.match_values(match)
+            game = by_slot.get(
+                (values["bracket_type"], values["round"], values["position"])
+            )
+            if game is not None and game.pk not in used:
+                resolved[match["id"]] = game
+                used.add(game.pk)
+
+        return resolved
+
+    @transaction.atomic
+    def save(self, matches: List[dict], delete_missing: bool = True) -> None:
+        """
+        Apply the submitted bracket to the tournament's games.
+
+        Args:
+            matches: Frontend match dicts as posted to ``save_bracket``
+            delete_missing: Delete existing games not in ``matches``; pass
+                False to add games (e.g. a new Swiss round) to a bracket
+        """
+        from app.models import Game
+
+        existing = list(Game.objects.filter(tournament=self.tournament))
+        resolved = self._resolve_existing(matches, existing)
+
+        id_to_game = {}
+        new_games = []
+        for match in matches:
+            values = self.match_values(match)
+            game = resolved.get(match["id"])
+            if game is None:
+                game = Game(tournament=self.tournament, **values)
+                new_games.append(game)
+            else:
+                for attr, value in values.items():
+                    self._set(game, attr, value)
+                # A recorded winner only stays valid while it still plays here
+                if game.winning_team_id not in (
+                    None,
+                    game.radiant_team_id,
+                    game.dire_team_id,
+                ):
+                    self._set(game, "winning_team_id", None)
+            id_to_game[match["id"]] = game
+
+        kept = {game.pk for game in resolved.values()}
+        if delete_missing:
+            self.deleted_pks = [g.pk for g in existing if g.pk not in kept]
+
+        # Deletes cascade to linked rows, so they keep cacheops' own invalidation
+        if self.deleted_pks:
+            Game.objects.filter(pk__in=self.deleted_pks).delete()
+
+        with no_invalidation:
+            if new_games:
+                self.created = Game.objects.bulk_create(new_games)
+            created_pks = {game.pk for game in self.created}
+
+            # Wire next/loser-next games now that every game has a pk
+            for match in matches:
+                game = id_to_game[match["id"]]
+                for attr, key in LINK_FIELDS:
+                    target = id_to_game.get(match.get(key))
+                    target_pk = target.pk if target is not None else None
+                    if game.pk in created_pks:
+                        if target_pk is not None:
+                            setattr(game, attr, target_pk)
+                            self._dirty.setdefault(game.pk, set()).add(attr)
+                    else:
+                        self._set(game, attr, target_pk)
+
+            if self._dirty:
+                to_update = [
+                    game for game in id_to_game.values() if game.pk in self._dirty
+                ]
+                attrs = set().union(*self._dirty.values())
+                Game.objects.bulk_update(
+                    to_update, [Game._meta.get_field(a).name for a in sorted(attrs)]
+                )
+                self.updated = [g for g in to_update if g.pk not in created_pks]
+
+        self._invalidate()
+
+        log.debug(
+            f"Saved bracket for tournament {self.tournament.pk}: "
+            f"{len(self.created)} created, {len(self.updated)} updated, "
+            f"{len(self.deleted_pks)} deleted"
+        )
+
+    def _invalidate(self) -> None:
+        """Invalidate caches for the changed games and the tournament once."""
+        for original in self._originals.values():
+            invalidate_obj(original)
+        for game in self.created + self.updated:
+            invalidate_obj(game)
+        if self.created or self.updated or self.deleted_pks:
+            invalidate_obj(self.tournament)
+            BracketGraph.invalidate(self.tournament.pk)
+            HeroDraftStats.invalidate_on_commit(
+                self.tournament.league_id,
+                *{game.league_id for game in self.created + self.updated},
+            )
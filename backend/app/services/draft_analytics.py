@@ -0,0 +1,272 @@
+"""Columnar export of completed hero drafts and league-wide hero statistics."""
+
+import json
+import logging
+import os
+import sys
+from array import array
+from collections import Counter
+from typing import Iterator, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+# One column per pick or ban: (name, array typecode, NumPy dtype)
+COLUMNS = (
+    ("draft_id", "q", "<i8"),
+    ("round_number", "B", "|u1"),
+    ("draft_team_id", "q", "<i8"),
+    ("first_pick", "B", "|u1"),
+    ("result", "B", "|u1"),
+    ("hero_id", "H", "<u2"),
+    ("action", "B", "|u1"),
+    ("elapsed_ms", "q", "<i8"),
+    ("reserve_used_ms", "q", "<i8"),
+)
+ACTIONS = {"ban": 0, "pick": 1}
+# result column: the game's outcome for the round's team
+LOSS, WIN, NO_RESULT = 0, 1, 2
+
+CHUNK_SIZE = 24 * 500  # 500 drafts
+STATS_CACHE_KEY = "herodraft:stats:league:{league_id}"
+STATS_CACHE_TIMEOUT = 60 * 60  # Dropped whenever a league draft or game changes
+
+
+class HeroDraftColumns:
+    """
+    Rounds of completed hero drafts as typed arrays, one per ``COLUMNS`` entry.
+
+    ``chunks`` streams them from a single query in fixed-size pieces, so an
+    export or a statistics pass never holds model instances or the whole
+    rounds table in memory.
+    """
+
+    def __init__(self):
+        self.columns = {name: array(code) for name, code, _ in COLUMNS}
+
+    def __len__(self):
+        return len(self.columns["draft_id"])
+
+    def __getitem__(self, name: str) -> array:
+        return self.columns[name]
+
+    @staticmethod
+    def queryset(league_id: Optional[int] = None):
+        """Completed drafts' rounds, in draft and round order."""
+        from django.db.models import Q
+
+        from app.models import HeroDraftRound, HeroDraftState
+
+        rounds = HeroDraftRound.objects.filter(
+            draft__state=HeroDraftState.COMPLETED, state="completed"
+        )
+        if league_id is not None:
+            rounds = rounds.filter(
+                Q(draft__game__league_id=league_id)
+                | Q(draft__game__tournament__league_id=league_id)
+            )
+        return rounds.order_by("draft_id", "round_number").values_list(
+            "draft_id",
+            "round_number",
+            "draft_team_id",
+            "draft_team__is_first_pick",
+            "draft_team__tournament_team_id",
+            "draft__game__winning_team_id",
+            "hero_id",
+            "action_type",
+            "started_at",
+            "completed_at",
+            "grace_time_ms",
+        )
+
+    @classmethod
+    def chunks(
+        cls, league_id: Optional[int] = None, chunk_size: int = CHUNK_SIZE
+    ) -> Iterator["HeroDraftColumns"]:
+        """Yield the completed drafts' rounds ``chunk_size`` rows at a time."""
+        chunk = cls()
+        for row in cls.queryset(league_id).iterator(chunk_size=chunk_size):
+            chunk.append(*row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = cls()
+        if len(chunk):
+            yield chunk
+
+    def append(
+        self,
+        draft_id,
+        round_number,
+        draft_team_id,
+        is_first_pick,
+        tournament_team_id,
+        winning_team_id,
+        hero_id,
+        action_type,
+        started_at,
+        completed_at,
+        grace_time_ms,
+    ):
+        elapsed_ms = 0
+        if started_at and completed_at:
+            elapsed_ms = int((completed_at - started_at).total_seconds() * 1000)
+        if winning_team_id is None:
+            result = NO_RESULT
+        else:
+            result = WIN if winning_team_id == tournament_team_id else LOSS
+
+        columns = self.columns
+        columns["draft_id"].append(draft_id)
+        columns["round_number"].append(round_number)
+        columns["draft_team_id"].append(draft_team_id)
+        columns["first_pick"].append(bool(is_first_pick))
+        columns["result"].append(result)
+        columns["hero_id"].append(hero_id or 0)
+        columns["action"].append(ACTIONS[action_type])
+        columns["elapsed_ms"].append(elapsed_ms)
+        columns["reserve_used_ms"].append(max(0, elapsed_ms - grace_time_ms))
+
+    def write(self, directory: str) -> None:
+        """
+        Append this chunk to ``<directory>/<column>.bin``.
+
+        Each file holds the column's raw little-endian values; read one back
+        with ``numpy.fromfile(path, dtype)`` using ``manifest.json``'s dtype.
+        """
+        for name, _, _ in COLUMNS:
+            values = self.columns[name]
+            if sys.byteorder == "big":
+                values = array(values.typecode, values)
+                values.byteswap()
+            with open(os.path.join(directory, f"{name}.bin"), "ab") as f:
+                values.tofile(f)
+
+
+def export(directory: str, league_id: Optional[int] = None, **kwargs) -> int:
+    """
+    Write the completed drafts' rounds to ``directory`` as columnar files.
+
+    Returns the number of rows written. ``manifest.json`` describes the
+    columns (NumPy dtypes), the row count and the ``action``/``result``
+    codes.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for name, _, _ in COLUMNS:
+        open(os.path.join(directory, f"{name}.bin"), "wb").close()
+
+    rows = 0
+    for chunk in HeroDraftColumns.chunks(league_id, **kwargs):
+        chunk.write(directory)
+        rows += len(chunk)
+
+    manifest = {
+        "league_id": league_id,
+        "rows": rows,
+        "columns": {name: dtype for name, _, dtype in COLUMNS},
+        "codes": {
+            "action": ACTIONS,
+            "result": {"loss": LOSS, "win": WIN, "no_result": NO_RESULT},
+        },
+    }
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return rows
+
+
+class HeroDraftStats:
+    """
+    League-wide hero pick/ban statistics, cached per league.
+
+    Computed in one pass over ``HeroDraftColumns`` chunks, column by column,
+    and dropped after the write commits when a league draft completes or a
+    league game changes: by signals for saves and deletes, and explicitly
+    by ``advance_winner`` and ``BracketWriter``, whose bulk writes send no
+    signals.
+    """
+
+    @classmethod
+    def cache_key(cls, league_id: int) -> str:
+        return STATS_CACHE_KEY.format(league_id=league_id)
+
+    @classmethod
+    def for_league(cls, league_id: int) -> dict:
+        key = cls.cache_key(league_id)
+        stats = cache.get(key)
+        if stats is None:
+            stats = cls.compute(HeroDraftColumns.chunks(league_id))
+            cache.set(key, stats, timeout=STATS_CACHE_TIMEOUT)
+        return stats
+
+    @classmethod
+    def invalidate(cls, *league_ids: Optional[int]) -> None:
+        keys = [cls.cache_key(league_id) for league_id in league_ids if league_id]
+        if keys:
+            cache.delete_many(keys)
+
+    @classmethod
+    def invalidate_on_commit(cls, *league_ids: Optional[int]) -> None:
+        """
+        Drop the leagues' statistics once the current transaction commits.
+
+        Dropping them earlier lets a concurrent request recompute and cache
+        them from the rows as they were before the write.
+        """
+        transaction.on_commit(lambda: cls.invalidate(*league_ids))
+
+    @staticmethod
+    def compute(chunks) -> dict:
+        picks, bans, wins = Counter(), Counter(), Counter()
+        # Picks whose game has a winner; the win rate ignores the others
+        decided_picks = Counter()
+        drafts = set()
+        first_pick_results = {}
+        reserve_used = 0
+        pick = ACTIONS["pick"]
+
+        for chunk in chunks:
+            drafts.update(chunk["draft_id"])
+            reserve_used += sum(chunk["reserve_used_ms"])
+            for hero_id, action, result in zip(
+                chunk["hero_id"], chunk["action"], chunk["result"]
+            ):
+                if action == pick:
+                    picks[hero_id] += 1
+                    wins[hero_id] += result == WIN
+                    decided_picks[hero_id] += result != NO_RESULT
+                else:
+                    bans[hero_id] += 1
+            for draft_id, first_pick, result in zip(
+                chunk["draft_id"], chunk["first_pick"], chunk["result"]
+            ):
+                if first_pick and result != NO_RESULT:
+                    first_pick_results[draft_id] = result == WIN
+
+        count = len(drafts)
+        heroes = [
+            {
+                "hero_id": hero_id,
+                "picks": picks[hero_id],
+                "bans": bans[hero_id],
+                "pick_rate": picks[hero_id] / count,
+                "ban_rate": bans[hero_id] / count,
+                "win_rate": (
+                    wins[hero_id] / decided_picks[hero_id]
+                    if decided_picks[hero_id]
+                    else None
+                ),
+            }
+            for hero_id in picks.keys() | bans.keys()
+        ]
+        heroes.sort(key=lambda h: (-(h["picks"] + h["bans"]), h["hero_id"]))
+        decided = len(first_pick_results)
+        return {
+            "drafts": count,
+            # Two teams per draft
+            "avg_reserve_used_ms": reserve_used / (2 * count) if count else None,
+            "first_pick_win_rate": (
+                sum(first_pick_results.values()) / decided if decided else None
+            ),
+            "heroes": heroes,
+        }
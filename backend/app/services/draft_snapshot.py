@@ -0,0 +1,144 @@
+"""Versioned, cached draft state served on connect and in broadcasts."""
+
+import json
+import time
+from typing import NamedTuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Backstop only; every change to the draft bumps its version
+SNAPSHOT_CACHE_TIMEOUT = 6 * 60 * 60
+# A build holds its lock this long at most (e.g. if the process dies)
+BUILD_LOCK_TIMEOUT = 30
+# How long other callers wait for a concurrent build before building too
+BUILD_WAIT_SECONDS = 2.0
+BUILD_POLL_SECONDS = 0.025
+
+
+class Snapshot(NamedTuple):
+    version: int
+    encoded: str
+
+    @property
+    def data(self) -> dict:
+        return json.loads(self.encoded)
+
+
+class VersionedSnapshot:
+    """
+    Serialized state of a draft, built at most once per draft version.
+
+    Each draft has a version counter that signals bump whenever something
+    in the serialized state changes. ``get`` returns the JSON for the
+    current version. On a miss only one caller (across processes) builds
+    it while concurrent callers wait for the result, so a burst of
+    connections to one draft costs one build.
+
+    Versions are bumped both when the change is saved and again when its
+    transaction commits, so a snapshot built by another connection from the
+    not-yet-committed state is never served under the final version.
+    Subclasses set ``key_prefix`` and implement ``build``.
+    """
+
+    key_prefix: str
+
+    @classmethod
+    def version_key(cls, draft_id: int) -> str:
+        return f"{cls.key_prefix}:{draft_id}:version"
+
+    @classmethod
+    def snapshot_key(cls, draft_id: int) -> str:
+        return f"{cls.key_prefix}:{draft_id}:snapshot"
+
+    @classmethod
+    def build_lock_key(cls, draft_id: int) -> str:
+        return f"{cls.key_prefix}:{draft_id}:snapshot:building"
+
+    @classmethod
+    def get(cls, draft_id: int) -> Snapshot:
+        """Return the draft's current snapshot, building it on a miss."""
+        version_key = cls.version_key(draft_id)
+        snapshot_key = cls.snapshot_key(draft_id)
+        cached = cache.get_many([version_key, snapshot_key])
+        version = cached.get(version_key)
+        if version is None:
+            version = cls._start_version(draft_id)
+        snapshot = cached.get(snapshot_key)
+        if snapshot is not None and snapshot[0] == version:
+            return Snapshot(*snapshot)
+
+        lock_key = cls.build_lock_key(draft_id)
+        if not cache.add(lock_key, version, timeout=BUILD_LOCK_TIMEOUT):
+            snapshot = cls._wait_for_build(snapshot_key, version)
+            if snapshot is not None:
+                return snapshot
+        try:
+            # Read the version before the rows: a concurrent bump can only
+            # make this snapshot newer than its version, never older
+            snapshot = Snapshot(version, json.dumps(cls.build(draft_id)))
+            cache.set(snapshot_key, tuple(snapshot), timeout=SNAPSHOT_CACHE_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        return snapshot
+
+    @classmethod
+    def _wait_for_build(cls, snapshot_key: str, version: int):
+        deadline = time.monotonic() + BUILD_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(BUILD_POLL_SECONDS)
+            snapshot = cache.get(snapshot_key)
+            if snapshot is not None and snapshot[0] >= version:
+                return Snapshot(*snapshot)
+        return None
+
+    @classmethod
+    def for_draft(cls, draft_id: int) -> dict:
+        return cls.get(draft_id).data
+
+    @classmethod
+    def bump(cls, draft_id: int) -> None:
+        """Mark the draft as changed, now and once the transaction commits."""
+        if not draft_id:
+            return
+        cls._bump(draft_id)
+        transaction.on_commit(lambda: cls._bump(draft_id))
+
+    @classmethod
+    def _bump(cls, draft_id: int) -> None:
+        try:
+            cache.incr(cls.version_key(draft_id))
+        except ValueError:
+            cls._start_version(draft_id)
+
+    @classmethod
+    def _start_version(cls, draft_id: int) -> int:
+        # Never restart from a number an evicted counter may already have used
+        key = cls.version_key(draft_id)
+        cache.add(key, time.time_ns(), timeout=SNAPSHOT_CACHE_TIMEOUT)
+        return cache.get(key)
+
+    @classmethod
+    def build(cls, draft_id: int) -> dict:
+        raise NotImplementedError
+
+
+class DraftSnapshot(VersionedSnapshot):
+    """``DraftSerializerForTournament`` state of a team draft."""
+
+    key_prefix = "draft"
+
+    @classmethod
+    def build(cls, draft_id: int) -> dict:
+        from app.models import Draft
+        from app.serializers import DraftSerializerForTournament
+
+        # Note: users_remaining is a property, not a relation, so it can't be prefetched
+        draft = Draft.objects.prefetch_related(
+            "draft_rounds__captain",
+            "draft_rounds__choice",
+            "tournament__teams__captain",
+            "tournament__teams__members",
+            "tournament__users",  # Prefetch users for users_remaining calculation
+        ).get(pk=draft_id)
+        return DraftSerializerForTournament(draft).data
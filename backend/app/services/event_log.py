@@ -0,0 +1,115 @@
+"""Per-draft event logs: cursor replay by ``seq`` and compaction."""
+
+import logging
+from typing import List
+
+from django.apps import apps
+from django.db.models import Max
+
+log = logging.getLogger(__name__)
+
+# Most events returned by one replay or page
+REPLAY_LIMIT = 100
+
+
+class EventLog:
+    """
+    Reads of a ``SequencedEvent`` log, in ``seq`` order.
+
+    ``seq`` is the cursor: a client that has seen events up to ``N`` asks
+    for ``since(draft_id, N)`` and pages on with the last ``seq`` it got.
+    All reads use the (draft, seq) unique index. Subclasses set
+    ``model_name`` and may override ``queryset`` to load what their
+    serializer reads.
+    """
+
+    model_name: str
+
+    @classmethod
+    def model(cls):
+        return apps.get_model("app", cls.model_name)
+
+    @classmethod
+    def queryset(cls):
+        return cls.model().objects.all()
+
+    @classmethod
+    def since(
+        cls, draft_id: int, after_seq: int = 0, limit: int = REPLAY_LIMIT
+    ) -> List:
+        """Up to ``limit`` events after ``after_seq``, oldest first."""
+        return list(
+            cls.queryset()
+            .filter(draft_id=draft_id, seq__gt=after_seq)
+            .order_by("seq")[:limit]
+        )
+
+    @classmethod
+    def latest(cls, draft_id: int, limit: int = REPLAY_LIMIT) -> List:
+        """The last ``limit`` events, newest first."""
+        return list(cls.queryset().filter(draft_id=draft_id).order_by("-seq")[:limit])
+
+
+class DraftEventLog(EventLog):
+    """Team draft ``DraftEvent``s."""
+
+    model_name = "DraftEvent"
+
+    @classmethod
+    def queryset(cls):
+        return super().queryset().select_related("actor__positions")
+
+
+class HeroDraftEventLog(EventLog):
+    """Hero draft ``HeroDraftEvent``s."""
+
+    model_name = "HeroDraftEvent"
+
+    @classmethod
+    def queryset(cls):
+        from django.db.models import Prefetch
+
+        from app.models import CustomUser
+
+        return (
+            super()
+            .queryset()
+            .select_related("draft_team__tournament_team__captain__positions")
+            .prefetch_related(
+                Prefetch(
+                    "draft_team__tournament_team__members",
+                    queryset=CustomUser.objects.select_related("positions"),
+                )
+            )
+        )
+
+    @classmethod
+    def compact(cls, draft_id: int) -> int:
+        """
+        Drop a finished draft's connection churn.
+
+        Captain connect/disconnect events are only interesting while the
+        draft runs. Once it is completed or abandoned, only the last event
+        of each kind per team is kept. Returns the number of events deleted.
+        """
+        from app.models import HeroDraft, HeroDraftState
+
+        finished = HeroDraft.objects.filter(
+            pk=draft_id,
+            state__in=(HeroDraftState.COMPLETED, HeroDraftState.ABANDONED),
+        ).exists()
+        if not finished:
+            return 0
+
+        churn = cls.model().objects.filter(
+            draft_id=draft_id, event_type__in=cls.model().CONNECTION_EVENTS
+        )
+        keep = (
+            churn.values("draft_team_id", "event_type")
+            .annotate(last_seq=Max("seq"))
+            .values_list("last_seq", flat=True)
+        )
+        deleted, _ = churn.exclude(seq__in=list(keep)).delete()
+        if deleted:
+            log.info(f"Compacted {deleted} connection events of herodraft {draft_id}")
+        return deleted
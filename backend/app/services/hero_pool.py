@@ -0,0 +1,120 @@
+"""Hero catalogue and per-draft hero availability as bitsets."""
+
+import json
+import random
+from pathlib import Path
+from typing import List, Optional
+
+from django.core.cache import cache
+from django.db import transaction
+
+HEROES_FILE = Path(__file__).resolve().parent.parent / "data" / "heroes.json"
+
+USED_HEROES_CACHE_KEY = "herodraft:{draft_id}:used_heroes"
+USED_HEROES_CACHE_TIMEOUT = 6 * 60 * 60  # Drafts finish well within this
+
+
+class HeroPool:
+    """
+    Valid hero ids and the heroes each draft has already picked or banned.
+
+    Both are integer bitsets indexed by hero id: bit ``n`` of ``mask()`` is
+    set when hero ``n`` exists, and bit ``n`` of a draft's used mask is set
+    once hero ``n`` is picked or banned in it. The catalogue is read once
+    per process from ``app/data/heroes.json`` (bump its ``version`` when
+    heroes are added). Used masks are cached per draft, dropped once a
+    round change commits and rebuilt from one query on a miss, so
+    availability checks and random auto-picks need no queries between
+    picks.
+    """
+
+    _catalogue = None  # (version, mask, sorted ids)
+
+    @classmethod
+    def _load(cls):
+        if cls._catalogue is None:
+            data = json.loads(HEROES_FILE.read_text())
+            ids = tuple(sorted(data["hero_ids"]))
+            mask = 0
+            for hero_id in ids:
+                mask |= 1 << hero_id
+            cls._catalogue = (data["version"], mask, ids)
+        return cls._catalogue
+
+    @classmethod
+    def version(cls) -> str:
+        return cls._load()[0]
+
+    @classmethod
+    def mask(cls) -> int:
+        return cls._load()[1]
+
+    @classmethod
+    def hero_ids(cls) -> tuple:
+        return cls._load()[2]
+
+    @classmethod
+    def is_hero(cls, hero_id: int) -> bool:
+        return hero_id > 0 and (cls.mask() >> hero_id) & 1 == 1
+
+    @classmethod
+    def cache_key(cls, draft_id: int) -> str:
+        return USED_HEROES_CACHE_KEY.format(draft_id=draft_id)
+
+    @classmethod
+    def used_mask(cls, draft_id: int) -> int:
+        """Return the draft's used-hero mask, building it on a miss."""
+        key = cls.cache_key(draft_id)
+        mask = cache.get(key)
+        if mask is None:
+            mask = cls.build_used_mask(draft_id)
+            cache.set(key, mask, timeout=USED_HEROES_CACHE_TIMEOUT)
+        return mask
+
+    @classmethod
+    def build_used_mask(cls, draft_id: int) -> int:
+        from app.models import HeroDraftRound
+
+        mask = 0
+        for hero_id in HeroDraftRound.objects.filter(
+            draft_id=draft_id, hero_id__isnull=False
+        ).values_list("hero_id", flat=True):
+            mask |= 1 << hero_id
+        return mask
+
+    @classmethod
+    def invalidate(cls, draft_id: Optional[int]) -> None:
+        """Drop the cached mask (draft created); the next read rebuilds it."""
+        if draft_id:
+            cache.delete(cls.cache_key(draft_id))
+
+    @classmethod
+    def invalidate_after_write(cls, draft_id: int) -> None:
+        """
+        Drop the cached mask now and again once the transaction commits.
+
+        Used whenever a round changes, never a read-modify-write of the
+        mask: picks take no row locks, so two picks committing back to back
+        could lose a bit, and a rolled-back pick must not leave its hero
+        marked used. Dropping now lets the writing transaction read its own
+        change; dropping after commit discards a mask another connection
+        rebuilt from the rounds before the commit.
+        """
+        cls.invalidate(draft_id)
+        transaction.on_commit(lambda: cls.invalidate(draft_id))
+
+    @classmethod
+    def is_available(cls, draft_id: int, hero_id: int) -> bool:
+        return cls.is_hero(hero_id) and (cls.used_mask(draft_id) >> hero_id) & 1 == 0
+
+    @classmethod
+    def available(cls, draft_id: int) -> List[int]:
+        """Hero ids not yet picked or banned in the draft, ascending."""
+        free = cls.mask() & ~cls.used_mask(draft_id)
+        return [hero_id for hero_id in cls.hero_ids() if (free >> hero_id) & 1]
+
+    @classmethod
+    def random_available(cls, draft_id: int, rng=random) -> Optional[int]:
+        """A random hero that is still available, or None if none are left."""
+        available = cls.available(draft_id)
+        return rng.choice(available) if available else None
@@ -0,0 +1,49 @@
+"""Versioned, cached hero draft state shared by REST, broadcasts and consumers."""
+
+from app.services.draft_snapshot import VersionedSnapshot
+
+
+class HeroDraftSnapshot(VersionedSnapshot):
+    """
+    ``HeroDraftSerializer`` state of a hero draft.
+
+    Signals bump the version whenever the draft, its teams, rounds, team
+    members or their profiles change. The same JSON is reused for the REST
+    response, the group broadcast and the initial state of new WebSocket
+    connections, and is built from a fixed number of queries.
+    """
+
+    key_prefix = "herodraft"
+
+    @staticmethod
+    def queryset():
+        """Hero drafts with everything ``HeroDraftSerializer`` reads."""
+        from django.db.models import Prefetch
+
+        from app.models import CustomUser, DraftTeam, HeroDraft, HeroDraftRound
+
+        return HeroDraft.objects.select_related("game").prefetch_related(
+            Prefetch(
+                "draft_teams",
+                queryset=DraftTeam.objects.select_related(
+                    "tournament_team__captain__positions"
+                ),
+            ),
+            Prefetch(
+                "draft_teams__tournament_team__members",
+                # The snapshot is the cache; don't layer cacheops under it
+                queryset=CustomUser.objects.select_related("positions").nocache(),
+            ),
+            Prefetch(
+                "rounds",
+                queryset=HeroDraftRound.objects.select_related(
+                    "draft_team__tournament_team"
+                ),
+            ),
+        )
+
+    @classmethod
+    def build(cls, draft_id: int) -> dict:
+        from app.serializers import HeroDraftSerializer
+
+        return HeroDraftSerializer(cls.queryset().get(pk=draft_id)).data
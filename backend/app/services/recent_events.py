@@ -0,0 +1,117 @@
+"""Capped Redis lists of the latest draft events, served on WebSocket connect."""
+
+import logging
+from typing import List, Optional
+
+import redis
+
+log = logging.getLogger(__name__)
+
+RECENT_EVENTS_LIMIT = 20
+# Also bounds how long an event pushed while a list was loading can be missing
+RECENT_EVENTS_TTL = 15 * 60
+DRAFT_EVENTS_KEY = "draft:{draft_id}:recent_events"
+TOURNAMENT_EVENTS_KEY = "tournament:{tournament_id}:recent_events"
+# Closes every loaded list so "loaded but empty" differs from "not loaded"
+END_MARKER = ""
+
+
+class RecentDraftEvents:
+    """
+    The last ``RECENT_EVENTS_LIMIT`` serialized ``DraftEvent``s, newest first.
+
+    Kept per draft (``DraftConsumer``) and per tournament
+    (``TournamentConsumer``), as JSON strings in Redis lists. A list is
+    loaded from the database on first read; new events are pushed only onto
+    lists that are already loaded (``LPUSHX``), so a push can never create a
+    partial list. Redis errors fall back to the database.
+    """
+
+    @staticmethod
+    def _redis():
+        from app.tasks.herodraft_tick import get_redis_client
+
+        return get_redis_client()
+
+    @classmethod
+    def _keys(cls, draft_id: Optional[int], tournament_id: Optional[int]) -> List[str]:
+        keys = []
+        if draft_id:
+            keys.append(DRAFT_EVENTS_KEY.format(draft_id=draft_id))
+        if tournament_id:
+            keys.append(TOURNAMENT_EVENTS_KEY.format(tournament_id=tournament_id))
+        return keys
+
+    @classmethod
+    def push(cls, draft_id: int, tournament_id: int, encoded: str) -> None:
+        """Add an encoded event to the draft's and tournament's loaded lists."""
+        try:
+            pipe = cls._redis().pipeline(transaction=False)
+            for key in cls._keys(draft_id, tournament_id):
+                pipe.lpushx(key, encoded)
+                # One spare slot so a full list keeps its end marker
+                pipe.ltrim(key, 0, RECENT_EVENTS_LIMIT)
+            pipe.execute()
+        except redis.RedisError as e:
+            log.warning(f"Failed to push recent event for draft {draft_id}: {e}")
+            cls.invalidate(draft_id, tournament_id)
+
+    @classmethod
+    def invalidate(cls, draft_id: Optional[int], tournament_id: Optional[int]) -> None:
+        keys = cls._keys(draft_id, tournament_id)
+        if not keys:
+            return
+        try:
+            cls._redis().delete(*keys)
+        except redis.RedisError as e:
+            log.warning(f"Failed to drop recent events for draft {draft_id}: {e}")
+
+    @classmethod
+    def for_draft(cls, draft_id: int) -> List[str]:
+        from app.models import DraftEvent
+
+        return cls._read(
+            DRAFT_EVENTS_KEY.format(draft_id=draft_id),
+            lambda: DraftEvent.objects.filter(draft_id=draft_id),
+        )
+
+    @classmethod
+    def for_tournament(cls, tournament_id: int) -> List[str]:
+        from app.models import DraftEvent
+
+        return cls._read(
+            TOURNAMENT_EVENTS_KEY.format(tournament_id=tournament_id),
+            lambda: DraftEvent.objects.filter(draft__tournament_id=tournament_id),
+        )
+
+    @classmethod
+    def _read(cls, key: str, events) -> List[str]:
+        try:
+            items = cls._redis().lrange(key, 0, RECENT_EVENTS_LIMIT)
+        except redis.RedisError as e:
+            log.warning(f"Failed to read recent events {key}: {e}")
+            return cls._load(events)
+        if not items:
+            items = cls._load(events)
+            try:
+                pipe = cls._redis().pipeline()
+                pipe.delete(key)
+                pipe.rpush(key, *items, END_MARKER)
+                pipe.expire(key, RECENT_EVENTS_TTL)
+                pipe.execute()
+            except redis.RedisError as e:
+                log.warning(f"Failed to store recent events {key}: {e}")
+            return items
+        return [item for item in items if item != END_MARKER][:RECENT_EVENTS_LIMIT]
+
+    @classmethod
+    def _load(cls, events) -> List[str]:
+        return cls.encode(events()[:RECENT_EVENTS_LIMIT])
+
+    @staticmethod
+    def encode(events) -> List[str]:
+        """``DraftEvent``s as JSON strings, in the form the lists hold."""
+        from app.serializers import DraftEventSerializer
+        from app.ws_frames import dumps
+
+        return [dumps(DraftEventSerializer(event).data).decode() for event in events]
@@ -0,0 +1,126 @@
+"""Cached per-user projection served on every page load."""
+
+import logging
+from typing import Iterable
+
+from django.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+SESSION_CACHE_KEY = "session:bootstrap:{user_id}"
+# Backstop only; events touching the user invalidate the projection
+SESSION_CACHE_TIMEOUT = 5 * 60
+
+ACTIVE_HERO_DRAFT_STATES = [
+    "waiting_for_captains",
+    "rolling",
+    "choosing",
+    "drafting",
+]
+
+
+class SessionBootstrap:
+    """
+    Profile, active drafts and current tournament team for the current user.
+
+    The projection is cached per user and dropped by signals whenever the
+    user, their team memberships, a team or tournament they belong to, or a
+    draft they captain changes. Full team history is served separately by
+    the paginated ``user_team_history`` endpoint.
+    """
+
+    @classmethod
+    def cache_key(cls, user_id: int) -> str:
+        return SESSION_CACHE_KEY.format(user_id=user_id)
+
+    @classmethod
+    def for_user(cls, user) -> dict:
+        """Return the cached projection for a user, building it on a miss."""
+        key = cls.cache_key(user.pk)
+        data = cache.get(key)
+        if data is None:
+            data = cls.build(user)
+            cache.set(key, data, timeout=SESSION_CACHE_TIMEOUT)
+        return data
+
+    @classmethod
+    def invalidate(cls, user_ids: Iterable[int]) -> None:
+        """Drop the cached projection for these users."""
+        keys = [cls.cache_key(pk) for pk in set(user_ids) if pk]
+        if keys:
+            cache.delete_many(keys)
+
+    @classmethod
+    def build(cls, user) -> dict:
+        from app.serializers import SessionUserSerializer, TeamHistorySerializer
+
+        data = dict(SessionUserSerializer(user).data)
+        data["active_drafts"] = cls.active_drafts(user)
+        team = cls.current_team(user)
+        data["current_team"] = TeamHistorySerializer(team).data if team else None
+        return data
+
+    @staticmethod
+    def active_drafts(user) -> list:
+        """Team drafts with a pending pick and hero drafts the user captains."""
+        from app.models import DraftRound, DraftTeam
+
+        active_drafts = []
+
+        # Team drafts: user is captain with pending pick in in_progress tournament
+        pending_team_round = (
+            DraftRound.objects.filter(
+                captain=user,
+                choice__isnull=True,
+                draft__tournament__state="in_progress",
+            )
+            .select_related("draft__tournament")
+            .order_by("pick_number")
+            .first()
+        )
+
+        if pending_team_round:
+            active_drafts.append(
+                {
+                    "type": "team_draft",
+                    "tournament_pk": pending_team_round.draft.tournament.pk,
+                    "draft_state": pending_team_round.draft.tournament.state,
+                }
+            )
+
+        # Hero drafts: user is captain of a DraftTeam in an active HeroDraft
+        hero_draft_teams = DraftTeam.objects.filter(
+            tournament_team__captain=user,
+            draft__state__in=ACTIVE_HERO_DRAFT_STATES,
+        ).select_related("draft__game__tournament")
+
+        for draft_team in hero_draft_teams:
+            hero_draft = draft_team.draft
+            active_drafts.append(
+                {
+                    "type": "hero_draft",
+                    "tournament_pk": hero_draft.game.tournament.pk,
+                    "game_pk": hero_draft.game.pk,
+                    "herodraft_pk": hero_draft.pk,
+                    "draft_state": hero_draft.state,
+                }
+            )
+
+        return active_drafts
+
+    @staticmethod
+    def current_team(user):
+        """The user's team in an in-progress tournament, else the next upcoming one."""
+        from app.models import Team
+
+        teams = list(
+            Team.objects.filter(
+                members=user, tournament__state__in=["in_progress", "future"]
+            )
+            .select_related("tournament")
+            .order_by("tournament__date_played", "pk")
+        )
+        for team in teams:
+            if team.tournament.state == "in_progress":
+                return team
+        return teams[0] if teams else None
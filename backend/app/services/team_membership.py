@@ -0,0 +1,160 @@
+"""Set-based team membership removal with captain succession."""
+
+import copy
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set
+
+from cacheops import invalidate_obj, no_invalidation
+from cacheops.invalidation import invalidate_dict
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+
+class TeamMembershipService:
+    """
+    Remove members from many teams at once.
+
+    Replaces per-team ``members.remove()`` loops (and the per-team signal
+    queries they trigger) with a fixed number of queries regardless of how
+    many teams or users are involved: one read of the affected membership
+    rows, one through-table delete, one ``bulk_update`` for captain/deputy
+    succession and one delete for teams left empty. Caches are invalidated
+    together once the writes are done.
+
+    Succession rules match the single-team signal: a removed deputy is
+    cleared, a removed captain is replaced by the deputy if they stay, and
+    otherwise by the highest MMR remaining member.
+    """
+
+    @staticmethod
+    def _through():
+        from app.models import Team
+
+        field = Team._meta.get_field("members")
+        return (
+            field.remote_field.through,
+            field.m2m_field_name(),
+            field.m2m_reverse_field_name(),
+        )
+
+    @classmethod
+    @transaction.atomic
+    def remove_members(cls, teams, user_pks: Optional[Iterable[int]] = None) -> Dict:
+        """
+        Remove users from a set of teams.
+
+        Args:
+            teams: Team queryset to remove the users from
+            user_pks: Users to remove, or None to remove every member
+
+        Returns:
+            Summary dict with updated and deleted team pks
+        """
+        through, team_field, user_field = cls._through()
+        user_pks = None if user_pks is None else set(user_pks)
+
+        rows = through.objects.filter(**{f"{team_field}__in": teams}).values_list(
+            f"{team_field}_id", f"{user_field}_id", f"{user_field}__mmr"
+        )
+        removed = defaultdict(set)
+        remaining = defaultdict(list)
+        for team_pk, user_pk, mmr in rows:
+            if user_pks is None or user_pk in user_pks:
+                removed[team_pk].add(user_pk)
+            else:
+                remaining[team_pk].append((user_pk, mmr))
+
+        if not removed:
+            return {"updated": [], "deleted": []}
+
+        with no_invalidation:
+            rows = through.objects.filter(**{f"{team_field}__in": list(removed)})
+            if user_pks is not None:
+                rows = rows.filter(**{f"{user_field}__in": user_pks})
+            rows.delete()
+
+        return cls._reconcile(removed, remaining)
+
+    @classmethod
+    @transaction.atomic
+    def handle_removed(cls, removed: Dict[int, Set[int]]) -> Dict:
+        """
+        Apply succession after members were already removed (e.g. by ``remove()``).
+
+        Args:
+            removed: Team pk -> set of removed user pks
+        """
+        through, team_field, user_field = cls._through()
+
+        remaining = defaultdict(list)
+        rows = through.objects.filter(
+            **{f"{team_field}__in": list(removed)}
+        ).values_list(f"{team_field}_id", f"{user_field}_id", f"{user_field}__mmr")
+        for team_pk, user_pk, mmr in rows:
+            remaining[team_pk].append((user_pk, mmr))
+
+        return cls._reconcile(removed, remaining, invalidate_rows=False)
+
+    @classmethod
+    def _reconcile(
+        cls,
+        removed: Dict[int, Set[int]],
+        remaining: Dict[int, list],
+        invalidate_rows: bool = True,
+    ) -> Dict:
+        from app.models import Team
+
+        through, team_field, user_field = cls._through()
+
+        empty = [pk for pk in removed if not remaining.get(pk)]
+        originals = []
+        updated = []
+        for team in Team.objects.filter(pk__in=removed).exclude(pk__in=empty):
+            gone = removed[team.pk]
+            captain_removed = team.captain_id in gone
+            deputy_removed = team.deputy_captain_id in gone
+            if not captain_removed and not deputy_removed:
+                continue
+
+            originals.append(copy.copy(team))
+            if captain_removed:
+                if team.deputy_captain_id and not deputy_removed:
+                    team.captain_id = team.deputy_captain_id
+                else:
+                    # Highest MMR member; unknown MMR sorts last, ties by pk
+                    team.captain_id = min(
+                        remaining[team.pk],
+                        key=lambda member: (
+                            member[1] is None,
+                            -(member[1] or 0),
+                            member[0],
+                        ),
+                    )[0]
+            team.deputy_captain_id = None
+            updated.append(team)
+
+        if updated:
+            with no_invalidation:
+                Team.objects.bulk_update(updated, ["captain", "deputy_captain"])
+
+        # Deletes cascade to games and drafts, so they keep cacheops' own invalidation
+        if empty:
+            Team.objects.filter(pk__in=empty).delete()
+
+        if invalidate_rows:
+            for team_pk, user_pks in removed.items():
+                for user_pk in user_pks:
+                    invalidate_dict(
+                        through,
+                        {f"{team_field}_id": team_pk, f"{user_field}_id": user_pk},
+                    )
+        for team in originals + updated:
+            invalidate_obj(team)
+
+        log.debug(
+            f"Removed members from {len(removed)} teams: "
+            f"{len(updated)} captain changes, {len(empty)} teams deleted"
+        )
+        return {"updated": [team.pk for team in updated], "deleted": empty}
@@ -0,0 +1,384 @@
+"""Streaming, bulk import of production tournament JSON."""
+
+import codecs
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+import requests
+from django.core.cache import cache
+from django.db import transaction
+
+log = logging.getLogger(__name__)
+
+# Tournaments created per transaction; each commit frees the SQLite writer
+IMPORT_BATCH_SIZE = 20
+# prod tournament pk -> {"id": local pk, "hash": content hash} of the last sync
+IMPORT_STATE_KEY = "tournament_import:state:{source}"
+
+
+def iter_json_array(chunks: Iterable[bytes]) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array as they arrive.
+
+    ``chunks`` is e.g. ``response.iter_content()`` of a streamed request.
+    Only the element being parsed is held in memory, never the whole body.
+    Elements must be objects or arrays (a number could end mid-chunk).
+    """
+    decoder = json.JSONDecoder()
+    # A multi-byte character may be split across chunks
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    started = False
+    for chunk in chunks:
+        buffer += utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+        while True:
+            buffer = buffer.lstrip()
+            if not started:
+                if not buffer:
+                    break
+                if buffer[0] != "[":
+                    raise ValueError("Expected a JSON array")
+                buffer = buffer[1:]
+                started = True
+                continue
+            if buffer[:1] == ",":
+                buffer = buffer[1:]
+                continue
+            if buffer[:1] == "]":
+                return
+            try:
+                element, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                break  # Element continues in the next chunk
+            yield element
+            buffer = buffer[end:]
+    raise ValueError("Unterminated JSON array")
+
+
+def stream_json_array(url: str, timeout: int = 60) -> Iterator:
+    """GET ``url`` and yield the elements of its JSON array body as they arrive."""
+    with requests.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        yield from iter_json_array(response.iter_content(chunk_size=64 * 1024))
+
+
+def content_hash(data: dict) -> str:
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+class TournamentImporter:
+    """
+    Create tournaments from production API data with bulk inserts.
+
+    Users are resolved through a map built from one query (Discord ID,
+    then Steam ID, then username), never looked up per row. A batch of
+    tournaments is written in dependency order, one ``bulk_create`` per
+    table: tournaments, tournament users, teams, team member rows,
+    winning teams, drafts, draft rounds, games.
+
+    Bulk inserts skip ``save()`` and signals, so ``import_batch`` drops the
+    cacheops caches of the imported models afterwards.
+    """
+
+    def __init__(
+        self,
+        resolve_user: Optional[Callable[[dict], Optional[int]]] = None,
+        name_prefix: str = "",
+        include_draft: bool = True,
+        default_state: str = "future",
+    ):
+        self.user_map = {} if resolve_user else self.build_user_map()
+        self.resolve_user = resolve_user or self._resolve_from_map
+        self.name_prefix = name_prefix
+        self.include_draft = include_draft
+        self.default_state = default_state
+
+    @staticmethod
+    def build_user_map() -> Dict[str, int]:
+        """Local user pks keyed by ``discord:``, ``steam:`` and ``username:``."""
+        from app.models import CustomUser
+
+        user_map = {}
+        for pk, discord_id, steamid, username in CustomUser.objects.values_list(
+            "pk", "discordId", "steamid", "username"
+        ):
+            if discord_id:
+                user_map[f"discord:{discord_id}"] = pk
+            if steamid:
+                user_map[f"steam:{steamid}"] = pk
+            if username:
+                user_map[f"username:{username}"] = pk
+        return user_map
+
+    def _resolve_from_map(self, user_data: Optional[dict]) -> Optional[int]:
+        if not user_data:
+            return None
+        for prefix, field in (
+            ("discord", "discordId"),
+            ("steam", "steamid"),
+            ("username", "username"),
+        ):
+            value = user_data.get(field)
+            if value and f"{prefix}:{value}" in self.user_map:
+                return self.user_map[f"{prefix}:{value}"]
+        return None
+
+    def _user_ids(self, users_data) -> List[int]:
+        user_ids = (self.resolve_user(user_data) for user_data in users_data or [])
+        # dict keeps order and drops duplicates
+        return list(dict.fromkeys(pk for pk in user_ids if pk))
+
+    def import_batch(self, tournaments_data: List[dict]) -> List:
+        """Create the tournaments in one transaction and return them."""
+        from cacheops import invalidate_model
+
+        from app.models import Draft, DraftRound, Game, Team, Tournament
+
+        with transaction.atomic():
+            tournaments = Tournament.objects.bulk_create(
+                [self._tournament(data) for data in tournaments_data]
+            )
+
+            Tournament.users.through.objects.bulk_create(
+                [
+                    Tournament.users.through(tournament_id=t.pk, customuser_id=pk)
+                    for t, data in zip(tournaments, tournaments_data)
+                    for pk in self._user_ids(data.get("users"))
+                ],
+                ignore_conflicts=True,
+            )
+
+            team_rows = [
+                (t, team_data)
+                for t, data in zip(tournaments, tournaments_data)
+                for team_data in data.get("teams", [])
+            ]
+            teams = Team.objects.bulk_create(
+                [
+                    Team(
+                        tournament_id=t.pk,
+                        name=team_data.get("name", "Unnamed Team"),
+                        captain_id=self.resolve_user(team_data.get("captain")),
+                        draft_order=team_data.get("draft_order", 0),
+                    )
+                    for t, team_data in team_rows
+                ]
+            )
+            # Games reference teams by name, the winning team by pk or name
+            team_maps = {t.pk: {} for t in tournaments}
+            for team, (t, team_data) in zip(teams, team_rows):
+                team_maps[t.pk][team_data.get("name")] = team
+                team_maps[t.pk][team_data.get("pk")] = team
+            for field in ("members", "dropin_members", "left_members"):
+                through = getattr(Team, field).through
+                through.objects.bulk_create(
+                    [
+                        through(team_id=team.pk, customuser_id=pk)
+                        for team, (_, team_data) in zip(teams, team_rows)
+                        for pk in self._user_ids(team_data.get(field))
+                    ],
+                    ignore_conflicts=True,
+                )
+
+            winners = []
+            for t, data in zip(tournaments, tournaments_data):
+                winner = self._team(team_maps[t.pk], data.get("winning_team"))
+                if winner:
+                    t.winning_team = winner
+                    winners.append(t)
+            Tournament.objects.bulk_update(winners, ["winning_team"])
+
+            drafts_data = [
+                (t, data["draft"])
+                for t, data in zip(tournaments, tournaments_data)
+                if self.include_draft and data.get("draft")
+            ]
+            drafts = Draft.objects.bulk_create(
+                [
+                    Draft(
+                        tournament_id=t.pk,
+                        draft_style=draft_data.get("draft_style", "snake"),
+                    )
+                    for t, draft_data in drafts_data
+                ]
+            )
+            DraftRound.objects.bulk_create(
+                [
+                    DraftRound(
+                        draft_id=draft.pk,
+                        captain_id=captain_id,
+                        choice_id=self.resolve_user(round_data.get("choice")),
+                        pick_number=round_data.get("pick_number", 1),
+                        pick_phase=round_data.get("pick_phase", 1),
+                    )
+                    for draft, (_, draft_data) in zip(drafts, drafts_data)
+                    for round_data in draft_data.get("draft_rounds", [])
+                    if (captain_id := self.resolve_user(round_data.get("captain")))
+                ]
+            )
+
+            Game.objects.bulk_create(
+                [
+                    Game(
+                        tournament_id=t.pk,
+                        round=game_data.get("round", 1),
+                        gameid=game_data.get("gameid"),
+                        radiant_team=self._team(
+                            team_maps[t.pk], game_data.get("radiant_team")
+                        ),
+                        dire_team=self._team(
+                            team_maps[t.pk], game_data.get("dire_team")
+                        ),
+                        winning_team=self._team(
+                            team_maps[t.pk], game_data.get("winning_team")
+                        ),
+                    )
+                    for t, data in zip(tournaments, tournaments_data)
+                    for game_data in data.get("games", [])
+                ]
+            )
+
+        for model in (Tournament, Team, Draft, DraftRound, Game):
+            invalidate_model(model)
+        return tournaments
+
+    def _import_one(self, data: dict, replaced_id: Optional[int] = None):
+        try:
+            with transaction.atomic():
+                self.delete([replaced_id] if replaced_id else [])
+                return self.import_batch([data])[0]
+        except Exception as e:
+            log.warning(f"Failed to import tournament {data.get('name')}: {e}")
+            return None
+
+    def _tournament(self, data: dict):
+        from app.models import Tournament
+
+        date_str = data.get("date_played")
+        if date_str:
+            date_played = datetime.strptime(date_str[:10], "%Y-%m-%d").date()
+        else:
+            date_played = datetime.now().date()
+        tournament = Tournament(
+            name=f"{self.name_prefix}{data.get('name', 'Unnamed Tournament')}",
+            date_played=date_played,
+            state=data.get("state", self.default_state),
+            tournament_type=data.get("tournament_type", "double_elimination"),
+        )
+        if data.get("timezone"):
+            tournament.timezone = data["timezone"]
+        return tournament
+
+    @staticmethod
+    def _team(team_map: dict, team_ref):
+        """A team referenced by pk or by a nested ``{"name": ...}`` object."""
+        if isinstance(team_ref, dict):
+            return team_map.get(team_ref.get("name"))
+        if team_ref is not None:
+            return team_map.get(team_ref)
+        return None
+
+    def sync(
+        self,
+        tournaments_data: Iterable[dict],
+        incremental: bool = False,
+        source: str = "prod",
+        batch_size: int = IMPORT_BATCH_SIZE,
+    ) -> Dict[str, int]:
+        """
+        Make the local tournaments match ``tournaments_data`` (streamed).
+
+        A full sync replaces every local tournament. An incremental sync
+        uses the state recorded by the previous sync of ``source``: it
+        keeps tournaments whose content is unchanged, replaces changed
+        ones, creates new ones and deletes those gone from the source. With
+        no recorded state it falls back to a full sync. Returns counts of
+        ``created``, ``updated``, ``unchanged``, ``deleted`` and ``failed``
+        (skipped because they could not be imported; ``created`` and
+        ``updated`` include them).
+        """
+        from app.models import Tournament
+
+        state_key = IMPORT_STATE_KEY.format(source=source)
+        previous = cache.get(state_key) if incremental else None
+        counts = dict(created=0, updated=0, unchanged=0, deleted=0, failed=0)
+        if previous is None:
+            counts["deleted"] = self.delete(
+                Tournament.objects.values_list("pk", flat=True)
+            )
+            previous = {}
+        local_ids = set(Tournament.objects.values_list("pk", flat=True))
+
+        state = {}
+        # (prod pk, data, content hash, previous import or None)
+        batch = []
+
+        def flush():
+            # A replaced tournament is deleted in the transaction that
+            # re-imports it, so a failed import leaves the old copy in place
+            try:
+                with transaction.atomic():
+                    self.delete(known["id"] for *_, known in batch if known)
+                    created = self.import_batch([data for _, data, *_ in batch])
+            except Exception as e:
+                # Retry one by one so a bad tournament only skips itself
+                log.warning(f"Batch import failed ({e}), importing one by one")
+                created = [
+                    self._import_one(data, known and known["id"])
+                    for _, data, _, known in batch
+                ]
+            for (source_pk, _, digest, known), tournament in zip(batch, created):
+                if tournament is not None:
+                    state[source_pk] = {"id": tournament.pk, "hash": digest}
+                    continue
+                counts["failed"] += 1
+                if known:
+                    # Still the old copy; the next sync retries the update
+                    state[source_pk] = known
+            batch.clear()
+
+        for data in tournaments_data:
+            source_pk = data.get("pk")
+            digest = content_hash(data)
+            known = previous.pop(source_pk, None)
+            if known and known["id"] in local_ids:
+                if known["hash"] == digest:
+                    state[source_pk] = known
+                    counts["unchanged"] += 1
+                    continue
+                counts["updated"] += 1
+            else:
+                known = None
+                counts["created"] += 1
+            batch.append((source_pk, data, digest, known))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+        # Gone from the source since the last sync
+        counts["deleted"] += self.delete(
+            known["id"] for known in previous.values() if known["id"] in local_ids
+        )
+        cache.set(state_key, state, timeout=None)
+        return counts
+
+    @staticmethod
+    def delete(tournament_ids) -> int:
+        """Delete tournaments with their teams, drafts and games."""
+        from app.models import Draft, DraftRound, Game, Team, Tournament
+
+        tournament_ids = list(tournament_ids)
+        if not tournament_ids:
+            return 0
+        with transaction.atomic():
+            # Children first, as the previous row-by-row sync did
+            DraftRound.objects.filter(draft__tournament__in=tournament_ids).delete()
+            Draft.objects.filter(tournament__in=tournament_ids).delete()
+            Game.objects.filter(tournament__in=tournament_ids).delete()
+            Team.objects.filter(tournament__in=tournament_ids).delete()
+            _, deleted = Tournament.objects.filter(pk__in=tournament_ids).delete()
+        return deleted.get(Tournament._meta.label, 0)
@@ -1,80 +1,428 @@
 """
-Django signals for Team member management.
+Django signals for Team member management and bracket caches.
 
 Handles:
 - Captain/deputy succession when members are removed
 - Team deletion when last member is removed
 - Cascade removal from tournament.users to team.members
+- Bracket graph invalidation when games are saved or deleted
+- Permission role map invalidation when org/league roles change
+- Session bootstrap invalidation for users touched by team/draft changes
+- Hero draft event log compaction once a draft is over
+- League hero draft statistics invalidation
 """
 
-from django.db.models.signals import m2m_changed
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+from app.permission_roles import invalidate_role_maps
+from app.services.bracket_graph import BracketGraph
+from app.services.draft_analytics import HeroDraftStats
+from app.services.draft_snapshot import DraftSnapshot
+from app.services.event_log import HeroDraftEventLog
+from app.services.hero_pool import HeroPool
+from app.services.herodraft_snapshot import HeroDraftSnapshot
+from app.services.recent_events import RecentDraftEvents
+from app.services.session_bootstrap import SessionBootstrap
+from app.services.team_membership import TeamMembershipService
+
 
 @receiver(m2m_changed, sender="app.Team_members")
-def handle_team_member_removal(sender, instance, action, pk_set, **kwargs):
+def handle_team_member_removal(sender, instance, action, pk_set, reverse, **kwargs):
     """Handle captain/deputy succession when members are removed."""
     # Only handle post_remove - skip post_clear to allow rebuild_teams() to work
     # (rebuild_teams calls clear() then add(), and we don't want deletion between)
-    if action != "post_remove":
+    if action != "post_remove" or not pk_set:
         return
 
-    team = instance
-    removed_pks = pk_set
+    # user.teams_as_member.remove(*teams) reports the teams in pk_set
+    if reverse:
+        removed = {team_pk: {instance.pk} for team_pk in pk_set}
+    else:
+        removed = {instance.pk: set(pk_set)}
+
+    TeamMembershipService.handle_removed(removed)
 
-    # Guard: Team is now empty → delete it
-    if team.members.count() == 0:
-        team.delete()
-        return
 
-    # Guard: Captain wasn't removed
-    captain_removed = team.captain and team.captain.pk in removed_pks
-    deputy_removed = team.deputy_captain and team.deputy_captain.pk in removed_pks
+@receiver(m2m_changed, sender="app.Tournament_users")
+def handle_tournament_user_removal(sender, instance, action, pk_set, reverse, **kwargs):
+    """Cascade removal from tournament.users to team.members."""
+    from app.models import Team
 
-    if not captain_removed and not deputy_removed:
+    # Handle clear all users: every team loses its members and is deleted
+    if action == "post_clear" and not reverse:
+        TeamMembershipService.remove_members(instance.teams.all())
         return
 
-    # Handle deputy removal (simple case)
-    if not captain_removed and deputy_removed:
-        team.deputy_captain = None
-        team.save(update_fields=["deputy_captain"])
+    if action != "post_remove" or not pk_set:
         return
 
-    # Captain was removed - need succession
-    # Try deputy first if they weren't also removed
-    if team.deputy_captain and not deputy_removed:
-        team.captain = team.deputy_captain
-        team.deputy_captain = None
-        team.save(update_fields=["captain", "deputy_captain"])
+    # Remove users from all teams of the affected tournaments in one pass
+    if reverse:
+        TeamMembershipService.remove_members(
+            Team.objects.filter(tournament_id__in=pk_set), [instance.pk]
+        )
+    else:
+        TeamMembershipService.remove_members(instance.teams.all(), pk_set)
+
+
+@receiver(post_save, sender="app.Game")
+@receiver(post_delete, sender="app.Game")
+def invalidate_bracket_graph(sender, instance, **kwargs):
+    """Drop the cached bracket graph when one of its games changes."""
+    BracketGraph.invalidate(instance.tournament_id)
+
+
+@receiver(m2m_changed, sender="app.Organization_admins")
+@receiver(m2m_changed, sender="app.Organization_staff")
+@receiver(m2m_changed, sender="app.League_admins")
+@receiver(m2m_changed, sender="app.League_staff")
+@receiver(m2m_changed, sender="app.League_organizations")
+def invalidate_roles_on_membership_change(sender, action, **kwargs):
+    """Drop cached role maps when org/league admins, staff or links change."""
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_role_maps()
+
+
+@receiver(post_save, sender="app.OrgLog")
+@receiver(post_save, sender="app.LeagueLog")
+@receiver(post_save, sender="app.Organization")
+@receiver(post_delete, sender="app.Organization")
+@receiver(post_delete, sender="app.League")
+def invalidate_roles_on_change(sender, **kwargs):
+    """Drop cached role maps on logged role changes and ownership updates."""
+    invalidate_role_maps()
+
+
+@receiver(post_save, sender="app.CustomUser")
+def invalidate_roles_on_user_created(sender, instance, created, **kwargs):
+    """A new user may reuse the pk of a deleted one (e.g. after a DB reset)."""
+    if created:
+        invalidate_role_maps()
+
+
+def _team_user_ids(team_filter):
+    """Members, captains and deputies of the matching teams."""
+    from app.models import Team
+
+    teams = Team.objects.filter(team_filter).nocache()
+    user_ids = set(teams.values_list("members", flat=True))
+    for captain_id, deputy_id in teams.values_list("captain_id", "deputy_captain_id"):
+        user_ids.update((captain_id, deputy_id))
+    return user_ids
+
+
+@receiver(post_save, sender="app.CustomUser")
+def invalidate_session_on_user_save(sender, instance, **kwargs):
+    SessionBootstrap.invalidate([instance.pk])
+
+
+@receiver(post_save, sender="app.PositionsModel")
+def invalidate_session_on_positions_save(sender, instance, created, **kwargs):
+    from app.models import CustomUser
+
+    if not created:
+        SessionBootstrap.invalidate(
+            CustomUser.objects.filter(positions=instance)
+            .nocache()
+            .values_list("pk", flat=True)
+        )
+
+
+@receiver(m2m_changed, sender="app.Team_members")
+def invalidate_session_on_membership_change(
+    sender, instance, action, pk_set, reverse, **kwargs
+):
+    """Drop the projection of every user whose team membership changed."""
+    if action == "pre_clear":
+        if reverse:
+            SessionBootstrap.invalidate([instance.pk])
+        else:
+            SessionBootstrap.invalidate(
+                instance.members.nocache().values_list("pk", flat=True)
+            )
+    elif action in ("post_add", "post_remove") and pk_set:
+        SessionBootstrap.invalidate([instance.pk] if reverse else pk_set)
+
+
+@receiver(post_save, sender="app.Team")
+@receiver(pre_delete, sender="app.Team")
+def invalidate_session_on_team_change(sender, instance, **kwargs):
+    from django.db.models import Q
+
+    user_ids = _team_user_ids(Q(pk=instance.pk))
+    user_ids.update((instance.captain_id, instance.deputy_captain_id))
+    SessionBootstrap.invalidate(user_ids)
+
+
+@receiver(post_save, sender="app.Tournament")
+def invalidate_session_on_tournament_save(sender, instance, created, **kwargs):
+    """State and date changes move the user's current team."""
+    from django.db.models import Q
+
+    if not created:
+        SessionBootstrap.invalidate(_team_user_ids(Q(tournament=instance)))
+
+
+@receiver(post_save, sender="app.DraftRound")
+def invalidate_session_on_draft_round_save(sender, instance, **kwargs):
+    SessionBootstrap.invalidate([instance.captain_id])
+
+
+@receiver(post_save, sender="app.HeroDraft")
+def invalidate_session_on_hero_draft_save(sender, instance, **kwargs):
+    """Hero draft state decides whether it is listed in the captains' drafts."""
+    from app.models import DraftTeam
+
+    SessionBootstrap.invalidate(
+        DraftTeam.objects.filter(draft=instance)
+        .nocache()
+        .values_list("tournament_team__captain_id", flat=True)
+    )
+
+
+@receiver(post_save, sender="app.HeroDraft")
+def reset_hero_pool_on_hero_draft_created(sender, instance, created, **kwargs):
+    # SQLite reuses ids, so a new draft must not inherit a stale mask
+    if created:
+        HeroPool.invalidate(instance.pk)
+
+
+@receiver(post_save, sender="app.HeroDraft")
+def compact_events_on_hero_draft_finished(sender, instance, **kwargs):
+    """Drop connection churn from the event log once the draft is over."""
+    from app.models import HeroDraftState
+
+    if instance.state in (HeroDraftState.COMPLETED, HeroDraftState.ABANDONED):
+        draft_id = instance.pk
+        transaction.on_commit(lambda: HeroDraftEventLog.compact(draft_id))
+
+
+@receiver(post_save, sender="app.HeroDraft")
+def invalidate_league_stats_on_hero_draft_completed(sender, instance, **kwargs):
+    from app.models import Game, HeroDraftState
+
+    if instance.state == HeroDraftState.COMPLETED:
+        HeroDraftStats.invalidate_on_commit(
+            *Game.objects.filter(pk=instance.game_id)
+            .values_list("league_id", "tournament__league_id")
+            .first()
+            or ()
+        )
+
+
+@receiver(post_save, sender="app.Game")
+@receiver(post_delete, sender="app.Game")
+def invalidate_league_stats_on_game_change(sender, instance, **kwargs):
+    """Results feed the win rates of the league's hero draft statistics."""
+    from app.models import Tournament
+
+    tournament_league_id = (
+        Tournament.objects.filter(pk=instance.tournament_id)
+        .values_list("league_id", flat=True)
+        .first()
+        if instance.tournament_id
+        else None
+    )
+    HeroDraftStats.invalidate_on_commit(instance.league_id, tournament_league_id)
+
+
+@receiver(post_save, sender="app.HeroDraftRound")
+@receiver(post_delete, sender="app.HeroDraftRound")
+def reset_hero_pool_on_round_change(sender, instance, **kwargs):
+    HeroPool.invalidate_after_write(instance.draft_id)
+
+
+def _hero_draft_ids(draft_filter):
+    from app.models import HeroDraft
+
+    return HeroDraft.objects.filter(draft_filter).values_list("pk", flat=True)
+
+
+@receiver(post_save, sender="app.HeroDraft")
+def bump_snapshot_on_hero_draft_save(sender, instance, **kwargs):
+    HeroDraftSnapshot.bump(instance.pk)
+
+
+@receiver(post_save, sender="app.DraftTeam")
+@receiver(post_delete, sender="app.DraftTeam")
+@receiver(post_save, sender="app.HeroDraftRound")
+@receiver(post_delete, sender="app.HeroDraftRound")
+def bump_snapshot_on_draft_part_change(sender, instance, **kwargs):
+    HeroDraftSnapshot.bump(instance.draft_id)
+
+
+@receiver(post_save, sender="app.Team")
+def bump_snapshot_on_team_save(sender, instance, created, **kwargs):
+    """Team name and captain are part of the hero draft state."""
+    from django.db.models import Q
+
+    if not created:
+        for draft_id in _hero_draft_ids(Q(draft_teams__tournament_team=instance)):
+            HeroDraftSnapshot.bump(draft_id)
+
+
+@receiver(m2m_changed, sender="app.Team_members")
+def bump_snapshot_on_membership_change(
+    sender, instance, action, pk_set, reverse, **kwargs
+):
+    from django.db.models import Q
+
+    if action not in ("post_add", "post_remove", "post_clear"):
         return
+    if reverse:
+        draft_filter = Q(draft_teams__tournament_team__members=instance)
+        if pk_set:
+            draft_filter |= Q(draft_teams__tournament_team__in=pk_set)
+    else:
+        draft_filter = Q(draft_teams__tournament_team=instance)
+    for draft_id in _hero_draft_ids(draft_filter).distinct():
+        HeroDraftSnapshot.bump(draft_id)
+
+
+@receiver(post_save, sender="app.CustomUser")
+def bump_snapshot_on_user_save(sender, instance, created, **kwargs):
+    """Captains and members are serialized with their profile."""
+    from django.db.models import Q
+
+    if not created:
+        for draft_id in _hero_draft_ids(
+            Q(draft_teams__tournament_team__members=instance)
+            | Q(draft_teams__tournament_team__captain=instance)
+        ).distinct():
+            HeroDraftSnapshot.bump(draft_id)
+
+
+@receiver(post_save, sender="app.PositionsModel")
+def bump_snapshot_on_positions_save(sender, instance, created, **kwargs):
+    from django.db.models import Q
+
+    if not created:
+        for draft_id in _hero_draft_ids(
+            Q(draft_teams__tournament_team__members__positions=instance)
+            | Q(draft_teams__tournament_team__captain__positions=instance)
+        ).distinct():
+            HeroDraftSnapshot.bump(draft_id)
+
+
+def _bump_team_drafts(tournament_filter):
+    """Bump the team draft snapshot of every matching tournament."""
+    from app.models import Draft
+
+    for draft_id in (
+        Draft.objects.filter(tournament_filter)
+        .nocache()
+        .values_list("pk", flat=True)
+        .distinct()
+    ):
+        DraftSnapshot.bump(draft_id)
+
 
-    # Fallback: promote highest MMR member
-    highest_mmr_member = team.members.order_by("-mmr").first()
-    team.captain = highest_mmr_member
-    team.deputy_captain = None
-    team.save(update_fields=["captain", "deputy_captain"])
+@receiver(post_save, sender="app.Draft")
+def bump_snapshot_on_draft_save(sender, instance, created, **kwargs):
+    DraftSnapshot.bump(instance.pk)
+    if created:
+        # SQLite reuses ids, so a new draft must not inherit stale events
+        RecentDraftEvents.invalidate(instance.pk, instance.tournament_id)
 
 
+@receiver(post_save, sender="app.DraftRound")
+@receiver(post_delete, sender="app.DraftRound")
+def bump_snapshot_on_draft_round_change(sender, instance, **kwargs):
+    DraftSnapshot.bump(instance.draft_id)
+
+
+@receiver(post_save, sender="app.Team")
+@receiver(post_delete, sender="app.Team")
+@receiver(post_save, sender="app.Tournament")
+def bump_snapshot_on_tournament_change(sender, instance, **kwargs):
+    """Teams and tournament users are part of the team draft state."""
+    from django.db.models import Q
+
+    tournament_id = getattr(instance, "tournament_id", instance.pk)
+    _bump_team_drafts(Q(tournament_id=tournament_id))
+
+
+@receiver(m2m_changed, sender="app.Team_members")
+@receiver(m2m_changed, sender="app.Team_dropin_members")
+@receiver(m2m_changed, sender="app.Team_left_members")
 @receiver(m2m_changed, sender="app.Tournament_users")
-def handle_tournament_user_removal(sender, instance, action, pk_set, **kwargs):
-    """Cascade removal from tournament.users to team.members."""
-    # Handle clear all users
-    if action == "post_clear":
-        # Clear all teams' members - this triggers team deletion via team signal
-        for team in instance.teams.all():
-            team.members.clear()
-        return
+def bump_snapshot_on_roster_change(sender, instance, action, pk_set, reverse, **kwargs):
+    from django.db.models import Q
+
+    from app.models import Tournament
 
-    if action != "post_remove":
+    if action not in ("post_add", "post_remove", "post_clear"):
         return
+    if not reverse:
+        tournament_id = (
+            instance.pk if isinstance(instance, Tournament) else instance.tournament_id
+        )
+        _bump_team_drafts(Q(tournament_id=tournament_id))
+    elif pk_set:
+        if sender is Tournament.users.through:
+            _bump_team_drafts(Q(tournament_id__in=pk_set))
+        else:
+            _bump_team_drafts(Q(tournament__teams__in=pk_set))
+
+
+@receiver(post_save, sender="app.CustomUser")
+def bump_team_draft_snapshot_on_user_save(sender, instance, created, **kwargs):
+    """Tournament users are serialized with their profile."""
+    from django.db.models import Q
+
+    if not created:
+        _bump_team_drafts(Q(tournament__users=instance))
+
+
+@receiver(post_save, sender="app.PositionsModel")
+def bump_team_draft_snapshot_on_positions_save(sender, instance, created, **kwargs):
+    from django.db.models import Q
+
+    if not created:
+        _bump_team_drafts(Q(tournament__users__positions=instance))
+
+
+@receiver(post_save, sender="app.DraftEvent")
+def push_recent_draft_event(sender, instance, created, **kwargs):
+    from app.serializers import DraftEventSerializer
+    from app.ws_frames import dumps
+
+    if created:
+        draft_id, tournament_id = instance.draft_id, instance.draft.tournament_id
+        encoded = dumps(DraftEventSerializer(instance).data).decode()
+        # After commit, so a rolled-back event is never served on connect
+        transaction.on_commit(
+            lambda: RecentDraftEvents.push(draft_id, tournament_id, encoded)
+        )
+
+
+@receiver(post_delete, sender="app.DraftEvent")
+def drop_recent_draft_events(sender, instance, **kwargs):
+    from app.models import Draft
+
+    tournament_id = (
+        Draft.objects.filter(pk=instance.draft_id)
+        .values_list("tournament_id", flat=True)
+        .first()
+    )
+    RecentDraftEvents.invalidate(instance.draft_id, tournament_id)
+
+
+@receiver(post_save, sender="app.Tournament")
+def drop_recent_events_on_tournament_created(sender, instance, created, **kwargs):
+    if created:
+        RecentDraftEvents.invalidate(None, instance.pk)
+
 
-    tournament = instance
-    removed_pks = pk_set
+@receiver(post_save, sender="app.DraftTeam")
+def invalidate_session_on_draft_team_created(sender, instance, created, **kwargs):
+    from app.models import Team
 
-    # Remove users from all teams in this tournament
-    for team in tournament.teams.all():
-        members_to_remove = team.members.filter(pk__in=removed_pks)
-        if not members_to_remove.exists():
-            continue
-        # This will trigger handle_team_member_removal signal
-        team.members.remove(*members_to_remove)
+    if created:
+        SessionBootstrap.invalidate(
+            Team.objects.filter(pk=instance.tournament_team_id)
+            .nocache()
+            .values_list("captain_id", flat=True)
+        )
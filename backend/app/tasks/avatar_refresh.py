@@ -16,15 +16,16 @@ def _is_test_environment():
 
 
 @shared_task
-def refresh_discord_avatars(batch_size: int = 100):
+def refresh_discord_avatars(batch_size: int = None):
     """
     Refresh Discord avatars for users.
 
-    Checks avatar URLs and updates them if they've changed or become invalid.
-    Runs periodically via Celery Beat.
+    Checks the least recently verified users' avatar URLs and updates them if
+    they've changed or become invalid. Runs periodically via Celery Beat.
 
     Args:
-        batch_size: Number of users to process per run
+        batch_size: Number of users to process per run (default: sized so
+            every user is checked within a day)
 
     Returns:
         dict: Summary of results
@@ -93,6 +94,10 @@ def refresh_all_discord_data():
         log.info("Skipping full Discord data refresh in test environment")
         return {"checked": 0, "updated": 0, "failed": 0, "skipped": True}
 
+    from django.utils import timezone
+
+    from app.utils.avatar_utils import refresh_avatar_batch, stale_avatar_users
+
     total_checked = 0
     total_updated = 0
     total_failed = 0
@@ -104,31 +109,34 @@ def refresh_all_discord_data():
     total_users = User.objects.filter(discordId__isnull=False).count()
     log.info(f"Found {total_users} users with Discord IDs")
 
-    offset = 0
+    # Users checked during this run move past the cursor; users that fail
+    # keep their old timestamp and are left for the next run
+    started = timezone.now()
+    failed_pks = set()
     while True:
-        users = User.objects.filter(discordId__isnull=False)[
-            offset : offset + batch_size
-        ]
-
+        users = stale_avatar_users(
+            batch_size, checked_before=started, exclude_pks=failed_pks
+        )
         if not users:
             break
 
-        for user in users:
-            try:
-                total_checked += 1
-
-                # check_and_update_avatar() checks and updates the avatar
-                updated = user.check_and_update_avatar()
-
-                if updated:
-                    total_updated += 1
-
-            except Exception as e:
-                total_failed += 1
-                log.error(f"Error refreshing Discord data for user {user.id}: {e}")
-
-        offset += batch_size
-        log.debug(f"Processed {offset}/{total_users} users")
+        try:
+            results = refresh_avatar_batch(users)
+        except Exception as e:
+            log.error(f"Error refreshing Discord data batch: {e}")
+            results = {"checked": 0, "updated": 0, "failed": len(users)}
+            failed_pks.update(user.pk for user in users)
+        else:
+            failed_pks.update(
+                user.pk
+                for user in users
+                if user.avatar_checked_at is None or user.avatar_checked_at < started
+            )
+
+        total_checked += results["checked"]
+        total_updated += results["updated"]
+        total_failed += results["failed"]
+        log.debug(f"Processed {total_checked + total_failed}/{total_users} users")
 
     log.info(
         f"Full Discord refresh complete: checked={total_checked}, "
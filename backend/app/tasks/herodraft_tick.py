@@ -11,6 +11,7 @@ import logging
 import threading
 import time
 from collections import namedtuple
+from contextlib import contextmanager
 
 import redis
 from asgiref.sync import sync_to_async
@@ -19,6 +20,10 @@ from channels.layers import get_channel_layer
 from django.conf import settings
 from django.utils import timezone
 
+from app.ws_frames import frame, herodraft_tick_message
+from telemetry.metrics import timed, up_down_counter
+from telemetry.tracing import span
+
 log = logging.getLogger(__name__)
 
 # Redis client for locking and connection tracking
@@ -166,60 +171,75 @@ async def broadcast_tick(draft_id: int):
             "draft_state": draft.state,
         }
 
-    tick_data = await get_tick_data()
+    with tick_phase("tick_build", draft_id):
+        tick_data = await get_tick_data()
     if tick_data:
+        attributes = {"ws.group_kind": "herodraft", "ws.message_type": "herodraft.tick"}
+        message = frame(
+            "herodraft.tick", room_group_name, herodraft_tick_message(tick_data)
+        )
+        # The tick fields are a handful of numbers; keep them beside the frame
+        message = {**tick_data, **message}
         try:
-            await channel_layer.group_send(room_group_name, tick_data)
+            with timed("ws.group_send.duration", attributes):
+                await channel_layer.group_send(room_group_name, message)
         except Exception as e:
             log.warning(f"Failed to broadcast tick for draft {draft_id}: {e}")
 
 
 async def check_timeout(draft_id: int):
     """Check if current round has timed out and auto-pick if needed."""
-    from django.db import transaction
-
     from app.broadcast import broadcast_herodraft_state
-    from app.functions.herodraft import auto_random_pick
-    from app.models import DraftTeam, HeroDraft, HeroDraftState
+    from app.functions.herodraft import PickConflict, auto_random_pick
+    from app.models import HeroDraft, HeroDraftState
 
     @database_sync_to_async
     def check_and_auto_pick():
-        # Use transaction with select_for_update to prevent race conditions
-        completed_round = None
-
-        with transaction.atomic():
-            try:
-                draft = HeroDraft.objects.select_for_update().get(id=draft_id)
-            except HeroDraft.DoesNotExist:
-                return None
+        # No row locks: the auto-pick claims the version and round read
+        # here, so a pick or pause racing this check raises PickConflict
+        try:
+            draft = HeroDraft.objects.get(id=draft_id)
+        except HeroDraft.DoesNotExist:
+            return None
 
-            if draft.state != HeroDraftState.DRAFTING:
-                return None
+        if draft.state != HeroDraftState.DRAFTING:
+            return None
 
-            current_round = (
-                draft.rounds.select_for_update().filter(state="active").first()
-            )
-            if not current_round:
-                return None
+        current_round = (
+            draft.rounds.select_related("draft_team").filter(state="active").first()
+        )
+        if not current_round:
+            return None
 
-            now = timezone.now()
-            if not current_round.started_at:
-                return None
+        now = timezone.now()
+        if not current_round.started_at:
+            return None
 
-            elapsed_ms = int((now - current_round.started_at).total_seconds() * 1000)
+        elapsed_ms = int((now - current_round.started_at).total_seconds() * 1000)
+        team = current_round.draft_team
+        total_time = current_round.grace_time_ms + team.reserve_time_remaining
 
-            # Lock the team to ensure reserve_time_remaining is consistent
-            team = DraftTeam.objects.select_for_update().get(
-                id=current_round.draft_team_id
+        completed_round = None
+        if elapsed_ms >= total_time:
+            # Time's up - auto pick
+            log.info(
+                f"Timeout reached for draft {draft_id}, round {current_round.round_number}"
             )
-            total_time = current_round.grace_time_ms + team.reserve_time_remaining
-
-            if elapsed_ms >= total_time:
-                # Time's up - auto pick
-                log.info(
-                    f"Timeout reached for draft {draft_id}, round {current_round.round_number}"
+            try:
+                completed_round = auto_random_pick(
+                    draft,
+                    team,
+                    expected_version=draft.version,
+                    round_id=current_round.pk,
                 )
-                completed_round = auto_random_pick(draft, team)
+            except PickConflict:
+                log.info(f"Auto-pick for draft {draft_id} lost to a concurrent write")
+                return None
+            except ValueError as e:
+                # Also a lost race (e.g. the draft completed meanwhile); it
+                # must not end the draft's tick loop
+                log.warning(f"Auto-pick for draft {draft_id} skipped: {e}")
+                return None
 
         # Broadcast AFTER transaction commits so clients see the updated state
         # Use broadcast_herodraft_state to avoid creating duplicate events
@@ -307,10 +327,9 @@ HEARTBEAT_STALE_SECONDS = (
 
 async def check_captain_heartbeats(draft_id: int):
     """Check if any captain's heartbeat is stale and trigger disconnect if so."""
-    from django.db import transaction
-
     from app.broadcast import broadcast_herodraft_state
     from app.models import DraftTeam, HeroDraft, HeroDraftEvent, HeroDraftState
+    from app.utils.write_queue import write_queue
 
     @database_sync_to_async
     def check_and_handle_stale():
@@ -365,15 +384,14 @@ async def check_captain_heartbeats(draft_id: int):
 
         draft_team, captain = stale_captain
 
-        # Trigger disconnect handling
-        with transaction.atomic():
+        def pause_for_stale_captain():
             draft = HeroDraft.objects.select_for_update().get(id=draft_id)
             if draft.state != HeroDraftState.DRAFTING:
-                return None
+                return False
 
-            draft_team = DraftTeam.objects.select_for_update().get(id=draft_team.id)
-            draft_team.is_connected = False
-            draft_team.save()
+            locked_team = DraftTeam.objects.select_for_update().get(id=draft_team.id)
+            locked_team.is_connected = False
+            locked_team.save()
 
             draft.state = HeroDraftState.PAUSED
             draft.paused_at = timezone.now()
@@ -382,7 +400,7 @@ async def check_captain_heartbeats(draft_id: int):
             HeroDraftEvent.objects.create(
                 draft=draft,
                 event_type="captain_disconnected",
-                draft_team=draft_team,
+                draft_team=locked_team,
                 metadata={
                     "user_id": captain.id,
                     "username": captain.username,
@@ -392,12 +410,17 @@ async def check_captain_heartbeats(draft_id: int):
             HeroDraftEvent.objects.create(
                 draft=draft,
                 event_type="draft_paused",
-                draft_team=draft_team,
+                draft_team=locked_team,
                 metadata={"reason": "heartbeat_stale"},
             )
             log.info(
                 f"HeroDraft {draft_id} paused: captain {captain.username} heartbeat stale"
             )
+            return True
+
+        # Trigger disconnect handling
+        if not write_queue.run(pause_for_stale_captain):
+            return None
 
         # Broadcast after transaction commits
         try:
@@ -440,6 +463,16 @@ def should_continue_ticking(draft_id: int, r: redis.Redis) -> tuple[bool, str]:
     return True, ""
 
 
+@contextmanager
+def tick_phase(phase: str, draft_id: int):
+    """Trace one phase of a tick and record its duration."""
+    with (
+        span(f"herodraft.tick.{phase}", **{"herodraft.id": draft_id}),
+        timed("herodraft.tick.phase.duration", {"phase": phase}),
+    ):
+        yield
+
+
 async def run_tick_loop(draft_id: int, stop_event: threading.Event):
     """Run tick broadcasts every second while draft is active and has connections."""
     r = get_redis_client()
@@ -455,21 +488,31 @@ async def run_tick_loop(draft_id: int, stop_event: threading.Event):
         r.expire(lock_key, LOCK_TIMEOUT)
 
     log.info(f"Tick loop started for draft {draft_id}")
+    active_loops = up_down_counter("herodraft.tick_loops.active")
+    active_loops.add(1)
 
-    while not stop_event.is_set():
-        should_continue, reason = await check_continue()
-        if not should_continue:
-            log.info(f"Stopping tick loop for draft {draft_id}: {reason}")
-            break
-
-        # Check if RESUMING countdown is complete first
-        await check_resume_countdown(draft_id)
-        # Check for stale captain heartbeats (zombie connections)
-        await check_captain_heartbeats(draft_id)
-        await broadcast_tick(draft_id)
-        await check_timeout(draft_id)
-        await extend_lock()
-        await asyncio.sleep(1)
+    try:
+        while not stop_event.is_set():
+            should_continue, reason = await check_continue()
+            if not should_continue:
+                log.info(f"Stopping tick loop for draft {draft_id}: {reason}")
+                break
+
+            with span("herodraft.tick", **{"herodraft.id": draft_id}):
+                # Check if RESUMING countdown is complete first
+                with tick_phase("resume_check", draft_id):
+                    await check_resume_countdown(draft_id)
+                # Check for stale captain heartbeats (zombie connections)
+                with tick_phase("heartbeat_check", draft_id):
+                    await check_captain_heartbeats(draft_id)
+                with tick_phase("broadcast", draft_id):
+                    await broadcast_tick(draft_id)
+                with tick_phase("timeout_check", draft_id):
+                    await check_timeout(draft_id)
+            await extend_lock()
+            await asyncio.sleep(1)
+    finally:
+        active_loops.add(-1)
 
     log.info(f"Tick loop ended for draft {draft_id}")
 
@@ -0,0 +1,103 @@
+"""Tests for the cursor-based Discord avatar refresh."""
+
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from app.models import CustomUser
+from app.utils.avatar_utils import (
+    DiscordRateLimiter,
+    refresh_avatar_batch,
+    refresh_invalid_avatars,
+    stale_avatar_users,
+)
+
+
+def _response(status_code, json_data=None, headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data or {}
+    response.headers = headers or {}
+    return response
+
+
+class AvatarRefreshTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.users = []
+        for i in range(4):
+            self.users.append(
+                CustomUser.objects.create(
+                    username=f"user{i}",
+                    discordId=str(1000 + i),
+                    avatar=f"hash{i}",
+                    avatar_checked_at=now - timedelta(hours=i) if i else None,
+                )
+            )
+
+    def test_stale_users_ordered_by_last_check(self):
+        users = stale_avatar_users(4)
+        # Never-checked first, then oldest check first
+        self.assertEqual(
+            [u.pk for u in users],
+            [self.users[0].pk, self.users[3].pk, self.users[2].pk, self.users[1].pk],
+        )
+
+    @patch("app.utils.avatar_utils.requests.Session")
+    def test_runs_advance_through_all_users(self, session_cls):
+        session_cls.return_value.__enter__.return_value = session_cls.return_value
+        session_cls.return_value.head.return_value = _response(200)
+
+        first = refresh_invalid_avatars(batch_size=2)
+        second = refresh_invalid_avatars(batch_size=2)
+
+        self.assertEqual(first["checked"], 2)
+        self.assertEqual(second["checked"], 2)
+        checked = CustomUser.objects.filter(
+            avatar_checked_at__gte=timezone.now() - timedelta(minutes=1)
+        )
+        self.assertEqual(checked.count(), 4)
+
+    @override_settings(DISCORD_BOT_TOKEN="token")
+    @patch("app.utils.avatar_utils.requests.Session")
+    def test_invalid_avatar_fetched_from_discord(self, session_cls):
+        session = session_cls.return_value
+        session.__enter__.return_value = session
+        session.head.return_value = _response(404)
+        session.get.return_value = _response(200, {"avatar": "newhash"})
+
+        with self.assertNumQueries(1):
+            results = refresh_avatar_batch(self.users[:2])
+
+        self.assertEqual(results["updated"], 2)
+        self.users[0].refresh_from_db()
+        self.assertEqual(self.users[0].avatar, "newhash")
+
+    @patch("app.utils.avatar_utils.requests.Session")
+    def test_transient_failure_keeps_user_stale(self, session_cls):
+        import requests
+
+        session = session_cls.return_value
+        session.__enter__.return_value = session
+        session.head.side_effect = requests.ConnectionError()
+
+        results = refresh_avatar_batch([self.users[1]])
+
+        self.assertEqual(results["failed"], 1)
+        before = self.users[1].avatar_checked_at
+        self.users[1].refresh_from_db()
+        self.assertEqual(self.users[1].avatar_checked_at, before)
+
+    def test_rate_limiter_blocks_after_exhausted_bucket(self):
+        limiter = DiscordRateLimiter()
+        limiter.update(
+            _response(
+                200,
+                headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset-After": "2"},
+            )
+        )
+        with patch("app.utils.avatar_utils.time.sleep") as sleep:
+            limiter.wait()
+        self.assertAlmostEqual(sleep.call_args[0][0], 2, delta=0.5)
@@ -0,0 +1,31 @@
+"""Tests for the serializer benchmark and its N+1 detection."""
+
+import random
+
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from app.management.commands.benchmark_serializers import (
+    CASES,
+    build_fixture,
+    measure,
+    query_growth,
+)
+
+
+class QueryGrowthTest(SimpleTestCase):
+    def test_flags_cases_whose_queries_grow(self):
+        results = {
+            "flat": {"4": {"queries": 5}, "16": {"queries": 5}},
+            "n_plus_one": {"16": {"queries": 40}, "4": {"queries": 10}},
+        }
+        self.assertEqual(query_growth(results), {"n_plus_one": ("4", 10, "16", 40)})
+
+
+@override_settings(CACHEOPS_ENABLED=False)
+class SerializerQueryCountTest(TestCase):
+    def _queries(self, case, teams):
+        fixture = build_fixture(teams, random.Random(0), label=f"t{teams}")
+        return measure(CASES[case], fixture, iterations=1)["queries"]
+
+    def test_herodraft_queries_do_not_grow_with_rounds(self):
+        self.assertEqual(self._queries("herodraft", 2), self._queries("herodraft", 4))
@@ -2,10 +2,12 @@
 
 from datetime import date
 
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.test import APIClient
 
 from app.models import CustomUser, Game, Team, Tournament
+from tests.helpers.cache import local_memory_cache
 
 
 class SaveBracketTest(TestCase):
@@ -162,7 +164,7 @@ class SaveBracketTest(TestCase):
         self.assertEqual(game_w1.next_game_slot, "radiant")
 
     def test_save_bracket_clears_existing_bracket_games(self):
-        """Save bracket deletes existing bracket games before creating new ones."""
+        """Save bracket replaces existing bracket games with the submitted ones."""
         # Create an existing game
         Game.objects.create(
             tournament=self.tournament,
@@ -198,7 +200,7 @@ class SaveBracketTest(TestCase):
             format="json",
         )
 
-        # Should have 2 games (old one deleted, 2 new created)
+        # Should have 2 games (existing w-1-0 game reused, 1 new created)
         self.assertEqual(Game.objects.filter(tournament=self.tournament).count(), 2)
 
     def test_save_bracket_returns_games_with_pks(self):
@@ -241,6 +243,140 @@ class SaveBracketTest(TestCase):
 
         self.assertEqual(response.status_code, 403)
 
+    def _two_round_matches(self):
+        return [
+            {
+                "id": "w-1-0",
+                "round": 1,
+                "position": 0,
+                "bracketType": "winners",
+                "eliminationType": "single",
+                "radiantTeam": {"pk": self.teams[0].pk},
+                "direTeam": {"pk": self.teams[1].pk},
+                "status": "pending",
+                "nextMatchId": "w-2-0",
+                "nextMatchSlot": "radiant",
+            },
+            {
+                "id": "w-1-1",
+                "round": 1,
+                "position": 1,
+                "bracketType": "winners",
+                "eliminationType": "single",
+                "radiantTeam": {"pk": self.teams[2].pk},
+                "direTeam": {"pk": self.teams[3].pk},
+                "status": "pending",
+                "nextMatchId": "w-2-0",
+                "nextMatchSlot": "dire",
+            },
+            {
+                "id": "w-2-0",
+                "round": 2,
+                "position": 0,
+                "bracketType": "winners",
+                "eliminationType": "single",
+                "status": "pending",
+            },
+        ]
+
+    def _save(self, matches):
+        return self.client.post(
+            f"/api/bracket/tournaments/{self.tournament.pk}/save/",
+            {"matches": matches},
+            format="json",
+        )
+
+    def test_resave_keeps_existing_games(self):
+        """Re-saving a bracket updates games in place and keeps linked data."""
+        self._save(self._two_round_matches())
+        game = Game.objects.get(
+            tournament=self.tournament, bracket_type="winners", round=1, position=0
+        )
+        game.gameid = 123456
+        game.save()
+        original_pks = set(
+            Game.objects.filter(tournament=self.tournament).values_list("pk", flat=True)
+        )
+
+        matches = self._two_round_matches()
+        matches[0]["status"] = "live"
+        response = self._save(matches)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(
+                Game.objects.filter(tournament=self.tournament).values_list(
+                    "pk", flat=True
+                )
+            ),
+            original_pks,
+        )
+        game.refresh_from_db()
+        self.assertEqual(game.status, "live")
+        self.assertEqual(game.gameid, 123456)
+        self.assertIsNotNone(game.next_game)
+
+    def test_resave_matches_by_game_id(self):
+        """A match carrying gameId reuses that game even if its slot moved."""
+        self._save(self._two_round_matches())
+        final = Game.objects.get(tournament=self.tournament, round=2)
+
+        matches = self._two_round_matches()
+        matches[2]["gameId"] = final.pk
+        matches[2]["round"] = 3
+        self._save(matches)
+
+        final.refresh_from_db()
+        self.assertEqual(final.round, 3)
+        self.assertEqual(Game.objects.filter(tournament=self.tournament).count(), 3)
+        self.assertEqual(
+            Game.objects.filter(tournament=self.tournament, next_game=final).count(),
+            2,
+        )
+
+    def test_resave_deletes_only_removed_games(self):
+        """Games missing from the submitted bracket are deleted."""
+        self._save(self._two_round_matches())
+        kept = Game.objects.get(tournament=self.tournament, round=1, position=0)
+
+        matches = self._two_round_matches()
+        del matches[1]
+        self._save(matches)
+
+        self.assertEqual(Game.objects.filter(tournament=self.tournament).count(), 2)
+        self.assertTrue(Game.objects.filter(pk=kept.pk).exists())
+
+    def test_resave_unchanged_bracket_does_not_write(self):
+        """Re-saving an identical bracket issues no UPDATE or INSERT."""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        self._save(self._two_round_matches())
+
+        with CaptureQueriesContext(connection) as ctx:
+            self._save(self._two_round_matches())
+
+        writes = [
+            q["sql"]
+            for q in ctx.captured_queries
+            if q["sql"].startswith(("UPDATE", "INSERT", "DELETE"))
+        ]
+        self.assertEqual(writes, [])
+
+    def test_resave_clears_stale_winner(self):
+        """A winner that no longer plays in the game is cleared."""
+        self._save(self._two_round_matches())
+        game = Game.objects.get(tournament=self.tournament, round=1, position=0)
+        game.winning_team = self.teams[0]
+        game.save()
+
+        matches = self._two_round_matches()
+        matches[0]["radiantTeam"] = {"pk": self.teams[2].pk}
+        self._save(matches)
+
+        game.refresh_from_db()
+        self.assertIsNone(game.winning_team)
+
 
 class CalculatePlacementTest(TestCase):
     """Test placement calculation logic."""
@@ -430,6 +566,147 @@ class AdvanceWinnerPlacementTest(TestCase):
         self.team2.refresh_from_db()
         self.assertIsNone(self.team2.placement)
 
+    def test_advance_winner_moves_both_teams(self):
+        """Winner and loser are placed into their next games' slots."""
+        next_game = Game.objects.create(
+            tournament=self.tournament, bracket_type="winners", round=2
+        )
+        losers_game = Game.objects.create(
+            tournament=self.tournament, bracket_type="losers", round=1
+        )
+        game = Game.objects.create(
+            tournament=self.tournament,
+            bracket_type="winners",
+            round=1,
+            radiant_team=self.team1,
+            dire_team=self.team2,
+            next_game=next_game,
+            next_game_slot="dire",
+            loser_next_game=losers_game,
+            loser_next_game_slot="radiant",
+        )
+
+        response = self.client.post(
+            f"/api/bracket/games/{game.pk}/advance-winner/",
+            {"winner": "dire"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        game.refresh_from_db()
+        next_game.refresh_from_db()
+        losers_game.refresh_from_db()
+        self.assertEqual(game.winning_team, self.team2)
+        self.assertEqual(game.status, "completed")
+        self.assertEqual(next_game.dire_team, self.team2)
+        self.assertEqual(losers_game.radiant_team, self.team1)
+
+
+@local_memory_cache
+class BracketGraphTest(TestCase):
+    """Test the cached bracket topology and simulation."""
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            name="Graph Tournament",
+            date_played=date.today(),
+        )
+        self.teams = [
+            Team.objects.create(name=f"Team {i}", tournament=self.tournament)
+            for i in range(4)
+        ]
+        self.final = Game.objects.create(
+            tournament=self.tournament, bracket_type="grand_finals", round=1
+        )
+        self.semis = [
+            Game.objects.create(
+                tournament=self.tournament,
+                bracket_type="winners",
+                round=1,
+                position=i,
+                elimination_type="single",
+                radiant_team=self.teams[i * 2],
+                dire_team=self.teams[i * 2 + 1],
+                next_game=self.final,
+                next_game_slot="radiant" if i == 0 else "dire",
+            )
+            for i in range(2)
+        ]
+
+    def test_graph_is_cached_until_a_game_changes(self):
+        """The graph is built once, then served without queries."""
+        from app.services.bracket_graph import BracketGraph
+
+        graph = BracketGraph.for_tournament(self.tournament.pk)
+        self.assertEqual(len(graph.nodes), 3)
+
+        with self.assertNumQueries(0):
+            BracketGraph.for_tournament(self.tournament.pk)
+
+        Game.objects.create(tournament=self.tournament, bracket_type="losers")
+        graph = BracketGraph.for_tournament(self.tournament.pk)
+        self.assertEqual(len(graph.nodes), 4)
+        self.assertEqual(graph.max_round["losers"], 1)
+
+    def test_stale_graph_is_rebuilt_for_a_missing_game(self):
+        """A game missing from the cached graph rebuilds it, not a lone node."""
+        from app.services.bracket_graph import BracketGraph
+
+        graph = BracketGraph.for_tournament(self.tournament.pk)
+        semi = self.semis[1]
+        stale = {pk: node for pk, node in graph.nodes.items() if pk != semi.pk}
+        cache.set(BracketGraph.cache_key(self.tournament.pk), stale)
+
+        graph = BracketGraph.for_game(semi)
+
+        self.assertEqual(len(graph.nodes), 3)
+        updates = graph.advance(semi.pk, self.teams[2].pk, self.teams[3].pk)
+        self.assertEqual(
+            updates.game_updates[self.final.pk], {"dire_team_id": self.teams[2].pk}
+        )
+        self.assertEqual(len(cache.get(BracketGraph.cache_key(self.tournament.pk))), 3)
+
+    def test_topological_order_puts_feeders_first(self):
+        """Games are ordered after every game that feeds them."""
+        from app.services.bracket_graph import BracketGraph
+
+        order = BracketGraph.for_tournament(self.tournament.pk).topological_order()
+
+        self.assertEqual(order[-1], self.final.pk)
+
+    def test_simulate_endpoint_previews_without_saving(self):
+        """Simulation plays out the bracket and leaves the database unchanged."""
+        client = APIClient()
+        response = client.post(
+            f"/api/bracket/tournaments/{self.tournament.pk}/simulate/",
+            {"winners": {str(self.semis[1].pk): "dire"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        by_pk = {m["pk"]: m for m in response.data["matches"]}
+        final = by_pk[self.final.pk]
+        self.assertEqual(final["radiant_team_id"], self.teams[0].pk)
+        self.assertEqual(final["dire_team_id"], self.teams[3].pk)
+        self.assertEqual(final["winning_team_id"], self.teams[0].pk)
+        self.assertEqual(response.data["placements"][self.teams[0].pk], 1)
+        self.assertEqual(response.data["placements"][self.teams[3].pk], 2)
+
+        self.final.refresh_from_db()
+        self.assertIsNone(self.final.radiant_team)
+        self.assertIsNone(self.final.winning_team)
+
+    def test_simulate_rejects_invalid_winner_slot(self):
+        """Winner overrides must be radiant or dire."""
+        client = APIClient()
+        response = client.post(
+            f"/api/bracket/tournaments/{self.tournament.pk}/simulate/",
+            {"winners": {str(self.semis[0].pk): "nobody"}},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+
 
 class ManualPlacementOverrideTest(TestCase):
     """Test manual placement override endpoint."""
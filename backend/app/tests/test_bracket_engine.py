@@ -0,0 +1,284 @@
+"""Tests for the in-memory bracket generation engine and its endpoints."""
+
+import random
+from collections import Counter
+from datetime import date
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from app.models import CustomUser, Game, Team, Tournament
+from app.services import bracket_engine
+
+
+def play_out(matches, rng=None):
+    """
+    Play a generated elimination bracket to the end.
+
+    Returns (champion pk, Counter of losses per team, number of games played).
+    Fails if any game ends up with other than two entrants.
+    """
+    by_id = {m["id"]: dict(m) for m in matches}
+    for match in by_id.values():
+        match["teams"] = {
+            slot: match[f"{slot}Team"]["pk"]
+            for slot in bracket_engine.SLOTS
+            if f"{slot}Team" in match
+        }
+
+    losses = Counter()
+    champion = None
+    remaining = list(by_id)
+    played = 0
+    while remaining:
+        ready = [i for i in remaining if len(by_id[i]["teams"]) == 2]
+        assert ready, f"Stuck with unplayable games: {remaining}"
+        for match_id in ready:
+            match = by_id[match_id]
+            radiant, dire = match["teams"]["radiant"], match["teams"]["dire"]
+            winner, loser = (
+                (dire, radiant)
+                if rng and rng.random() < 0.5
+                else (
+                    radiant,
+                    dire,
+                )
+            )
+            losses[loser] += 1
+            played += 1
+            if match.get("nextMatchId"):
+                by_id[match["nextMatchId"]]["teams"][match["nextMatchSlot"]] = winner
+            else:
+                champion = winner
+            if match.get("loserNextMatchId"):
+                target = by_id[match["loserNextMatchId"]]
+                target["teams"][match["loserNextMatchSlot"]] = loser
+            remaining.remove(match_id)
+    return champion, losses, played
+
+
+class SeedOrderTest(SimpleTestCase):
+    def test_standard_seed_order(self):
+        self.assertEqual(bracket_engine.seed_order(8), [1, 8, 4, 5, 2, 7, 3, 6])
+
+    def test_seed_teams_sorts_by_mmr(self):
+        seeded = bracket_engine.seed_teams([(1, 3000), (2, 5000), (3, None), (4, 4000)])
+        self.assertEqual(seeded, [2, 4, 1, 3])
+
+
+class EliminationEngineTest(SimpleTestCase):
+    def test_single_elimination_any_team_count(self):
+        """Every team count yields n-1 playable games and one champion."""
+        for count in range(2, 40):
+            teams = list(range(1, count + 1))
+            matches = bracket_engine.single_elimination(teams)
+            self.assertEqual(len(matches), count - 1)
+            champion, losses, _ = play_out(matches)
+            self.assertEqual(champion, 1)
+            self.assertEqual(set(losses), set(teams) - {1})
+
+    def test_double_elimination_any_team_count(self):
+        """Every non-champion is eliminated after exactly two losses."""
+        for count in range(3, 40):
+            teams = list(range(1, count + 1))
+            matches = bracket_engine.double_elimination(teams)
+            # Higher seeds win, so the winners champion takes the grand final
+            self.assertEqual(len(matches), 2 * (count - 1))
+            champion, losses, played = play_out(matches)
+            self.assertEqual(champion, 1)
+            self.assertEqual(played, len(matches))
+            self.assertEqual(losses, Counter({team: 2 for team in teams if team != 1}))
+
+    def test_double_elimination_random_results(self):
+        rng = random.Random(7)
+        teams = list(range(1, 24))
+        matches = bracket_engine.double_elimination(teams)
+        champion, losses, _ = play_out(matches, rng=rng)
+        self.assertIn(champion, teams)
+        self.assertTrue(all(losses[team] == 2 for team in teams if team != champion))
+
+    def test_top_seeds_get_byes(self):
+        matches = bracket_engine.single_elimination([1, 2, 3, 4, 5, 6])
+        first_round = [m for m in matches if m["round"] == 1]
+        self.assertEqual(len(first_round), 2)
+        seeded_in_round_one = {
+            m[f"{slot}Team"]["pk"] for m in first_round for slot in ("radiant", "dire")
+        }
+        self.assertEqual(seeded_in_round_one, {3, 4, 5, 6})
+
+    def test_match_ids_are_compact(self):
+        matches = bracket_engine.double_elimination(list(range(1, 7)))
+        ids = {m["id"] for m in matches}
+        for match in matches:
+            self.assertEqual(
+                match["id"],
+                bracket_engine.match_id(
+                    match["bracketType"], match["round"], match["position"]
+                ),
+            )
+            self.assertTrue(match.get("nextMatchId") in ids | {None})
+            self.assertTrue(match.get("loserNextMatchId") in ids | {None})
+
+    def test_large_events(self):
+        for count in (64, 128):
+            matches = bracket_engine.double_elimination(list(range(1, count + 1)))
+            self.assertEqual(len(matches), 2 * (count - 1))
+            self.assertEqual(play_out(matches)[0], 1)
+
+
+class SwissEngineTest(SimpleTestCase):
+    def test_first_round_pairs_every_team(self):
+        matches = bracket_engine.generate("swiss", list(range(1, 9)))
+        self.assertEqual(len(matches), 4)
+        paired = [m[f"{s}Team"]["pk"] for m in matches for s in ("radiant", "dire")]
+        self.assertEqual(sorted(paired), list(range(1, 9)))
+
+    def test_odd_team_count_gives_lowest_team_a_bye(self):
+        matches = bracket_engine.generate("swiss", list(range(1, 8)))
+        bye = [m for m in matches if "direTeam" not in m]
+        self.assertEqual(len(bye), 1)
+        self.assertEqual(bye[0]["radiantTeam"]["pk"], 7)
+        self.assertEqual((bye[0]["status"], bye[0]["winner"]), ("completed", "radiant"))
+
+    def test_pairs_by_record_without_rematches(self):
+        teams = list(range(1, 17))
+        rng = random.Random(3)
+        records, played = bracket_engine.swiss_standings([], team_ids=teams)
+        results = []
+        for round_number in range(1, 5):
+            matches = bracket_engine.swiss_pairings(records, played, round_number)
+            for match in matches:
+                radiant, dire = match["radiantTeam"]["pk"], match["direTeam"]["pk"]
+                self.assertNotIn(frozenset((radiant, dire)), played)
+                # Opponents are at most one floated win apart
+                self.assertLessEqual(abs(records[radiant][0] - records[dire][0]), 1)
+                results.append((radiant, dire, rng.choice([radiant, dire])))
+            records, played = bracket_engine.swiss_standings(results, team_ids=teams)
+
+    def test_byes_go_to_teams_without_one(self):
+        teams = list(range(1, 6))
+        results, byes = [], []
+        for round_number in range(1, 6):
+            records, played = bracket_engine.swiss_standings(results, team_ids=teams)
+            for match in bracket_engine.swiss_pairings(records, played, round_number):
+                radiant, dire = match["radiantTeam"]["pk"], match.get("direTeam")
+                if dire is None:
+                    byes.append(radiant)
+                    results.append((radiant, None, radiant))
+                else:
+                    results.append((radiant, dire["pk"], radiant))
+
+        self.assertEqual(sorted(byes), teams)
+        # The first bye goes to the lowest-ranked team
+        self.assertEqual(byes[0], 5)
+
+    def test_finished_teams_are_not_paired(self):
+        records = {1: [3, 0], 2: [2, 1], 3: [2, 1], 4: [0, 3]}
+        matches = bracket_engine.swiss_pairings(
+            records, set(), 4, wins_to_advance=3, losses_to_eliminate=3
+        )
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(
+            {matches[0]["radiantTeam"]["pk"], matches[0]["direTeam"]["pk"]}, {2, 3}
+        )
+
+
+class GenerateBracketViewTest(TestCase):
+    def setUp(self):
+        self.admin = CustomUser.objects.create_superuser(
+            username="admin", password="admin123", email="admin@test.com"
+        )
+        self.tournament = Tournament.objects.create(
+            name="Engine Tournament", date_played=date.today()
+        )
+        self.teams = []
+        for i in range(6):
+            captain = CustomUser.objects.create_user(
+                username=f"captain{i}", password="test123", mmr=3000 + (i * 100)
+            )
+            self.teams.append(
+                Team.objects.create(
+                    name=f"Team {i}", captain=captain, tournament=self.tournament
+                )
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def _generate(self, **data):
+        return self.client.post(
+            f"/api/bracket/tournaments/{self.tournament.pk}/generate/",
+            data,
+            format="json",
+        )
+
+    def test_generate_returns_preview_without_saving(self):
+        response = self._generate(seeding_method="captain_mmr")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["matches"]), 10)
+        self.assertFalse(Game.objects.filter(tournament=self.tournament).exists())
+
+        # Highest captain MMR is the top seed and gets a bye into round 2
+        round_one = [
+            m
+            for m in response.data["matches"]
+            if m["bracketType"] == "winners" and m["round"] == 1
+        ]
+        round_one_teams = {
+            m[f"{s}Team"]["pk"] for m in round_one for s in ("radiant", "dire")
+        }
+        self.assertNotIn(self.teams[5].pk, round_one_teams)
+
+    def test_generate_persist_saves_games(self):
+        response = self._generate(persist=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Game.objects.filter(tournament=self.tournament).count(), 10)
+        self.assertTrue(all(m["pk"] for m in response.data["matches"]))
+
+    def test_swiss_next_round(self):
+        self.tournament.tournament_type = "swiss"
+        self.tournament.save()
+        self._generate(persist=True)
+
+        url = f"/api/bracket/tournaments/{self.tournament.pk}/swiss/next-round/"
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 400)
+
+        for game in Game.objects.filter(tournament=self.tournament):
+            game.winning_team_id = game.radiant_team_id
+            game.status = "completed"
+            game.save()
+
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["round"], 2)
+        self.assertEqual(Game.objects.filter(tournament=self.tournament).count(), 6)
+        for match in response.data["matches"]:
+            self.assertEqual(
+                match["swiss_record_wins"] + match["swiss_record_losses"], 1
+            )
+
+    def test_swiss_byes_are_saved_as_wins(self):
+        self.tournament.tournament_type = "swiss"
+        self.tournament.save()
+        self.teams.pop().delete()
+        self._generate(persist=True)
+
+        (bye,) = Game.objects.filter(tournament=self.tournament, dire_team=None)
+        self.assertEqual(bye.status, "completed")
+        self.assertEqual(bye.winning_team_id, bye.radiant_team_id)
+
+        # Only the paired games need results before the next round
+        for game in Game.objects.filter(tournament=self.tournament, status="pending"):
+            game.winning_team_id = game.radiant_team_id
+            game.status = "completed"
+            game.save()
+        url = f"/api/bracket/tournaments/{self.tournament.pk}/swiss/next-round/"
+        response = self.client.post(url, {}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+        (next_bye,) = Game.objects.filter(
+            tournament=self.tournament, round=2, dire_team=None
+        )
+        self.assertEqual(next_bye.status, "completed")
+        self.assertEqual(next_bye.winning_team_id, next_bye.radiant_team_id)
+        self.assertNotEqual(next_bye.radiant_team_id, bye.radiant_team_id)
@@ -0,0 +1,71 @@
+"""Tests for read-replica routing with sticky primary reads."""
+
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from app.models import Team
+from common.db_router import (
+    STICKY_CACHE_KEY,
+    ReadReplicaRouter,
+    ReplicaStickyMiddleware,
+    mark_primary,
+    replica_reads,
+)
+from tests.helpers.cache import local_memory_cache
+
+REPLICA_DATABASES = {**settings.DATABASES, "replica": settings.DATABASES["default"]}
+
+
+@local_memory_cache
+@override_settings(DATABASES=REPLICA_DATABASES, READ_REPLICA_ALIAS="replica")
+class ReadReplicaRouterTest(SimpleTestCase):
+    def setUp(self):
+        self.router = ReadReplicaRouter()
+        self.factory = RequestFactory()
+        self.user = SimpleNamespace(pk=987654, is_authenticated=True)
+
+    def _request(self, method="get"):
+        request = getattr(self.factory, method)("/api/tournaments/")
+        request.user = self.user
+        return request
+
+    def test_reads_use_replica_only_inside_scope(self):
+        self.assertIsNone(self.router.db_for_read(Team))
+        with replica_reads(self._request()):
+            self.assertEqual(self.router.db_for_read(Team), "replica")
+            self.assertEqual(self.router.db_for_write(Team), "default")
+        self.assertIsNone(self.router.db_for_read(Team))
+
+    def test_unsafe_methods_stay_on_primary(self):
+        with replica_reads(self._request("post")):
+            self.assertIsNone(self.router.db_for_read(Team))
+
+    def test_user_sticks_to_primary_after_write(self):
+        middleware = ReplicaStickyMiddleware(lambda request: HttpResponse())
+        middleware(self._request("post"))
+
+        with replica_reads(self._request()):
+            self.assertIsNone(self.router.db_for_read(Team))
+
+        cache.clear()
+        with replica_reads(self._request()):
+            self.assertEqual(self.router.db_for_read(Team), "replica")
+
+    def test_failed_write_does_not_pin(self):
+        middleware = ReplicaStickyMiddleware(lambda request: HttpResponse(status=400))
+        middleware(self._request("post"))
+        self.assertIsNone(cache.get(STICKY_CACHE_KEY.format(user_id=self.user.pk)))
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "app"))
+        self.assertTrue(self.router.allow_migrate("default", "app"))
+
+    @override_settings(DATABASES=settings.DATABASES)
+    def test_no_replica_configured(self):
+        mark_primary(self.user)
+        with replica_reads(self._request()):
+            self.assertIsNone(self.router.db_for_read(Team))
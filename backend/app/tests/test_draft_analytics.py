@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+from array import array
+from datetime import date, timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.functions.herodraft import CAPTAINS_MODE_SEQUENCE, build_draft_rounds
+from app.models import (
+    CustomUser,
+    DraftTeam,
+    Game,
+    HeroDraft,
+    HeroDraftState,
+    League,
+    Team,
+    Tournament,
+)
+from app.services.draft_analytics import HeroDraftColumns, HeroDraftStats, export
+from tests.helpers.cache import local_memory_cache
+
+
+@local_memory_cache
+class DraftAnalyticsTest(TestCase):
+    def setUp(self):
+        self.league = League.objects.create(name="League", steam_league_id=4242)
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today(), league=self.league
+        )
+        captain1 = CustomUser.objects.create_user(username="captain1", password="test")
+        captain2 = CustomUser.objects.create_user(username="captain2", password="test")
+        self.team1 = Team.objects.create(
+            name="Team 1", tournament=self.tournament, captain=captain1
+        )
+        self.team2 = Team.objects.create(
+            name="Team 2", tournament=self.tournament, captain=captain2
+        )
+        self.game = self._completed_draft(winner=self.team1)
+
+    def _completed_draft(self, winner=None):
+        game = Game.objects.create(
+            tournament=self.tournament,
+            radiant_team=self.team1,
+            dire_team=self.team2,
+            winning_team=winner,
+        )
+        draft = HeroDraft.objects.create(game=game, state=HeroDraftState.COMPLETED)
+        first = DraftTeam.objects.create(
+            draft=draft, tournament_team=self.team1, is_first_pick=True
+        )
+        second = DraftTeam.objects.create(
+            draft=draft, tournament_team=self.team2, is_first_pick=False
+        )
+        build_draft_rounds(draft, first, second)
+        started = timezone.now()
+        for hero_round in draft.rounds.all():
+            # 40s per action: 10s of reserve time each
+            hero_round.hero_id = hero_round.round_number
+            hero_round.state = "completed"
+            hero_round.started_at = started
+            hero_round.completed_at = started + timedelta(seconds=40)
+            hero_round.save()
+        return game
+
+    def test_chunks_hold_one_row_per_round(self):
+        chunks = list(HeroDraftColumns.chunks(self.league.pk, chunk_size=10))
+
+        self.assertEqual([len(c) for c in chunks], [10, 10, 4])
+        self.assertEqual(list(chunks[0]["round_number"]), list(range(1, 11)))
+        self.assertEqual(chunks[0]["elapsed_ms"][0], 40000)
+        self.assertEqual(chunks[0]["reserve_used_ms"][0], 10000)
+        self.assertEqual(
+            list(HeroDraftColumns.chunks(league_id=self.league.pk + 1)), []
+        )
+
+    def test_stats(self):
+        stats = HeroDraftStats.compute(HeroDraftColumns.chunks(self.league.pk))
+
+        self.assertEqual(stats["drafts"], 1)
+        self.assertEqual(stats["first_pick_win_rate"], 1.0)
+        self.assertEqual(
+            stats["avg_reserve_used_ms"], len(CAPTAINS_MODE_SEQUENCE) * 10000 / 2
+        )
+        heroes = {h["hero_id"]: h for h in stats["heroes"]}
+        # Round 1 is a first-pick ban, round 8 a first-pick pick, 9 a second
+        self.assertEqual((heroes[1]["bans"], heroes[1]["win_rate"]), (1, None))
+        self.assertEqual((heroes[8]["picks"], heroes[8]["win_rate"]), (1, 1.0))
+        self.assertEqual(heroes[9]["win_rate"], 0.0)
+
+    def test_league_stats_cached_until_a_game_changes(self):
+        url = f"/api/leagues/{self.league.pk}/herodraft-stats/"
+        self.assertEqual(APIClient().get(url).data["drafts"], 1)
+
+        with self.assertNumQueries(0):
+            HeroDraftStats.for_league(self.league.pk)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self._completed_draft()
+            # Dropped only once the draft commits
+            self.assertEqual(HeroDraftStats.for_league(self.league.pk)["drafts"], 1)
+        for callback in callbacks:
+            callback()
+
+        stats = HeroDraftStats.for_league(self.league.pk)
+        self.assertEqual(stats["drafts"], 2)
+        # The second game has no result yet, so it counts toward neither rate
+        self.assertEqual(stats["first_pick_win_rate"], 1.0)
+        heroes = {h["hero_id"]: h for h in stats["heroes"]}
+        self.assertEqual((heroes[8]["picks"], heroes[8]["win_rate"]), (2, 1.0))
+
+    def test_advancing_a_winner_refreshes_league_stats(self):
+        game = self._completed_draft()
+        stats = HeroDraftStats.for_league(self.league.pk)
+        self.assertEqual(stats["first_pick_win_rate"], 1.0)
+
+        client = APIClient()
+        client.force_authenticate(
+            CustomUser.objects.create_superuser(username="admin", password="test")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                f"/api/bracket/games/{game.pk}/advance-winner/",
+                {"winner": "dire"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+
+        stats = HeroDraftStats.for_league(self.league.pk)
+        # The first-pick team (radiant) lost the second game
+        self.assertEqual(stats["first_pick_win_rate"], 0.5)
+
+    def test_export_writes_numpy_readable_columns(self):
+        with tempfile.TemporaryDirectory() as directory:
+            rows = export(directory, league_id=self.league.pk, chunk_size=10)
+
+            with open(os.path.join(directory, "manifest.json")) as f:
+                manifest = json.load(f)
+            hero_ids = array("H")
+            with open(os.path.join(directory, "hero_id.bin"), "rb") as f:
+                hero_ids.frombytes(f.read())
+
+        self.assertEqual(rows, len(CAPTAINS_MODE_SEQUENCE))
+        self.assertEqual(manifest["rows"], rows)
+        self.assertEqual(manifest["columns"]["hero_id"], "<u2")
+        self.assertEqual(list(hero_ids), list(range(1, rows + 1)))
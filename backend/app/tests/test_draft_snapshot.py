@@ -0,0 +1,124 @@
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from app.models import CustomUser, Draft, DraftEvent, DraftRound, Team, Tournament
+from app.serializers import DraftSerializerForTournament
+from app.services.draft_snapshot import DraftSnapshot
+from app.services.recent_events import RECENT_EVENTS_LIMIT, RecentDraftEvents
+from tests.helpers.cache import local_memory_cache
+
+
+@local_memory_cache
+class DraftSnapshotTest(TestCase):
+    def setUp(self):
+        self.captain = CustomUser.objects.create_user(
+            username="captain", password="test"
+        )
+        self.player = CustomUser.objects.create_user(username="player", password="test")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        self.tournament.users.add(self.captain, self.player)
+        self.team = Team.objects.create(
+            name="Team 1", tournament=self.tournament, captain=self.captain
+        )
+        self.team.members.add(self.captain)
+        self.draft = Draft.objects.create(tournament=self.tournament)
+
+    def test_matches_serializer(self):
+        data = DraftSnapshot.for_draft(self.draft.pk)
+
+        expected = DraftSerializerForTournament(Draft.objects.get(pk=self.draft.pk))
+        self.assertEqual(data, json.loads(json.dumps(expected.data)))
+
+    def test_memoized_per_version(self):
+        snapshot = DraftSnapshot.get(self.draft.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(DraftSnapshot.get(self.draft.pk), snapshot)
+
+    def test_pick_bumps_version(self):
+        version = DraftSnapshot.get(self.draft.pk).version
+
+        DraftRound.objects.create(
+            draft=self.draft, captain=self.captain, choice=self.player
+        )
+        self.team.members.add(self.player)
+
+        snapshot = DraftSnapshot.get(self.draft.pk)
+        self.assertGreater(snapshot.version, version)
+        self.assertEqual(len(snapshot.data["draft_rounds"]), 1)
+
+    def test_waits_for_concurrent_build(self):
+        version = DraftSnapshot.get(self.draft.pk).version
+        DraftSnapshot.bump(self.draft.pk)
+        cache.add(DraftSnapshot.build_lock_key(self.draft.pk), version)
+        self.addCleanup(cache.delete, DraftSnapshot.build_lock_key(self.draft.pk))
+
+        def other_builder_finishes(seconds):
+            cache.set(
+                DraftSnapshot.snapshot_key(self.draft.pk),
+                (cache.get(DraftSnapshot.version_key(self.draft.pk)), "{}"),
+            )
+
+        with (
+            patch.object(DraftSnapshot, "build", return_value={}) as build,
+            patch("app.services.draft_snapshot.time.sleep", other_builder_finishes),
+        ):
+            self.assertEqual(DraftSnapshot.for_draft(self.draft.pk), {})
+        build.assert_not_called()
+
+
+class RecentDraftEventsTest(TestCase):
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        self.draft = Draft.objects.create(tournament=self.tournament)
+
+    def _event(self, n):
+        with self.captureOnCommitCallbacks(execute=True):
+            return DraftEvent.objects.create(
+                draft=self.draft, event_type="player_picked", payload={"n": n}
+            )
+
+    def test_loaded_once_then_kept_in_sync(self):
+        self._event(0)
+        self.assertEqual(len(RecentDraftEvents.for_draft(self.draft.pk)), 1)
+
+        for n in range(1, RECENT_EVENTS_LIMIT + 5):
+            self._event(n)
+
+        with self.assertNumQueries(0):
+            events = RecentDraftEvents.for_draft(self.draft.pk)
+        self.assertEqual(len(events), RECENT_EVENTS_LIMIT)
+        self.assertEqual(
+            [json.loads(e)["payload"]["n"] for e in events[:2]],
+            [RECENT_EVENTS_LIMIT + 4, RECENT_EVENTS_LIMIT + 3],
+        )
+
+    def test_empty_list_is_cached(self):
+        self.assertEqual(RecentDraftEvents.for_tournament(self.tournament.pk), [])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(RecentDraftEvents.for_tournament(self.tournament.pk), [])
+
+        self._event(1)
+        events = RecentDraftEvents.for_tournament(self.tournament.pk)
+        self.assertEqual([json.loads(e)["payload"] for e in events], [{"n": 1}])
+
+    def test_rolled_back_event_is_not_pushed(self):
+        self.assertEqual(RecentDraftEvents.for_draft(self.draft.pk), [])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                DraftEvent.objects.create(draft=self.draft, event_type="player_picked")
+                raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(RecentDraftEvents.for_draft(self.draft.pk), [])
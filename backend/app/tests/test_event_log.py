@@ -0,0 +1,104 @@
+from datetime import date
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from app.models import (
+    CustomUser,
+    Draft,
+    DraftEvent,
+    DraftTeam,
+    Game,
+    HeroDraft,
+    HeroDraftEvent,
+    HeroDraftState,
+    Team,
+    Tournament,
+)
+from app.services.event_log import DraftEventLog, HeroDraftEventLog
+
+
+class EventLogTest(TestCase):
+    def setUp(self):
+        self.captain = CustomUser.objects.create_user(
+            username="captain", password="test"
+        )
+        captain2 = CustomUser.objects.create_user(username="captain2", password="test")
+        self.tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        team1 = Team.objects.create(
+            name="Team 1", tournament=self.tournament, captain=self.captain
+        )
+        team2 = Team.objects.create(
+            name="Team 2", tournament=self.tournament, captain=captain2
+        )
+        game = Game.objects.create(
+            tournament=self.tournament, radiant_team=team1, dire_team=team2
+        )
+        self.hero_draft = HeroDraft.objects.create(game=game)
+        self.draft_team = DraftTeam.objects.create(
+            draft=self.hero_draft, tournament_team=team1, is_first_pick=True
+        )
+
+    def _hero_event(self, event_type, draft_team=None):
+        return HeroDraftEvent.objects.create(
+            draft=self.hero_draft, event_type=event_type, draft_team=draft_team
+        )
+
+    def test_seq_counts_per_draft(self):
+        draft = Draft.objects.create(tournament=self.tournament)
+        first = DraftEvent.objects.create(draft=draft, event_type="draft_started")
+        second = DraftEvent.objects.create(draft=draft, event_type="player_picked")
+
+        self.assertEqual((first.seq, second.seq), (1, 2))
+        self.assertEqual(self._hero_event("captain_ready").seq, 1)
+
+    def test_since_replays_after_cursor(self):
+        for event_type in ("roll_triggered", "roll_result", "choice_made"):
+            self._hero_event(event_type)
+
+        events = HeroDraftEventLog.since(self.hero_draft.pk, after_seq=1, limit=1)
+
+        self.assertEqual([(e.seq, e.event_type) for e in events], [(2, "roll_result")])
+        self.assertEqual(
+            [e.seq for e in HeroDraftEventLog.latest(self.hero_draft.pk, 2)], [3, 2]
+        )
+        self.assertEqual(DraftEventLog.since(self.hero_draft.pk), [])
+
+    def test_list_events_pages_by_seq(self):
+        for _ in range(3):
+            self._hero_event("captain_ready")
+        client = APIClient()
+        client.force_authenticate(user=self.captain)
+        url = f"/api/herodraft/{self.hero_draft.pk}/list-events/"
+
+        response = client.get(url, {"limit": 2})
+        self.assertEqual([e["seq"] for e in response.data], [1, 2])
+        self.assertEqual(response["X-Next-After-Seq"], "2")
+
+        response = client.get(url, {"after_seq": 2, "limit": 2})
+        self.assertEqual([e["seq"] for e in response.data], [3])
+        self.assertNotIn("X-Next-After-Seq", response)
+
+        self.assertEqual(client.get(url, {"after_seq": "x"}).status_code, 400)
+
+    def test_compact_keeps_last_connection_event_per_team(self):
+        for _ in range(3):
+            self._hero_event("captain_connected", self.draft_team)
+            self._hero_event("captain_disconnected", self.draft_team)
+        self._hero_event("draft_completed")
+
+        self.assertEqual(HeroDraftEventLog.compact(self.hero_draft.pk), 0)
+
+        self.hero_draft.state = HeroDraftState.COMPLETED
+        self.hero_draft.save()
+        self.assertEqual(HeroDraftEventLog.compact(self.hero_draft.pk), 4)
+        self.assertEqual(
+            list(self.hero_draft.events.values_list("seq", "event_type")),
+            [
+                (5, "captain_connected"),
+                (6, "captain_disconnected"),
+                (7, "draft_completed"),
+            ],
+        )
@@ -0,0 +1,114 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase
+
+from app.functions.herodraft import build_draft_rounds, get_available_heroes
+from app.models import CustomUser, DraftTeam, Game, HeroDraft, Team, Tournament
+from app.services.hero_pool import HeroPool
+from tests.helpers.cache import local_memory_cache
+
+
+class HeroPoolCatalogueTest(TestCase):
+    def test_mask_matches_hero_ids(self):
+        ids = HeroPool.hero_ids()
+        self.assertEqual(len(ids), bin(HeroPool.mask()).count("1"))
+        self.assertTrue(all(HeroPool.is_hero(hero_id) for hero_id in ids))
+
+    def test_gaps_are_not_heroes(self):
+        self.assertFalse(HeroPool.is_hero(0))
+        self.assertFalse(HeroPool.is_hero(24))
+        self.assertFalse(HeroPool.is_hero(140))
+        self.assertFalse(HeroPool.is_hero(-1))
+
+
+@local_memory_cache
+class HeroPoolAvailabilityTest(TestCase):
+    def setUp(self):
+        captain1 = CustomUser.objects.create_user(username="captain1", password="test")
+        captain2 = CustomUser.objects.create_user(username="captain2", password="test")
+        tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        team1 = Team.objects.create(
+            name="Team 1", tournament=tournament, captain=captain1
+        )
+        team2 = Team.objects.create(
+            name="Team 2", tournament=tournament, captain=captain2
+        )
+        game = Game.objects.create(
+            tournament=tournament, radiant_team=team1, dire_team=team2
+        )
+        self.draft = HeroDraft.objects.create(game=game)
+        first = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=team1, is_first_pick=True
+        )
+        second = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=team2, is_first_pick=False
+        )
+        build_draft_rounds(self.draft, first, second)
+
+    def _complete_round(self, round_number, hero_id):
+        hero_round = self.draft.rounds.get(round_number=round_number)
+        hero_round.hero_id = hero_id
+        hero_round.state = "completed"
+        with self.captureOnCommitCallbacks(execute=True):
+            hero_round.save()
+
+    def test_committed_pick_drops_cached_mask(self):
+        self.assertEqual(
+            len(get_available_heroes(self.draft)), len(HeroPool.hero_ids())
+        )
+
+        self._complete_round(1, 1)
+
+        self.assertFalse(HeroPool.is_available(self.draft.id, 1))
+        with self.assertNumQueries(0):
+            self.assertFalse(HeroPool.is_available(self.draft.id, 1))
+            self.assertTrue(HeroPool.is_available(self.draft.id, 2))
+            self.assertNotIn(1, HeroPool.available(self.draft.id))
+            self.assertNotEqual(HeroPool.random_available(self.draft.id), 1)
+
+    def test_rolled_back_pick_keeps_hero_available(self):
+        self.assertTrue(HeroPool.is_available(self.draft.id, 1))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                self._complete_round(1, 1)
+                raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(HeroPool.is_available(self.draft.id, 1))
+
+    def test_cleared_pick_frees_hero(self):
+        self._complete_round(1, 1)
+        self.assertFalse(HeroPool.is_available(self.draft.id, 1))
+
+        self._complete_round(1, None)
+
+        self.assertTrue(HeroPool.is_available(self.draft.id, 1))
+
+    def test_miss_rebuilds_from_rounds(self):
+        self._complete_round(1, 5)
+        HeroPool.invalidate(self.draft.id)
+
+        with self.assertNumQueries(1):
+            self.assertFalse(HeroPool.is_available(self.draft.id, 5))
+
+    def test_deleted_rounds_reset_mask(self):
+        self._complete_round(1, 5)
+        self.assertFalse(HeroPool.is_available(self.draft.id, 5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.draft.rounds.all().delete()
+
+        self.assertTrue(HeroPool.is_available(self.draft.id, 5))
+
+    def test_unknown_hero_is_not_available(self):
+        self.assertFalse(HeroPool.is_available(self.draft.id, 24))
+
+    def test_no_random_hero_when_pool_is_exhausted(self):
+        cache.set(HeroPool.cache_key(self.draft.id), HeroPool.mask())
+
+        self.assertIsNone(HeroPool.random_available(self.draft.id))
@@ -0,0 +1,209 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from django.utils import timezone
+
+from app.functions.herodraft import (
+    CAPTAINS_MODE_SEQUENCE,
+    PickConflict,
+    auto_random_pick,
+    build_draft_rounds,
+    submit_pick,
+)
+from app.models import (
+    CustomUser,
+    DraftTeam,
+    Game,
+    HeroDraft,
+    HeroDraftRound,
+    HeroDraftState,
+    Team,
+    Tournament,
+)
+from app.services.hero_pool import HeroPool
+from app.tasks.herodraft_tick import check_timeout
+
+
+class SubmitPickTest(TestCase):
+    def setUp(self):
+        captain1 = CustomUser.objects.create_user(username="captain1", password="test")
+        captain2 = CustomUser.objects.create_user(username="captain2", password="test")
+        tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        team1 = Team.objects.create(
+            name="Team 1", tournament=tournament, captain=captain1
+        )
+        team2 = Team.objects.create(
+            name="Team 2", tournament=tournament, captain=captain2
+        )
+        game = Game.objects.create(
+            tournament=tournament, radiant_team=team1, dire_team=team2
+        )
+        self.draft = HeroDraft.objects.create(game=game, state=HeroDraftState.DRAFTING)
+        self.first = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=team1, is_first_pick=True
+        )
+        self.second = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=team2, is_first_pick=False
+        )
+        build_draft_rounds(self.draft, self.first, self.second)
+        self.draft.rounds.filter(round_number=1).update(
+            state="active", started_at=timezone.now()
+        )
+
+    def _team(self, round_number):
+        is_first, _ = CAPTAINS_MODE_SEQUENCE[round_number - 1]
+        return self.first if is_first else self.second
+
+    def test_pick_is_a_fixed_number_of_statements(self):
+        # State/version and rounds reads, draft claim, round transition, event
+        # seq read and insert, plus the savepoints around the writes
+        with self.assertNumQueries(10):
+            completed = submit_pick(self.draft, self.first, 1)
+
+        self.assertEqual((completed.round_number, completed.hero_id), (1, 1))
+        states = dict(self.draft.rounds.values_list("round_number", "state")[:3])
+        self.assertEqual(states, {1: "completed", 2: "active", 3: "planned"})
+        self.assertIsNotNone(self.draft.rounds.get(round_number=2).started_at)
+        self.assertEqual(
+            list(self.draft.events.values_list("seq", "event_type")),
+            [(1, "hero_selected"), (2, "round_started")],
+        )
+        self.assertFalse(HeroPool.is_available(self.draft.id, 1))
+
+    def test_full_draft_completes(self):
+        for round_number in range(1, len(CAPTAINS_MODE_SEQUENCE) + 1):
+            submit_pick(self.draft, self._team(round_number), round_number)
+
+        self.draft.refresh_from_db()
+        self.assertEqual(self.draft.state, HeroDraftState.COMPLETED)
+        self.assertFalse(self.draft.rounds.exclude(state="completed").exists())
+        self.assertEqual(self.draft.events.last().event_type, "draft_completed")
+        self.assertEqual(
+            list(self.draft.events.values_list("seq", flat=True)),
+            list(range(1, 2 * len(CAPTAINS_MODE_SEQUENCE) + 1)),
+        )
+
+    def test_reserve_time_is_deducted(self):
+        self.draft.rounds.filter(round_number=1).update(
+            started_at=timezone.now() - timedelta(seconds=40)
+        )
+
+        submit_pick(self.draft, self.first, 1)
+
+        self.first.refresh_from_db()
+        self.assertLess(self.first.reserve_time_remaining, 81000)
+
+    def test_stale_version_conflicts(self):
+        read_rounds = HeroDraftRound.objects.filter
+
+        # A pause lands between reading the draft and claiming it
+        def pause_then_read_rounds(*args, **kwargs):
+            HeroDraft.objects.get(pk=self.draft.pk).save()
+            return read_rounds(*args, **kwargs)
+
+        with patch.object(
+            HeroDraftRound.objects, "filter", side_effect=pause_then_read_rounds
+        ):
+            with self.assertRaises(PickConflict):
+                submit_pick(self.draft, self.first, 1)
+
+        self.assertEqual(self.draft.rounds.get(round_number=1).state, "active")
+        self.assertFalse(self.draft.events.exists())
+
+    def test_paused_draft_conflicts(self):
+        # Paused after the caller checked the state on its own instance
+        HeroDraft.objects.get(pk=self.draft.pk).save()
+        HeroDraft.objects.filter(pk=self.draft.pk).update(state=HeroDraftState.PAUSED)
+        with self.assertRaises(PickConflict):
+            submit_pick(self.draft, self.first, 1)
+
+        read_rounds = HeroDraftRound.objects.filter
+
+        # Paused between the read and the claim, without a version bump
+        def pause_then_read_rounds(*args, **kwargs):
+            HeroDraft.objects.filter(pk=self.draft.pk).update(
+                state=HeroDraftState.DRAFTING
+            )
+            rounds = read_rounds(*args, **kwargs)
+            HeroDraft.objects.filter(pk=self.draft.pk).update(
+                state=HeroDraftState.PAUSED
+            )
+            return rounds
+
+        HeroDraft.objects.filter(pk=self.draft.pk).update(state=HeroDraftState.DRAFTING)
+        with patch.object(
+            HeroDraftRound.objects, "filter", side_effect=pause_then_read_rounds
+        ):
+            with self.assertRaises(PickConflict):
+                submit_pick(self.draft, self.first, 1)
+
+        self.assertEqual(self.draft.rounds.get(round_number=1).state, "active")
+        self.assertFalse(self.draft.events.exists())
+
+    def test_stale_instance_save_never_repeats_a_version(self):
+        stale = HeroDraft.objects.get(pk=self.draft.pk)
+        before = stale.version
+
+        submit_pick(self.draft, self.first, 1)
+        stale.save()
+
+        self.assertEqual(stale.version, before + 2)
+        self.assertEqual(
+            HeroDraft.objects.values_list("version", flat=True).get(pk=stale.pk),
+            before + 2,
+        )
+
+    def test_rejects_used_hero_and_wrong_team(self):
+        submit_pick(self.draft, self.first, 1)
+
+        with self.assertRaisesMessage(ValueError, "Hero already picked or banned"):
+            submit_pick(self.draft, self.first, 1)
+        with self.assertRaisesMessage(ValueError, "Not your turn"):
+            submit_pick(self.draft, self.second, 2)
+
+    def test_auto_pick_records_timeout_in_same_insert(self):
+        auto_random_pick(self.draft, self.first)
+
+        self.assertEqual(
+            list(self.draft.events.values_list("event_type", flat=True)),
+            ["round_timeout", "hero_selected", "round_started"],
+        )
+
+    def test_pick_between_timeout_check_and_auto_pick(self):
+        # Round 1 timed out; the captain's pick commits while the tick is
+        # choosing a random hero. The next round belongs to the same team
+        # first, then to the other team.
+        for round_number, hero_id in ((1, 1), (2, 2)):
+            self.draft.rounds.filter(round_number=round_number).update(
+                started_at=timezone.now() - timedelta(minutes=10)
+            )
+            team = self._team(round_number)
+            draft = HeroDraft.objects.get(pk=self.draft.pk)
+
+            def pick_first(draft_id):
+                submit_pick(self.draft, team, hero_id)
+                return 100
+
+            with patch.object(HeroPool, "random_available", side_effect=pick_first):
+                self.assertIsNone(async_to_sync(check_timeout)(self.draft.id))
+
+            next_round = self.draft.rounds.get(round_number=round_number + 1)
+            self.assertEqual((next_round.state, next_round.hero_id), ("active", None))
+            self.assertFalse(self.draft.events.filter(event_type="round_timeout"))
+            self.assertEqual(
+                draft.version + 1, HeroDraft.objects.get(pk=draft.pk).version
+            )
+
+    def test_auto_pick_conflicts_when_version_or_round_moved(self):
+        draft = HeroDraft.objects.get(pk=self.draft.pk)
+        round_one = self.draft.rounds.get(round_number=1)
+        submit_pick(self.draft, self.first, 1)
+
+        with self.assertRaises(PickConflict):
+            auto_random_pick(draft, self.first, expected_version=draft.version)
+        with self.assertRaises(PickConflict):
+            auto_random_pick(draft, self.first, round_id=round_one.pk)
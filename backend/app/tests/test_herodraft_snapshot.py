@@ -0,0 +1,109 @@
+from datetime import date
+
+from django.test import TestCase
+
+from app.functions.herodraft import build_draft_rounds
+from app.models import CustomUser, DraftTeam, Game, HeroDraft, Team, Tournament
+from app.serializers import HeroDraftSerializer
+from app.services.herodraft_snapshot import HeroDraftSnapshot
+from tests.helpers.cache import local_memory_cache
+
+
+@local_memory_cache
+class HeroDraftSnapshotTest(TestCase):
+    def setUp(self):
+        self.captain1 = CustomUser.objects.create_user(
+            username="captain1", password="test"
+        )
+        captain2 = CustomUser.objects.create_user(username="captain2", password="test")
+        tournament = Tournament.objects.create(
+            name="Test Tournament", date_played=date.today()
+        )
+        self.team1 = Team.objects.create(
+            name="Team 1", tournament=tournament, captain=self.captain1
+        )
+        team2 = Team.objects.create(
+            name="Team 2", tournament=tournament, captain=captain2
+        )
+        self.team1.members.add(self.captain1)
+        team2.members.add(captain2)
+        game = Game.objects.create(
+            tournament=tournament, radiant_team=self.team1, dire_team=team2
+        )
+        self.draft = HeroDraft.objects.create(game=game)
+        self.first = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=self.team1, is_first_pick=True
+        )
+        second = DraftTeam.objects.create(
+            draft=self.draft, tournament_team=team2, is_first_pick=False
+        )
+        build_draft_rounds(self.draft, self.first, second)
+        self.draft.roll_winner = self.first
+        self.draft.save()
+
+    def test_matches_serializer(self):
+        active = self.draft.rounds.get(round_number=3)
+        active.state = "active"
+        active.save()
+
+        data = HeroDraftSnapshot.for_draft(self.draft.id)
+
+        expected = HeroDraftSerializer(HeroDraft.objects.get(pk=self.draft.pk)).data
+        self.assertEqual(data, expected)
+        self.assertEqual(data["current_round"], 2)
+        self.assertEqual(data["roll_winner"]["id"], self.first.id)
+        self.assertEqual(data["tournament_id"], self.draft.game.tournament_id)
+
+    def test_memoized_per_version(self):
+        snapshot = HeroDraftSnapshot.get(self.draft.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(HeroDraftSnapshot.get(self.draft.id), snapshot)
+
+    def test_build_queries_do_not_grow_with_members(self):
+        with self.assertNumQueries(4):
+            HeroDraftSnapshot.build(self.draft.id)
+
+        for i in range(5):
+            self.team1.members.add(
+                CustomUser.objects.create_user(username=f"member{i}", password="test")
+            )
+        with self.assertNumQueries(4):
+            HeroDraftSnapshot.build(self.draft.id)
+
+    def test_changes_bump_version(self):
+        version = HeroDraftSnapshot.get(self.draft.id).version
+
+        hero_round = self.draft.rounds.get(round_number=1)
+        hero_round.hero_id = 1
+        hero_round.save()
+        snapshot = HeroDraftSnapshot.get(self.draft.id)
+        self.assertGreater(snapshot.version, version)
+        self.assertEqual(snapshot.data["rounds"][0]["hero_id"], 1)
+
+        self.team1.name = "Renamed"
+        self.team1.save()
+        self.assertEqual(
+            HeroDraftSnapshot.for_draft(self.draft.id)["draft_teams"][0]["team_name"],
+            "Renamed",
+        )
+
+        self.captain1.nickname = "Cap"
+        self.captain1.save()
+        self.assertEqual(
+            HeroDraftSnapshot.for_draft(self.draft.id)["draft_teams"][0]["captain"][
+                "nickname"
+            ],
+            "Cap",
+        )
+
+    def test_new_member_is_included(self):
+        HeroDraftSnapshot.get(self.draft.id)
+        member = CustomUser.objects.create_user(username="member", password="test")
+
+        self.team1.members.add(member)
+
+        members = HeroDraftSnapshot.for_draft(self.draft.id)["draft_teams"][0][
+            "members"
+        ]
+        self.assertIn(member.pk, [m["pk"] for m in members])
@@ -0,0 +1,76 @@
+"""Tests for the draft load-test harness helpers."""
+
+import asyncio
+
+from django.test import SimpleTestCase
+
+from app.management.commands.loadtest_drafts import (
+    Room,
+    _event_key,
+    compare_to_baseline,
+)
+
+
+class CompareToBaselineTest(SimpleTestCase):
+    def test_flags_slower_and_lower_throughput(self):
+        baseline = {"herodraft": {"delivery_p99_ms": 100.0, "messages_per_s": 50.0}}
+        results = {"herodraft": {"delivery_p99_ms": 130.0, "messages_per_s": 30.0}}
+
+        self.assertEqual(
+            compare_to_baseline(results, baseline, 0.25),
+            [
+                ("herodraft", "delivery_p99_ms", 100.0, 130.0),
+                ("herodraft", "messages_per_s", 50.0, 30.0),
+            ],
+        )
+
+    def test_ignores_changes_within_tolerance_and_config(self):
+        baseline = {
+            "connect": {"p50_ms": 10.0},
+            "config": {"spectators": 200},
+        }
+        results = {"connect": {"p50_ms": 12.0}, "config": {"spectators": 10}}
+        self.assertEqual(compare_to_baseline(results, baseline, 0.25), [])
+
+
+class RoomTest(SimpleTestCase):
+    def test_expectation_completes_when_every_client_received(self):
+        async def scenario():
+            room = Room("herodraft_1")
+            room.clients = ["a", "b"]
+            done = room.expect(("hero_selected", 1))
+            room.received(("hero_selected", 1))
+            room.received(None)  # e.g. a tick
+            self.assertFalse(done.is_set())
+            room.received(("hero_selected", 1))
+            return room, done
+
+        room, done = asyncio.run(scenario())
+        self.assertTrue(done.is_set())
+        self.assertEqual(room.messages, 3)
+        self.assertEqual(len(room.latencies), 2)
+
+    def test_event_keys(self):
+        self.assertEqual(
+            _event_key(
+                {
+                    "type": "herodraft_event",
+                    "event_type": "hero_selected",
+                    "metadata": {"round_number": 3},
+                }
+            ),
+            ("hero_selected", 3),
+        )
+        self.assertEqual(
+            _event_key(
+                {
+                    "type": "draft_event",
+                    "event": {
+                        "event_type": "player_picked",
+                        "payload": {"pick_number": 7},
+                    },
+                }
+            ),
+            ("player_picked", 7),
+        )
+        self.assertIsNone(_event_key({"type": "herodraft_tick"}))
@@ -0,0 +1,119 @@
+"""Tests for precomputed org/league role maps used by permission checks."""
+
+import time
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from app.models import CustomUser, League, Organization, Tournament
+from app.permission_roles import (
+    ROLE_VERSION_KEY,
+    _request_roles,
+    build_role_map,
+    invalidate_role_maps,
+)
+from app.permissions_org import (
+    can_edit_tournament,
+    has_league_admin_access,
+    has_league_staff_access,
+    has_org_admin_access,
+    has_org_staff_access,
+)
+from tests.helpers.cache import local_memory_cache
+
+
+class RoleMapTest(TestCase):
+    def setUp(self):
+        self.owner = CustomUser.objects.create_user(username="owner", password="x")
+        self.org_admin = CustomUser.objects.create_user(username="oadmin", password="x")
+        self.org_staff = CustomUser.objects.create_user(username="ostaff", password="x")
+        self.league_admin = CustomUser.objects.create_user(
+            username="ladmin", password="x"
+        )
+        self.league_staff = CustomUser.objects.create_user(
+            username="lstaff", password="x"
+        )
+        self.outsider = CustomUser.objects.create_user(username="out", password="x")
+
+        self.org = Organization.objects.create(name="Org", owner=self.owner)
+        self.org.admins.add(self.org_admin)
+        self.org.staff.add(self.org_staff)
+
+        self.league = League.objects.create(name="League", steam_league_id=4242)
+        self.league.organizations.add(self.org)
+        self.league.admins.add(self.league_admin)
+        self.league.staff.add(self.league_staff)
+
+        self.other_league = League.objects.create(name="Other", steam_league_id=4343)
+
+    def test_build_role_map_inherits_org_roles(self):
+        roles = build_role_map(self.org_admin.pk)
+        self.assertIn(self.org.pk, roles.org_admin)
+        self.assertIn(self.league.pk, roles.league_admin)
+        self.assertIn(self.league.pk, roles.league_staff)
+        self.assertNotIn(self.other_league.pk, roles.league_staff)
+
+        roles = build_role_map(self.org_staff.pk)
+        self.assertNotIn(self.league.pk, roles.league_admin)
+        self.assertIn(self.league.pk, roles.league_staff)
+
+    def test_helpers_match_roles(self):
+        self.assertTrue(has_org_admin_access(self.owner, self.org))
+        self.assertTrue(has_org_admin_access(self.org_admin, self.org))
+        self.assertFalse(has_org_admin_access(self.org_staff, self.org))
+        self.assertTrue(has_org_staff_access(self.org_staff, self.org))
+
+        self.assertTrue(has_league_admin_access(self.owner, self.league))
+        self.assertTrue(has_league_admin_access(self.league_admin, self.league))
+        self.assertFalse(has_league_admin_access(self.league_staff, self.league))
+        self.assertTrue(has_league_staff_access(self.league_staff, self.league))
+        self.assertTrue(has_league_staff_access(self.org_staff, self.league))
+        self.assertFalse(has_league_staff_access(self.outsider, self.league))
+        self.assertFalse(has_league_admin_access(self.org_admin, self.other_league))
+
+    def test_role_change_invalidates_cached_map(self):
+        self.assertFalse(has_league_admin_access(self.outsider, self.other_league))
+
+        self.other_league.admins.add(self.outsider)
+        self.assertTrue(has_league_admin_access(self.outsider, self.other_league))
+
+        self.other_league.admins.remove(self.outsider)
+        self.assertFalse(has_league_admin_access(self.outsider, self.other_league))
+
+        # Linking an org grants its admins access to the league
+        self.other_league.organizations.add(self.org)
+        self.assertTrue(has_league_admin_access(self.org_admin, self.other_league))
+
+    def test_checks_within_request_scope_need_no_queries(self):
+        tournament = Tournament.objects.create(
+            name="Scoped", date_played="2026-01-01T00:00:00Z", league=self.league
+        )
+        token = _request_roles.set({})
+        try:
+            self.assertTrue(can_edit_tournament(self.org_admin, tournament))
+            with self.assertNumQueries(0):
+                for _ in range(10):
+                    self.assertTrue(can_edit_tournament(self.org_admin, tournament))
+                    self.assertTrue(
+                        has_league_staff_access(self.org_admin, self.league)
+                    )
+        finally:
+            _request_roles.reset(token)
+
+
+@local_memory_cache
+class RoleVersionTest(TestCase):
+    def test_missing_version_starts_from_clock(self):
+        # An evicted counter must not restart at a version still cached
+        before = time.time_ns()
+
+        invalidate_role_maps()
+
+        self.assertGreaterEqual(cache.get(ROLE_VERSION_KEY), before)
+
+    def test_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_role_maps()
+            version = cache.get(ROLE_VERSION_KEY)
+
+        self.assertEqual(cache.get(ROLE_VERSION_KEY), version + 1)
@@ -0,0 +1,119 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from app.models import CustomUser, Game, League, Organization, Team, Tournament
+from steam.models import Match, PlayerMatchStats
+from tests.populate_scale import (
+    SCALE_LEAGUE_ID_BASE,
+    SCALE_ORG_PREFIX,
+    clear_scale_data,
+    populate_scale_data,
+)
+
+SMALL = dict(
+    organizations=2,
+    leagues=3,
+    users=60,
+    tournaments=4,
+    teams_per_tournament=4,
+    games_per_tournament=3,
+    matches=20,
+)
+
+
+def snapshot():
+    return (
+        list(
+            Match.objects.order_by("match_id").values_list(
+                "match_id", "radiant_win", "duration", "start_time", "league_id"
+            )
+        ),
+        list(
+            PlayerMatchStats.objects.order_by("match_id", "player_slot").values_list(
+                "match_id", "steam_id", "user__username", "hero_id", "kills"
+            )
+        ),
+        list(
+            Game.objects.order_by("tournament__name", "position", "round").values_list(
+                "tournament__name", "radiant_team__name", "winning_team__name"
+            )
+        ),
+    )
+
+
+class PopulateScaleDataTest(TestCase):
+    def test_creates_requested_volumes(self):
+        counts = populate_scale_data(**SMALL)
+
+        self.assertEqual(counts["player_stats"], 200)
+        self.assertEqual(
+            Organization.objects.filter(name__startswith=SCALE_ORG_PREFIX).count(), 2
+        )
+        self.assertEqual(
+            League.objects.filter(steam_league_id__gte=SCALE_LEAGUE_ID_BASE).count(),
+            3,
+        )
+        self.assertEqual(Tournament.objects.count(), 4)
+        self.assertEqual(Team.objects.count(), 16)
+        self.assertEqual(Team.members.through.objects.count(), 80)
+        self.assertEqual(Match.objects.count(), 20)
+        self.assertEqual(PlayerMatchStats.objects.count(), 200)
+        # Every player stat belongs to a scale user
+        self.assertFalse(PlayerMatchStats.objects.filter(user=None).exists())
+        # 12 games, all completed by the first 12 matches
+        self.assertEqual(Game.objects.filter(status="completed").count(), 12)
+        game = Game.objects.exclude(gameid=None).first()
+        match = Match.objects.get(match_id=game.gameid)
+        self.assertEqual(
+            game.winning_team,
+            game.radiant_team if match.radiant_win else game.dire_team,
+        )
+        self.assertEqual(
+            set(
+                PlayerMatchStats.objects.filter(
+                    match=match, player_slot__lt=128
+                ).values_list("user", flat=True)
+            ),
+            set(game.radiant_team.members.values_list("pk", flat=True)),
+        )
+
+    def test_same_seed_gives_same_data(self):
+        populate_scale_data(seed=7, **SMALL)
+        first = snapshot()
+
+        # Existing data is kept without force
+        self.assertIsNone(populate_scale_data(seed=7, **SMALL))
+        populate_scale_data(seed=7, force=True, **SMALL)
+        self.assertEqual(snapshot(), first)
+
+        populate_scale_data(seed=8, force=True, **SMALL)
+        self.assertNotEqual(snapshot(), first)
+
+    def test_clear_only_removes_scale_data(self):
+        CustomUser.objects.create_user(username="regular", password="test")
+        populate_scale_data(**SMALL)
+
+        clear_scale_data()
+
+        self.assertEqual(
+            list(CustomUser.objects.values_list("username", flat=True)), ["regular"]
+        )
+        self.assertFalse(Tournament.objects.exists())
+        self.assertFalse(PlayerMatchStats.objects.exists())
+
+    def test_command(self):
+        out = StringIO()
+        call_command(
+            "populate_scale_data",
+            "--matches",
+            "5",
+            "--users",
+            "40",
+            "--tournaments",
+            "2",
+            stdout=out,
+        )
+
+        self.assertIn("50 player_stats", out.getvalue())
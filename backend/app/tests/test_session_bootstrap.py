@@ -0,0 +1,88 @@
+"""Tests for the cached session bootstrap and paginated team history."""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from app.models import CustomUser, Team, Tournament
+from app.services.session_bootstrap import SessionBootstrap
+from tests.helpers.cache import local_memory_cache
+
+
+@local_memory_cache
+class SessionBootstrapTest(TestCase):
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="player", password="x")
+        self.other = CustomUser.objects.create_user(username="other", password="x")
+        now = timezone.now()
+        self.past = Tournament.objects.create(
+            name="Past", date_played=now - timedelta(days=30), state="past"
+        )
+        self.live = Tournament.objects.create(
+            name="Live", date_played=now, state="in_progress"
+        )
+        self.past_team = Team.objects.create(tournament=self.past, name="Old")
+        self.past_team.members.add(self.user)
+        self.live_team = Team.objects.create(
+            tournament=self.live, name="Current", captain=self.user
+        )
+        self.live_team.members.add(self.user)
+        SessionBootstrap.invalidate([self.user.pk, self.other.pk])
+
+    def test_projection_has_current_team_only(self):
+        data = SessionBootstrap.for_user(self.user)
+        self.assertNotIn("teams", data)
+        self.assertEqual(data["current_team"]["pk"], self.live_team.pk)
+        self.assertEqual(data["active_drafts"], [])
+
+    def test_second_call_is_served_from_cache(self):
+        SessionBootstrap.for_user(self.user)
+        with self.assertNumQueries(0):
+            SessionBootstrap.for_user(self.user)
+
+    def test_user_save_invalidates_projection(self):
+        SessionBootstrap.for_user(self.user)
+        self.user.nickname = "renamed"
+        self.user.save()
+        self.assertIsNone(cache.get(SessionBootstrap.cache_key(self.user.pk)))
+        self.assertEqual(SessionBootstrap.for_user(self.user)["nickname"], "renamed")
+
+    def test_membership_change_invalidates_only_affected_users(self):
+        SessionBootstrap.for_user(self.user)
+        SessionBootstrap.for_user(self.other)
+
+        self.live_team.members.add(self.other)
+
+        self.assertIsNotNone(cache.get(SessionBootstrap.cache_key(self.user.pk)))
+        data = SessionBootstrap.for_user(self.other)
+        self.assertEqual(data["current_team"]["pk"], self.live_team.pk)
+
+    def test_tournament_state_change_updates_current_team(self):
+        SessionBootstrap.for_user(self.user)
+        self.live.state = "past"
+        self.live.save()
+        self.assertIsNone(SessionBootstrap.for_user(self.user)["current_team"])
+
+    def test_current_user_endpoint_uses_projection(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get("/api/current_user")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["current_team"]["name"], "Current")
+
+        response = client.get("/api/session/bootstrap/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["pk"], self.user.pk)
+
+    def test_team_history_is_paginated_newest_first(self):
+        response = APIClient().get(
+            f"/api/users/{self.user.pk}/teams/", {"page_size": 1}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(response.data["results"][0]["pk"], self.live_team.pk)
+        self.assertEqual(response.data["results"][0]["tournament_name"], "Live")
+        self.assertIsNotNone(response.data["next"])
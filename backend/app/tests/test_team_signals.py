@@ -8,7 +8,9 @@ Verifies:
 - Cascade from tournament.users to team.members
 """
 
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from app.models import CustomUser, PositionsModel, Team, Tournament
@@ -205,6 +207,51 @@ class TournamentUserRemovalCascadeTests(TestCase):
 
         self.assertEqual(Team.objects.filter(tournament=self.tournament).count(), 0)
 
+    def test_user_side_removal_triggers_succession(self):
+        """Removing a team from the user's side also hands over captaincy."""
+        captain = self.team1.captain
+
+        captain.teams_as_member.remove(self.team1)
+
+        self.team1.refresh_from_db()
+        self.assertEqual(self.team1.captain, self.users[1])
+
+    def test_bulk_removal_query_count_is_constant(self):
+        """Removing many users across many teams uses a fixed number of queries."""
+        users = list(self.users)
+        for i in range(6):
+            positions = PositionsModel.objects.create()
+            users.append(
+                CustomUser.objects.create(
+                    username=f"extra_{i}", mmr=1000 + i, positions=positions
+                )
+            )
+        self.tournament.users.add(*users[10:])
+        for i in range(3):
+            team = Team.objects.create(tournament=self.tournament, name=f"Extra {i}")
+            team.members.set(users[10 + i * 2 : 12 + i * 2])
+            team.captain = users[10 + i * 2]
+            team.save()
+
+        # Captains of every team plus a regular member
+        no_shows = [self.users[0], self.users[5], users[10], users[12], users[14]]
+        no_shows.append(self.users[3])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.tournament.users.remove(*no_shows)
+
+        self.assertLessEqual(len(queries), 12)
+        self.team1.refresh_from_db()
+        self.team2.refresh_from_db()
+        self.assertEqual(self.team1.captain, self.users[1])
+        self.assertEqual(self.team2.captain, self.users[6])
+        self.assertEqual(
+            set(self.team1.members.all()), {self.users[1], self.users[2], self.users[4]}
+        )
+        for i in range(3):
+            team = Team.objects.get(name=f"Extra {i}")
+            self.assertEqual(team.captain, users[11 + i * 2])
+
 
 class TeamValidationTests(TestCase):
     """Test Team model validation."""
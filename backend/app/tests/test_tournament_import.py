@@ -0,0 +1,144 @@
+import json
+
+from django.test import TestCase
+
+from app.models import CustomUser, DraftRound, Game, Team, Tournament
+from app.services.tournament_import import TournamentImporter, iter_json_array
+from tests.helpers.cache import local_memory_cache
+
+
+def chunked(text, size):
+    data = text.encode()
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+class IterJsonArrayTest(TestCase):
+    def test_yields_elements_across_chunk_boundaries(self):
+        elements = [{"name": "Ærø Cup", "teams": [1, 2]}, {"name": "b"}, []]
+        text = (
+            " [ "
+            + ", ".join(json.dumps(e, ensure_ascii=False) for e in elements)
+            + " ] "
+        )
+
+        self.assertEqual(list(iter_json_array(chunked(text, 3))), elements)
+        self.assertEqual(list(iter_json_array([b"[]"])), [])
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(chunked('[{"name": "a"}, {"na', 4)))
+
+
+@local_memory_cache
+class TournamentImporterTest(TestCase):
+    def setUp(self):
+        self.alice = CustomUser.objects.create_user(
+            username="alice", password="test", discordId="111"
+        )
+        self.bob = CustomUser.objects.create_user(username="bob", password="test")
+
+    def _tournament(self, pk, name, **extra):
+        alice = {"discordId": "111", "username": "whatever"}
+        bob = {"username": "bob"}
+        return {
+            "pk": pk,
+            "name": name,
+            "date_played": "2025-01-02T00:00:00Z",
+            "state": "past",
+            "users": [alice, bob, {"username": "nobody"}],
+            "teams": [
+                {"pk": 10, "name": "Red", "captain": alice, "members": [alice]},
+                {"pk": 11, "name": "Blue", "captain": bob, "members": [bob]},
+            ],
+            "winning_team": 11,
+            "draft": {
+                "draft_style": "snake",
+                "draft_rounds": [{"captain": alice, "choice": bob, "pick_number": 1}],
+            },
+            "games": [
+                {
+                    "round": 1,
+                    "radiant_team": {"name": "Red"},
+                    "dire_team": {"name": "Blue"},
+                    "winning_team": {"name": "Blue"},
+                }
+            ],
+            **extra,
+        }
+
+    def test_import_batch_creates_everything(self):
+        (tournament,) = TournamentImporter().import_batch([self._tournament(1, "Cup")])
+
+        tournament.refresh_from_db()
+        self.assertEqual(set(tournament.users.all()), {self.alice, self.bob})
+        self.assertEqual(tournament.winning_team.name, "Blue")
+        red = Team.objects.get(tournament=tournament, name="Red")
+        self.assertEqual(
+            (red.captain, list(red.members.all())), (self.alice, [self.alice])
+        )
+        draft_round = DraftRound.objects.get(draft__tournament=tournament)
+        self.assertEqual(
+            (draft_round.captain, draft_round.choice), (self.alice, self.bob)
+        )
+        game = Game.objects.get(tournament=tournament)
+        self.assertEqual((game.radiant_team, game.winning_team.name), (red, "Blue"))
+
+    def test_incremental_sync_only_touches_changed_tournaments(self):
+        Tournament.objects.create(name="Local only", date_played="2025-01-01")
+        importer = TournamentImporter()
+        data = [self._tournament(1, "Cup"), self._tournament(2, "League")]
+
+        counts = importer.sync(iter(data), incremental=True, source="test")
+        # No previous state: a full sync
+        self.assertEqual((counts["created"], counts["deleted"]), (2, 1))
+        unchanged = Tournament.objects.get(name="League")
+
+        data = [self._tournament(2, "League"), self._tournament(3, "New")]
+        counts = importer.sync(
+            iter([self._tournament(1, "Cup", state="in_progress"), *data]),
+            incremental=True,
+            source="test",
+        )
+
+        self.assertEqual(
+            counts,
+            dict(created=1, updated=1, unchanged=1, deleted=0, failed=0),
+        )
+        self.assertEqual(
+            sorted(Tournament.objects.values_list("name", flat=True)),
+            ["Cup", "League", "New"],
+        )
+        self.assertTrue(Tournament.objects.filter(pk=unchanged.pk).exists())
+        self.assertEqual(Tournament.objects.get(name="Cup").state, "in_progress")
+
+        counts = importer.sync(iter(data), incremental=True, source="test")
+        self.assertEqual((counts["unchanged"], counts["deleted"]), (2, 1))
+        self.assertFalse(Tournament.objects.filter(name="Cup").exists())
+
+    def test_failed_update_keeps_previous_tournament(self):
+        importer = TournamentImporter()
+        importer.sync(
+            iter([self._tournament(1, "Cup"), self._tournament(2, "League")]),
+            incremental=True,
+            source="test",
+        )
+        cup = Tournament.objects.get(name="Cup")
+
+        broken = self._tournament(1, "Cup", date_played="not a date")
+        counts = importer.sync(
+            iter([broken, self._tournament(2, "League", state="in_progress")]),
+            incremental=True,
+            source="test",
+        )
+
+        self.assertEqual((counts["updated"], counts["failed"]), (2, 1))
+        self.assertTrue(Game.objects.filter(tournament=cup).exists())
+        self.assertEqual(Tournament.objects.get(name="League").state, "in_progress")
+
+        counts = importer.sync(
+            iter([self._tournament(1, "Cup", state="in_progress")]),
+            incremental=True,
+            source="test",
+        )
+        self.assertEqual((counts["updated"], counts["deleted"]), (1, 1))
+        self.assertEqual(Tournament.objects.get(name="Cup").state, "in_progress")
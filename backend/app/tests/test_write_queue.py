@@ -0,0 +1,45 @@
+"""Tests for the group-commit write queue."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import TransactionTestCase
+
+from app.models import PositionsModel
+from app.utils.write_queue import WriteQueue
+
+
+class WriteQueueTest(TransactionTestCase):
+    def setUp(self):
+        self.queue = WriteQueue(enabled=True)
+
+    def tearDown(self):
+        self.queue.stop()
+
+    def test_concurrent_writes_are_committed(self):
+        def create(value):
+            return PositionsModel.objects.create(carry=value).pk
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            pks = list(pool.map(lambda v: self.queue.run(create, v), range(40)))
+
+        self.assertEqual(len(set(pks)), 40)
+        self.assertEqual(PositionsModel.objects.filter(pk__in=pks).count(), 40)
+
+    def test_failed_write_only_rolls_back_itself(self):
+        def fail():
+            PositionsModel.objects.create(carry=1)
+            raise ValueError("boom")
+
+        ok = self.queue.submit(lambda: PositionsModel.objects.create(carry=2).pk)
+        bad = self.queue.submit(fail)
+
+        self.assertTrue(PositionsModel.objects.filter(pk=ok.result()).exists())
+        with self.assertRaises(ValueError):
+            bad.result()
+        self.assertFalse(PositionsModel.objects.filter(carry=1).exists())
+
+    def test_disabled_queue_runs_inline(self):
+        queue = WriteQueue(enabled=False)
+        pk = queue.run(lambda: PositionsModel.objects.create(carry=3).pk)
+        self.assertIsNone(queue._thread)
+        self.assertTrue(PositionsModel.objects.filter(pk=pk).exists())
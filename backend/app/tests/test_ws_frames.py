@@ -0,0 +1,147 @@
+"""Tests for pre-encoded WebSocket frames."""
+
+import json
+import zlib
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+
+from app import ws_frames
+from app.consumers import HeroDraftConsumer, event_frame
+
+
+class EncodeTest(SimpleTestCase):
+    def test_splices_raw_json(self):
+        state = json.dumps({"id": 7, "state": "drafting"})
+
+        text = ws_frames.encode({"type": "herodraft_event"}, {"draft_state": state})
+
+        self.assertEqual(
+            json.loads(text),
+            {"type": "herodraft_event", "draft_state": {"id": 7, "state": "drafting"}},
+        )
+
+    def test_stdlib_fallback_matches_orjson(self):
+        message = {"type": "draft_event", "event": {"name": "Ærø", "n": [1, None]}}
+        fast = ws_frames.encode(message)
+
+        with patch.object(ws_frames, "orjson", None):
+            slow = ws_frames.encode(message)
+
+        self.assertEqual(json.loads(fast), json.loads(slow))
+
+    def test_frame_carries_encoded_message(self):
+        message = ws_frames.frame(
+            "draft.event",
+            "draft_3",
+            ws_frames.draft_event_message({"payload": {"event_type": "x"}}),
+        )
+
+        self.assertEqual(message["type"], "draft.event")
+        self.assertEqual(
+            json.loads(message["frame"]),
+            {"type": "draft_event", "event": {"event_type": "x"}},
+        )
+
+
+class EventFrameTest(SimpleTestCase):
+    def test_forwards_frame_verbatim(self):
+        event = {"type": "herodraft.event", "frame": '{"type":"herodraft_event"}'}
+
+        self.assertIs(
+            event_frame(event, ws_frames.herodraft_event_message), event["frame"]
+        )
+
+    def test_encodes_messages_without_frame(self):
+        event = {
+            "type": "herodraft.event",
+            "event_type": "hero_selected",
+            "event_id": None,
+            "metadata": {"hero_id": 1},
+        }
+
+        self.assertEqual(
+            json.loads(event_frame(event, ws_frames.herodraft_event_message)),
+            {
+                "type": "herodraft_event",
+                "event_type": "hero_selected",
+                "metadata": {"hero_id": 1},
+            },
+        )
+
+
+class NormalizeTest(SimpleTestCase):
+    def test_users_are_sent_once(self):
+        alice = {"pk": 1, "username": "alice", "positions": {"carry": 1}}
+        bob = {"pk": 2, "username": "bob", "positions": {"carry": 5}}
+        message = {
+            "type": "draft_event",
+            "draft_state": {
+                "teams": [{"captain": alice, "members": [alice, bob]}],
+                "users_remaining": [bob],
+            },
+        }
+
+        normalized = ws_frames.normalize(message)
+
+        self.assertEqual(
+            normalized["draft_state"],
+            {"teams": [{"captain": 1, "members": [1, 2]}], "users_remaining": [2]},
+        )
+        self.assertEqual(normalized["entities"], {"users": {"1": alice, "2": bob}})
+
+    def test_messages_without_users_are_unchanged(self):
+        message = {"type": "herodraft_tick", "current_round": 3}
+        self.assertEqual(ws_frames.normalize(message), message)
+
+
+class FrameOptionsTest(SimpleTestCase):
+    def test_from_query_string(self):
+        options = ws_frames.FrameOptions.from_scope(
+            {"query_string": b"format=normalized&compress=deflate"}
+        )
+        self.assertEqual(options, ws_frames.FrameOptions("normalized", "deflate"))
+
+    def test_unknown_values_fall_back_to_defaults(self):
+        options = ws_frames.FrameOptions.from_scope(
+            {"query_string": b"format=xml&compress=br"}
+        )
+        self.assertEqual(options, ws_frames.DEFAULT_FRAME_OPTIONS)
+
+    def test_deflate_round_trip_and_memo(self):
+        text = ws_frames.encode({"type": "x", "user": {"pk": 1, "username": "a"}})
+        options = ws_frames.FrameOptions("normalized", "deflate")
+
+        data = ws_frames.render(text, options, "frame-1")
+
+        self.assertIs(ws_frames.render(text, options, "frame-1"), data)
+        self.assertEqual(
+            json.loads(zlib.decompress(data, wbits=-zlib.MAX_WBITS)),
+            {
+                "type": "x",
+                "user": 1,
+                "entities": {"users": {"1": {"pk": 1, "username": "a"}}},
+            },
+        )
+        self.assertIs(ws_frames.render(text, ws_frames.DEFAULT_FRAME_OPTIONS), text)
+
+
+class HeroDraftKickedTest(SimpleTestCase):
+    def test_kick_uses_the_negotiated_frame_format(self):
+        consumer = HeroDraftConsumer()
+        consumer.scope = {"query_string": b"compress=deflate"}
+        consumer.draft_id, consumer.user = 1, SimpleNamespace(id=2)
+        consumer.send, consumer.close = AsyncMock(), AsyncMock()
+
+        async_to_sync(consumer.herodraft_kicked)(
+            {"type": "herodraft.kicked", "reason": "new_connection"}
+        )
+
+        data = consumer.send.call_args.kwargs["bytes_data"]
+        self.assertEqual(
+            json.loads(zlib.decompress(data, wbits=-zlib.MAX_WBITS)),
+            {"type": "herodraft_kicked", "reason": "new_connection"},
+        )
+        consumer.close.assert_awaited_once_with(code=4000)
@@ -3,49 +3,202 @@ Utility functions for Discord avatar management
 """
 
 import logging
-
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from cacheops import invalidate_obj, no_invalidation
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import F, Q
+from django.utils import timezone
 
 User = get_user_model()
 
 
-def refresh_invalid_avatars(batch_size=50):
+# Beat runs of refresh_discord_avatars per day (every 5 minutes)
+AVATAR_REFRESH_RUNS_PER_DAY = 288
+AVATAR_REFRESH_MIN_BATCH = 50
+AVATAR_REFRESH_WORKERS = 8
+
+CDN_AVATAR_URL = "https://cdn.discordapp.com/avatars/{discord_id}/{avatar}.{ext}"
+
+
+class DiscordRateLimiter:
+    """
+    Shared gate for Discord API calls made from worker threads.
+
+    Tracks the ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset-After``
+    headers of the last response and makes callers wait for the bucket to
+    reset once it is exhausted (or for ``retry_after`` after a 429).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+
+    def wait(self):
+        with self._lock:
+            delay = self._blocked_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    def update(self, response):
+        headers = response.headers
+        delay = None
+        if response.status_code == 429:
+            try:
+                delay = float(response.json().get("retry_after", 1))
+            except ValueError:
+                delay = float(headers.get("Retry-After", 1))
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = float(headers.get("X-RateLimit-Reset-After", 1))
+        if delay is not None:
+            with self._lock:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+
+def _avatar_url(discord_id, avatar):
+    ext = "gif" if avatar.startswith("a_") else "png"
+    return CDN_AVATAR_URL.format(discord_id=discord_id, avatar=avatar, ext=ext)
+
+
+def _check_avatar(session, limiter, discord_id, avatar):
     """
-    Check and refresh avatars that return 404 errors.
+    Verify one user's avatar, asking the Discord API only if the CDN misses.
+
+    Returns:
+        (checked, new_avatar): checked is False on transient failures so the
+        user stays at the front of the refresh queue
+    """
+    if avatar:
+        try:
+            response = session.head(_avatar_url(discord_id, avatar), timeout=5)
+            if response.status_code == 200:
+                return True, avatar
+        except requests.RequestException:
+            return False, avatar
+
+    token = getattr(settings, "DISCORD_BOT_TOKEN", None)
+    if not token:
+        return True, avatar
+
+    url = f"{settings.DISCORD_API_BASE_URL}/users/{discord_id}"
+    for _ in range(2):  # One retry after a 429
+        limiter.wait()
+        try:
+            response = session.get(
+                url, headers={"Authorization": f"Bot {token}"}, timeout=10
+            )
+        except requests.RequestException:
+            return False, avatar
+        limiter.update(response)
+        if response.status_code == 200:
+            return True, response.json().get("avatar")
+        if response.status_code != 429:
+            # Unknown users and other client errors won't fix themselves
+            return response.status_code < 500, avatar
+    return False, avatar
+
+
+def stale_avatar_users(batch_size, checked_before=None, exclude_pks=()):
+    """
+    Users whose avatars were verified longest ago (never-checked first).
 
     Args:
-        batch_size (int): Number of users to process at once
+        batch_size: Maximum number of users to return
+        checked_before: Only users not checked since this time
+        exclude_pks: Users to leave out (e.g. already failed this run)
+    """
+    users = User.objects.filter(discordId__isnull=False).exclude(pk__in=exclude_pks)
+    if checked_before is not None:
+        users = users.filter(
+            Q(avatar_checked_at__isnull=True) | Q(avatar_checked_at__lt=checked_before)
+        )
+    # Bypass cacheops: the ordering changes after every batch
+    return list(
+        users.nocache()
+        .order_by(F("avatar_checked_at").asc(nulls_first=True), "pk")
+        .only("pk", "username", "discordId", "avatar", "avatar_checked_at")[:batch_size]
+    )
+
+
+def refresh_avatar_batch(users, max_workers=AVATAR_REFRESH_WORKERS):
+    """
+    Check a batch of users' avatars concurrently and save the results.
+
+    CDN checks and Discord API lookups run on a thread pool sharing one
+    pooled HTTP session and one rate limiter. Results are written with a
+    single ``bulk_update``.
 
     Returns:
-        dict: Summary of results
+        dict: Summary with checked/updated/failed counts
     """
     results = {"checked": 0, "updated": 0, "failed": 0, "errors": []}
+    if not users:
+        return results
+
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=2, pool_maxsize=max_workers
+    )
+    session.mount("https://", adapter)
+    limiter = DiscordRateLimiter()
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = pool.map(
+            lambda user: _check_avatar(session, limiter, user.discordId, user.avatar),
+            users,
+        )
+        outcomes = list(outcomes)
+
+    now = timezone.now()
+    checked, changed = [], []
+    for user, (ok, new_avatar) in zip(users, outcomes):
+        if not ok:
+            results["failed"] += 1
+            results["errors"].append(f"Could not verify avatar for {user.username}")
+            continue
+        results["checked"] += 1
+        user.avatar_checked_at = now
+        if new_avatar != user.avatar:
+            user.avatar = new_avatar
+            changed.append(user)
+        checked.append(user)
+
+    if checked:
+        with no_invalidation:
+            User.objects.bulk_update(checked, ["avatar", "avatar_checked_at"])
+        for user in changed:
+            invalidate_obj(user)
+            logging.info(f"Updated avatar for user {user.username}")
+    results["updated"] = len(changed)
+    return results
 
-    # Get users with Discord IDs
-    users = User.objects.filter(discordId__isnull=False, avatar__isnull=False).exclude(
-        avatar=""
-    )[:batch_size]
-
-    for user in users:
-        try:
-            results["checked"] += 1
-            old_avatar = user.avatar
 
-            # This will check the URL and update if needed
-            updated = user.check_and_update_avatar()
+def refresh_invalid_avatars(batch_size=None):
+    """
+    Verify the avatars of the least recently checked users.
 
-            if updated:
-                results["updated"] += 1
-                logging.info(f"Updated avatar for user {user.username}")
+    Each run continues where the last one stopped (by ``avatar_checked_at``),
+    so repeated runs cycle through every user.
 
-        except Exception as e:
-            results["failed"] += 1
-            error_msg = f"Error processing user {user.username}: {str(e)}"
-            results["errors"].append(error_msg)
-            logging.error(error_msg)
+    Args:
+        batch_size (int): Users to check; defaults to enough that the beat
+            schedule covers all users within a day
 
-    return results
+    Returns:
+        dict: Summary of results
+    """
+    if batch_size is None:
+        total = User.objects.filter(discordId__isnull=False).nocache().count()
+        batch_size = max(
+            AVATAR_REFRESH_MIN_BATCH,
+            math.ceil(total / AVATAR_REFRESH_RUNS_PER_DAY),
+        )
+    return refresh_avatar_batch(stale_avatar_users(batch_size))
 
 
 def refresh_user_avatar(user_id):
@@ -0,0 +1,32 @@
+"""Throwaway migrated database for benchmarks and load tests."""
+
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def scratch_database(using=DEFAULT_DB_ALIAS):
+    """
+    Point ``using`` at a freshly migrated database for the enclosed block.
+
+    Uses the test-database machinery with a file in a temporary directory,
+    so seeded data never touches the configured database and SQLite runs
+    with the same pragmas as in production.
+    """
+    from app.utils.write_queue import write_queue
+
+    connection = connections[using]
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.settings_dict["TEST"]["NAME"] = str(Path(tmp) / "scratch.sqlite3")
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        try:
+            yield
+        finally:
+            # The write queue keeps its own connection to the scratch file
+            write_queue.stop()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
@@ -0,0 +1,135 @@
+"""Process-local write queue that groups small writes into shared transactions."""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+log = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class WriteQueue:
+    """
+    Serialize a process's small writes through one thread (group commit).
+
+    SQLite allows a single writer at a time, so many threads each opening a
+    short transaction (consumers flagging captain connections, tick loops
+    recording events) mostly wait on each other's locks. Writes submitted
+    here are executed by a single worker thread, up to ``max_batch`` at a
+    time inside one transaction. Each write runs in its own savepoint, so a
+    failing write only rolls back itself.
+
+    ``run`` blocks until the write has committed and returns its result, so
+    callers can keep broadcasting after commit. When ``DB_WRITE_QUEUE`` is
+    off (the default under tests) writes run inline in their own
+    transaction instead.
+    """
+
+    def __init__(
+        self, using=DEFAULT_DB_ALIAS, max_batch=100, max_delay=0.002, enabled=None
+    ):
+        self.using = using
+        self._enabled = enabled
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        if self._enabled is not None:
+            return self._enabled
+        return getattr(settings, "DB_WRITE_QUEUE", False)
+
+    def run(self, fn, *args, **kwargs):
+        """Execute ``fn`` in a transaction and return its result after commit."""
+        if not self.enabled or threading.current_thread() is self._thread:
+            with transaction.atomic(using=self.using):
+                return fn(*args, **kwargs)
+        return self.submit(fn, *args, **kwargs).result()
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue ``fn`` and return a Future resolved once its batch commits."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((fn, args, kwargs, future))
+        return future
+
+    def stop(self, timeout=5):
+        """Drain pending writes and stop the worker thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _ensure_worker(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._work, name="db-write-queue", daemon=True
+                )
+                self._thread.start()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while batch[-1] is not _STOP and len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                batch.append(
+                    self._queue.get(timeout=timeout)
+                    if timeout > 0
+                    else self._queue.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _work(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is _STOP
+            if stop:
+                batch.pop()
+            if batch:
+                self._commit(batch)
+            if stop:
+                connections[self.using].close()
+                return
+
+    def _commit(self, batch):
+        outcomes = []
+        try:
+            with transaction.atomic(using=self.using):
+                for fn, args, kwargs, future in batch:
+                    try:
+                        with transaction.atomic(using=self.using):
+                            outcomes.append((future, fn(*args, **kwargs), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+        except Exception as e:
+            log.exception(f"Write batch of {len(batch)} failed to commit")
+            # The worker keeps its connection open; reconnect after a failure
+            connections[self.using].close()
+            for _, _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_queue = WriteQueue()
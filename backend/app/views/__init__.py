@@ -15,6 +15,7 @@ from app.views_main import (  # ViewSets; Create views; Functions
     TournamentsBasicView,
     TournamentView,
     UserCreateView,
+    UserTeamHistoryView,
     UserView,
     ajax_auth,
     current_user,
@@ -28,6 +29,7 @@ from app.views_main import (  # ViewSets; Create views; Functions
     require_city,
     require_country,
     require_email,
+    session_bootstrap,
     validation_sent,
 )
 
@@ -44,6 +46,7 @@ __all__ = [
     "DraftRoundView",
     "GameView",
     "TournamentsBasicView",
+    "UserTeamHistoryView",
     # Create views
     "UserCreateView",
     "GameCreateView",
@@ -62,6 +65,7 @@ __all__ = [
     "require_city",
     "ajax_auth",
     "current_user",
+    "session_bootstrap",
     "refresh_avatar",
     "refresh_user_avatar_admin",
     "refresh_all_avatars",
@@ -2,7 +2,6 @@
 
 from cacheops import invalidate_obj
 from django.db import transaction
-from django.db.models import Max
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
@@ -20,29 +19,40 @@ from app.serializers import (
     BracketGenerateSerializer,
     BracketSaveSerializer,
 )
+from app.services import bracket_engine
+from app.services.bracket_graph import STATE_FIELDS, BracketGraph
+from app.services.bracket_writer import BracketWriter
+from app.services.draft_analytics import HeroDraftStats
+from common.db_router import replica_reads
 
 
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def get_bracket(request, tournament_id):
     """Get bracket structure for a tournament."""
-    try:
-        tournament = Tournament.objects.get(pk=tournament_id)
-    except Tournament.DoesNotExist:
-        return Response(
-            {"error": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND
-        )
+    with replica_reads(request):
+        try:
+            tournament = Tournament.objects.get(pk=tournament_id)
+        except Tournament.DoesNotExist:
+            return Response(
+                {"error": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND
+            )
 
-    games = (
-        Game.objects.filter(tournament=tournament)
-        .select_related(
-            "radiant_team", "dire_team", "winning_team", "next_game", "loser_next_game"
+        games = (
+            Game.objects.filter(tournament=tournament)
+            .select_related(
+                "radiant_team",
+                "dire_team",
+                "winning_team",
+                "next_game",
+                "loser_next_game",
+            )
+            .order_by("bracket_type", "round", "position")
         )
-        .order_by("bracket_type", "round", "position")
-    )
 
-    serializer = BracketGameSerializer(games, many=True)
-    return Response({"tournamentId": tournament_id, "matches": serializer.data})
+        serializer = BracketGameSerializer(games, many=True)
+        data = serializer.data
+    return Response({"tournamentId": tournament_id, "matches": data})
 
 
 @api_view(["POST"])
@@ -72,14 +82,38 @@ def generate_bracket(request, tournament_id):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    # TODO: Implement bracket generation logic
-    # For now, return empty bracket structure
-    return Response(
-        {
-            "tournamentId": tournament_id,
-            "matches": [],
-            "message": "Bracket generation placeholder",
-        }
+    seeding_method = serializer.validated_data["seeding_method"]
+    teams = tournament.teams.select_related("captain").prefetch_related("members")
+    seeded = bracket_engine.seed_teams(
+        ((team.pk, team_seed_mmr(team, seeding_method)) for team in teams),
+        method=seeding_method,
+    )
+    if len(seeded) < 2:
+        return Response(
+            {"error": "At least 2 teams are required to generate a bracket"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    matches = bracket_engine.generate(tournament.tournament_type, seeded)
+
+    if serializer.validated_data["persist"]:
+        BracketWriter(tournament).save(matches)
+        saved_games = Game.objects.filter(tournament=tournament).select_related(
+            "radiant_team", "dire_team", "winning_team", "next_game", "loser_next_game"
+        )
+        matches = BracketGameSerializer(saved_games, many=True).data
+
+    return Response({"tournamentId": tournament_id, "matches": matches})
+
+
+def team_seed_mmr(team, seeding_method):
+    """Seeding MMR for a team (members must be prefetched)."""
+    captain_mmr = team.captain.mmr if team.captain and team.captain.mmr else 0
+    if seeding_method == "captain_mmr":
+        return captain_mmr
+    # Same total as TeamSerializer.get_total_mmr
+    return captain_mmr + sum(
+        member.mmr or 0 for member in team.members.all() if member.pk != team.captain_id
     )
 
 
@@ -113,56 +147,9 @@ def save_bracket(request, tournament_id):
 
     matches = serializer.validated_data["matches"]
 
-    # Delete existing bracket games for this tournament
-    Game.objects.filter(tournament=tournament).delete()
-
-    # Pass 1: Create all games without FK relationships
-    # Map frontend ID -> database PK
-    id_to_game = {}
-
-    for match in matches:
-        game = Game.objects.create(
-            tournament=tournament,
-            round=match.get("round", 1),
-            position=match.get("position", 0),
-            bracket_type=match.get("bracketType", "winners"),
-            elimination_type=match.get("eliminationType", "double"),
-            status=match.get("status", "pending"),
-            next_game_slot=match.get("nextMatchSlot"),
-            loser_next_game_slot=match.get("loserNextMatchSlot"),
-            swiss_record_wins=match.get("swissRecordWins", 0),
-            swiss_record_losses=match.get("swissRecordLosses", 0),
-        )
-
-        # Set teams if provided
-        radiant_team = match.get("radiantTeam")
-        if radiant_team and radiant_team.get("pk"):
-            game.radiant_team_id = radiant_team["pk"]
-
-        dire_team = match.get("direTeam")
-        if dire_team and dire_team.get("pk"):
-            game.dire_team_id = dire_team["pk"]
-
-        game.save()
-        id_to_game[match["id"]] = game
-
-    # Pass 2: Wire up FK relationships
-    for match in matches:
-        game = id_to_game[match["id"]]
-        updated = False
-
-        next_match_id = match.get("nextMatchId")
-        if next_match_id and next_match_id in id_to_game:
-            game.next_game = id_to_game[next_match_id]
-            updated = True
-
-        loser_next_match_id = match.get("loserNextMatchId")
-        if loser_next_match_id and loser_next_match_id in id_to_game:
-            game.loser_next_game = id_to_game[loser_next_match_id]
-            updated = True
-
-        if updated:
-            game.save()
+    # Diff against existing games so unchanged games (and their linked
+    # Steam matches, HeroDrafts and LeagueMatches) are left untouched
+    BracketWriter(tournament).save(matches)
 
     # Return saved games
     saved_games = Game.objects.filter(tournament=tournament).select_related(
@@ -170,11 +157,6 @@ def save_bracket(request, tournament_id):
     )
     result_serializer = BracketGameSerializer(saved_games, many=True)
 
-    # Invalidate caches after saving bracket - invalidate each saved game
-    for game in saved_games:
-        invalidate_obj(game)
-    invalidate_obj(tournament)
-
     return Response({"tournamentId": tournament_id, "matches": result_serializer.data})
 
 
@@ -185,36 +167,7 @@ def calculate_placement(game):
     Returns placement number or None if team isn't eliminated
     (e.g., winners bracket losers go to losers bracket).
     """
-    # Grand finals loser = 2nd place
-    if game.bracket_type == "grand_finals":
-        return 2
-
-    # Losers bracket elimination
-    if game.bracket_type == "losers":
-        # Find max losers round for this tournament
-        max_round = Game.objects.filter(
-            tournament=game.tournament,
-            bracket_type="losers",
-        ).aggregate(Max("round"))["round__max"]
-
-        if max_round is None:
-            return 3  # Only one losers game = losers finals
-
-        rounds_from_final = max_round - game.round
-
-        if rounds_from_final == 0:  # Losers finals
-            return 3
-        elif rounds_from_final <= 2:  # Losers semi (4th)
-            return 4
-        else:
-            # Each earlier round: 5th-6th, 7th-8th, etc.
-            base = 5
-            for i in range(rounds_from_final - 3):
-                base += 2**i
-            return base
-
-    # Winners bracket elimination → goes to losers (no placement yet)
-    return None
+    return BracketGraph.for_game(game).placement(game.pk)
 
 
 @api_view(["POST"])
@@ -226,7 +179,9 @@ def advance_winner(request, game_id):
     Requires league staff access.
     """
     try:
-        game = Game.objects.get(pk=game_id)
+        game = Game.objects.select_related(
+            "radiant_team", "dire_team", "tournament"
+        ).get(pk=game_id)
     except Game.DoesNotExist:
         return Response({"error": "Game not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -260,56 +215,193 @@ def advance_winner(request, game_id):
         winning_team = game.dire_team
         losing_team = game.radiant_team
 
-    game.winning_team = winning_team
-    game.status = "completed"
-    game.save()
+    # Plan winner/loser advancement and placements from the cached topology
+    advancement = BracketGraph.for_game(game).advance(
+        game.pk, winning_team.pk, losing_team.pk if losing_team else None
+    )
 
-    # Advance winner to next game if exists
-    if game.next_game and game.next_game_slot:
-        next_game = game.next_game
-        if game.next_game_slot == "radiant":
-            next_game.radiant_team = winning_team
-        else:
-            next_game.dire_team = winning_team
-        next_game.save()
+    # Persist all touched games and teams with one bulk write each
+    games = {game.pk: game}
+    successor_pks = set(advancement.game_updates) - {game.pk}
+    if successor_pks:
+        games.update(Game.objects.in_bulk(successor_pks))
+    changed_games = []
+    for pk, updates in advancement.game_updates.items():
+        if pk not in games:
+            continue
+        invalidate_obj(games[pk])  # Old state, before the update below
+        for attr, value in updates.items():
+            setattr(games[pk], attr, value)
+        changed_games.append(games[pk])
+    fields = {attr for updates in advancement.game_updates.values() for attr in updates}
+    Game.objects.bulk_update(
+        changed_games, [Game._meta.get_field(attr).name for attr in sorted(fields)]
+    )
 
-    # Handle loser path
+    teams = {winning_team.pk: winning_team}
     if losing_team:
-        if (
-            game.elimination_type == "double"
-            and game.loser_next_game
-            and game.loser_next_game_slot
-        ):
-            # Advance loser to losers bracket
-            loser_game = game.loser_next_game
-            if game.loser_next_game_slot == "radiant":
-                loser_game.radiant_team = losing_team
-            else:
-                loser_game.dire_team = losing_team
-            loser_game.save()
-        else:
-            # No loser path - team is eliminated, set placement
-            placement = calculate_placement(game)
-            if placement:
-                losing_team.placement = placement
-                losing_team.save()
-
-    # Grand finals - also set winner's placement
-    if game.bracket_type == "grand_finals":
-        winning_team.placement = 1
-        winning_team.save()
+        teams[losing_team.pk] = losing_team
+    placed_teams = []
+    for team_pk, placement in advancement.placements.items():
+        teams[team_pk].placement = placement
+        placed_teams.append(teams[team_pk])
+    if placed_teams:
+        Team.objects.bulk_update(placed_teams, ["placement"])
 
     # Invalidate caches after advancing winner
-    invalidate_obj(game)
+    for changed_game in changed_games:
+        invalidate_obj(changed_game)
     invalidate_obj(winning_team)
     if losing_team:
         invalidate_obj(losing_team)
     if game.tournament:
         invalidate_obj(game.tournament)
+    # The bulk update sends no post_save, so drop the league stats here
+    HeroDraftStats.invalidate_on_commit(
+        game.league_id, game.tournament.league_id if game.tournament else None
+    )
 
     return Response(BracketGameSerializer(game).data)
 
 
+@api_view(["POST"])
+@permission_classes([AllowAny])
+def simulate_bracket(request, tournament_id):
+    """Preview the rest of a bracket without saving anything.
+
+    Undecided games are won by the radiant side unless overridden with
+    ``{"winners": {"<game pk>": "radiant" | "dire"}}``.
+    """
+    try:
+        tournament = Tournament.objects.get(pk=tournament_id)
+    except Tournament.DoesNotExist:
+        return Response(
+            {"error": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    winners = request.data.get("winners") or {}
+    if not isinstance(winners, dict) or any(
+        slot not in ["radiant", "dire"] for slot in winners.values()
+    ):
+        return Response(
+            {"error": "winners must map game ids to 'radiant' or 'dire'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        winners = {int(pk): slot for pk, slot in winners.items()}
+    except (TypeError, ValueError):
+        return Response(
+            {"error": "winners must map game ids to 'radiant' or 'dire'"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    graph = BracketGraph.for_tournament(tournament.pk)
+    state = {
+        row["pk"]: row
+        for row in Game.objects.filter(tournament=tournament).values(
+            "pk", *STATE_FIELDS
+        )
+    }
+    result = graph.simulate(state, winners)
+
+    return Response(
+        {
+            "tournamentId": tournament_id,
+            "matches": result["games"],
+            "placements": result["placements"],
+        }
+    )
+
+
+@api_view(["POST"])
+@permission_classes([IsAuthenticated])
+def swiss_next_round(request, tournament_id):
+    """Pair and save the next round of a Swiss tournament.
+
+    Pairings come from the results of the completed Swiss games. Optional
+    ``wins_to_advance`` / ``losses_to_eliminate`` stop pairing teams that
+    have already qualified or been eliminated.
+    """
+    try:
+        tournament = Tournament.objects.get(pk=tournament_id)
+    except Tournament.DoesNotExist:
+        return Response(
+            {"error": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    if not can_edit_tournament(request.user, tournament):
+        return Response(
+            {
+                "error": "You do not have permission to generate brackets for this tournament"
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    if tournament.tournament_type != "swiss":
+        return Response(
+            {"error": "Tournament is not a Swiss tournament"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    limits = {}
+    for key in ("wins_to_advance", "losses_to_eliminate"):
+        value = request.data.get(key)
+        if value is None:
+            continue
+        try:
+            limits[key] = int(value)
+        except (TypeError, ValueError):
+            return Response(
+                {"error": f"{key} must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    games = list(
+        Game.objects.filter(tournament=tournament, bracket_type="swiss").values_list(
+            "round", "status", "radiant_team_id", "dire_team_id", "winning_team_id"
+        )
+    )
+    if any(game_status != "completed" for _, game_status, *_ in games):
+        return Response(
+            {"error": "All games of the current round must be completed"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    teams = tournament.teams.select_related("captain").prefetch_related("members")
+    seeded = bracket_engine.seed_teams(
+        (team.pk, team_seed_mmr(team, "mmr_total")) for team in teams
+    )
+    records, played = bracket_engine.swiss_standings(
+        (game[2:] for game in games), team_ids=seeded
+    )
+    round_number = max((game[0] for game in games), default=0) + 1
+    matches = bracket_engine.swiss_pairings(
+        records,
+        played,
+        round_number,
+        seeds={pk: seed for seed, pk in enumerate(seeded)},
+        **limits,
+    )
+    if not matches:
+        return Response(
+            {"error": "No teams left to pair"}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # The engine emits byes as completed wins, so the writer saves them as such
+    BracketWriter(tournament).save(matches, delete_missing=False)
+
+    saved_games = Game.objects.filter(
+        tournament=tournament, bracket_type="swiss", round=round_number
+    ).select_related("radiant_team", "dire_team", "winning_team")
+    return Response(
+        {
+            "tournamentId": tournament_id,
+            "round": round_number,
+            "matches": BracketGameSerializer(saved_games, many=True).data,
+        }
+    )
+
+
 @api_view(["PATCH"])
 @permission_classes([IsAuthenticated])
 def set_team_placement(request, tournament_id, team_id):
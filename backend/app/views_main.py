@@ -15,6 +15,7 @@ from django.utils import timezone
 from rest_framework import generics, permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.reverse import reverse
@@ -26,6 +27,7 @@ from social_django.models import AbstractUserSocialAuth, DjangoStorage
 from social_django.utils import load_strategy, psa
 
 from backend import settings
+from common.db_router import ReplicaReadMixin
 
 from .decorators import render_to
 from .models import (
@@ -59,12 +61,15 @@ from .serializers import (
     LeaguesSerializer,
     OrganizationSerializer,
     OrganizationsSerializer,
+    TeamHistorySerializer,
     TeamSerializer,
     TournamentListSerializer,
     TournamentSerializer,
     TournamentsSerializer,
     UserSerializer,
 )
+from .services.draft_analytics import HeroDraftStats
+from .services.session_bootstrap import SessionBootstrap
 
 log = logging.getLogger(__name__)
 from .utils.avatar_utils import refresh_user_avatar
@@ -231,7 +236,7 @@ class UserView(viewsets.ModelViewSet):
 
 
 @permission_classes((IsStaff,))
-class TournamentView(viewsets.ModelViewSet):
+class TournamentView(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = TournamentSerializer
     queryset = Tournament.objects.all()
     http_method_names = [
@@ -333,7 +338,7 @@ class TournamentView(viewsets.ModelViewSet):
 
 
 @permission_classes((IsStaff,))
-class TeamView(viewsets.ModelViewSet):
+class TeamView(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = TeamSerializer
     queryset = Team.objects.all()
     http_method_names = [
@@ -546,63 +551,45 @@ class UserCreateView(generics.CreateAPIView):
 def current_user(request):
     user = request.user
     if request.user.is_authenticated:
-        data = UserSerializer(user).data
+        return Response(SessionBootstrap.for_user(user), 201)
 
-        # Add active drafts info
-        active_drafts = []
+    else:
+        return Response()
 
-        # Team drafts: user is captain with pending pick in in_progress tournament
-        from app.models import DraftTeam, HeroDraft
 
-        pending_team_round = (
-            DraftRound.objects.filter(
-                captain=user,
-                choice__isnull=True,
-                draft__tournament__state="in_progress",
-            )
-            .select_related("draft__tournament")
-            .order_by("pick_number")
-            .first()
-        )
+@api_view(["GET"])
+@permission_classes((IsAuthenticated,))
+def session_bootstrap(request):
+    """
+    GET /api/session/bootstrap/
+    Slim per-user projection: profile, active drafts and current team.
+    Team history is served by /api/users/<pk>/teams/.
+    """
+    return Response(SessionBootstrap.for_user(request.user))
 
-        if pending_team_round:
-            active_drafts.append(
-                {
-                    "type": "team_draft",
-                    "tournament_pk": pending_team_round.draft.tournament.pk,
-                    "draft_state": pending_team_round.draft.tournament.state,
-                }
-            )
 
-        # Hero drafts: user is captain of a DraftTeam in an active HeroDraft
-        active_hero_states = [
-            "waiting_for_captains",
-            "rolling",
-            "choosing",
-            "drafting",
-        ]
-        hero_draft_teams = DraftTeam.objects.filter(
-            tournament_team__captain=user,
-            draft__state__in=active_hero_states,
-        ).select_related("draft__game__tournament")
-
-        for draft_team in hero_draft_teams:
-            hero_draft = draft_team.draft
-            active_drafts.append(
-                {
-                    "type": "hero_draft",
-                    "tournament_pk": hero_draft.game.tournament.pk,
-                    "game_pk": hero_draft.game.pk,
-                    "herodraft_pk": hero_draft.pk,
-                    "draft_state": hero_draft.state,
-                }
-            )
+class TeamHistoryPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
 
-        data["active_drafts"] = active_drafts
-        return Response(data, 201)
 
-    else:
-        return Response()
+class UserTeamHistoryView(generics.ListAPIView):
+    """
+    GET /api/users/<user_pk>/teams/
+    Paginated team history for a user, newest tournament first.
+    """
+
+    serializer_class = TeamHistorySerializer
+    pagination_class = TeamHistoryPagination
+    permission_classes = [AllowAny]
+
+    def get_queryset(self):
+        return (
+            Team.objects.filter(members=self.kwargs["user_pk"])
+            .select_related("tournament")
+            .order_by("-tournament__date_played", "-pk")
+        )
 
 
 from django.core.cache import cache
@@ -653,7 +640,7 @@ class GameCreateView(generics.CreateAPIView):
         serializer.save()
 
 
-class GameView(viewsets.ModelViewSet):
+class GameView(ReplicaReadMixin, viewsets.ModelViewSet):
     serializer_class = GameSerializer
     queryset = Game.objects.all()
     http_method_names = [
@@ -900,7 +887,7 @@ class OrganizationView(viewsets.ModelViewSet):
         return Response(data)
 
 
-class LeagueView(viewsets.ModelViewSet):
+class LeagueView(ReplicaReadMixin, viewsets.ModelViewSet):
     """League CRUD endpoints with org filtering."""
 
     queryset = League.objects.all()
@@ -1009,6 +996,12 @@ class LeagueView(viewsets.ModelViewSet):
         serializer = LeagueMatchSerializer(games, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"], url_path="herodraft-stats")
+    def herodraft_stats(self, request, pk=None):
+        """Hero pick/ban rates and timing across the league's completed drafts."""
+        league = self.get_object()
+        return Response(HeroDraftStats.for_league(league.pk))
+
 
 class TeamCreateView(generics.CreateAPIView):
     serializer_class = TeamSerializer
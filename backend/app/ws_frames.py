@@ -0,0 +1,214 @@
+"""
+Pre-encoded WebSocket frames for channel group fan-out.
+
+Broadcasts encode the client message once and send it through the channel
+layer as ``{"type": <handler>, "frame": <json text>, "frame_id": <id>}``;
+consumers forward the frame verbatim instead of re-encoding a dict per
+socket. Uses orjson when it is installed and the stdlib encoder otherwise.
+
+Connections may opt in, via the query string, to a normalized format and
+to compression (see ``FrameOptions``). Those variants are rendered once
+per frame and process, not once per socket.
+"""
+
+import json
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+from urllib.parse import parse_qs
+
+from telemetry.metrics import histogram, timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact JSON encoding of ``obj`` as UTF-8 bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def encode_bytes(message: dict, raw: Optional[dict[str, str]] = None) -> bytes:
+    """
+    Encode a client message, splicing in already-encoded JSON values.
+
+    ``raw`` maps extra keys to JSON text (e.g. a cached hero draft snapshot)
+    that is appended without being parsed and re-encoded. ``message`` must
+    not be empty.
+    """
+    body = dumps(message)
+    for key, value in (raw or {}).items():
+        body = b"%s,%s:%s}" % (body[:-1], dumps(key), value.encode())
+    return body
+
+
+def encode(message: dict, raw: Optional[dict[str, str]] = None) -> str:
+    """``encode_bytes`` as text, ready for ``send(text_data=...)``."""
+    return encode_bytes(message, raw).decode()
+
+
+def frame(
+    handler_type: str, group: str, message: dict, raw: Optional[dict[str, str]] = None
+) -> dict:
+    """
+    Channel layer message carrying ``message`` pre-encoded for ``group``.
+
+    Records ``ws.frame.encode.duration`` and ``ws.frame.bytes`` per group
+    kind and message type.
+    """
+    attributes = {
+        "ws.group_kind": group.split("_", 1)[0],
+        "ws.message_type": handler_type,
+    }
+    with timed("ws.frame.encode.duration", attributes):
+        body = encode_bytes(message, raw)
+    histogram("ws.frame.bytes", unit="By").record(len(body), attributes)
+    return {"type": handler_type, "frame": body.decode(), "frame_id": uuid.uuid4().hex}
+
+
+def _is_user(value: dict) -> bool:
+    # TournamentUserSerializer and its relatives
+    return "pk" in value and "username" in value
+
+
+def normalize(message: dict) -> dict:
+    """
+    Move every nested user object into ``entities.users``, keyed by pk.
+
+    Each place a user appeared (captains, members, ``users_remaining``,
+    round captains, ...) holds the user's pk instead, so a user repeated
+    across teams and rounds is sent once.
+    """
+    users = {}
+
+    def walk(value):
+        if isinstance(value, dict):
+            if _is_user(value):
+                users.setdefault(str(value["pk"]), {}).update(
+                    (key, walk(item)) for key, item in value.items()
+                )
+                return value["pk"]
+            return {key: walk(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [walk(item) for item in value]
+        return value
+
+    normalized = walk(message)
+    if users:
+        normalized["entities"] = {"users": users}
+    return normalized
+
+
+class FrameOptions(NamedTuple):
+    """
+    Per-connection frame rendering, from the WebSocket URL's query string.
+
+    ``?format=normalized`` sends ``normalize``d messages and
+    ``?compress=deflate`` sends each message as a binary frame of raw
+    DEFLATE data (``DecompressionStream("deflate-raw")`` in browsers).
+    """
+
+    format: str = "json"
+    compress: str = "none"
+
+    @classmethod
+    def from_scope(cls, scope: dict) -> "FrameOptions":
+        query = parse_qs(scope.get("query_string", b"").decode())
+        fmt = query.get("format", ["json"])[0]
+        compress = query.get("compress", ["none"])[0]
+        return cls(
+            format=fmt if fmt in ("json", "normalized") else "json",
+            compress=compress if compress in ("none", "deflate") else "none",
+        )
+
+
+DEFAULT_FRAME_OPTIONS = FrameOptions()
+
+# Recently rendered variants per (frame id, options); a broadcast reaches
+# every socket in the process within a few event-loop turns
+_RENDERED_CACHE_SIZE = 64
+_rendered: OrderedDict = OrderedDict()
+
+
+def _render(text: str, options: FrameOptions):
+    if options.format == "normalized":
+        text = encode(normalize(json.loads(text)))
+    if options.compress == "deflate":
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        return compressor.compress(text.encode()) + compressor.flush()
+    return text
+
+
+def render(text: str, options: FrameOptions, frame_id: Optional[str] = None):
+    """The frame as sent with ``options``: text, or bytes when compressed."""
+    if options == DEFAULT_FRAME_OPTIONS:
+        return text
+    if frame_id is None:
+        return _render(text, options)
+    key = (frame_id, options)
+    rendered = _rendered.get(key)
+    if rendered is None:
+        rendered = _rendered[key] = _render(text, options)
+        if len(_rendered) > _RENDERED_CACHE_SIZE:
+            _rendered.popitem(last=False)
+    return rendered
+
+
+def draft_event_message(event: dict) -> dict:
+    """Client message for a team draft event (draft and tournament groups)."""
+    message = {"type": "draft_event", "event": event["payload"]}
+    # Include draft state if available (allows clients to update without API calls)
+    if event.get("draft_state"):
+        message["draft_state"] = event["draft_state"]
+    return message
+
+
+HERODRAFT_EVENT_FIELDS = (
+    "event_id",
+    "seq",
+    "draft_team",
+    "draft_state",
+    "timestamp",
+    "metadata",
+)
+
+
+def herodraft_event_message(event: dict) -> dict:
+    """Client message for a hero draft event, omitting fields without a value."""
+    # A missing key would serialize to null, which fails Zod validation where
+    # .optional() expects undefined, not null
+    message = {"type": "herodraft_event", "event_type": event.get("event_type")}
+    for field in HERODRAFT_EVENT_FIELDS:
+        if event.get(field) is not None:
+            message[field] = event[field]
+    return message
+
+
+HERODRAFT_TICK_FIELDS = (
+    "current_round",
+    "active_team_id",
+    "grace_time_remaining_ms",
+    "team_a_id",
+    "team_a_reserve_ms",
+    "team_b_id",
+    "team_b_reserve_ms",
+    "draft_state",
+)
+
+
+def herodraft_tick_message(tick: dict) -> dict:
+    """Client message for a hero draft timer tick."""
+    return {
+        "type": "herodraft_tick",
+        **{field: tick.get(field) for field in HERODRAFT_TICK_FIELDS},
+    }
+
+
+def herodraft_kicked_message(event: dict) -> dict:
+    """Client message for a captain connection replaced by a newer one."""
+    return {"type": "herodraft_kicked", "reason": event.get("reason", "unknown")}
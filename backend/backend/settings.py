@@ -124,6 +124,8 @@ MIDDLEWARE = [
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "telemetry.middleware.TelemetryMiddleware",  # AFTER AuthenticationMiddleware
+    "app.permission_roles.RoleScopeMiddleware",
+    "common.db_router.ReplicaStickyMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -232,15 +234,57 @@ match os.environ.get("NODE_ENV", "").lower():
         db_name = "dev.db.sqlite3"
     case "test":
         db_name = "test.db.sqlite3"
+
+# SQLite tuning for concurrent writers (consumers, tick loops, Celery, HTTP).
+# WAL lets readers proceed during a write, synchronous=NORMAL is durable in
+# WAL mode, and IMMEDIATE transactions take the write lock up front instead
+# of failing on a read->write lock upgrade. Set SQLITE_TUNING=false to opt out.
+SQLITE_TUNING = env_bool("SQLITE_TUNING", True)
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,  # KiB
+}
+
+_sqlite_options = {"timeout": 30}  # seconds
+if SQLITE_TUNING:
+    _sqlite_options.update(
+        transaction_mode="IMMEDIATE",
+        init_command=";".join(f"PRAGMA {k}={v}" for k, v in SQLITE_PRAGMAS.items()),
+    )
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR_PATH / db_name,
+        "OPTIONS": _sqlite_options,
+    }
+}
+
+# Group small writes into shared transactions (see app.utils.write_queue)
+DB_WRITE_QUEUE = env_bool("DB_WRITE_QUEUE", not TEST)
+
+# Read replica for safe-method API reads (see common.db_router). Our
+# deployment uses a read-only handle on the same SQLite file; any other
+# deployment can define DATABASES["replica"] itself.
+READ_REPLICA_ALIAS = "replica"
+REPLICA_STICKY_SECONDS = 10
+if env_bool("SQLITE_READ_REPLICA", False):
+    DATABASES[READ_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": f"file:{DATABASES['default']['NAME']}?mode=ro",
         "OPTIONS": {
-            "timeout": 30,  # seconds
+            "timeout": 30,
+            "init_command": "PRAGMA query_only=1;"
+            + ";".join(
+                f"PRAGMA {k}={SQLITE_PRAGMAS[k]}" for k in ("mmap_size", "cache_size")
+            ),
         },
+        "TEST": {"MIRROR": "default"},
     }
-}
+DATABASE_ROUTERS = ["common.db_router.ReadReplicaRouter"]
 
 
 # Docker environment detection
@@ -435,6 +479,18 @@ DEFAULT_LEAGUE_ID = app_config.default_league_id
 # Telemetry Configuration
 # =============================================================================
 
+# Per-route hot-path budgets (see telemetry.stats). Keys are URL names for
+# HTTP routes and "ws:<Consumer>.<message type>" for WebSocket events; values
+# cap any of queries, db_ms, cache_misses, serializer_ms, payload_bytes,
+# duration_ms. Exceeding one logs a "budget_exceeded" warning.
+TELEMETRY_BUDGETS = {
+    "tournaments-detail": {"queries": 50, "duration_ms": 500},
+    "pick_player": {"queries": 40, "duration_ms": 500},
+    "herodraft_submit_pick": {"queries": 30, "duration_ms": 300},
+    "session_bootstrap": {"queries": 10, "duration_ms": 100},
+    "ws:HeroDraftConsumer.websocket.connect": {"queries": 20, "duration_ms": 300},
+}
+
 # Initialize telemetry (structured logging + optional OTel tracing)
 from telemetry.config import init_telemetry
 
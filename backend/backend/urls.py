@@ -47,8 +47,10 @@ from app.views import (
     TournamentsBasicView,
     TournamentView,
     UserCreateView,
+    UserTeamHistoryView,
     UserView,
     current_user,
+    session_bootstrap,
 )
 from app.views.admin_team import (
     add_league_admin,
@@ -102,8 +104,14 @@ urlpatterns = [
     path("", include("social_django.urls")),
     # User search (must be before router to avoid conflict with UserView)
     path("api/users/search/", search_users, name="search_users"),
+    path(
+        "api/users/<int:user_pk>/teams/",
+        UserTeamHistoryView.as_view(),
+        name="user_team_history",
+    ),
     path("api/", include(router.urls)),
     path("api/current_user", current_user),
+    path("api/session/bootstrap/", session_bootstrap, name="session_bootstrap"),
     path("api/home-stats/", app_views.home_stats, name="home_stats"),
     path("api/user/register", UserCreateView.as_view()),
     path("api/tournament/register", TournamentCreateView.as_view()),
@@ -4,6 +4,7 @@ import math
 from django.db import models
 
 from app.models import TOURNAMNET_TYPE_CHOICES, CustomUser, Game, Team, Tournament
+from app.services.bracket_graph import BracketGraph
 
 log = logging.getLogger(__name__)
 
@@ -38,7 +39,8 @@ class TournamentBracket(models.Model):
         """
         Generates a double elimination bracket structure for a number of teams
         that is a power of 2 (4, 8, 16).
-        This function creates all the necessary BracketSlot and Game objects.
+        This function creates all the necessary BracketSlot and Game objects,
+        inserting each round in bulk.
 
         The structure is a standard double-elimination bracket with a
         Winners' Bracket and a Losers' Bracket, culminating in a Grand Final.
@@ -70,36 +72,32 @@ class TournamentBracket(models.Model):
         lb_slots = [[] for _ in range(lb_rounds)]
 
         # --- Winners' Bracket ---
-        # Round 1
-        for i in range(num_teams // 2):
-            game = Game.objects.create(tournament=self.tournament)
-            slot1 = BracketSlot.objects.create(bracket=self, max_rounds=1, game=game)
-            slot2 = BracketSlot.objects.create(bracket=self, max_rounds=1, game=game)
-            wb_slots[0].extend([slot1, slot2])
-
-        # Assign teams
-        for i in range(num_teams):
-            wb_slots[0][i].participant = teams[i]
-            wb_slots[0][i].save()
+        # Round 1: teams are assigned directly to the slots
+        wb_slots[0] = self._create_round(
+            [
+                (
+                    {"max_rounds": 1, "participant": teams[i * 2]},
+                    {"max_rounds": 1, "participant": teams[i * 2 + 1]},
+                )
+                for i in range(num_teams // 2)
+            ]
+        )
 
         # Subsequent Winners' Bracket Rounds
         for r in range(1, wb_rounds):
             num_matches_in_round = len(wb_slots[r - 1]) // 2
-            for i in range(num_matches_in_round):
-                game = Game.objects.create(tournament=self.tournament)
-                slot1 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=r + 1,
-                    game=game,
-                    winners_source=wb_slots[r - 1][i * 2],
-                )
-                slot2 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=r + 1,
-                    game=game,
-                    winners_source=wb_slots[r - 1][i * 2 + 1],
-                )
-                wb_slots[r].extend([slot1, slot2])
+            wb_slots[r] = self._create_round(
+                [
+                    (
+                        {"max_rounds": r + 1, "winners_source": wb_slots[r - 1][i * 2]},
+                        {
+                            "max_rounds": r + 1,
+                            "winners_source": wb_slots[r - 1][i * 2 + 1],
+                        },
+                    )
+                    for i in range(num_matches_in_round)
+                ]
+            )
 
         # --- Losers' Bracket ---
         # LB has two "sequences" of rounds.
@@ -109,69 +107,84 @@ class TournamentBracket(models.Model):
         for r in range(wb_rounds - 1):
             # Sequence 1
             num_matches = len(wb_slots[r]) // 4
-            round_slots = []
-            for i in range(num_matches):
-                game = Game.objects.create(tournament=self.tournament)
-                slot1 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=lb_round_counter,
-                    is_losers_bracket=True,
-                    game=game,
-                    losers_source=wb_slots[r][i * 2],
-                )
-                slot2 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=lb_round_counter,
-                    is_losers_bracket=True,
-                    game=game,
-                    losers_source=wb_slots[r][i * 2 + 1],
-                )
-                round_slots.extend([slot1, slot2])
+            round_slots = self._create_round(
+                [
+                    (
+                        {
+                            "max_rounds": lb_round_counter,
+                            "is_losers_bracket": True,
+                            "losers_source": wb_slots[r][i * 2],
+                        },
+                        {
+                            "max_rounds": lb_round_counter,
+                            "is_losers_bracket": True,
+                            "losers_source": wb_slots[r][i * 2 + 1],
+                        },
+                    )
+                    for i in range(num_matches)
+                ]
+            )
             lb_slots[lb_round_counter - 1] = round_slots
             lb_round_counter += 1
 
             # Sequence 2
             prev_lb_round_slots = round_slots
             num_matches = len(prev_lb_round_slots) // 2
-            round_slots = []
-            for i in range(num_matches):
-                game = Game.objects.create(tournament=self.tournament)
-                slot1 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=lb_round_counter,
-                    is_losers_bracket=True,
-                    game=game,
-                    losers_source=wb_slots[r + 1][i],
-                )
-                slot2 = BracketSlot.objects.create(
-                    bracket=self,
-                    max_rounds=lb_round_counter,
-                    is_losers_bracket=True,
-                    game=game,
-                    winners_source=prev_lb_round_slots[i * 2],
-                )
-                round_slots.extend([slot1, slot2])
+            round_slots = self._create_round(
+                [
+                    (
+                        {
+                            "max_rounds": lb_round_counter,
+                            "is_losers_bracket": True,
+                            "losers_source": wb_slots[r + 1][i],
+                        },
+                        {
+                            "max_rounds": lb_round_counter,
+                            "is_losers_bracket": True,
+                            "winners_source": prev_lb_round_slots[i * 2],
+                        },
+                    )
+                    for i in range(num_matches)
+                ]
+            )
             lb_slots[lb_round_counter - 1] = round_slots
             lb_round_counter += 1
 
         # --- Grand Final ---
-        game = Game.objects.create(tournament=self.tournament)
-        final_slot1 = BracketSlot.objects.create(
-            bracket=self, max_rounds=200, game=game, winners_source=wb_slots[-1][0]
-        )
         # The winner of the last LB round advances.
-        final_slot2 = BracketSlot.objects.create(
-            bracket=self, max_rounds=200, game=game, winners_source=lb_slots[-1][0]
+        self._create_round(
+            [
+                (
+                    {"max_rounds": 200, "winners_source": wb_slots[-1][0]},
+                    {"max_rounds": 200, "winners_source": lb_slots[-1][0]},
+                )
+            ]
         )
+        BracketGraph.invalidate(self.tournament_id)
+        self.save()
+
+    def _create_round(self, slot_pairs):
+        """
+        Create one Game per slot pair and its two BracketSlots in bulk.
 
-        # Add all slots to the bracket
-        all_slots = [slot for round_slots in wb_slots for slot in round_slots]
-        all_slots.extend(
-            [slot for round_slots in lb_slots if round_slots for slot in round_slots]
+        Slots may only reference slots from earlier rounds, which already
+        have primary keys, so each round costs two INSERT statements.
+
+        Args:
+            slot_pairs: List of (slot1 kwargs, slot2 kwargs) tuples, one per game
+
+        Returns:
+            Flat list of created slots in game order
+        """
+        games = Game.objects.bulk_create(
+            [Game(tournament=self.tournament) for _ in slot_pairs]
         )
-        all_slots.extend([final_slot1, final_slot2])
-        self.slots.add(*all_slots)
-        self.save()
+        slots = [
+            BracketSlot(bracket=self, game=game, **kwargs)
+            for game, pair in zip(games, slot_pairs)
+            for kwargs in pair
+        ]
+        return BracketSlot.objects.bulk_create(slots)
 
 
 class BracketSlot(models.Model):
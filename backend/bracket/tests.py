@@ -1,3 +1,58 @@
+from datetime import date
+
 from django.test import TestCase
 
-# Create your tests here.
+from app.models import CustomUser, Game, Team, Tournament
+from bracket.models import BracketSlot, TournamentBracket
+
+
+class GenerateDoubleEliminationBracketTest(TestCase):
+    """Test TournamentBracket.generate_double_elimination_bracket."""
+
+    def setUp(self):
+        self.tournament = Tournament.objects.create(
+            name="Bracket Tournament",
+            date_played=date.today(),
+        )
+        for i in range(8):
+            captain = CustomUser.objects.create_user(
+                username=f"bracket_captain{i}", password="test123"
+            )
+            Team.objects.create(
+                name=f"Team {i + 1}", captain=captain, tournament=self.tournament
+            )
+        self.bracket = TournamentBracket.objects.create(tournament=self.tournament)
+
+    def test_creates_games_and_slots(self):
+        """Every game gets exactly two slots and round 1 holds every team."""
+        self.bracket.generate_double_elimination_bracket()
+
+        games = Game.objects.filter(tournament=self.tournament)
+        self.assertEqual(self.bracket.slots.count(), games.count() * 2)
+        for game in games:
+            self.assertEqual(game.matches.count(), 2)
+        self.assertEqual(
+            self.bracket.slots.filter(participant__isnull=False).count(), 8
+        )
+        self.assertEqual(
+            self.bracket.slots.filter(max_rounds=1, is_losers_bracket=False).count(),
+            8,
+        )
+
+    def test_slots_link_to_earlier_rounds(self):
+        """Grand final slots are fed by the winners and losers bracket finals."""
+        self.bracket.generate_double_elimination_bracket()
+
+        final_slots = BracketSlot.objects.filter(bracket=self.bracket, max_rounds=200)
+        self.assertEqual(final_slots.count(), 2)
+        self.assertEqual(len({slot.game_id for slot in final_slots}), 1)
+        sources = [slot.winners_source for slot in final_slots]
+        self.assertFalse(sources[0].is_losers_bracket)
+        self.assertTrue(sources[1].is_losers_bracket)
+
+    def test_rejects_unsupported_team_count(self):
+        """Team counts other than 4, 8 or 16 raise ValueError."""
+        Team.objects.filter(tournament=self.tournament).first().delete()
+
+        with self.assertRaises(ValueError):
+            self.bracket.generate_double_elimination_bracket()
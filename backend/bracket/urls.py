@@ -6,6 +6,8 @@ from app.views.bracket import (
     get_bracket,
     save_bracket,
     set_team_placement,
+    simulate_bracket,
+    swiss_next_round,
 )
 
 from .functions.generate import gen_double_elim
@@ -20,6 +22,16 @@ urlpatterns = [
         name="generate_bracket",
     ),
     path("tournaments/<int:tournament_id>/save/", save_bracket, name="save_bracket"),
+    path(
+        "tournaments/<int:tournament_id>/simulate/",
+        simulate_bracket,
+        name="simulate_bracket",
+    ),
+    path(
+        "tournaments/<int:tournament_id>/swiss/next-round/",
+        swiss_next_round,
+        name="swiss_next_round",
+    ),
     path(
         "tournaments/<int:tournament_id>/teams/<int:team_id>/placement/",
         set_team_placement,
@@ -0,0 +1,133 @@
+"""
+Read-replica routing for read-heavy API views.
+
+Views using ``ReplicaReadMixin`` (or the ``replica_reads`` context manager)
+send their safe-method queries to ``settings.READ_REPLICA_ALIAS``. In our
+deployment that alias is a read-only handle on the SQLite file, so public
+reads stop competing with draft writes on the primary connection; elsewhere
+it can point at a real replica.
+
+After a user's own write, their reads stick to the primary for
+``REPLICA_STICKY_SECONDS`` so read-your-writes holds during drafts.
+``ReplicaStickyMiddleware`` records writes from any view, not only those
+using the mixin.
+"""
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+log = logging.getLogger(__name__)
+
+STICKY_CACHE_KEY = "db:primary:{user_id}"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# True while the current request may read from the replica
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_alias():
+    """The configured replica alias, or None if there is none."""
+    alias = getattr(settings, "READ_REPLICA_ALIAS", None)
+    if alias and alias in settings.DATABASES:
+        return alias
+    return None
+
+
+def mark_primary(user):
+    """Pin a user's reads to the primary for a short window after a write."""
+    if user is not None and user.is_authenticated:
+        cache.set(
+            STICKY_CACHE_KEY.format(user_id=user.pk),
+            1,
+            timeout=settings.REPLICA_STICKY_SECONDS,
+        )
+
+
+def is_pinned_to_primary(user):
+    if user is None or not user.is_authenticated:
+        return False
+    return cache.get(STICKY_CACHE_KEY.format(user_id=user.pk)) is not None
+
+
+@contextmanager
+def replica_reads(request=None):
+    """
+    Route reads in this block to the replica.
+
+    Skipped for unsafe methods and for users pinned to the primary.
+    """
+    allowed = replica_alias() is not None
+    if allowed and request is not None:
+        allowed = request.method in SAFE_METHODS and not is_pinned_to_primary(
+            getattr(request, "user", None)
+        )
+    token = _replica_reads.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReadReplicaRouter:
+    """Send reads to the replica inside a ``replica_reads`` scope."""
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return None
+        # Reads inside a transaction must see its uncommitted writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica and primary hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != replica_alias()
+
+
+class ReplicaReadMixin:
+    """
+    Serve safe-method requests of a DRF view from the read replica.
+
+    Must come before the view base class so ``initial`` and
+    ``finalize_response`` wrap the whole handler.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        self._replica_scope = replica_reads(request)
+        self._replica_scope.__enter__()
+        super().initial(request, *args, **kwargs)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        scope = getattr(self, "_replica_scope", None)
+        if scope is not None:
+            self._replica_scope = None
+            scope.__exit__(None, None, None)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class ReplicaStickyMiddleware:
+    """Pin users to the primary after any successful write request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_alias() is not None
+        ):
+            mark_primary(getattr(request, "user", None))
+        return response
@@ -19,11 +19,16 @@ app.conf.beat_schedule = {
         "task": "discordbot.tasks.check_scheduled_events",
         "schedule": 60.0,  # Every 60 seconds
     },
-    # Discord avatar refresh - check batch of users every 5 minutes
+    # Discord avatar refresh - check the least recently verified users every
+    # 5 minutes (batch sized to cover everyone within a day)
     "refresh-discord-avatars": {
         "task": "app.tasks.avatar_refresh.refresh_discord_avatars",
         "schedule": 300.0,  # Every 5 minutes
-        "kwargs": {"batch_size": 50},
+    },
+    # Guild member sync - fold nicknames/avatars into users from paged member lists
+    "sync-discord-guild-members-hourly": {
+        "task": "discordbot.tasks.sync_guild_members_task",
+        "schedule": crontab(minute=30),
     },
     # Full Discord data refresh - run once daily at 4 AM
     "refresh-all-discord-data-daily": {
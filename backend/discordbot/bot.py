@@ -7,6 +7,8 @@ import discord
 from discord import app_commands
 from django.conf import settings
 
+from discordbot.rsvp import RSVPIngestor
+
 log = logging.getLogger(__name__)
 
 
@@ -50,9 +52,11 @@ class KettleBot(discord.Client):
         super().__init__(intents=intents)
         self.tree = app_commands.CommandTree(self)
         self.guild_id = settings.DISCORD_GUILD_ID
+        self.rsvps = RSVPIngestor()
 
     async def setup_hook(self):
         """Called when bot is ready to sync commands."""
+        self.rsvps.start()
         guild = discord.Object(id=self.guild_id)
         self.tree.copy_global_to(guild=guild)
         await self.tree.sync(guild=guild)
@@ -73,7 +77,7 @@ class KettleBot(discord.Client):
         if emoji not in RSVP_EMOJIS:
             return
 
-        await self._handle_rsvp(payload, RSVP_EMOJIS[emoji])
+        self._handle_rsvp(payload, RSVP_EMOJIS[emoji])
 
     async def on_raw_reaction_remove(self, payload: discord.RawReactionActionEvent):
         """Remove RSVP when user removes reaction."""
@@ -81,50 +85,25 @@ class KettleBot(discord.Client):
         if emoji not in RSVP_EMOJIS:
             return
 
-        await self._remove_rsvp(payload)
-
-    async def _handle_rsvp(self, payload, status):
-        """Create or update RSVP record."""
-        # Import here to avoid circular imports
-        from discordbot.models import RSVP, ScheduledEvent
+        self._remove_rsvp(payload)
 
-        try:
-            event = ScheduledEvent.objects.get(
-                discord_message_id=str(payload.message_id)
-            )
-        except ScheduledEvent.DoesNotExist:
-            return  # Not an event message
+    async def close(self):
+        """Write queued RSVPs before disconnecting."""
+        await self.rsvps.stop()
+        await super().close()
 
+    def _handle_rsvp(self, payload, status):
+        """Queue an RSVP create/update (written in batches off the event loop)."""
         # Get user info
         guild = self.get_guild(payload.guild_id)
         member = guild.get_member(payload.user_id) if guild else None
         username = member.display_name if member else f"User {payload.user_id}"
 
-        RSVP.objects.update_or_create(
-            scheduled_event=event,
-            discord_user_id=str(payload.user_id),
-            defaults={
-                "discord_username": username,
-                "status": status,
-            },
-        )
-        log.info(f"RSVP: {username} marked {status} for {event.template.name}")
-
-    async def _remove_rsvp(self, payload):
-        """Remove RSVP record."""
-        from discordbot.models import RSVP, ScheduledEvent
+        self.rsvps.submit(payload.message_id, payload.user_id, username, status)
 
-        try:
-            event = ScheduledEvent.objects.get(
-                discord_message_id=str(payload.message_id)
-            )
-            RSVP.objects.filter(
-                scheduled_event=event,
-                discord_user_id=str(payload.user_id),
-            ).delete()
-            log.info(f"RSVP removed: user {payload.user_id} for {event.template.name}")
-        except ScheduledEvent.DoesNotExist:
-            pass
+    def _remove_rsvp(self, payload):
+        """Queue an RSVP removal."""
+        self.rsvps.submit(payload.message_id, payload.user_id, None, None)
 
 
 # Create bot instance
@@ -0,0 +1,198 @@
+"""Batched RSVP ingestion for the Discord bot."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, transaction
+
+log = logging.getLogger(__name__)
+
+# Seconds a message id -> event lookup is trusted (misses expire sooner so a
+# freshly posted announcement is picked up)
+EVENT_CACHE_TTL = 300
+EVENT_MISS_TTL = 30
+# Queued by stop(): the background task flushes what it holds and exits
+_STOP = object()
+
+
+def coalesce(reactions):
+    """
+    Collapse queued reactions to the last action per (message, user).
+
+    Args:
+        reactions: (message_id, user_id, username, status) tuples in arrival
+            order; status None means the reaction was removed
+
+    Returns:
+        dict: (message_id, user_id) -> (username, status)
+    """
+    latest = {}
+    for message_id, user_id, username, status in reactions:
+        latest[(message_id, user_id)] = (username, status)
+    return latest
+
+
+class RSVPIngestor:
+    """
+    Queue RSVP reactions on the event loop and write them in batches.
+
+    Reaction handlers only enqueue, so gateway processing never waits on the
+    database. A background task drains the queue into batches (up to
+    ``batch_size`` reactions or ``flush_interval`` seconds), coalesces
+    add/remove flaps per user and hands the batch to a single worker
+    thread, which resolves message ids through a small cache and applies one
+    upsert and one delete per event.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Not bound to a loop until first awaited, so reactions submitted
+        # before start() are kept
+        self.queue = asyncio.Queue()
+        self._task = None
+        # Single worker keeps batches in order
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        # message id -> (event pk or None, expires at)
+        self._events = {}
+
+    def start(self):
+        """Start the background flush task on the running loop."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def submit(self, message_id, user_id, username, status):
+        """Queue a reaction (status None for a removal) without blocking."""
+        self.queue.put_nowait((str(message_id), str(user_id), username, status))
+
+    async def stop(self):
+        """Flush queued reactions and stop the background task."""
+        if self._task is not None:
+            # Not cancelled: _run flushes the batch it is collecting when it
+            # reaches the marker, and a write in progress completes
+            self.queue.put_nowait(_STOP)
+            await self._task
+            self._task = None
+
+        # Reactions queued after the marker, or with no task running
+        pending = []
+        while not self.queue.empty():
+            item = self.queue.get_nowait()
+            if item is not _STOP:
+                pending.append(item)
+        if pending:
+            await self._flush(pending)
+        self._executor.shutdown(wait=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+            if stopping:
+                return
+
+    async def _flush(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self._executor, self._write_in_worker, coalesce(batch)
+            )
+        except Exception:
+            log.exception(f"Failed to write {len(batch)} RSVP reactions")
+
+    def _resolve_events(self, message_ids):
+        """Map message ids to event pks (None if not an event), querying misses only."""
+        from discordbot.models import ScheduledEvent
+
+        now = time.monotonic()
+        missing = [
+            mid
+            for mid in message_ids
+            if mid not in self._events or self._events[mid][1] < now
+        ]
+        if missing:
+            found = dict(
+                ScheduledEvent.objects.filter(
+                    discord_message_id__in=missing
+                ).values_list("discord_message_id", "pk")
+            )
+            for mid in missing:
+                pk = found.get(mid)
+                ttl = EVENT_CACHE_TTL if pk else EVENT_MISS_TTL
+                self._events[mid] = (pk, now + ttl)
+        return {mid: self._events[mid][0] for mid in message_ids}
+
+    def _write_in_worker(self, reactions):
+        # The worker thread keeps its own connection between batches
+        close_old_connections()
+        try:
+            self.write(reactions)
+        finally:
+            close_old_connections()
+
+    def write(self, reactions):
+        """
+        Apply coalesced reactions in one transaction.
+
+        Args:
+            reactions: Output of ``coalesce``
+        """
+        from discordbot.models import RSVP
+
+        events = self._resolve_events({mid for mid, _ in reactions})
+
+        upserts = []
+        removals = {}
+        for (message_id, user_id), (username, status) in reactions.items():
+            event_pk = events[message_id]
+            if event_pk is None:
+                continue  # Not an event message
+            if status is None:
+                removals.setdefault(event_pk, []).append(user_id)
+            else:
+                upserts.append(
+                    RSVP(
+                        scheduled_event_id=event_pk,
+                        discord_user_id=user_id,
+                        discord_username=username,
+                        status=status,
+                    )
+                )
+
+        with transaction.atomic():
+            if upserts:
+                RSVP.objects.bulk_create(
+                    upserts,
+                    update_conflicts=True,
+                    unique_fields=["scheduled_event", "discord_user_id"],
+                    update_fields=["discord_username", "status", "responded_at"],
+                )
+            for event_pk, user_ids in removals.items():
+                RSVP.objects.filter(
+                    scheduled_event_id=event_pk, discord_user_id__in=user_ids
+                ).delete()
+        if upserts or removals:
+            log.info(
+                f"RSVP batch: {len(upserts)} upserted, "
+                f"{sum(len(u) for u in removals.values())} removed"
+            )
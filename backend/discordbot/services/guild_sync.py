@@ -0,0 +1,177 @@
+"""Guild member fetching with an incremental cache, and bulk sync into users."""
+
+import logging
+import time
+
+import requests
+from cacheops import invalidate_obj, no_invalidation
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+log = logging.getLogger(__name__)
+
+MEMBER_PAGE_LIMIT = 1000
+MEMBER_CACHE_KEY = "discord_members_{guild_id}"
+# Full re-fetch interval; between full fetches only new members are fetched
+MEMBER_FULL_REFRESH = 10 * 60
+# How long a snapshot is served before checking for new members
+MEMBER_TOP_UP_INTERVAL = 15
+SYNC_CHUNK_SIZE = 500
+
+# CustomUser field -> getter on a guild member object
+MEMBER_FIELDS = {
+    "discordUsername": lambda m: m["user"].get("username"),
+    "discordNickname": lambda m: m["user"].get("global_name"),
+    "guildNickname": lambda m: m.get("nick"),
+    "avatar": lambda m: m["user"].get("avatar"),
+}
+
+
+def _members_url(guild_id):
+    return f"{settings.DISCORD_API_BASE_URL}/guilds/{guild_id}/members"
+
+
+def iter_member_pages(guild_id, after=None, etag=None, session=None):
+    """
+    Yield guild member pages (up to 1000 members each), following ``after``.
+
+    Args:
+        guild_id: Discord guild ID
+        after: Only members with a user id greater than this
+        etag: ETag of a previous first page; a 304 ends iteration early
+
+    Yields:
+        (members, etag) per page; etag is the first page's response ETag
+    """
+    session = session or requests
+    headers = {"Authorization": f"Bot {settings.DISCORD_BOT_TOKEN}"}
+    first = True
+    while True:
+        params = {"limit": MEMBER_PAGE_LIMIT}
+        if after:
+            params["after"] = after
+        page_headers = dict(headers)
+        if first and etag:
+            page_headers["If-None-Match"] = etag
+
+        try:
+            response = session.get(
+                _members_url(guild_id), headers=page_headers, params=params
+            )
+            if response.status_code == 304:
+                return
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Discord API error: {str(e)}")
+
+        page = response.json()
+        if first:
+            etag = response.headers.get("ETag")
+            first = False
+        if not page:
+            return
+        yield page, etag
+        if len(page) < MEMBER_PAGE_LIMIT:
+            return
+        after = page[-1]["user"]["id"]
+
+
+def get_guild_members(guild_id):
+    """
+    Return the guild's members from an incrementally refreshed cache.
+
+    A full fetch happens at most every ``MEMBER_FULL_REFRESH`` seconds (and
+    is skipped on a 304 when Discord returns an ETag). In between, a stale
+    snapshot is topped up with members after the highest cached user id,
+    which is usually a single empty page.
+    """
+    key = MEMBER_CACHE_KEY.format(guild_id=guild_id)
+    snapshot = cache.get(key)
+    now = time.time()
+
+    if snapshot and now - snapshot["checked_at"] < MEMBER_TOP_UP_INTERVAL:
+        return snapshot["members"]
+
+    if snapshot and now - snapshot["fetched_at"] < MEMBER_FULL_REFRESH:
+        for page, _ in iter_member_pages(guild_id, after=snapshot["last_id"]):
+            snapshot["members"].extend(page)
+            snapshot["last_id"] = page[-1]["user"]["id"]
+    else:
+        etag = snapshot.get("etag") if snapshot else None
+        members = []
+        for page, etag in iter_member_pages(guild_id, etag=etag):
+            members.extend(page)
+        if members or not snapshot:
+            snapshot = {
+                "members": members,
+                "etag": etag,
+                "last_id": members[-1]["user"]["id"] if members else None,
+            }
+        snapshot["fetched_at"] = now
+
+    snapshot["checked_at"] = now
+    # Outlive the full-refresh interval so the next full fetch has the ETag
+    cache.set(key, snapshot, timeout=2 * MEMBER_FULL_REFRESH)
+    return snapshot["members"]
+
+
+def sync_guild_members(guild_id=None, chunk_size=SYNC_CHUNK_SIZE):
+    """
+    Fold guild member data back into CustomUser records.
+
+    Streams member pages, diffs each member against an in-memory index of
+    users keyed by ``discordId`` and writes changed users with chunked
+    ``bulk_update``. Users whose avatar changed are marked as verified so
+    the avatar refresh scheduler skips them.
+
+    Returns:
+        dict: Summary with seen/matched/updated counts
+    """
+    from app.models import CustomUser
+
+    if guild_id is None:
+        guild_id = settings.DISCORD_GUILD_ID
+
+    fields = list(MEMBER_FIELDS)
+    users = {
+        user.discordId: user
+        for user in CustomUser.objects.filter(discordId__isnull=False)
+        .nocache()
+        .only("pk", "discordId", "avatar_checked_at", *fields)
+    }
+
+    now = timezone.now()
+    seen = matched = 0
+    changed = []
+    with requests.Session() as session:
+        for page, _ in iter_member_pages(guild_id, session=session):
+            seen += len(page)
+            for member in page:
+                user = users.get(member["user"]["id"])
+                if user is None:
+                    continue
+                matched += 1
+                dirty = False
+                for field, getter in MEMBER_FIELDS.items():
+                    value = getter(member)
+                    if getattr(user, field) != value:
+                        setattr(user, field, value)
+                        dirty = True
+                if dirty:
+                    user.avatar_checked_at = now
+                    changed.append(user)
+
+    with no_invalidation:
+        for start in range(0, len(changed), chunk_size):
+            CustomUser.objects.bulk_update(
+                changed[start : start + chunk_size], fields + ["avatar_checked_at"]
+            )
+    for user in changed:
+        invalidate_obj(user)
+
+    log.info(
+        f"Guild member sync for {guild_id}: {seen} members, "
+        f"{matched} matched users, {len(changed)} updated"
+    )
+    return {"seen": seen, "matched": matched, "updated": len(changed)}
@@ -75,44 +75,17 @@ def get_discord_members_data(guild_id=None):
     Helper function to get discord members data as raw list (not JsonResponse).
     Useful for testing and internal operations.
 
+    Members come from an incrementally refreshed cache (see
+    ``discordbot.services.guild_sync.get_guild_members``).
+
     Args:
         guild_id: Discord guild ID. Defaults to settings.DISCORD_GUILD_ID if not provided.
     """
+    from discordbot.services.guild_sync import get_guild_members
+
     if guild_id is None:
         guild_id = settings.DISCORD_GUILD_ID
-    bot_token = settings.DISCORD_BOT_TOKEN  # Add your bot token in settings
-
-    url = f"{settings.DISCORD_API_BASE_URL}/guilds/{guild_id}/members"
-    headers = {"Authorization": f"Bot {bot_token}"}
-    after = None
-    limit = 1000
-    members = []
-    cache_key = f"discord_members_{guild_id}"
-    cached_members = cache.get(cache_key)
-
-    if cached_members:
-        return cached_members
-
-    while True:
-        params = {"limit": limit}
-        if after:
-            params["after"] = after
-
-        try:
-            response = requests.get(url, headers=headers, params=params)
-            response.raise_for_status()
-            page = response.json()
-            if not page:
-                break
-            after = page[-1]["user"]["id"]
-            members.extend(page)
-            if len(page) < limit:
-                break
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Discord API error: {str(e)}")
-
-    cache.set(cache_key, members, timeout=15)
-    return members
+    return get_guild_members(guild_id)
 
 
 def get_discord_members_api():
@@ -62,3 +62,20 @@ def check_scheduled_events():
         scheduled_event.save()
 
     return f"Processed {due_events.count()} scheduled events"
+
+
+@shared_task
+def sync_guild_members_task(guild_id=None):
+    """
+    Fold guild member nicknames and avatars into users.
+    Runs hourly via Celery beat.
+    """
+    from django.conf import settings
+
+    from .services.guild_sync import sync_guild_members
+
+    if not getattr(settings, "DISCORD_BOT_TOKEN", None):
+        log.info("Skipping guild member sync: DISCORD_BOT_TOKEN not configured")
+        return {"seen": 0, "matched": 0, "updated": 0, "skipped": True}
+
+    return sync_guild_members(guild_id)
@@ -4,6 +4,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 
 from discordbot.models import RSVP, EventTemplate, ScheduledEvent
+from tests.helpers.cache import local_memory_cache
 
 User = get_user_model()
 
@@ -242,3 +243,191 @@ class ScheduledEventTaskTest(TestCase):
         self.assertGreater(event.next_post_at, original_time)
         # discord_message_id should be cleared for next posting
         self.assertIsNone(event.discord_message_id)
+
+
+def _member(user_id, username, nick=None, avatar=None):
+    return {
+        "user": {"id": str(user_id), "username": username, "avatar": avatar},
+        "nick": nick,
+    }
+
+
+def _page_response(members, etag=None, status_code=200):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = members
+    response.headers = {"ETag": etag} if etag else {}
+    return response
+
+
+@local_memory_cache
+class GuildSyncTest(TestCase):
+    @patch("discordbot.services.guild_sync.requests.Session")
+    def test_sync_updates_only_changed_users(self, mock_session):
+        from discordbot.services.guild_sync import sync_guild_members
+
+        session = mock_session.return_value.__enter__.return_value
+        unchanged = User.objects.create(
+            username="same", discordId="1", discordUsername="same", avatar="a1"
+        )
+        renamed = User.objects.create(
+            username="old", discordId="2", discordUsername="old", avatar="a2"
+        )
+        session.get.return_value = _page_response(
+            [
+                _member(1, "same", avatar="a1"),
+                _member(2, "new", nick="Nick", avatar="b2"),
+                _member(3, "stranger"),
+            ]
+        )
+
+        result = sync_guild_members(guild_id=42)
+
+        self.assertEqual(result, {"seen": 3, "matched": 2, "updated": 1})
+        renamed.refresh_from_db()
+        self.assertEqual(renamed.discordUsername, "new")
+        self.assertEqual(renamed.guildNickname, "Nick")
+        self.assertEqual(renamed.avatar, "b2")
+        self.assertIsNotNone(renamed.avatar_checked_at)
+        unchanged.refresh_from_db()
+        self.assertIsNone(unchanged.avatar_checked_at)
+
+    @patch("discordbot.services.guild_sync.time.time")
+    @patch("discordbot.services.guild_sync.requests.get")
+    def test_member_cache_tops_up_after_last_id(self, mock_get, mock_time):
+        from discordbot.services.guild_sync import get_guild_members
+
+        mock_time.return_value = 1000.0
+        mock_get.return_value = _page_response([_member(1, "a")], etag='"v1"')
+        self.assertEqual(len(get_guild_members(42)), 1)
+
+        # Within the top-up interval the snapshot is served as-is
+        mock_time.return_value = 1005.0
+        get_guild_members(42)
+        self.assertEqual(mock_get.call_count, 1)
+
+        # Later, only members after the last cached id are requested
+        mock_time.return_value = 1030.0
+        mock_get.return_value = _page_response([_member(2, "b")])
+        self.assertEqual(len(get_guild_members(42)), 2)
+        self.assertEqual(mock_get.call_args.kwargs["params"]["after"], "1")
+
+        # A full refresh sends the ETag and keeps the snapshot on 304
+        mock_time.return_value = 2000.0
+        mock_get.return_value = _page_response([], status_code=304)
+        self.assertEqual(len(get_guild_members(42)), 2)
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"v1"')
+
+
+class RSVPIngestorTest(TestCase):
+    def setUp(self):
+        from django.utils import timezone
+
+        template = EventTemplate.objects.create(
+            name="Inhouse",
+            template_type="announcement",
+            title="Inhouse",
+            description="Weekly inhouse",
+            color="#FF0000",
+            channel_id="123",
+        )
+        self.event = ScheduledEvent.objects.create(
+            template=template, next_post_at=timezone.now(), discord_message_id="555"
+        )
+
+    def test_coalesce_keeps_last_action(self):
+        from discordbot.rsvp import coalesce
+
+        result = coalesce(
+            [
+                ("555", "1", "a", "yes"),
+                ("555", "1", None, None),
+                ("555", "2", "b", "no"),
+                ("555", "1", "a", "maybe"),
+            ]
+        )
+        self.assertEqual(
+            result, {("555", "1"): ("a", "maybe"), ("555", "2"): ("b", "no")}
+        )
+
+    def test_write_upserts_and_removes_in_batch(self):
+        from discordbot.rsvp import RSVPIngestor, coalesce
+
+        RSVP.objects.create(
+            scheduled_event=self.event,
+            discord_user_id="1",
+            discord_username="a",
+            status="no",
+        )
+        RSVP.objects.create(
+            scheduled_event=self.event,
+            discord_user_id="3",
+            discord_username="c",
+            status="yes",
+        )
+        ingestor = RSVPIngestor()
+
+        with self.assertNumQueries(5):
+            ingestor.write(
+                coalesce(
+                    [
+                        ("555", "1", "a", "yes"),
+                        ("555", "2", "b", "maybe"),
+                        ("555", "3", None, None),
+                        ("999", "4", "d", "yes"),  # Not an event message
+                    ]
+                )
+            )
+
+        rsvps = dict(self.event.rsvps.values_list("discord_user_id", "status"))
+        self.assertEqual(rsvps, {"1": "yes", "2": "maybe"})
+
+        # Message lookups are cached for the next batch
+        with self.assertNumQueries(3):
+            ingestor.write(coalesce([("555", "2", "b", "no"), ("999", "4", "d", "no")]))
+
+    def test_queue_batches_reactions(self):
+        import asyncio
+
+        from discordbot.rsvp import RSVPIngestor
+
+        batches = []
+
+        async def scenario():
+            ingestor = RSVPIngestor(flush_interval=0.05)
+            ingestor._write_in_worker = batches.append
+            ingestor.start()
+            for user_id in range(5):
+                ingestor.submit(555, user_id, f"user{user_id}", "yes")
+            ingestor.submit(555, 0, None, None)
+            await asyncio.sleep(0.2)
+            await ingestor.stop()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 5)
+        self.assertEqual(batches[0][("555", "0")], (None, None))
+
+    def test_stop_flushes_batch_being_collected(self):
+        import asyncio
+
+        from discordbot.rsvp import RSVPIngestor
+
+        batches = []
+
+        async def scenario():
+            ingestor = RSVPIngestor(flush_interval=60)
+            ingestor._write_in_worker = batches.append
+            # Queued before the task starts
+            ingestor.submit(555, 0, "user0", "yes")
+            ingestor.start()
+            for user_id in range(1, 3):
+                ingestor.submit(555, user_id, f"user{user_id}", "yes")
+            # Let the task pick the reactions up into its batch
+            await asyncio.sleep(0.05)
+            await ingestor.stop()
+
+        asyncio.run(scenario())
+
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(len(batches[0]), 3)
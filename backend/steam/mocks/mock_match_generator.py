@@ -215,7 +215,12 @@ POSITION_STATS = {
 
 
 def generate_player_stats(
-    user, position: int, is_winner: bool, player_slot: int, duration: int
+    user,
+    position: int,
+    is_winner: bool,
+    player_slot: int,
+    duration: int,
+    rng: random.Random = random,
 ) -> dict:
     """
     Generate realistic player stats based on position and win/loss.
@@ -228,6 +233,7 @@ def generate_player_stats(
         is_winner: Whether player's team won
         player_slot: 0-4 for Radiant, 128-132 for Dire
         duration: Match duration in seconds (affects gold/xp totals)
+        rng: Random source; pass a seeded random.Random for repeatable data
 
     Returns:
         Dict matching Steam API player response format
@@ -239,9 +245,9 @@ def generate_player_stats(
 
     def rand_stat(key):
         low, high = stats[key]
-        base = random.randint(low, high)
+        base = rng.randint(low, high)
         # Apply multiplier with some variance
-        return int(base * multiplier * random.uniform(0.9, 1.1))
+        return int(base * multiplier * rng.uniform(0.9, 1.1))
 
     # Convert 64-bit Steam ID to 32-bit account_id
     account_id = user.steamid - 76561197960265728
@@ -264,23 +270,23 @@ def generate_player_stats(
 
     # Calculate derived stats based on GPM/XPM and duration
     minutes = duration / 60
-    net_worth = int(gpm * minutes * random.uniform(0.9, 1.1))
-    gold = random.randint(500, 5000)  # Gold on hand
+    net_worth = int(gpm * minutes * rng.uniform(0.9, 1.1))
+    gold = rng.randint(500, 5000)  # Gold on hand
     gold_spent = net_worth - gold
 
     # Level based on XPM (max 30)
     level = min(30, max(15, int(xpm * minutes / 1500)))
 
     # Generate items (6 inventory slots)
-    items = random.sample(ITEM_IDS, min(6, len(ITEM_IDS)))
+    items = rng.sample(ITEM_IDS, min(6, len(ITEM_IDS)))
     while len(items) < 6:
         items.append(0)
 
     # Aghanim's based on position/role
-    has_scepter = random.random() < (0.6 if position <= 2 else 0.3)
-    has_shard = random.random() < (0.7 if position <= 2 else 0.5)
+    has_scepter = rng.random() < (0.6 if position <= 2 else 0.3)
+    has_shard = rng.random() < (0.7 if position <= 2 else 0.5)
     has_moonshard = (
-        random.random() < (0.3 if position == 0 else 0.1) if level >= 25 else False
+        rng.random() < (0.3 if position == 0 else 0.1) if level >= 25 else False
     )
 
     return {
@@ -288,8 +294,8 @@ def generate_player_stats(
         "player_slot": player_slot,
         "team_number": team_number,
         "team_slot": team_slot,
-        "hero_id": random.choice(HERO_IDS),
-        "hero_variant": random.randint(1, 3),
+        "hero_id": rng.choice(HERO_IDS),
+        "hero_variant": rng.randint(1, 3),
         "item_0": items[0],
         "item_1": items[1],
         "item_2": items[2],
@@ -299,8 +305,8 @@ def generate_player_stats(
         "backpack_0": 0,
         "backpack_1": 0,
         "backpack_2": 0,
-        "item_neutral": random.choice(NEUTRAL_ITEMS),
-        "item_neutral2": random.choice(NEUTRAL_ITEMS),
+        "item_neutral": rng.choice(NEUTRAL_ITEMS),
+        "item_neutral2": rng.choice(NEUTRAL_ITEMS),
         "kills": kills,
         "deaths": deaths,
         "assists": assists,
@@ -333,6 +339,7 @@ def generate_mock_match(
     start_time: int,
     radiant_win: bool = None,
     league_id: int = None,
+    rng: random.Random = random,
 ) -> dict:
     """
     Generate a mock Steam API match response.
@@ -347,15 +354,16 @@ def generate_mock_match(
         start_time: Unix timestamp for match start
         radiant_win: If None, randomly determined
         league_id: Optional league ID
+        rng: Random source; pass a seeded random.Random for repeatable data
 
     Returns:
         Dict matching Steam API GetMatchHistoryBySequenceNum response format
     """
     if radiant_win is None:
-        radiant_win = random.choice([True, False])
+        radiant_win = rng.choice([True, False])
 
     # Duration: 25-55 minutes
-    duration = random.randint(1500, 3300)
+    duration = rng.randint(1500, 3300)
 
     players = []
 
@@ -369,6 +377,7 @@ def generate_mock_match(
                 is_winner=radiant_win,
                 player_slot=i,
                 duration=duration,
+                rng=rng,
             )
         )
 
@@ -382,6 +391,7 @@ def generate_mock_match(
                 is_winner=not radiant_win,
                 player_slot=128 + i,
                 duration=duration,
+                rng=rng,
             )
         )
 
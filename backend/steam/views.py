@@ -5,6 +5,8 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.db_router import ReplicaReadMixin
+
 from .constants import LEAGUE_ID
 from .functions.match import update_match_details
 from .models import LeaguePlayerStats, Match
@@ -51,7 +53,7 @@ class LeaderboardPagination(PageNumberPagination):
     max_page_size = 100
 
 
-class LeaderboardView(generics.ListAPIView):
+class LeaderboardView(ReplicaReadMixin, generics.ListAPIView):
     """
     GET /api/steam/leaderboard/
     Returns paginated leaderboard sorted by league_mmr.
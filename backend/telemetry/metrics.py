@@ -0,0 +1,66 @@
+"""
+OpenTelemetry metric instruments with no-op fallbacks.
+
+Instruments are created once per name from the global meter. Without a
+configured MeterProvider (OTEL_ENABLED=false) the API hands out no-op
+instruments; without the OpenTelemetry packages a local no-op is used, so
+callers never need to check.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+METER_NAME = "dtx-backend"
+
+_instruments: dict[tuple[str, str], Any] = {}
+
+
+class _NoopInstrument:
+    def add(self, amount, attributes=None) -> None:
+        pass
+
+    def record(self, amount, attributes=None) -> None:
+        pass
+
+
+def _instrument(kind: str, name: str, unit: str = "", description: str = "") -> Any:
+    key = (kind, name)
+    instrument = _instruments.get(key)
+    if instrument is None:
+        try:
+            from opentelemetry import metrics
+
+            meter = metrics.get_meter(METER_NAME)
+            instrument = getattr(meter, f"create_{kind}")(
+                name, unit=unit, description=description
+            )
+        except ImportError:
+            instrument = _NoopInstrument()
+        _instruments[key] = instrument
+    return instrument
+
+
+def histogram(name: str, unit: str = "", description: str = "") -> Any:
+    return _instrument("histogram", name, unit, description)
+
+
+def counter(name: str, unit: str = "", description: str = "") -> Any:
+    return _instrument("counter", name, unit, description)
+
+
+def up_down_counter(name: str, unit: str = "", description: str = "") -> Any:
+    """For gauges of live things (connections, running loops): add +1/-1."""
+    return _instrument("up_down_counter", name, unit, description)
+
+
+@contextmanager
+def timed(name: str, attributes: Optional[dict[str, Any]] = None) -> Iterator[None]:
+    """Record the block's duration in milliseconds on histogram ``name``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram(name, unit="ms").record(
+            (time.perf_counter() - start) * 1000, attributes or {}
+        )
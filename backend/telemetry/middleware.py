@@ -2,17 +2,26 @@
 
 import time
 import uuid
-from typing import Callable
+from typing import Callable, Optional
 
 import structlog
 from django.http import HttpRequest, HttpResponse
 
 from telemetry.labels import extract_labels
 from telemetry.logging import get_logger
+from telemetry.stats import collect_stats, instrument_serializers
 
 log = get_logger(__name__)
 
 
+def route_name(request: HttpRequest) -> Optional[str]:
+    """URL name of the resolved view (e.g. ``tournaments-detail``)."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    return match.view_name or match.route
+
+
 class TelemetryMiddleware:
     """
     Middleware that binds telemetry context to each request.
@@ -23,11 +32,13 @@ class TelemetryMiddleware:
     - Extract labels from URL path
     - Bind all context to structlog for request duration
     - Add X-Request-ID to response headers
-    - Log request completion with timing
+    - Log request completion with timing and hot-path stats (DB queries and
+      time, cache hits/misses, serializer time, payload bytes) per route
     """
 
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
         self.get_response = get_response
+        instrument_serializers()
 
     def __call__(self, request: HttpRequest) -> HttpResponse:
         # Start timing
@@ -57,7 +68,11 @@ class TelemetryMiddleware:
 
         try:
             # Process request
-            response = self.get_response(request)
+            with collect_stats("http") as stats:
+                response = self.get_response(request)
+                stats.route = route_name(request)
+                if not response.streaming:
+                    stats.payload_bytes += len(response.content)
 
             # Calculate duration
             duration_ms = (time.perf_counter() - start_time) * 1000
@@ -68,8 +83,10 @@ class TelemetryMiddleware:
                 **{
                     "http.method": request.method,
                     "http.route": request.path,
+                    "http.route_name": stats.route,
                     "http.status_code": response.status_code,
                     "duration_ms": round(duration_ms, 2),
+                    **stats.log_fields(),
                 },
             )
 
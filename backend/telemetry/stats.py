@@ -0,0 +1,220 @@
+"""
+Hot-path stats per HTTP route and WebSocket event.
+
+While a ``collect_stats`` scope is active, every DB query, cacheops read and
+top-level DRF serialization in that context (including threads entered via
+``sync_to_async``) is added to one ``HotPathStats``. On exit the totals are
+recorded as OpenTelemetry metrics and checked against
+``settings.TELEMETRY_BUDGETS``; callers add ``log_fields()`` to their
+completion log line.
+
+Budgets map a route name to limits for any stats field, e.g.::
+
+    TELEMETRY_BUDGETS = {
+        "tournaments-detail": {"queries": 30, "duration_ms": 300},
+        "ws:HeroDraftConsumer.websocket.connect": {"queries": 15},
+    }
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from telemetry.logging import get_logger
+from telemetry.metrics import counter, histogram
+
+log = get_logger(__name__)
+
+_current: ContextVar[Optional["HotPathStats"]] = ContextVar(
+    "hotpath_stats", default=None
+)
+
+# Stats field -> structured log field
+LOG_FIELDS = {
+    "queries": "db.queries",
+    "db_ms": "db.duration_ms",
+    "cache_hits": "cache.hits",
+    "cache_misses": "cache.misses",
+    "serializer_ms": "serializer.duration_ms",
+    "payload_bytes": "payload.bytes",
+}
+
+
+class HotPathStats:
+    """Counters for one request or WebSocket event."""
+
+    __slots__ = (
+        "kind",
+        "route",
+        "queries",
+        "db_ms",
+        "cache_hits",
+        "cache_misses",
+        "serializer_ms",
+        "payload_bytes",
+        "duration_ms",
+        "_serializing",
+    )
+
+    def __init__(self, kind: str, route: Optional[str] = None):
+        self.kind = kind
+        self.route = route
+        self.queries = 0
+        self.db_ms = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.serializer_ms = 0.0
+        self.payload_bytes = 0
+        self.duration_ms = 0.0
+        self._serializing = False
+
+    def log_fields(self) -> dict[str, Any]:
+        fields = {}
+        for name, key in LOG_FIELDS.items():
+            value = getattr(self, name)
+            fields[key] = round(value, 2) if isinstance(value, float) else value
+        return fields
+
+
+def current_stats() -> Optional[HotPathStats]:
+    return _current.get()
+
+
+def record_payload(size: int) -> None:
+    """Add response/frame bytes to the active stats, if any."""
+    stats = _current.get()
+    if stats is not None:
+        stats.payload_bytes += size
+
+
+@contextmanager
+def collect_stats(kind: str, route: Optional[str] = None) -> Iterator[HotPathStats]:
+    """
+    Collect hot-path stats for the enclosed block.
+
+    ``route`` may be set on the yielded stats inside the block (the HTTP
+    route is only known after URL resolution). Metrics and budget checks
+    run on exit.
+    """
+    _install_query_counter()
+    stats = HotPathStats(kind, route)
+    token = _current.set(stats)
+    start = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats.duration_ms = (time.perf_counter() - start) * 1000
+        _current.reset(token)
+        _record(stats)
+
+
+def _count_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_ms += (time.perf_counter() - start) * 1000
+
+
+def _add_query_counter(connection) -> None:
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _install_query_counter() -> None:
+    # Connections are per thread; new ones are covered by connection_created
+    for connection in connections.all():
+        _add_query_counter(connection)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _add_query_counter(connection)
+
+
+connection_created.connect(_on_connection_created)
+
+
+def _on_cache_read(sender, func, hit, **kwargs):
+    stats = _current.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+try:
+    from cacheops.signals import cache_read
+
+    cache_read.connect(_on_cache_read)
+except ImportError:  # pragma: no cover - cacheops is optional here
+    pass
+
+
+def instrument_serializers() -> None:
+    """Time top-level ``.data`` calls of DRF serializers."""
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        fget = cls.data.fget
+        if getattr(fget, "_hotpath_timed", False):
+            continue
+
+        def timed_data(self, _fget=fget):
+            stats = _current.get()
+            # Nested .data calls are already inside the outer timing
+            if stats is None or stats._serializing:
+                return _fget(self)
+            stats._serializing = True
+            start = time.perf_counter()
+            try:
+                return _fget(self)
+            finally:
+                stats._serializing = False
+                stats.serializer_ms += (time.perf_counter() - start) * 1000
+
+        timed_data._hotpath_timed = True
+        cls.data = property(timed_data)
+
+
+# Stats field -> (instrument kind, name, unit)
+INSTRUMENTS = {
+    "duration_ms": (histogram, "hotpath.duration", "ms"),
+    "queries": (histogram, "hotpath.db.queries", ""),
+    "db_ms": (histogram, "hotpath.db.duration", "ms"),
+    "serializer_ms": (histogram, "hotpath.serializer.duration", "ms"),
+    "payload_bytes": (histogram, "hotpath.payload.size", "By"),
+    "cache_hits": (counter, "hotpath.cache.hits", ""),
+    "cache_misses": (counter, "hotpath.cache.misses", ""),
+}
+
+
+def _record(stats: HotPathStats) -> None:
+    route = stats.route or "unmatched"
+    attributes = {"kind": stats.kind, "route": route}
+    for field, (kind, name, unit) in INSTRUMENTS.items():
+        value = getattr(stats, field)
+        if kind is histogram:
+            histogram(name, unit=unit).record(value, attributes)
+        elif value:
+            counter(name, unit=unit).add(value, attributes)
+
+    budget = getattr(settings, "TELEMETRY_BUDGETS", {}).get(route)
+    if not budget:
+        return
+    exceeded = {
+        name: {"value": round(getattr(stats, name), 2), "budget": limit}
+        for name, limit in budget.items()
+        if getattr(stats, name, 0) > limit
+    }
+    if exceeded:
+        log.warning("budget_exceeded", route=route, kind=stats.kind, exceeded=exceeded)
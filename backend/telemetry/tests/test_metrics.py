@@ -0,0 +1,92 @@
+"""Tests for metric helpers and WebSocket/tick instrumentation."""
+
+import asyncio
+from unittest import TestCase, mock
+
+from telemetry.metrics import _NoopInstrument, counter, histogram, timed
+from telemetry.tests.test_websocket import MockConsumer
+from telemetry.tracing import span
+
+
+class MetricsHelpersTest(TestCase):
+    def test_instruments_are_cached_per_kind_and_name(self):
+        self.assertIs(histogram("test.cached"), histogram("test.cached"))
+        self.assertIsNot(histogram("test.cached"), counter("test.cached"))
+
+    def test_timed_records_milliseconds(self):
+        instrument = mock.Mock()
+        with mock.patch("telemetry.metrics.histogram", return_value=instrument) as h:
+            with timed("test.duration", {"phase": "x"}):
+                pass
+        h.assert_called_once_with("test.duration", unit="ms")
+        value, attributes = instrument.record.call_args.args
+        self.assertGreaterEqual(value, 0)
+        self.assertEqual(attributes, {"phase": "x"})
+
+    def test_timed_records_on_error(self):
+        instrument = _NoopInstrument()
+        with mock.patch("telemetry.metrics.histogram", return_value=instrument):
+            with mock.patch.object(instrument, "record") as record:
+                with self.assertRaises(ValueError):
+                    with timed("test.duration"):
+                        raise ValueError
+        record.assert_called_once()
+
+    def test_span_runs_block_without_tracer(self):
+        with span("test.span", **{"herodraft.id": 1}):
+            ran = True
+        self.assertTrue(ran)
+
+
+class ConnectionGaugeTest(TestCase):
+    def test_connect_and_disconnect_balance_gauge(self):
+        gauge = mock.Mock()
+        consumer = MockConsumer()
+        with mock.patch("telemetry.websocket.up_down_counter", return_value=gauge):
+            asyncio.run(consumer.telemetry_connect())
+            asyncio.run(consumer.telemetry_disconnect(1000))
+            # A second disconnect must not decrement again
+            asyncio.run(consumer.telemetry_disconnect(1000))
+
+        amounts = [call.args[0] for call in gauge.add.call_args_list]
+        self.assertEqual(amounts, [1, -1])
+        self.assertEqual(gauge.add.call_args.args[1], {"ws.consumer": "MockConsumer"})
+
+    def test_phase_is_timed_per_consumer(self):
+        with mock.patch("telemetry.websocket.timed") as timed_mock:
+            with MockConsumer().telemetry_phase("initial_state"):
+                pass
+        timed_mock.assert_called_once_with(
+            "ws.phase.duration",
+            {"ws.consumer": "MockConsumer", "ws.phase": "initial_state"},
+        )
+
+
+class GroupSendTest(TestCase):
+    def test_group_send_is_timed_by_group_kind(self):
+        from app.broadcast import group_send
+
+        layer = mock.Mock()
+        layer.group_send = mock.AsyncMock()
+        with mock.patch("app.broadcast.timed") as timed_mock:
+            group_send(layer, "herodraft_7", {"type": "herodraft.event"})
+
+        layer.group_send.assert_awaited_once_with(
+            "herodraft_7", {"type": "herodraft.event"}
+        )
+        timed_mock.assert_called_once_with(
+            "ws.group_send.duration",
+            {"ws.group_kind": "herodraft", "ws.message_type": "herodraft.event"},
+        )
+
+
+class TickPhaseTest(TestCase):
+    def test_tick_phase_records_phase(self):
+        from app.tasks.herodraft_tick import tick_phase
+
+        with mock.patch("app.tasks.herodraft_tick.timed") as timed_mock:
+            with tick_phase("heartbeat_check", 3):
+                pass
+        timed_mock.assert_called_once_with(
+            "herodraft.tick.phase.duration", {"phase": "heartbeat_check"}
+        )
@@ -0,0 +1,94 @@
+"""Tests for hot-path stats and budgets."""
+
+import asyncio
+from unittest import mock
+
+from cacheops.signals import cache_read
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import serializers
+
+from app.models import CustomUser
+from telemetry.middleware import TelemetryMiddleware
+from telemetry.stats import collect_stats, instrument_serializers
+from telemetry.websocket import TelemetryConsumerMixin
+
+
+class _NameSerializer(serializers.Serializer):
+    name = serializers.CharField()
+
+
+class CollectStatsTest(TestCase):
+    def test_counts_queries_and_db_time(self):
+        with collect_stats("test", "route") as stats:
+            list(CustomUser.objects.nocache().all())
+            CustomUser.objects.nocache().count()
+        self.assertEqual(stats.queries, 2)
+        self.assertGreater(stats.db_ms, 0)
+
+        # Queries outside the scope are not counted
+        CustomUser.objects.nocache().count()
+        self.assertEqual(stats.queries, 2)
+
+    def test_counts_cache_reads(self):
+        with collect_stats("test") as stats:
+            cache_read.send(sender=None, func=None, hit=True)
+            cache_read.send(sender=None, func=None, hit=False)
+            cache_read.send(sender=None, func=None, hit=False)
+        self.assertEqual((stats.cache_hits, stats.cache_misses), (1, 2))
+
+    def test_times_top_level_serialization(self):
+        instrument_serializers()
+        with collect_stats("test") as stats:
+            _NameSerializer([{"name": "a"}] * 50, many=True).data
+        self.assertGreater(stats.serializer_ms, 0)
+
+    @override_settings(TELEMETRY_BUDGETS={"budgeted": {"queries": 0}})
+    def test_budget_exceeded_logs_warning(self):
+        with mock.patch("telemetry.stats.log") as log:
+            with collect_stats("test", "budgeted"):
+                CustomUser.objects.nocache().count()
+            with collect_stats("test", "other"):
+                CustomUser.objects.nocache().count()
+
+        log.warning.assert_called_once()
+        kwargs = log.warning.call_args.kwargs
+        self.assertEqual(kwargs["route"], "budgeted")
+        self.assertEqual(kwargs["exceeded"]["queries"], {"value": 1, "budget": 0})
+
+    def test_middleware_logs_stats_fields(self):
+        def view(request):
+            CustomUser.objects.nocache().count()
+            return HttpResponse("hello")
+
+        with mock.patch("telemetry.middleware.log") as log:
+            TelemetryMiddleware(view)(RequestFactory().get("/api/tournaments/"))
+
+        fields = log.info.call_args.kwargs
+        self.assertEqual(fields["db.queries"], 1)
+        self.assertEqual(fields["payload.bytes"], 5)
+
+
+class _BaseConsumer:
+    async def dispatch(self, message):
+        await getattr(self, message["type"].replace(".", "_"))(message)
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        pass
+
+
+class _Consumer(TelemetryConsumerMixin, _BaseConsumer):
+    scope = {"path": "/ws/herodraft/1/"}
+
+    async def herodraft_event(self, message):
+        await self.send(text_data="x" * 10)
+
+
+class ConsumerStatsTest(TestCase):
+    def test_dispatch_collects_per_message_type(self):
+        with mock.patch("telemetry.stats._record") as record:
+            asyncio.run(_Consumer().dispatch({"type": "herodraft.event"}))
+
+        stats = record.call_args.args[0]
+        self.assertEqual(stats.route, "ws:_Consumer.herodraft.event")
+        self.assertEqual(stats.payload_bytes, 10)
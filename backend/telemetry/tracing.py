@@ -2,6 +2,8 @@
 
 import logging
 import os
+from contextlib import contextmanager
+from typing import Any, Iterator
 
 # Use stdlib logging for bootstrap messages
 _log = logging.getLogger("telemetry.tracing")
@@ -97,6 +99,26 @@ def init_tracing() -> None:
         # Set global tracer provider
         trace.set_tracer_provider(provider)
 
+        # Export metrics (hot-path stats from telemetry.stats, system metrics)
+        try:
+            from opentelemetry import metrics
+            from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
+                OTLPMetricExporter,
+            )
+            from opentelemetry.sdk.metrics import MeterProvider
+            from opentelemetry.sdk.metrics.export import (
+                PeriodicExportingMetricReader,
+            )
+
+            reader = PeriodicExportingMetricReader(
+                OTLPMetricExporter(endpoint=endpoint, headers=header_dict or None)
+            )
+            metrics.set_meter_provider(
+                MeterProvider(resource=resource, metric_readers=[reader])
+            )
+        except Exception as e:
+            _log.warning(f"Failed to configure metrics export: {e}")
+
         # Instrument Django
         try:
             from opentelemetry.instrumentation.django import DjangoInstrumentor
@@ -134,3 +156,22 @@ def init_tracing() -> None:
         _log.error(f"Failed to initialize OpenTelemetry: {e}")
 
     _initialized = True
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Run the block in an OpenTelemetry span.
+
+    A no-op span is used when tracing is not configured, and nothing at all
+    when the OpenTelemetry packages are missing.
+    """
+    try:
+        from opentelemetry import trace
+    except ImportError:
+        yield None
+        return
+
+    tracer = trace.get_tracer("dtx-backend")
+    with tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
@@ -1,12 +1,16 @@
 """WebSocket telemetry mixin for Django Channels consumers."""
 
 import uuid
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 import structlog
 
 from telemetry.labels import extract_labels
 from telemetry.logging import get_logger
+from telemetry.metrics import counter, timed, up_down_counter
+from telemetry.stats import HotPathStats, collect_stats, record_payload
+from telemetry.tracing import span
 
 log = get_logger(__name__)
 
@@ -30,6 +34,9 @@ class TelemetryConsumerMixin:
     - Extracts labels from WebSocket path
     - Binds context for all logs during connection
     - Logs connect/disconnect events
+    - Traces and collects hot-path stats per handled message type (connect,
+      receive, group events) and counts sent frame bytes towards them
+    - Tracks active connections per consumer (``ws.connections.active``)
     """
 
     # These will be set during connect
@@ -76,6 +83,10 @@ class TelemetryConsumerMixin:
 
         # Log connection
         log.info("ws_connected", client_ip=client_ip)
+        self._ws_counted = True
+        up_down_counter("ws.connections.active").add(
+            1, {"ws.consumer": type(self).__name__}
+        )
 
     async def telemetry_disconnect(self, close_code: int) -> None:
         """
@@ -87,6 +98,11 @@ class TelemetryConsumerMixin:
             close_code: WebSocket close code
         """
         log.info("ws_disconnected", close_code=close_code)
+        if getattr(self, "_ws_counted", False):
+            self._ws_counted = False
+            up_down_counter("ws.connections.active").add(
+                -1, {"ws.consumer": type(self).__name__}
+            )
 
         # Clear context
         structlog.contextvars.clear_contextvars()
@@ -103,3 +119,62 @@ class TelemetryConsumerMixin:
         # Log with truncated data to avoid huge log entries
         preview = text_data[:100] if text_data else None
         log.debug("ws_receive", data_preview=preview)
+
+    @contextmanager
+    def telemetry_event(self, event_type: str) -> Iterator[HotPathStats]:
+        """
+        Collect hot-path stats for handling one WebSocket event.
+
+        The route is ``ws:<ConsumerClass>.<event_type>``, which is also the
+        key for ``TELEMETRY_BUDGETS``. Logs a ``ws_event`` line with the stats.
+        """
+        route = f"ws:{type(self).__name__}.{event_type}"
+        with collect_stats("ws", route) as stats:
+            yield stats
+        log.debug(
+            "ws_event",
+            event_type=event_type,
+            duration_ms=round(stats.duration_ms, 2),
+            **stats.log_fields(),
+        )
+
+    @contextmanager
+    def telemetry_phase(self, phase: str) -> Iterator[None]:
+        """Trace and time one phase of a handler (``ws.phase.duration``)."""
+        consumer = type(self).__name__
+        attributes = {"ws.consumer": consumer, "ws.phase": phase}
+        with (
+            span(f"ws {consumer} {phase}", **attributes),
+            timed("ws.phase.duration", attributes),
+        ):
+            yield
+
+    async def dispatch(self, message: dict[str, Any]) -> None:
+        """Wrap every handled message (connect, receive, group events) in stats."""
+        consumer = type(self).__name__
+        with (
+            span(
+                f"ws {consumer} {message['type']}",
+                **{"ws.consumer": consumer, "ws.message_type": message["type"]},
+            ),
+            self.telemetry_event(message["type"]),
+        ):
+            await super().dispatch(message)
+
+    async def send(self, text_data=None, bytes_data=None, close=False):
+        """
+        Send a frame, counting its size towards the active event's stats and
+        ``ws.frames.bytes_sent`` per consumer.
+        """
+        # Text length; equal to the byte count for ASCII-only frames
+        size = None
+        if text_data is not None:
+            size = len(text_data)
+        elif bytes_data is not None:
+            size = len(bytes_data)
+        if size is not None:
+            record_payload(size)
+            counter("ws.frames.bytes_sent", unit="By").add(
+                size, {"ws.consumer": type(self).__name__}
+            )
+        await super().send(text_data=text_data, bytes_data=bytes_data, close=close)
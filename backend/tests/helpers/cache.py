@@ -0,0 +1,33 @@
+"""
+Cache helpers for tests.
+
+Tests that exercise caching need a working cache even when the suite runs
+with ``DISABLE_CACHE=true`` (see ``tests/tasks.py``), which configures a
+DummyCache as the default cache.
+"""
+
+from django.core.cache import cache
+from django.test import override_settings
+
+LOCAL_MEMORY_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+}
+
+
+def local_memory_cache(test_class):
+    """
+    Run a test class on a local-memory default cache, emptied before each test.
+
+    Usage:
+        @local_memory_cache
+        class MyCacheTest(TestCase):
+            ...
+    """
+    set_up = test_class.setUp
+
+    def setUp(self):
+        cache.clear()
+        set_up(self)
+
+    test_class.setUp = setUp
+    return override_settings(CACHES=LOCAL_MEMORY_CACHES)(test_class)
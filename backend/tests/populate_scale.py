@@ -0,0 +1,433 @@
+"""
+Seeded synthetic data at production scale.
+
+``populate.py`` builds small, hand-shaped scenarios one row at a time. This
+builds volume instead: organizations, leagues, users, tournaments with
+teams and bracket games, and Steam matches with their ``PlayerMatchStats``,
+written with bulk inserts. The same parameters and seed always produce the
+same data, so a benchmark run on one machine can be repeated on another.
+
+Scale rows live in reserved ranges (``scale_`` usernames, league IDs from
+``SCALE_LEAGUE_ID_BASE``, match IDs from ``SCALE_MATCH_ID_BASE``) so they
+can be cleared without touching anything else.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.db import connections, router, transaction
+
+from app.models import CustomUser
+
+SCALE_USERNAME_PREFIX = "scale_"
+SCALE_ORG_PREFIX = "Scale Org"
+SCALE_LEAGUE_ID_BASE = 900000
+SCALE_LEAGUE_ID_LIMIT = SCALE_LEAGUE_ID_BASE + 100000
+# populate_steam_matches uses 9000000000-9100000000
+SCALE_MATCH_ID_BASE = 9100000000
+SCALE_MATCH_ID_LIMIT = SCALE_MATCH_ID_BASE + 1000000000
+SCALE_MATCH_SEQ_NUM_BASE = 7100000000
+SCALE_DISCORD_ID_BASE = 900000000000000000
+# Steam32 account IDs from 900000000, clear of populate.create_user's range
+SCALE_STEAM_ID_BASE = CustomUser.STEAM_ID_64_BASE + 900000000
+SCALE_START_DATE = datetime(2024, 1, 6, 18, 0, tzinfo=timezone.utc)
+
+BULK_BATCH_SIZE = 5000
+# Matches generated and inserted per transaction
+MATCH_CHUNK_SIZE = 10000
+PREFETCH_CHUNK_SIZE = 500
+TEAM_SIZE = 5
+
+MATCH_FIELDS = (
+    "match_id",
+    "radiant_win",
+    "duration",
+    "start_time",
+    "game_mode",
+    "lobby_type",
+    "league_id",
+)
+PLAYER_STATS_FIELDS = (
+    "player_slot",
+    "hero_id",
+    "kills",
+    "deaths",
+    "assists",
+    "gold_per_min",
+    "xp_per_min",
+    "last_hits",
+    "denies",
+    "hero_damage",
+    "tower_damage",
+    "hero_healing",
+)
+
+
+def clear_scale_data():
+    """Delete everything a previous ``populate_scale_data`` run created."""
+    from app.models import League, Organization, PositionsModel, Tournament
+    from app.services.tournament_import import TournamentImporter
+    from steam.models import Match, PlayerMatchStats
+
+    matches = Match.objects.filter(
+        match_id__gte=SCALE_MATCH_ID_BASE, match_id__lt=SCALE_MATCH_ID_LIMIT
+    )
+    PlayerMatchStats.objects.filter(match__in=matches).delete()
+    matches.delete()
+
+    leagues = League.objects.filter(
+        steam_league_id__gte=SCALE_LEAGUE_ID_BASE,
+        steam_league_id__lt=SCALE_LEAGUE_ID_LIMIT,
+    )
+    TournamentImporter.delete(
+        Tournament.objects.filter(league__in=leagues).values_list("pk", flat=True)
+    )
+    leagues.delete()
+    Organization.objects.filter(name__startswith=SCALE_ORG_PREFIX).delete()
+
+    users = CustomUser.objects.filter(username__startswith=SCALE_USERNAME_PREFIX)
+    position_ids = list(users.values_list("positions_id", flat=True))
+    users.delete()
+    PositionsModel.objects.filter(pk__in=position_ids).delete()
+
+
+def populate_scale_data(
+    seed=0,
+    organizations=2,
+    leagues=4,
+    users=2000,
+    tournaments=50,
+    teams_per_tournament=8,
+    games_per_tournament=7,
+    matches=10000,
+    force=False,
+):
+    """
+    Generate a deterministic synthetic dataset.
+
+    Leagues are spread round-robin over organizations and tournaments over
+    leagues. Each tournament draws ``teams_per_tournament`` five-player
+    teams from the user pool and gets ``games_per_tournament`` games. Each
+    of the ``matches`` Steam matches (ten ``PlayerMatchStats`` rows each)
+    is played by two teams of a tournament; the first ones complete the
+    tournament games in order, the rest are unlinked league matches.
+
+    Args:
+        seed (int): Seed for every random choice.
+        force (bool): If True, clear previous scale data first.
+
+    Returns:
+        dict: Rows created per model, or None if scale data already exists.
+    """
+    from cacheops import invalidate_model, no_invalidation
+
+    from app.models import Game, League, Organization, Team, Tournament
+    from steam.models import Match, PlayerMatchStats
+
+    if leagues < 1 or organizations < 1 or tournaments < 1:
+        raise ValueError("Need at least one organization, league and tournament")
+    if teams_per_tournament < 2:
+        raise ValueError("Need at least 2 teams per tournament")
+    if users < teams_per_tournament * TEAM_SIZE:
+        raise ValueError(
+            f"Need at least {teams_per_tournament * TEAM_SIZE} users "
+            f"for {teams_per_tournament} teams per tournament"
+        )
+
+    if CustomUser.objects.filter(username__startswith=SCALE_USERNAME_PREFIX).exists():
+        if not force:
+            print("Scale data already exists. Use force=True to regenerate.")
+            return None
+        print("Clearing previous scale data...")
+        clear_scale_data()
+
+    rng = random.Random(seed)
+    started = time.monotonic()
+
+    # Per-row cacheops invalidation would cost a Redis call per object;
+    # the touched models are invalidated once at the end instead
+    with no_invalidation:
+        with transaction.atomic():
+            orgs, league_objs = _create_orgs_and_leagues(organizations, leagues)
+            user_ids = _create_users(rng, users)
+            tournament_objs, teams = _create_tournaments(
+                rng, league_objs, user_ids, tournaments, teams_per_tournament
+            )
+        games = _plan_games(rng, tournament_objs, teams, games_per_tournament)
+        print(
+            f"Created {len(orgs)} organizations, {len(league_objs)} leagues, "
+            f"{len(user_ids)} users and {len(tournament_objs)} tournaments "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+        stats_count = _create_matches(
+            rng, tournament_objs, teams, games, user_ids, matches
+        )
+        Game.objects.bulk_create(games, batch_size=BULK_BATCH_SIZE)
+        print(
+            f"Created {matches} matches, {stats_count} player stats and "
+            f"{len(games)} games in {time.monotonic() - started:.1f}s"
+        )
+
+    # Bulk inserts skip save() and its cache invalidation
+    for model in (
+        Organization,
+        League,
+        CustomUser,
+        Tournament,
+        Team,
+        Game,
+        Match,
+        PlayerMatchStats,
+    ):
+        invalidate_model(model)
+
+    return {
+        "organizations": len(orgs),
+        "leagues": len(league_objs),
+        "users": len(user_ids),
+        "tournaments": len(tournament_objs),
+        "teams": len(tournament_objs) * teams_per_tournament,
+        "games": len(games),
+        "matches": matches,
+        "player_stats": stats_count,
+    }
+
+
+def _create_orgs_and_leagues(organizations, leagues):
+    from app.models import League, Organization
+
+    orgs = Organization.objects.bulk_create(
+        [
+            Organization(
+                name=f"{SCALE_ORG_PREFIX} {i + 1}",
+                description="Synthetic organization for scale testing.",
+            )
+            for i in range(organizations)
+        ]
+    )
+    league_objs = League.objects.bulk_create(
+        [
+            League(
+                steam_league_id=SCALE_LEAGUE_ID_BASE + i,
+                name=f"Scale League {i + 1}",
+            )
+            for i in range(leagues)
+        ]
+    )
+    League.organizations.through.objects.bulk_create(
+        [
+            League.organizations.through(
+                league_id=league.pk, organization_id=orgs[i % len(orgs)].pk
+            )
+            for i, league in enumerate(league_objs)
+        ]
+    )
+    for i, org in enumerate(orgs[: len(league_objs)]):
+        org.default_league = league_objs[i]
+    Organization.objects.bulk_update(orgs, ["default_league"])
+    return orgs, league_objs
+
+
+def _create_users(rng, count):
+    from app.models import PositionsModel
+
+    positions = PositionsModel.objects.bulk_create(
+        [
+            PositionsModel(
+                carry=rng.randint(0, 5),
+                mid=rng.randint(0, 5),
+                offlane=rng.randint(0, 5),
+                soft_support=rng.randint(0, 5),
+                hard_support=rng.randint(0, 5),
+            )
+            for _ in range(count)
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    users = CustomUser.objects.bulk_create(
+        [
+            CustomUser(
+                username=f"{SCALE_USERNAME_PREFIX}{i:06d}",
+                # Unusable; hashing a password per user would dominate the run
+                password="!",
+                discordId=str(SCALE_DISCORD_ID_BASE + i),
+                discordUsername=f"{SCALE_USERNAME_PREFIX}{i:06d}",
+                # bulk_create skips save(), which derives steam_account_id
+                steamid=SCALE_STEAM_ID_BASE + i,
+                steam_account_id=SCALE_STEAM_ID_BASE + i - CustomUser.STEAM_ID_64_BASE,
+                mmr=rng.randint(200, 6000),
+                positions=position,
+            )
+            for i, position in enumerate(positions)
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    return [user.pk for user in users]
+
+
+def _create_tournaments(rng, league_objs, user_ids, count, teams_per_tournament):
+    from django.db.models import Prefetch, prefetch_related_objects
+
+    from app.models import Team, Tournament
+
+    tournament_objs = Tournament.objects.bulk_create(
+        [
+            Tournament(
+                name=f"Scale Tournament {i + 1}",
+                date_played=SCALE_START_DATE + timedelta(weeks=i),
+                state="past",
+                league=league_objs[i % len(league_objs)],
+                steam_league_id=league_objs[i % len(league_objs)].steam_league_id,
+            )
+            for i in range(count)
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    rosters = {}
+    teams, team_members = [], []
+    for tournament in tournament_objs:
+        players = rng.sample(user_ids, teams_per_tournament * TEAM_SIZE)
+        rosters[tournament.pk] = players
+        for j in range(teams_per_tournament):
+            members = players[j * TEAM_SIZE : (j + 1) * TEAM_SIZE]
+            teams.append(
+                Team(
+                    tournament=tournament,
+                    name=f"Team {j + 1}",
+                    captain_id=members[0],
+                    draft_order=j + 1,
+                )
+            )
+            team_members.append(members)
+    teams = Team.objects.bulk_create(teams, batch_size=BULK_BATCH_SIZE)
+
+    Tournament.users.through.objects.bulk_create(
+        [
+            Tournament.users.through(tournament_id=tournament_id, customuser_id=pk)
+            for tournament_id, players in rosters.items()
+            for pk in players
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    Team.members.through.objects.bulk_create(
+        [
+            Team.members.through(team_id=team.pk, customuser_id=pk)
+            for team, members in zip(teams, team_members)
+            for pk in members
+        ],
+        batch_size=BULK_BATCH_SIZE,
+    )
+
+    # generate_mock_match reads team.members.all(); prefetched, that is no
+    # query. Chunked so each IN list stays within SQLite's variable limit.
+    members = Prefetch(
+        "members", queryset=CustomUser.objects.only("pk", "steamid").order_by("pk")
+    )
+    for i in range(0, len(teams), PREFETCH_CHUNK_SIZE):
+        prefetch_related_objects(teams[i : i + PREFETCH_CHUNK_SIZE], members)
+    teams_by_tournament = {}
+    for team in teams:
+        teams_by_tournament.setdefault(team.tournament_id, []).append(team)
+    return tournament_objs, teams_by_tournament
+
+
+def _plan_games(rng, tournament_objs, teams, games_per_tournament):
+    """Unsaved games; the first matches complete them before they are saved."""
+    from app.models import Game
+
+    return [
+        Game(
+            tournament=tournament,
+            league_id=tournament.league_id,
+            round=position // 2 + 1,
+            position=position % 2,
+            radiant_team=radiant,
+            dire_team=dire,
+        )
+        for tournament in tournament_objs
+        for position in range(games_per_tournament)
+        for radiant, dire in [rng.sample(teams[tournament.pk], 2)]
+    ]
+
+
+def _create_matches(rng, tournament_objs, teams, games, user_ids, count):
+    """
+    Generate ``count`` matches with ``generate_mock_match`` and insert them.
+
+    Match ``i`` plays ``games[i]`` and completes it; matches past the games
+    are between two random teams of a random tournament. Work is done
+    ``MATCH_CHUNK_SIZE`` matches per transaction, so memory stays flat
+    however many matches are asked for.
+    """
+    from steam.mocks.mock_match_generator import generate_mock_match
+    from steam.models import Match, PlayerMatchStats
+
+    # Users were created with consecutive Steam IDs
+    user_by_steamid = {SCALE_STEAM_ID_BASE + i: pk for i, pk in enumerate(user_ids)}
+
+    stats_count = 0
+    for chunk_start in range(0, count, MATCH_CHUNK_SIZE):
+        match_rows, stats_rows = [], []
+        for offset in range(chunk_start, min(chunk_start + MATCH_CHUNK_SIZE, count)):
+            game = games[offset] if offset < len(games) else None
+            if game:
+                tournament = game.tournament
+                radiant, dire = game.radiant_team, game.dire_team
+            else:
+                tournament = rng.choice(tournament_objs)
+                radiant, dire = rng.sample(teams[tournament.pk], 2)
+            match_id = SCALE_MATCH_ID_BASE + offset
+            data = generate_mock_match(
+                radiant_team=radiant,
+                dire_team=dire,
+                match_id=match_id,
+                match_seq_num=SCALE_MATCH_SEQ_NUM_BASE + offset,
+                # Some time during the tournament's week
+                start_time=int(tournament.date_played.timestamp())
+                + rng.randrange(7 * 24 * 3600),
+                league_id=tournament.steam_league_id,
+                rng=rng,
+            )["result"]
+
+            match_rows.append(tuple(data[field] for field in MATCH_FIELDS))
+            for player in data["players"]:
+                steam_id = player["account_id"] + CustomUser.STEAM_ID_64_BASE
+                stats_rows.append(
+                    (match_id, steam_id, user_by_steamid.get(steam_id))
+                    + tuple(player[field] for field in PLAYER_STATS_FIELDS)
+                )
+            if game:
+                game.gameid = match_id
+                game.status = "completed"
+                game.winning_team = radiant if data["radiant_win"] else dire
+
+        with transaction.atomic():
+            _insert_rows(Match, MATCH_FIELDS, match_rows)
+            _insert_rows(
+                PlayerMatchStats,
+                ("match", "steam_id", "user") + PLAYER_STATS_FIELDS,
+                stats_rows,
+            )
+        stats_count += len(stats_rows)
+    return stats_count
+
+
+def _insert_rows(model, fields, rows):
+    """
+    INSERT ``rows`` (tuples in ``fields`` order) with one ``executemany``.
+
+    ``bulk_create`` builds a model instance per row and prepares every value
+    through its field; at a million rows that is most of the run time.
+    """
+    connection = connections[router.db_for_write(model)]
+    quote = connection.ops.quote_name
+    columns = [quote(model._meta.get_field(field).column) for field in fields]
+    sql = (
+        f"INSERT INTO {quote(model._meta.db_table)} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)